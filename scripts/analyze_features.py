@@ -11,7 +11,9 @@ from lightgbm import LGBMClassifier
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from btc_predictor.infrastructure.store import DataStore
-from btc_predictor.strategies.xgboost_v1.features import generate_features, get_feature_columns
+from btc_predictor.infrastructure.ohlcv_archive import DEFAULT_ARCHIVE_ROOT, OHLCVArchive
+from btc_predictor.strategies.xgboost_v1.features import FEATURE_SET, generate_features, get_feature_columns
+from btc_predictor.strategies.feature_store import FeatureStore
 from btc_predictor.infrastructure.labeling import add_direction_labels
 
 def main():
@@ -19,10 +21,12 @@ def main():
     parser.add_argument("--timeframe", type=int, default=10, help="Timeframe (10, 30, 60, 1440)")
     parser.add_argument("--days", type=int, default=180, help="Days of data to analyze")
     parser.add_argument("--model", type=str, default="xgboost", choices=["xgboost", "lgbm"], help="Model to use for Boruta")
+    parser.add_argument("--archive", type=str, nargs="?", const=str(DEFAULT_ARCHIVE_ROOT),
+                        help="Load OHLCV from the columnar archive (see scripts/sync_ohlcv_archive.py)")
     
     args = parser.parse_args()
     
-    store = DataStore()
+    store = OHLCVArchive(args.archive) if args.archive else DataStore()
     limit = args.days * 24 * 60
     df = store.get_ohlcv("BTCUSDT", "1m", limit=limit)
     
@@ -31,7 +35,7 @@ def main():
         return
 
     print(f"Generating features for {len(df)} rows...")
-    feat_df = generate_features(df)
+    feat_df = FeatureStore().attach(df).get(FEATURE_SET, df, generate_features)
     labeled_df = add_direction_labels(feat_df, args.timeframe)
     
     feature_cols = get_feature_columns()
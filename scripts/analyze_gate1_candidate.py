@@ -2,8 +2,15 @@ import json
 import argparse
 import numpy as np
 import os
+import sys
+from pathlib import Path
 from typing import Dict, Any
 
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.backtest.trade_log import TradeLog
+
 def analyze_report(report_path: str):
     if not os.path.exists(report_path):
         print(f"Error: Report {report_path} not found.")
@@ -13,7 +20,10 @@ def analyze_report(report_path: str):
         data = json.load(f)
 
     stats = data.get('stats', {})
-    trades = data.get('trades', [])
+    if 'trades_file' in data:
+        directions = TradeLog.load(Path(report_path).parent / data['trades_file']).direction.tolist()
+    else:
+        directions = [t.get('direction') for t in data.get('trades', [])]
     
     total_trades = stats.get('total_trades', 0)
     higher_da = stats.get('higher_da', 0)
@@ -21,8 +31,8 @@ def analyze_report(report_path: str):
     per_fold_da = np.array(stats.get('per_fold_da', []))
     
     # Calculate counts from trades
-    higher_trades = sum(1 for t in trades if t.get('direction') == 'higher')
-    lower_trades = sum(1 for t in trades if t.get('direction') == 'lower')
+    higher_trades = directions.count('higher')
+    lower_trades = directions.count('lower')
     
     # Analysis
     da_diff = abs(higher_da - lower_da)
@@ -9,10 +9,13 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from btc_predictor.infrastructure.store import DataStore
-from btc_predictor.backtest.engine import run_backtest
+from btc_predictor.infrastructure.ohlcv_archive import DEFAULT_ARCHIVE_ROOT, OHLCVArchive
+from btc_predictor.backtest.engine import BACKENDS, run_backtest
+from btc_predictor.backtest.fold_cache import DEFAULT_FOLD_CACHE_ROOT, FoldCache
 from btc_predictor.backtest.stats import calculate_backtest_stats, compute_regression_stats
 # from btc_predictor.strategies.xgboost_v1.strategy import XGBoostDirectionStrategy (Removed)
-from btc_predictor.strategies.xgboost_v1.features import generate_features
+from btc_predictor.strategies.xgboost_v1.features import FEATURE_SET, generate_features
+from btc_predictor.strategies.feature_store import DEFAULT_FEATURE_STORE_ROOT, FeatureStore
 from btc_predictor.strategies.registry import StrategyRegistry
 STRATEGIES_DIR = "src/btc_predictor/strategies"
 MODELS_DIR = "models"
@@ -29,13 +32,26 @@ def main():
     parser.add_argument("--start-date", type=str, help="Backtest start date (YYYY-MM-DD)")
     parser.add_argument("--end-date", type=str, help="Backtest end date (YYYY-MM-DD)")
     parser.add_argument("--n-jobs", type=int, default=-2, help="Parallel jobs (-1: all, -2: all-1)")
+    parser.add_argument("--backend", type=str, default="threading", choices=BACKENDS,
+                        help="Fold parallelism: threads, or worker processes sharing OHLCV via mmap")
     parser.add_argument("--platform", type=str, default="binance", help="Trading platform (binance or polymarket)")
+    parser.add_argument("--archive", type=str, nargs="?", const=str(DEFAULT_ARCHIVE_ROOT),
+                        help="Load OHLCV from the columnar archive (see scripts/sync_ohlcv_archive.py)")
+    parser.add_argument("--feature-store", type=str, default=str(DEFAULT_FEATURE_STORE_ROOT),
+                        help="Materialized feature directory")
+    parser.add_argument("--no-feature-store", action="store_true", help="Recompute features in every fold")
+    parser.add_argument("--fold-cache", type=str, default=str(DEFAULT_FOLD_CACHE_ROOT),
+                        help="Fold result cache (folds with unchanged code, models and data are reused)")
+    parser.add_argument("--no-fold-cache", action="store_true", help="Recompute every fold")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Continue training from the previous fold's model (supported strategies)")
+    parser.add_argument("--refit-every", type=int, default=4, help="With --warm-start: full refit every N folds")
     
     args = parser.parse_args()
     
     # 1. Load Data
     print(f"Loading data for {args.symbol} {args.interval}...")
-    store = DataStore()
+    store = OHLCVArchive(args.archive) if args.archive else DataStore()
     
     start_ms = None
     if args.start_date:
@@ -51,14 +67,19 @@ def main():
     df = store.get_ohlcv(args.symbol, args.interval, start_time=start_ms, end_time=end_ms)
     
     if df.empty:
-        print(f"No data found for {args.symbol} {args.interval} in database.")
+        print(f"No data found for {args.symbol} {args.interval} in {'archive' if args.archive else 'database'}.")
         return
         
     print(f"Loaded {len(df)} rows. Range: {df.index[0]} to {df.index[-1]}")
     
     # Pre-calculate features to speed up backtest
     print("Pre-calculating features...")
-    df = generate_features(df)
+    feature_store = None
+    if args.no_feature_store:
+        df = generate_features(df)
+    else:
+        feature_store = FeatureStore(args.feature_store).attach(df)
+        df = feature_store.get(FEATURE_SET, df, generate_features)
     
     # 2. Initialize Strategy
     try:
@@ -70,6 +91,15 @@ def main():
         print(f"Available strategies: {registry.list_names()}")
         return
         
+    # Raw model outputs go next to the report so decision rules can be swept
+    # without re-running the backtest (scripts/replay_sweep.py)
+    output_dir = Path(args.output)
+    output_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_filename = f"backtest_{args.strategy}_{args.timeframe}m_{timestamp}.json"
+    report_path = output_dir / report_filename
+    predictions_path = report_path.with_suffix(".predictions.arrow")
+
     # 3. Run Backtest
     print(f"Starting walk-forward backtest for {args.strategy} ({args.timeframe}m)...")
     trades = run_backtest(
@@ -79,7 +109,14 @@ def main():
         train_days=args.train_days,
         test_days=args.test_days,
         n_jobs=args.n_jobs,
-        platform=args.platform
+        platform=args.platform,
+        feature_store=feature_store,
+        backend=args.backend,
+        models_dir=Path(MODELS_DIR),
+        predictions_path=predictions_path,
+        fold_cache=None if args.no_fold_cache else FoldCache(args.fold_cache),
+        warm_start=args.warm_start,
+        refit_every=args.refit_every
     )
     
     if not trades:
@@ -107,17 +144,12 @@ def main():
     print("="*40)
     
     # Save to JSON
-    output_dir = Path(args.output)
-    output_dir.mkdir(exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_filename = f"backtest_{args.strategy}_{args.timeframe}m_{timestamp}.json"
-    report_path = output_dir / report_filename
-    
-    # Include raw trades for merging later if needed
+    # Raw trades go to a columnar trade log next to the report (for merging later)
+    trades_path = trades.save(report_path.with_suffix(".trades.arrow"))
     full_output = {
         "stats": stats,
-        "trades": [vars(t) for t in trades]
+        "trades_file": trades_path.name,
+        "predictions_file": predictions_path.name
     }
     
     with open(report_path, "w", encoding="utf-8") as f:
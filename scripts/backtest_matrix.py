@@ -0,0 +1,147 @@
+"""
+Walk-forward backtests of several strategies at several timeframes in one job.
+
+Loads OHLCV once, serves every strategy's features from one feature store
+(each feature set is computed once), builds the fold boundaries once and runs
+the folds of all (strategy, timeframe) pairs on a single worker pool
+(``run_backtest_matrix``). Writes the same report / trade log / prediction
+files per pair as ``scripts/backtest.py`` and prints the scoreboard of
+``scripts/generate_scoreboard.py`` for the pairs just run.
+
+Usage:
+    python scripts/backtest_matrix.py --strategies xgboost_v1 xgboost_v2 lgbm_v1 lgbm_v2 catboost_v1 mlp_v1 \\
+        --timeframes 10 30 60 --start-date 2025-01-01
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.backtest.engine import BACKENDS, run_backtest_matrix
+from btc_predictor.backtest.fold_cache import DEFAULT_FOLD_CACHE_ROOT, FoldCache
+from btc_predictor.backtest.stats import calculate_backtest_stats, compute_regression_stats
+from btc_predictor.infrastructure.ohlcv_archive import DEFAULT_ARCHIVE_ROOT, OHLCVArchive
+from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.strategies.feature_store import DEFAULT_FEATURE_STORE_ROOT, FeatureStore
+from btc_predictor.strategies.registry import StrategyRegistry
+from btc_predictor.strategies.xgboost_v1.features import FEATURE_SET, generate_features
+from generate_scoreboard import print_scoreboard, summarize
+
+STRATEGIES_DIR = "src/btc_predictor/strategies"
+MODELS_DIR = "models"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strategy x timeframe walk-forward backtest matrix")
+    parser.add_argument("--strategies", type=str, nargs="+", required=True, help="Strategy names")
+    parser.add_argument("--timeframes", type=int, nargs="+", default=[10, 30, 60], help="Timeframes in minutes")
+    parser.add_argument("--train-days", type=int, default=60, help="Initial training window in days")
+    parser.add_argument("--test-days", type=int, default=7, help="Test window in days")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT")
+    parser.add_argument("--interval", type=str, default="1m")
+    parser.add_argument("--output", type=str, default="reports", help="Output directory for reports")
+    parser.add_argument("--start-date", type=str, help="Backtest start date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=str, help="Backtest end date (YYYY-MM-DD)")
+    parser.add_argument("--n-jobs", type=int, default=-2, help="Parallel jobs (-1: all, -2: all-1)")
+    parser.add_argument("--backend", type=str, default="threading", choices=BACKENDS)
+    parser.add_argument("--platform", type=str, default="binance", help="Trading platform (binance or polymarket)")
+    parser.add_argument("--archive", type=str, nargs="?", const=str(DEFAULT_ARCHIVE_ROOT),
+                        help="Load OHLCV from the columnar archive")
+    parser.add_argument("--feature-store", type=str, default=str(DEFAULT_FEATURE_STORE_ROOT))
+    parser.add_argument("--no-feature-store", action="store_true", help="Recompute features in every fold")
+    parser.add_argument("--fold-cache", type=str, default=str(DEFAULT_FOLD_CACHE_ROOT))
+    parser.add_argument("--no-fold-cache", action="store_true", help="Recompute every fold")
+    parser.add_argument("--warm-start", action="store_true")
+    parser.add_argument("--refit-every", type=int, default=4)
+    args = parser.parse_args()
+
+    registry = StrategyRegistry()
+    registry.discover(STRATEGIES_DIR, MODELS_DIR)
+    unknown = [name for name in args.strategies if name not in registry.list_names()]
+    if unknown:
+        print(f"Unknown strategies: {unknown}")
+        print(f"Available strategies: {registry.list_names()}")
+        return
+    strategies = [registry.get(name) for name in args.strategies]
+
+    # 1. Load data (once for the whole matrix)
+    print(f"Loading data for {args.symbol} {args.interval}...")
+    store = OHLCVArchive(args.archive) if args.archive else DataStore()
+    start_ms = None
+    if args.start_date:
+        start_dt = datetime.strptime(args.start_date, "%Y-%m-%d") - timedelta(days=args.train_days)
+        start_ms = int(start_dt.timestamp() * 1000)
+    end_ms = int(datetime.strptime(args.end_date, "%Y-%m-%d").timestamp() * 1000) if args.end_date else None
+    df = store.get_ohlcv(args.symbol, args.interval, start_time=start_ms, end_time=end_ms)
+    if df.empty:
+        print(f"No data found for {args.symbol} {args.interval} in {'archive' if args.archive else 'database'}.")
+        return
+    print(f"Loaded {len(df)} rows. Range: {df.index[0]} to {df.index[-1]}")
+
+    print("Pre-calculating features...")
+    feature_store = None
+    if args.no_feature_store:
+        df = generate_features(df)
+    else:
+        feature_store = FeatureStore(args.feature_store).attach(df)
+        df = feature_store.get(FEATURE_SET, df, generate_features)
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_paths = {
+        (name, tf): output_dir / f"backtest_{name}_{tf}m_{timestamp}.json"
+        for name in args.strategies for tf in args.timeframes
+    }
+
+    # 2. Run every (strategy, timeframe) on one pool
+    start = time.perf_counter()
+    results = run_backtest_matrix(
+        strategies,
+        df,
+        timeframes=args.timeframes,
+        train_days=args.train_days,
+        test_days=args.test_days,
+        n_jobs=args.n_jobs,
+        platform=args.platform,
+        feature_store=feature_store,
+        backend=args.backend,
+        models_dir=Path(MODELS_DIR),
+        predictions_paths={key: path.with_suffix(".predictions.arrow") for key, path in report_paths.items()},
+        fold_cache=None if args.no_fold_cache else FoldCache(args.fold_cache),
+        warm_start=args.warm_start,
+        refit_every=args.refit_every,
+    )
+    print(f"\nMatrix finished in {time.perf_counter() - start:.1f}s")
+
+    # 3. Reports (same layout as scripts/backtest.py)
+    scoreboard = {}
+    for (name, tf), trades in results.items():
+        if not trades:
+            print(f"{name} {tf}m: no trades generated.")
+            continue
+        stats = calculate_backtest_stats(trades, test_days=args.test_days)
+        reg_stats = compute_regression_stats(trades)
+        if reg_stats:
+            stats["regression_stats"] = reg_stats
+        report_path = report_paths[(name, tf)]
+        trades_path = trades.save(report_path.with_suffix(".trades.arrow"))
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "stats": stats,
+                "trades_file": trades_path.name,
+                "predictions_file": report_path.with_suffix(".predictions.arrow").name
+            }, f, indent=4, default=str)
+        scoreboard[(name, str(tf))] = summarize(stats)
+    print(f"Reports saved to {output_dir}\n")
+
+    print_scoreboard(scoreboard, [str(tf) for tf in args.timeframes])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Per-signal inference latency for every registered strategy.
+
+For each strategy / timeframe with a model, replays the last ``--signals``
+candles one at a time (like live ticks) and times ``strategy.predict``. Tree
+strategies using native predictors (``btc_predictor.strategies.inference``)
+also report the model call alone: sklearn-style wrapper on a one-row
+DataFrame (previous path) vs native predictor on a float32 row.
+
+Models are loaded from ``--models-dir``; with ``--fit``, strategies without a
+saved model for ``--timeframe`` are first trained on the benchmark data.
+
+Usage:
+    python scripts/bench_inference.py --signals 200
+    python scripts/bench_inference.py --fit --timeframe 10 --synthetic-days 5
+    python scripts/bench_inference.py --db data/btc_predictor.db --strategy xgboost_v1 lgbm_v1
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import btc_predictor.strategies as strategies_pkg
+from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.inference import FallbackPredictor, PredictorCache
+from btc_predictor.strategies.registry import StrategyRegistry
+
+
+def _synthetic_ohlcv(days: int, seed: int = 7) -> pd.DataFrame:
+    periods = days * 1440
+    times = pd.date_range("2025-01-01", periods=periods, freq="1min", tz="UTC")
+    rng = np.random.default_rng(seed)
+    close = 95000 + np.cumsum(rng.normal(0, 25, periods))
+    return pd.DataFrame({
+        "open": close + rng.normal(0, 5, periods),
+        "high": close + np.abs(rng.normal(0, 10, periods)),
+        "low": close - np.abs(rng.normal(0, 10, periods)),
+        "close": close,
+        "volume": np.abs(rng.normal(10, 3, periods)),
+    }, index=times)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    arr = np.asarray(samples) * 1e6
+    return {"mean": float(arr.mean()), "p50": float(np.percentile(arr, 50)), "p95": float(np.percentile(arr, 95))}
+
+
+def bench_predict(strategy: BaseStrategy, ohlcv: pd.DataFrame, timeframe: int, signals: int, window: int) -> Dict[str, float]:
+    """Latency (µs) of ``predict`` on successive windows ending at each of the last ``signals`` candles."""
+    ends = range(len(ohlcv) - signals, len(ohlcv))
+    strategy.predict(ohlcv.iloc[ends[0] - window:ends[0]], timeframe)  # warm-up
+    samples = []
+    for end in ends:
+        frame = ohlcv.iloc[end + 1 - window:end + 1]
+        start = time.perf_counter()
+        strategy.predict(frame, timeframe)
+        samples.append(time.perf_counter() - start)
+    return _percentiles(samples)
+
+
+def bench_model_call(strategy: BaseStrategy, timeframe: int, calls: int) -> Optional[Dict[str, float]]:
+    """Mean µs of one single-row model call: wrapper vs native predictor."""
+    cache = getattr(strategy, "_predictors", None)
+    if not isinstance(cache, PredictorCache):
+        return None
+    model = strategy.models[timeframe]
+    native = cache.get(timeframe, model)
+    wrapper = FallbackPredictor(model, cache.feature_columns, cache.output)
+    row = pd.DataFrame(np.random.default_rng(0).normal(size=(1, len(cache.feature_columns))), columns=list(cache.feature_columns))
+    results = {}
+    for name, predictor in (("wrapper", wrapper), ("native", native)):
+        predictor.predict_frame(row)  # warm-up
+        start = time.perf_counter()
+        for _ in range(calls):
+            predictor.predict_frame(row)
+        results[name] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-signal inference latency benchmark")
+    parser.add_argument("--strategy", type=str, nargs="+", default=None, help="Strategies to benchmark (default: all registered)")
+    parser.add_argument("--models-dir", type=str, default="models", help="Saved models directory")
+    parser.add_argument("--timeframe", type=int, default=10, help="Timeframe used with --fit")
+    parser.add_argument("--fit", action="store_true", help="Train strategies without a saved model for --timeframe")
+    parser.add_argument("--db", type=str, default=None, help="Use the latest candles of this SQLite DB instead of synthetic data")
+    parser.add_argument("--synthetic-days", type=int, default=5, help="Days of synthetic 1m data")
+    parser.add_argument("--signals", type=int, default=200, help="Signals (ticks) timed per strategy/timeframe")
+    parser.add_argument("--window", type=int, default=1000, help="Candles passed to predict per signal")
+    parser.add_argument("--calls", type=int, default=500, help="Model calls timed for the wrapper/native comparison")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.db:
+        ohlcv = DataStore(args.db).get_latest_ohlcv("BTCUSDT", "1m", limit=args.synthetic_days * 1440)
+    else:
+        ohlcv = _synthetic_ohlcv(args.synthetic_days)
+
+    registry = StrategyRegistry()
+    registry.discover(Path(strategies_pkg.__file__).parent, Path(args.models_dir))
+    names = args.strategy or sorted(registry.list_names())
+
+    print(f"{'strategy':<20}{'tf':>5}{'mean (µs)':>12}{'p50 (µs)':>12}{'p95 (µs)':>12}"
+          f"{'wrapper (µs)':>15}{'native (µs)':>14}{'speedup':>10}")
+    for name in names:
+        strategy = registry.get(name)
+        timeframes = sorted(strategy.available_timeframes)
+        if args.fit and strategy.requires_fitting and args.timeframe not in timeframes:
+            try:
+                strategy.fit(ohlcv.iloc[:-args.signals], args.timeframe)
+                timeframes = sorted(set(timeframes) | {args.timeframe})
+            except Exception as e:
+                print(f"{name:<20}  fit failed: {e}")
+                continue
+        if not strategy.requires_fitting and not timeframes:
+            timeframes = [args.timeframe]
+        if not timeframes:
+            print(f"{name:<20}  no model (use --fit)")
+            continue
+
+        for tf in timeframes:
+            try:
+                latency = bench_predict(strategy, ohlcv, tf, args.signals, args.window)
+            except Exception as e:
+                print(f"{name:<20}{tf:>5}  predict failed: {e}")
+                continue
+            model_call = bench_model_call(strategy, tf, args.calls)
+            line = f"{name:<20}{tf:>5}{latency['mean']:>12.0f}{latency['p50']:>12.0f}{latency['p95']:>12.0f}"
+            if model_call:
+                line += (f"{model_call['wrapper']:>15.0f}{model_call['native']:>14.0f}"
+                         f"{model_call['wrapper'] / model_call['native']:>9.1f}x")
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark for the performance rollup tables on a synthetic database.
+
+Builds a schema-v2 database (no rollups) with ``--rows`` simulated trades and
+prediction signals, times ``get_strategy_detail`` in its earlier per-row form,
+then opens it with ``DataStore`` — migration 3 creates and backfills the
+rollups — and times the rollup-based detail plus the cost the settlement
+triggers add to a batch of settlements.
+
+The synthetic data is the rollups' worst case: each (strategy, timeframe)
+trades once every 100 minutes, so its hourly rollup rows barely compress it.
+
+Usage:
+    python scripts/bench_rollups.py --rows 1000000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench_schema import STRATEGIES, TIMEFRAMES, populate
+from bench_stats import LegacyDataStore
+from btc_predictor.infrastructure.store import DataStore
+
+
+class PreRollupDataStore(LegacyDataStore):
+    """Schema before the rollups, with the per-row ``get_strategy_detail``."""
+
+    MIGRATIONS = DataStore.MIGRATIONS[:2]
+
+
+def timed(fn, repeat: int = 1) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance rollup benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Simulated trades / prediction signals")
+    parser.add_argument("--settle", type=int, default=250, help="Trades settled in the timed batch")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls timed per query")
+    args = parser.parse_args()
+
+    strategy, timeframe = STRATEGIES[3], TIMEFRAMES[3]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench_rollups.db")
+        legacy = PreRollupDataStore(db_path)
+        start = time.perf_counter()
+        populate(legacy, args.rows)
+        print(f"populated {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+        before = {
+            "detail (strategy)": timed(lambda: legacy.get_strategy_detail(strategy), args.repeat),
+            "detail (strategy, timeframe)": timed(lambda: legacy.get_strategy_detail(strategy, timeframe), args.repeat),
+        }
+        pending = legacy.get_pending_trades()["id"].tolist()
+        start = time.perf_counter()
+        legacy.update_simulated_trades((tid, 95010.0, "win", 8.0) for tid in pending[:args.settle])
+        before["settle batch"] = (time.perf_counter() - start) * 1e3
+        legacy.close()
+
+        start = time.perf_counter()
+        store = DataStore(db_path)
+        print(f"migrated to schema v{store.schema_version} (rollup backfill) in {time.perf_counter() - start:.1f}s\n")
+        after = {
+            "detail (strategy)": timed(lambda: store.get_strategy_detail(strategy), args.repeat),
+            "detail (strategy, timeframe)": timed(lambda: store.get_strategy_detail(strategy, timeframe), args.repeat),
+        }
+        start = time.perf_counter()
+        store.update_simulated_trades((tid, 95010.0, "win", 8.0) for tid in pending[args.settle:2 * args.settle])
+        after["settle batch"] = (time.perf_counter() - start) * 1e3
+        store.close()
+
+    print(f"{'operation':<32}{'before (ms)':>14}{'after (ms)':>14}")
+    for name in before:
+        print(f"{name:<32}{before[name]:>14.2f}{after[name]:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Query benchmark for the epoch-ms schema migration on a synthetic database.
+
+Builds a pre-migration database (ISO TEXT times only, original indexes) with
+``--rows`` simulated trades and prediction signals (plus Polymarket orders for
+a quarter of the signals), times the hot queries in their previous form, then
+opens it with ``DataStore`` — which applies ``SCHEMA_MIGRATIONS`` (backfill +
+covering indexes) — and times the rewritten queries (epoch-ms ranges).
+
+Usage:
+    python scripts/bench_schema.py --rows 1000000
+    python scripts/bench_schema.py --rows 200000 --db /tmp/bench_schema.db
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.infrastructure.store import DataStore, day_bounds_ms
+
+STRATEGIES = [f"strat_{i:02d}" for i in range(20)]
+TIMEFRAMES = [5, 10, 15, 30, 60]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class LegacyDataStore(DataStore):
+    """DataStore schema before the migrations (and its original indexes)."""
+
+    MIGRATIONS = ()
+
+    def _init_db(self):
+        super()._init_db()
+        with self._get_connection() as conn:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_unsettled ON prediction_signals(expiry_time) WHERE actual_direction IS NULL;")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_strategy ON prediction_signals(strategy_name, timeframe_minutes);")
+
+
+def populate(store: DataStore, rows: int) -> None:
+    """One trade and one signal per minute over 20 strategies x 5 timeframes."""
+    def key(i):
+        return STRATEGIES[i % len(STRATEGIES)], TIMEFRAMES[(i // len(STRATEGIES)) % len(TIMEFRAMES)]
+
+    def trades():
+        for i in range(rows):
+            t = START + timedelta(minutes=i)
+            strategy, tf = key(i)
+            settled = i < rows - 500
+            win = (i * 7919) % 100 < 54
+            yield (
+                f"t{i}", strategy, "higher" if (i * 31) % 2 else "lower", 0.6, tf, 10.0,
+                t.isoformat(), 95000.0, (t + timedelta(minutes=tf)).isoformat(),
+                95010.0 if settled else None,
+                ("win" if win else "lose") if settled else None,
+                (8.0 if win else -10.0) if settled else None,
+            )
+
+    def signals():
+        for i in range(rows):
+            t = START + timedelta(minutes=i)
+            strategy, tf = key(i)
+            settled = i < rows - 500
+            yield (
+                f"s{i}", strategy, t.isoformat(), tf, "higher", 0.6, 95000.0,
+                (t + timedelta(minutes=tf)).isoformat(),
+                "higher" if settled else None, 95010.0 if settled else None, 1 if settled else None,
+            )
+
+    def orders():
+        # A quarter of the signals (every strategy) became Polymarket orders
+        for i in range(rows):
+            if (i // len(STRATEGIES)) % 4:
+                continue
+            t = START + timedelta(minutes=i)
+            yield (f"o{i}", f"s{i}", "tok", "BUY", 0.5, 20.0, "GTC", "FILLED", t.isoformat(), 8.0 if i % 3 else -10.0)
+
+    with store._get_connection() as conn:
+        conn.executemany("""
+            INSERT INTO simulated_trades (id, strategy_name, direction, confidence, timeframe_minutes, bet_amount,
+                open_time, open_price, expiry_time, close_price, result, pnl) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, trades())
+        conn.executemany("""
+            INSERT INTO prediction_signals (id, strategy_name, timestamp, timeframe_minutes, direction, confidence,
+                current_price, expiry_time, actual_direction, close_price, is_correct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, signals())
+        conn.executemany("""
+            INSERT INTO pm_orders (order_id, signal_id, token_id, side, price, size, order_type, status, placed_at, pnl)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, orders())
+
+
+# Hot query shapes: name -> (before, after)
+QUERIES = {
+    "daily stats": (
+        "SELECT SUM(CASE WHEN pnl < 0 THEN -pnl ELSE 0 END), COUNT(*) FROM simulated_trades "
+        "WHERE strategy_name = ? AND open_time LIKE ?",
+        "SELECT SUM(CASE WHEN pnl < 0 THEN -pnl ELSE 0 END), COUNT(*) FROM simulated_trades "
+        "WHERE strategy_name = ? AND open_time_ms >= ? AND open_time_ms < ?",
+    ),
+    "loss streak": (
+        "SELECT result FROM simulated_trades WHERE strategy_name = ? ORDER BY open_time DESC LIMIT 20",
+        "SELECT result FROM simulated_trades WHERE strategy_name = ? ORDER BY open_time_ms DESC LIMIT 20",
+    ),
+    "pm daily stats": (
+        "SELECT SUM(CASE WHEN o.pnl < 0 THEN -o.pnl ELSE 0 END), COUNT(*) FROM pm_orders o "
+        "JOIN prediction_signals s ON o.signal_id = s.id WHERE s.strategy_name = ? AND o.placed_at LIKE ?",
+        "SELECT SUM(CASE WHEN o.pnl < 0 THEN -o.pnl ELSE 0 END), COUNT(*) FROM pm_orders o "
+        "JOIN prediction_signals s ON o.signal_id = s.id WHERE s.strategy_name = ? "
+        "AND o.placed_at_ms >= ? AND o.placed_at_ms < ?",
+    ),
+    "pm loss streak": (
+        "SELECT o.pnl FROM pm_orders o JOIN prediction_signals s ON o.signal_id = s.id "
+        "WHERE s.strategy_name = ? AND o.pnl IS NOT NULL ORDER BY o.placed_at DESC LIMIT 20",
+        "SELECT o.pnl FROM pm_orders o CROSS JOIN prediction_signals s ON o.signal_id = s.id "
+        "WHERE s.strategy_name = ? AND o.pnl IS NOT NULL ORDER BY o.placed_at_ms DESC LIMIT 20",
+    ),
+    "bot daily pnl": (
+        "SELECT COALESCE(SUM(pnl), 0) FROM simulated_trades WHERE strategy_name = ? AND open_time LIKE ? "
+        "AND result IS NOT NULL",
+        "SELECT COALESCE(SUM(pnl), 0) FROM simulated_trades WHERE strategy_name = ? AND open_time_ms >= ? "
+        "AND open_time_ms < ? AND result IS NOT NULL",
+    ),
+    "strategy/tf pnl curve": (
+        "SELECT pnl FROM simulated_trades WHERE strategy_name = ? AND result IS NOT NULL "
+        "AND timeframe_minutes = ? ORDER BY open_time ASC",
+        "SELECT pnl FROM simulated_trades WHERE strategy_name = ? AND result IS NOT NULL "
+        "AND timeframe_minutes = ? ORDER BY open_time_ms ASC",
+    ),
+    "pending trades": (
+        "SELECT * FROM simulated_trades WHERE close_price IS NULL ORDER BY expiry_time ASC",
+        "SELECT * FROM simulated_trades WHERE close_price IS NULL ORDER BY expiry_time_ms ASC",
+    ),
+    "unsettled signals": (
+        "SELECT * FROM prediction_signals WHERE actual_direction IS NULL ORDER BY expiry_time ASC",
+        "SELECT * FROM prediction_signals WHERE actual_direction IS NULL ORDER BY expiry_time_ms ASC",
+    ),
+}
+
+
+def params(sql: str, date_str: str) -> tuple:
+    p = [STRATEGIES[3]] if "strategy_name = ?" in sql else []
+    if "timeframe_minutes = ?" in sql:
+        p.append(TIMEFRAMES[3])
+    if "LIKE ?" in sql:
+        p.append(f"{date_str}%")
+    elif ">= ?" in sql:
+        p.extend(day_bounds_ms(date_str))
+    return tuple(p)
+
+
+def bench(conn: sqlite3.Connection, which: int, date_str: str, repeat: int) -> Dict[str, float]:
+    """Mean ms per query (``which``: 0 = before, 1 = after)."""
+    results = {}
+    for name, pair in QUERIES.items():
+        sql = pair[which]
+        p = params(sql, date_str)
+        conn.execute(sql, p).fetchall()  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, p).fetchall()
+        results[name] = (time.perf_counter() - start) / repeat * 1e3
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epoch-ms schema migration query benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Simulated trades / prediction signals")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls timed per query")
+    parser.add_argument("--db", type=str, default=None, help="Database path (default: temporary directory)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(args.db or Path(tmp) / "bench_schema.db")
+        if db_path.exists():
+            db_path.unlink()
+        date_str = (START + timedelta(minutes=args.rows // 2)).strftime("%Y-%m-%d")
+
+        start = time.perf_counter()
+        legacy = LegacyDataStore(str(db_path))
+        populate(legacy, args.rows)
+        print(f"populated {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+        with legacy._get_connection() as conn:
+            before = bench(conn, 0, date_str, args.repeat)
+        legacy.close()
+
+        start = time.perf_counter()
+        store = DataStore(str(db_path))
+        print(f"migrated to schema v{store.schema_version} in {time.perf_counter() - start:.1f}s\n")
+        with store._get_connection() as conn:
+            after = bench(conn, 1, date_str, args.repeat)
+        store.close()
+
+    print(f"{'query':<24}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in before:
+        print(f"{name:<24}{before[name]:>14.2f}{after[name]:>14.2f}{before[name] / after[name]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark for the /stats summary table on a synthetic database.
+
+Compares the previous summary (DISTINCT pairs, then ``get_strategy_detail``
+per (strategy, timeframe): five queries each plus a Python drawdown loop)
+with ``DataStore.get_strategy_stats``: one grouped pass on the first call,
+then incremental refreshes that read only new and newly settled rows.
+
+Usage:
+    python scripts/bench_stats.py --rows 1000000
+    python scripts/bench_stats.py --rows 200000 --settle 20
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench_schema import populate
+from btc_predictor.infrastructure.store import DataStore
+
+
+class LegacyDataStore(DataStore):
+    """``get_strategy_detail`` before the grouped stats."""
+
+    def get_strategy_detail(self, strategy_name: str, timeframe: int = None) -> dict:
+        base_where = "WHERE strategy_name = ? AND result IS NOT NULL"
+        params = [strategy_name]
+        if timeframe:
+            base_where += " AND timeframe_minutes = ?"
+            params.append(timeframe)
+        with self._get_connection() as conn:
+            row = conn.execute(f"""
+                SELECT COUNT(*), COALESCE(SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END), 0), COALESCE(SUM(pnl), 0)
+                FROM simulated_trades {base_where}
+            """, params).fetchone()
+            higher = conn.execute(f"""
+                SELECT COUNT(*), COALESCE(SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END), 0)
+                FROM simulated_trades {base_where} AND direction = 'higher'
+            """, params).fetchone()
+            lower = conn.execute(f"""
+                SELECT COUNT(*), COALESCE(SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END), 0)
+                FROM simulated_trades {base_where} AND direction = 'lower'
+            """, params).fetchone()
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM simulated_trades WHERE strategy_name = ? AND result IS NULL"
+                + (" AND timeframe_minutes = ?" if timeframe else ""), params
+            ).fetchone()[0]
+            pnl_rows = conn.execute(
+                f"SELECT pnl FROM simulated_trades {base_where} ORDER BY open_time_ms ASC", params
+            ).fetchall()
+        cumulative = peak = max_dd = 0.0
+        for (p,) in pnl_rows:
+            cumulative += p
+            peak = max(peak, cumulative)
+            max_dd = max(max_dd, peak - cumulative)
+        return {"settled": row[0], "pending": pending, "wins": row[1], "total_pnl": row[2],
+                "higher_total": higher[0], "lower_total": lower[0], "max_drawdown": max_dd}
+
+    def legacy_summary(self) -> dict:
+        with self._get_connection() as conn:
+            pairs = conn.execute("SELECT DISTINCT strategy_name, timeframe_minutes FROM simulated_trades").fetchall()
+        return {pair: self.get_strategy_detail(*pair) for pair in sorted(pairs)}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/stats summary benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Simulated trades")
+    parser.add_argument("--settle", type=int, default=20, help="Trades settled between warm refreshes")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm refreshes timed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LegacyDataStore(str(Path(tmp) / "bench_stats.db"))
+        start = time.perf_counter()
+        populate(store, args.rows)
+        print(f"populated {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+        legacy, legacy_ms = timed(store.legacy_summary)
+        stats, cold_ms = timed(store.get_strategy_stats)
+        for pair, old in legacy.items():
+            new = {key: stats[pair][key] for key in old}
+            assert new["total_pnl"] == old["total_pnl"] or abs(new["total_pnl"] - old["total_pnl"]) < 1e-6, pair
+            assert new["max_drawdown"] == old["max_drawdown"] and new["settled"] == old["settled"], pair
+
+        _, unchanged_ms = timed(store.get_strategy_stats)
+        pending = store.get_pending_trades()["id"].tolist()
+        settle_ms = []
+        for i in range(args.repeat):
+            batch = pending[i * args.settle:(i + 1) * args.settle]
+            store.update_simulated_trades((tid, 95010.0, "win", 8.0) for tid in batch)
+            settle_ms.append(timed(store.get_strategy_stats)[1])
+        store.close()
+
+    print(f"\n/stats over {len(legacy)} (strategy, timeframe) pairs")
+    print(f"{'per-pair get_strategy_detail':<36}{legacy_ms:>12.1f} ms")
+    print(f"{'get_strategy_stats (first call)':<36}{cold_ms:>12.1f} ms")
+    print(f"{'get_strategy_stats (no change)':<36}{unchanged_ms:>12.2f} ms")
+    print(f"{f'get_strategy_stats (+{args.settle} settled)':<36}{sum(settle_ms) / len(settle_ms):>12.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
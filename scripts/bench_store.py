@@ -0,0 +1,123 @@
+"""
+Micro-benchmark for DataStore per-call latency.
+
+Compares the pooled connection layer against the previous behaviour of
+opening a fresh ``sqlite3.connect`` per call, on the hot paths of a live tick
+(save_prediction_signal, check_trade_exists, get_daily_stats,
+update_signal_traded).
+
+``--strategies`` / ``--ticks`` also time one live trigger tick (signal +
+process_signal + link for every strategy) written directly through the store
+(one transaction per write) vs through ``WriteBehindQueue`` (one per tick).
+
+Usage:
+    python scripts/bench_store.py --calls 2000
+    python scripts/bench_store.py --strategies 20 --ticks 200
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.infrastructure.store import DataStore, WriteBehindQueue
+from btc_predictor.simulation.engine import process_signal
+
+
+class UnpooledDataStore(DataStore):
+    """DataStore with the old connect-per-call behaviour."""
+
+    def _get_connection(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+
+def _signal(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        strategy_name=f"strat_{i % 10}",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i),
+        timeframe_minutes=10,
+        direction="higher",
+        confidence=0.6,
+        current_price=95000.0,
+    )
+
+
+def bench(store: DataStore, calls: int) -> Dict[str, float]:
+    """Return mean latency (µs) per call for each hot method."""
+    ops: Dict[str, Callable[[int], object]] = {
+        "save_prediction_signal": lambda i: store.save_prediction_signal(_signal(i)),
+        "check_trade_exists": lambda i: store.check_trade_exists(f"strat_{i % 10}", 10, f"2025-01-01T00:{i % 60:02d}:00+00:00"),
+        "get_daily_stats": lambda i: store.get_daily_stats(f"strat_{i % 10}", "2025-01-01"),
+        "update_signal_traded": lambda i: store.update_signal_traded(f"missing-{i}", f"trade-{i}"),
+    }
+    results = {}
+    for name, op in ops.items():
+        op(0)  # warm-up
+        start = time.perf_counter()
+        for i in range(calls):
+            op(i)
+        results[name] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+
+def _tick_signal(strategy: int, tick: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        strategy_name=f"strat_{strategy}",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=10 * tick),
+        timeframe_minutes=10,
+        direction="higher",
+        confidence=0.9,
+        current_price=95000.0,
+        features_used={},
+    )
+
+
+def bench_tick(store: DataStore, strategies: int, ticks: int, write_behind: bool) -> float:
+    """Mean ms to persist one trigger tick of ``strategies`` signals."""
+    writer = WriteBehindQueue(store) if write_behind else store
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for strategy in range(strategies):
+            signal = _tick_signal(strategy, tick)
+            signal_id = writer.save_prediction_signal(signal)
+            trade = process_signal(signal, writer)
+            if trade:
+                writer.update_signal_traded(signal_id, trade.id)
+        if write_behind:
+            writer.flush()
+    return (time.perf_counter() - start) / ticks * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DataStore per-call latency benchmark")
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per method")
+    parser.add_argument("--strategies", type=int, default=20, help="Strategies firing per tick")
+    parser.add_argument("--ticks", type=int, default=100, help="Ticks timed for the per-tick comparison")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = bench(UnpooledDataStore(str(Path(tmp) / "before.db")), args.calls)
+        after = bench(DataStore(str(Path(tmp) / "after.db")), args.calls)
+
+    print(f"{'method':<26}{'before (µs)':>14}{'after (µs)':>14}{'speedup':>10}")
+    for name in before:
+        print(f"{name:<26}{before[name]:>14.1f}{after[name]:>14.1f}{before[name] / after[name]:>9.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct = bench_tick(DataStore(str(Path(tmp) / "direct.db")), args.strategies, args.ticks, write_behind=False)
+        queued = bench_tick(DataStore(str(Path(tmp) / "queued.db")), args.strategies, args.ticks, write_behind=True)
+
+    print()
+    print(f"{'tick of ' + str(args.strategies) + ' strategies':<26}{'direct (ms)':>14}{'queued (ms)':>14}{'speedup':>10}")
+    print(f"{'persist':<26}{direct:>14.2f}{queued:>14.2f}{direct / queued:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
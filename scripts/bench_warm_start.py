@@ -0,0 +1,168 @@
+"""
+Benchmark: warm-start walk-forward retraining vs. a full refit every fold.
+
+Runs ``run_backtest`` twice per strategy — every fold fitted from scratch,
+then ``warm_start=True`` (full refit every ``--refit-every`` folds, the folds
+in between continue from the previous model on the new rows only) — and
+prints DA / PnL parity next to the wall-clock spent in model fitting and in
+the whole backtest.
+
+Folds run sequentially (``--n-jobs 1``) by default so the timings compare
+compute rather than scheduling: warm-start segments run their folds one after
+another, so with many workers and few folds a cold run can still finish
+first.
+
+Usage:
+    python scripts/bench_warm_start.py --strategies pm_xgb_reg_v1 pm_lgbm_reg_v1 --timeframe 60 \\
+        --train-days 60 --test-days 7 --start-date 2025-01-01
+    python scripts/bench_warm_start.py --synthetic 120   # random-walk candles, no database needed
+"""
+import argparse
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.backtest.engine import run_backtest
+from btc_predictor.backtest.stats import calculate_backtest_stats
+from btc_predictor.infrastructure.ohlcv_archive import DEFAULT_ARCHIVE_ROOT, OHLCVArchive
+from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.strategies.registry import StrategyRegistry
+
+STRATEGIES_DIR = "src/btc_predictor/strategies"
+MODELS_DIR = "models"
+WARM_START_STRATEGIES = [
+    "pm_xgb_reg_v1", "pm_lgbm_reg_v1", "pm_cb_reg_v1",
+    "pm_mlp_reg_v1", "pm_cnn_reg_v1", "pm_lstm_reg_v1", "pm_tabnet_reg_v1",
+]
+
+
+class FitTimer:
+    """Wall-clock inside ``fit`` / ``warm_start_fit`` (outermost call only)."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._local = threading.local()
+
+    @contextmanager
+    def patch(self, strategy):
+        cls = type(strategy)
+        originals = {name: cls.__dict__.get(name) for name in ("fit", "warm_start_fit")}
+        for name in originals:
+            setattr(cls, name, self._timed(getattr(cls, name)))
+        try:
+            yield
+        finally:
+            for name, original in originals.items():
+                if original is None:
+                    delattr(cls, name)
+                else:
+                    setattr(cls, name, original)
+
+    def _timed(self, method):
+        def timed(*args, **kwargs):
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._local.depth = depth
+                if depth == 0:
+                    self.seconds += time.perf_counter() - start
+        return timed
+
+
+def synthetic_ohlcv(days: int, seed: int = 7) -> pd.DataFrame:
+    periods = days * 24 * 60
+    index = pd.date_range("2025-01-01", periods=periods, freq="1min", tz="UTC", name="datetime")
+    rng = np.random.default_rng(seed)
+    close = 95000 + np.cumsum(rng.normal(0, 20, periods))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 8, periods))
+    return pd.DataFrame({
+        "open": open_, "high": np.maximum(open_, close) + spread, "low": np.minimum(open_, close) - spread,
+        "close": close, "volume": rng.uniform(1, 10, periods),
+    }, index=index)
+
+
+def load_ohlcv(args) -> pd.DataFrame:
+    if args.synthetic:
+        return synthetic_ohlcv(args.synthetic)
+    store = OHLCVArchive(args.archive) if args.archive else DataStore()
+    start_ms = int(datetime.strptime(args.start_date, "%Y-%m-%d").timestamp() * 1000) if args.start_date else None
+    end_ms = int(datetime.strptime(args.end_date, "%Y-%m-%d").timestamp() * 1000) if args.end_date else None
+    return store.get_ohlcv(args.symbol, args.interval, start_time=start_ms, end_time=end_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm-start vs full-refit walk-forward benchmark")
+    parser.add_argument("--strategies", type=str, nargs="+", default=WARM_START_STRATEGIES)
+    parser.add_argument("--timeframe", type=int, default=60, help="Timeframe in minutes")
+    parser.add_argument("--train-days", type=int, default=60)
+    parser.add_argument("--test-days", type=int, default=7)
+    parser.add_argument("--refit-every", type=int, default=4, help="Full refit cadence (folds)")
+    parser.add_argument("--n-jobs", type=int, default=1)
+    parser.add_argument("--platform", type=str, default="polymarket")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT")
+    parser.add_argument("--interval", type=str, default="1m")
+    parser.add_argument("--start-date", type=str, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", type=str, help="YYYY-MM-DD")
+    parser.add_argument("--archive", type=str, nargs="?", const=str(DEFAULT_ARCHIVE_ROOT),
+                        help="Load OHLCV from the columnar archive")
+    parser.add_argument("--synthetic", type=int, metavar="DAYS", help="Use DAYS of random-walk candles")
+    args = parser.parse_args()
+
+    df = load_ohlcv(args)
+    if df.empty:
+        print("No OHLCV data found.")
+        return
+    print(f"Loaded {len(df):,} candles: {df.index[0]} to {df.index[-1]}\n")
+
+    registry = StrategyRegistry()
+    registry.discover(STRATEGIES_DIR, MODELS_DIR)
+
+    rows = []
+    for name in args.strategies:
+        strategy = registry.get(name)
+        for warm in (False, True):
+            timer = FitTimer()
+            start = time.perf_counter()
+            with timer.patch(strategy):
+                trades = run_backtest(
+                    strategy, df, timeframe_minutes=args.timeframe, train_days=args.train_days,
+                    test_days=args.test_days, n_jobs=args.n_jobs, platform=args.platform,
+                    warm_start=warm, refit_every=args.refit_every,
+                )
+            total = time.perf_counter() - start
+            stats = calculate_backtest_stats(trades) if trades else {}
+            rows.append({
+                "strategy": name,
+                "mode": f"warm/{args.refit_every}" if warm else "full",
+                "trades": stats.get("total_trades", 0),
+                "da": stats.get("total_da", float("nan")),
+                "pnl": stats.get("total_pnl", 0.0),
+                "fit_s": timer.seconds,
+                "total_s": total,
+            })
+
+    print(f"\n{'strategy':<18}{'mode':<9}{'trades':>8}{'DA':>9}{'PnL':>10}{'fit (s)':>10}{'total (s)':>11}")
+    for row in rows:
+        print(f"{row['strategy']:<18}{row['mode']:<9}{row['trades']:>8}{row['da']:>9.2%}{row['pnl']:>10.1f}"
+              f"{row['fit_s']:>10.1f}{row['total_s']:>11.1f}")
+    print(f"\n{'strategy':<18}{'ΔDA (pp)':>10}{'fit speedup':>13}{'total speedup':>15}")
+    for full, warm in zip(rows[::2], rows[1::2]):
+        print(f"{full['strategy']:<18}{(warm['da'] - full['da']) * 100:>10.2f}"
+              f"{full['fit_s'] / max(warm['fit_s'], 1e-9):>12.2f}x{full['total_s'] / max(warm['total_s'], 1e-9):>14.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -196,6 +196,7 @@ async def main() -> None:
 
     # Cleanup
     await feed.stop()
+    await pipeline.aclose()
     if bot:
         await bot.close()
     await client.close_connection()
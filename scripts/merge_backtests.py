@@ -1,5 +1,4 @@
 import json
-import pandas as pd
 from pathlib import Path
 import sys
 import argparse
@@ -9,6 +8,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from btc_predictor.backtest.stats import calculate_backtest_stats
+from btc_predictor.backtest.trade_log import TradeLog
 
 def main():
     parser = argparse.ArgumentParser(description="Merge segmented backtest reports")
@@ -23,29 +23,32 @@ def main():
     report_dir = Path(args.dir)
     pattern = f"backtest_{args.strategy}_{args.timeframe}m_*.json"
     
-    all_trades = []
+    logs = []
     files_processed = 0
     
     for file_path in report_dir.glob(pattern):
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-            if 'trades' in data:
-                all_trades.extend(data['trades'])
-                files_processed += 1
-                print(f"Loaded {len(data['trades'])} trades from {file_path}")
+        if 'trades_file' in data:
+            log = TradeLog.load(file_path.parent / data['trades_file'])
+        elif data.get('trades'):
+            # Reports written before trade logs embedded the trades as JSON
+            log = TradeLog.from_trades(data['trades'])
+        else:
+            continue
+        logs.append(log)
+        files_processed += 1
+        print(f"Loaded {len(log)} trades from {file_path}")
     
-    if not all_trades:
+    if not logs:
         print("No trades found to merge.")
         return
         
+    all_trades = TradeLog.concat(logs, logs[0].strategy_name, logs[0].timeframe_minutes)
     print(f"Total trades collected: {len(all_trades)} from {files_processed} files.")
     
     # Sort and remove potential overlaps
-    df = pd.DataFrame(all_trades)
-    df['open_time'] = pd.to_datetime(df['open_time'])
-    df = df.sort_values('open_time').drop_duplicates(subset=['open_time'])
-    
-    unique_trades = df.to_dict('records')
+    unique_trades = all_trades.sorted_unique()
     print(f"Final unique trades count: {len(unique_trades)}")
     
     # Use centralized stats calculation
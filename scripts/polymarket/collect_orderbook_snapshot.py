@@ -1,11 +1,19 @@
 import os
+import sys
+import math
 import time
 import json
+import asyncio
 import logging
 import requests
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from btc_predictor.polymarket.clob_client import CLOBClient
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,7 +27,6 @@ logger = logging.getLogger(__name__)
 
 # Constants
 GAMMA_API_URL = "https://gamma-api.polymarket.com/events"
-CLOB_API_URL = "https://clob.polymarket.com/book"
 BINANCE_API_URL = "https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT"
 DATA_DIR = Path("data/polymarket")
 DATA_FILE = DATA_DIR / "orderbook_snapshots.jsonl"
@@ -78,17 +85,6 @@ def get_active_markets():
         logger.error(f"Error fetching active markets: {e}")
         return []
 
-def get_order_book(token_id):
-    """Fetch order book for a given token ID."""
-    params = {"token_id": token_id}
-    try:
-        resp = requests.get(CLOB_API_URL, params=params, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        logger.error(f"Error fetching order book for {token_id}: {e}")
-        return None
-
 def get_binance_price():
     """Fetch real-time BTC price from Binance."""
     try:
@@ -99,111 +95,84 @@ def get_binance_price():
         logger.error(f"Error fetching Binance price: {e}")
         return None
 
-def walk_the_book(orders, target_usd):
-    """Calculate average price for a target USD size by walking the book."""
-    if not orders:
-        return None
-        
-    filled_usd = 0.0
-    total_shares = 0.0
-    
-    for order in orders:
-        try:
-            price = float(order.get("price"))
-            size = float(order.get("size"))  # size is in shares
-            
-            # Polymarket price is 0-1. Cost to buy 'size' shares is price * size
-            available_usd = price * size
-            
-            if filled_usd + available_usd >= target_usd:
-                needed_usd = target_usd - filled_usd
-                needed_shares = needed_usd / price
-                total_shares += needed_shares
-                filled_usd = target_usd
-                break
-            else:
-                filled_usd += available_usd
-                total_shares += size
-        except (ValueError, TypeError):
-            continue
-            
-    if filled_usd < target_usd:
-        return None  # Insufficient depth
-        
-    avg_price = target_usd / total_shares
-    return avg_price
+def _nan_to_none(x):
+    x = float(x)
+    return None if math.isnan(x) else x
 
-def collect_snapshots(duration_hrs=2, interval_sec=5):
+async def collect_snapshots(duration_hrs=2, interval_sec=5):
     ensure_data_dir()
     end_time = time.time() + duration_hrs * 3600
     
     logger.info(f"Starting collection for {duration_hrs} hours. Interval: {interval_sec}s")
     
-    while time.time() < end_time:
-        start_loop = time.time()
-        
-        markets = get_active_markets()
-        binance_price = get_binance_price()
-        
-        timestamp = datetime.now(timezone.utc).isoformat()
-        
-        for m in markets:
-            book = get_order_book(m["up_token_id"])
-            if not book:
-                continue
-                
-            bids = book.get("bids", [])
-            asks = book.get("asks", [])
+    async with CLOBClient(cache_ttl=0) as clob:
+        while time.time() < end_time:
+            start_loop = time.time()
             
-            # Sort orders (bids desc, asks asc)
-            bids = sorted(bids, key=lambda x: float(x["price"]), reverse=True)
-            asks = sorted(asks, key=lambda x: float(x["price"]))
+            markets, binance_price = await asyncio.gather(
+                asyncio.to_thread(get_active_markets),
+                asyncio.to_thread(get_binance_price),
+            )
             
-            best_bid = float(bids[0]["price"]) if bids else None
-            best_ask = float(asks[0]["price"]) if asks else None
-            spread = (best_ask - best_bid) if best_bid and best_ask else None
-            midpoint = (best_ask + best_bid) / 2 if best_bid and best_ask else None
+            # Both tokens of every market, fetched concurrently
+            token_ids = [t for m in markets for t in (m["up_token_id"], m["down_token_id"]) if t]
+            books = await clob.get_orderbooks(token_ids, depth_usd=(50.0, 100.0), keep_books=True)
+            row = {token_id: i for i, token_id in enumerate(books.token_ids)}
             
-            depth_50 = walk_the_book(asks, 50.0)
-            depth_100 = walk_the_book(asks, 100.0)
+            timestamp = datetime.now(timezone.utc).isoformat()
             
-            # Calculate market lifecycle stage (seconds since start)
-            # Market ends at end_date. For 5m market, start is end_date - 5m
-            try:
-                end_dt = datetime.fromisoformat(m["end_date"].replace("Z", "+00:00"))
-                now_dt = datetime.now(timezone.utc)
-                delta = (now_dt - end_dt).total_seconds()
-                # If delta is negative, we are before end_date
-                # For a 5m cycle, it started at end_dt - 300s
-                time_since_start = 300 + delta if m["timeframe"] == "5m" else 900 + delta
-            except:
-                time_since_start = None
+            snapshots = []
+            for m in markets:
+                i = row[m["up_token_id"]]
+                book = books.books[i]
+                if not book:
+                    continue
+                    
+                # Sort orders (bids desc, asks asc)
+                bids = sorted(book.get("bids", []), key=lambda x: float(x["price"]), reverse=True)
+                asks = sorted(book.get("asks", []), key=lambda x: float(x["price"]))
+                
+                # Calculate market lifecycle stage (seconds since start)
+                # Market ends at end_date. For 5m market, start is end_date - 5m
+                try:
+                    end_dt = datetime.fromisoformat(m["end_date"].replace("Z", "+00:00"))
+                    now_dt = datetime.now(timezone.utc)
+                    delta = (now_dt - end_dt).total_seconds()
+                    # If delta is negative, we are before end_date
+                    # For a 5m cycle, it started at end_dt - 300s
+                    time_since_start = 300 + delta if m["timeframe"] == "5m" else 900 + delta
+                except:
+                    time_since_start = None
 
-            snapshot = {
-                "type": "orderbook",
-                "timestamp": timestamp,
-                "market_slug": m["event_slug"],
-                "market_id": m["market_id"],
-                "timeframe": m["timeframe"],
-                "lifecycle_sec": time_since_start,
-                "binance_price": binance_price,
-                "best_bid": best_bid,
-                "best_ask": best_ask,
-                "spread": spread,
-                "midpoint": midpoint,
-                "depth_at_50": depth_50,
-                "depth_at_100": depth_100,
-                "top_5_bids": bids[:5],
-                "top_5_asks": asks[:5]
-            }
+                down = row.get(m["down_token_id"])
+                snapshots.append({
+                    "type": "orderbook",
+                    "timestamp": timestamp,
+                    "market_slug": m["event_slug"],
+                    "market_id": m["market_id"],
+                    "timeframe": m["timeframe"],
+                    "lifecycle_sec": time_since_start,
+                    "binance_price": binance_price,
+                    "best_bid": _nan_to_none(books.best_bid[i]),
+                    "best_ask": _nan_to_none(books.best_ask[i]),
+                    "spread": _nan_to_none(books.spread[i]),
+                    "midpoint": _nan_to_none(books.midpoint[i]),
+                    "depth_at_50": _nan_to_none(books.fill_price[i, 0]),
+                    "depth_at_100": _nan_to_none(books.fill_price[i, 1]),
+                    "top_5_bids": bids[:5],
+                    "top_5_asks": asks[:5],
+                    "down_best_bid": _nan_to_none(books.best_bid[down]) if down is not None else None,
+                    "down_best_ask": _nan_to_none(books.best_ask[down]) if down is not None else None,
+                })
             
             with open(DATA_FILE, "a") as f:
-                f.write(json.dumps(snapshot) + "\n")
-        
-        # Sleep to maintain interval
-        elapsed = time.time() - start_loop
-        wait = max(0, interval_sec - elapsed)
-        time.sleep(wait)
+                for snapshot in snapshots:
+                    f.write(json.dumps(snapshot) + "\n")
+            
+            # Sleep to maintain interval
+            elapsed = time.time() - start_loop
+            wait = max(0, interval_sec - elapsed)
+            await asyncio.sleep(wait)
 
 if __name__ == "__main__":
     import argparse
@@ -213,7 +182,7 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     try:
-        collect_snapshots(duration_hrs=args.duration, interval_sec=args.interval)
+        asyncio.run(collect_snapshots(duration_hrs=args.duration, interval_sec=args.interval))
     except KeyboardInterrupt:
         logger.info("Collection stopped by user.")
     except Exception as e:
@@ -11,11 +11,14 @@ import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 from btc_predictor.analytics.extractors import (
-    get_signal_dataframe, get_trade_dataframe, get_market_context, join_signals_with_context
+    get_signal_dataframe, get_trade_dataframe, get_market_context, join_signals_with_context,
+    get_rollup_dataframe, get_calibration_rollup_dataframe
 )
 from btc_predictor.analytics.metrics import (
     compute_directional_accuracy, compute_pnl_metrics, compute_alpha_analysis,
-    compute_temporal_patterns, compute_confidence_calibration, compute_drift_detection
+    compute_temporal_patterns, compute_confidence_calibration, compute_drift_detection,
+    compute_directional_accuracy_from_rollups, compute_pnl_metrics_from_rollups,
+    compute_temporal_patterns_from_rollups, compute_confidence_calibration_from_rollups
 )
 
 logger = logging.getLogger(__name__)
@@ -80,7 +83,6 @@ def main():
     }
 
     signals_df = get_signal_dataframe(args.db_path, args.strategy, args.timeframe, settled_only=True, days=args.days)
-    trades_df = get_trade_dataframe(args.db_path, args.strategy, args.days) # timeframe filter handled via signal JOIN logic or here
 
     if signals_df.empty:
         print("Insufficient data: No settled signals found.")
@@ -89,10 +91,6 @@ def main():
         print("Gate3 Status: NOT_PASSED | DA: 0.00% | PnL: $0.00")
         return
 
-    # Filter trades by timeframe if specified (as get_trade_dataframe returns s.timeframe_minutes)
-    if not trades_df.empty and args.timeframe:
-        trades_df = trades_df[trades_df['timeframe_minutes'] == args.timeframe]
-
     meta["data_range"]["first_signal"] = signals_df['timestamp'].min().isoformat()
     meta["data_range"]["last_signal"] = signals_df['timestamp'].max().isoformat()
     meta["data_range"]["total_signals"] = len(signals_df)
@@ -107,21 +105,41 @@ def main():
         logger.warning(f"Could not merge context: {e}")
         analysis_df = signals_df
 
-    da_metrics = compute_directional_accuracy(analysis_df, groupby=['timeframe_minutes'] if not args.timeframe else None)
-    metrics["directional_accuracy"] = da_metrics
+    # DA / PnL / temporal / calibration from the settlement-maintained rollups;
+    # per-row scans only when the DB has none (not yet opened by DataStore)
+    signal_rollups = get_rollup_dataframe(
+        args.db_path, "signals", args.strategy, args.timeframe, args.days, by_timeframe=True
+    )
+    groupby = ['timeframe_minutes'] if not args.timeframe else None
+    if not signal_rollups.empty:
+        da_metrics = compute_directional_accuracy_from_rollups(signal_rollups, groupby=groupby)
+        pnl_metrics = compute_pnl_metrics_from_rollups(
+            get_rollup_dataframe(args.db_path, "polymarket", args.strategy, args.timeframe, args.days)
+        )
+        temporal_metrics = compute_temporal_patterns_from_rollups(signal_rollups)
+        calib_metrics = compute_confidence_calibration_from_rollups(
+            get_calibration_rollup_dataframe(args.db_path, "signals", args.strategy, args.timeframe, args.days),
+            signal_rollups,
+        )
+    else:
+        trades_df = get_trade_dataframe(args.db_path, args.strategy, args.days)
+        # Filter trades by timeframe if specified (as get_trade_dataframe returns s.timeframe_minutes)
+        if not trades_df.empty and args.timeframe:
+            trades_df = trades_df[trades_df['timeframe_minutes'] == args.timeframe]
+        da_metrics = compute_directional_accuracy(analysis_df, groupby=groupby)
+        pnl_metrics = compute_pnl_metrics(trades_df)
+        temporal_metrics = compute_temporal_patterns(analysis_df)
+        calib_metrics = compute_confidence_calibration(analysis_df)
 
-    pnl_metrics = compute_pnl_metrics(trades_df)
+    metrics["directional_accuracy"] = da_metrics
     metrics["pnl"] = pnl_metrics
+    metrics["temporal"] = temporal_metrics
+    metrics["calibration"] = calib_metrics
 
+    # Row-level: alpha distribution and rolling-window drift
     alpha_metrics = compute_alpha_analysis(analysis_df)
     metrics["alpha"] = alpha_metrics
 
-    temporal_metrics = compute_temporal_patterns(analysis_df)
-    metrics["temporal"] = temporal_metrics
-
-    calib_metrics = compute_confidence_calibration(analysis_df)
-    metrics["calibration"] = calib_metrics
-
     drift_metrics = compute_drift_detection(analysis_df)
     metrics["drift"] = drift_metrics
 
@@ -0,0 +1,43 @@
+"""
+Rebuild the performance rollup tables from the raw settled rows.
+
+The rollups (``strategy_rollups`` / ``strategy_calibration_rollups``) are kept
+up to date by the settlement triggers; rebuild them after editing settled
+rows by hand (e.g. correcting a PnL) or restoring a partial backup.
+
+Usage:
+    python scripts/rebuild_rollups.py
+    python scripts/rebuild_rollups.py --source polymarket --db data/btc_predictor.db
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.infrastructure.rollups import ROLLUP_SOURCES
+from btc_predictor.infrastructure.store import DataStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the performance rollup tables")
+    parser.add_argument("--source", type=str, nargs="+", choices=list(ROLLUP_SOURCES), default=None,
+                        help="Sources to rebuild (default: all)")
+    parser.add_argument("--db", type=str, default="data/btc_predictor.db", help="SQLite database path")
+    args = parser.parse_args()
+
+    store = DataStore(args.db)
+    start = time.perf_counter()
+    store.rebuild_rollups(args.source)
+    elapsed = time.perf_counter() - start
+    with store._get_connection() as conn:
+        rows = conn.execute("SELECT source, COUNT(*) FROM strategy_rollups GROUP BY source").fetchall()
+    print(f"Rebuilt {', '.join(args.source or ROLLUP_SOURCES)} in {elapsed:.2f}s: "
+          + ", ".join(f"{source} {count:,} hourly rows" for source, count in rows))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Sweep decision rules over a saved backtest's predictions, without re-running it.
+
+Reads the ``predictions_file`` written next to a ``scripts/backtest.py`` report
+and evaluates every combination of confidence threshold, bet range, alpha
+threshold / market price and (optionally) risk-control limits. Prints the top
+combinations and writes the full table as CSV next to the report.
+
+Usage:
+    python scripts/replay_sweep.py reports/backtest_lgbm_v2_60m_20260101_120000.json \
+        --thresholds 0.50:0.70:0.01 --bet-ranges 5-20 10-10 --daily-max-loss 50 inf
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.backtest.replay import DecisionRule, sweep
+from btc_predictor.backtest.trade_log import PredictionLog
+
+
+def float_range(spec: str) -> list:
+    """``start:stop:step`` (stop inclusive) or a single value."""
+    if ":" not in spec:
+        return [float(spec)]
+    start, stop, step = (float(part) for part in spec.split(":"))
+    return [round(v, 6) for v in np.arange(start, stop + step / 2, step)]
+
+
+def bet_range(spec: str) -> tuple:
+    low, high = spec.split("-")
+    return float(low), float(high)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decision-rule sweep over backtest predictions")
+    parser.add_argument("report", type=str, help="Backtest report JSON (or a .predictions.arrow file)")
+    parser.add_argument("--platform", type=str, default="binance", help="Base rule: binance or polymarket")
+    parser.add_argument("--thresholds", type=str, nargs="+", help="Confidence thresholds (start:stop:step or values)")
+    parser.add_argument("--bet-ranges", type=bet_range, nargs="+", help="Bet ranges as min-max (e.g. 5-20)")
+    parser.add_argument("--market-prices", type=float, nargs="+", help="Entry prices for the alpha check")
+    parser.add_argument("--alpha-thresholds", type=str, nargs="+", help="Minimum confidence - market price")
+    parser.add_argument("--min-changes", type=str, nargs="+", help="Minimum |predicted change %%|")
+    parser.add_argument("--daily-max-loss", type=float, nargs="+", help="Daily loss limits (inf: off)")
+    parser.add_argument("--max-daily-trades", type=float, nargs="+", help="Daily trade limits (inf: off)")
+    parser.add_argument("--max-consecutive-losses", type=float, nargs="+", help="Losing streak limits (inf: off)")
+    parser.add_argument("--sort", type=str, default="total_pnl", help="Column to rank combinations by")
+    parser.add_argument("--min-trades", type=int, default=30, help="Hide combinations with fewer trades")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    args = parser.parse_args()
+
+    report = Path(args.report)
+    if report.suffix == ".json":
+        with open(report, encoding="utf-8") as f:
+            predictions_file = json.load(f).get("predictions_file")
+        if not predictions_file:
+            print(f"{report} has no predictions_file; re-run scripts/backtest.py to record one.")
+            return
+        predictions_path = report.parent / predictions_file
+    else:
+        predictions_path = report
+    predictions = PredictionLog.load(predictions_path)
+    base = DecisionRule.from_config(predictions.timeframe_minutes, platform=args.platform)
+    print(f"Loaded {len(predictions):,} predictions of {predictions.strategy_name} "
+          f"{predictions.timeframe_minutes}m; base rule: {base}")
+
+    grid = {
+        "confidence_threshold": [v for spec in args.thresholds for v in float_range(spec)] if args.thresholds else None,
+        "bet_range": args.bet_ranges,
+        "market_price": args.market_prices,
+        "alpha_threshold": [v for spec in args.alpha_thresholds for v in float_range(spec)] if args.alpha_thresholds else None,
+        "min_predicted_change": [v for spec in args.min_changes for v in float_range(spec)] if args.min_changes else None,
+        "daily_max_loss": args.daily_max_loss,
+        "max_daily_trades": args.max_daily_trades,
+        "max_consecutive_losses": args.max_consecutive_losses,
+    }
+    grid = {name: values for name, values in grid.items() if values}
+    if not grid:
+        grid = {"confidence_threshold": [base.confidence_threshold]}
+
+    start = time.perf_counter()
+    table = sweep(predictions, grid, base=base)
+    print(f"Evaluated {len(table):,} combinations in {time.perf_counter() - start:.2f}s\n")
+
+    ranked = table[table["total_trades"] >= args.min_trades].sort_values(args.sort, ascending=False)
+    print(ranked.head(args.top).to_string(index=False))
+
+    output_path = predictions_path.with_name(predictions_path.name.replace(".predictions.arrow", "") + ".sweep.csv")
+    table.to_csv(output_path, index=False)
+    print(f"\nSweep saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ from btc_predictor.infrastructure.store import DataStore
 from btc_predictor.binance.feed import BinanceFeed
 from btc_predictor.strategies.registry import StrategyRegistry
 from btc_predictor.polymarket.gamma_client import GammaClient
+from btc_predictor.polymarket.clob_client import CLOBClient
 from btc_predictor.polymarket.tracker import PolymarketTracker
 from btc_predictor.polymarket.pipeline import PolymarketLivePipeline
 from btc_predictor.discord_bot.bot import EventContractBot
@@ -34,6 +35,11 @@ async def main() -> None:
         help="Comma-separated list of strategies to load (e.g. pm_v1)",
         default="pm_v1"
     )
+    parser.add_argument(
+        "--orderbook-pricing",
+        action="store_true",
+        help="Price entries at the CLOB best ask instead of Gamma's close_price"
+    )
     args = parser.parse_args()
 
     load_dotenv()
@@ -78,6 +84,7 @@ async def main() -> None:
     # 3. Setup Polymarket Components
     # For now, we only need GammaClient for public read-only requests. No CLOB API key needed yet.
     gamma_client = GammaClient()
+    clob_client = CLOBClient() if args.orderbook_pricing else None
     tracker = PolymarketTracker(gamma_client=gamma_client, store=store)
 
     # Setup Discord Bot
@@ -97,7 +104,9 @@ async def main() -> None:
     # 4. Instantiate BinanceFeed and PolymarketLivePipeline
     # BinanceFeed is used to supply high-frequency OHLCV features
     feed = BinanceFeed(symbol="BTCUSDT", store=store)
-    pipeline = PolymarketLivePipeline(strategies=strategies, store=store, tracker=tracker, bot=bot)
+    pipeline = PolymarketLivePipeline(
+        strategies=strategies, store=store, tracker=tracker, bot=bot, clob_client=clob_client
+    )
 
     # Expose pipeline on bot for /predict, /stats, /health, /models
     if bot:
@@ -129,6 +138,9 @@ async def main() -> None:
 
     # Cleanup
     await feed.stop()
+    await gamma_client.aclose()
+    if clob_client:
+        await clob_client.aclose()
     if bot:
         await bot.close()
     
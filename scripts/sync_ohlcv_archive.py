@@ -0,0 +1,47 @@
+"""
+Export the SQLite ``ohlcv`` table into the columnar OHLCV archive.
+
+Only months whose contents changed since the last sync are rewritten, so it is
+cheap to run before every backtest / training session.
+
+Usage:
+    python scripts/sync_ohlcv_archive.py --symbol BTCUSDT --interval 1m
+    python scripts/backtest.py --strategy xgboost_v1 --timeframe 10 --archive
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to sys.path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from btc_predictor.infrastructure.ohlcv_archive import DEFAULT_ARCHIVE_ROOT, OHLCVArchive
+from btc_predictor.infrastructure.store import DataStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the OHLCV archive from the database")
+    parser.add_argument("--symbol", type=str, default="BTCUSDT", help="Trading symbol")
+    parser.add_argument("--interval", type=str, nargs="+", default=["1m"], help="Data interval(s) (1m, 5m, etc.)")
+    parser.add_argument("--db", type=str, default="data/btc_predictor.db", help="SQLite database path")
+    parser.add_argument("--root", type=str, default=str(DEFAULT_ARCHIVE_ROOT), help="Archive directory")
+    parser.add_argument("--full", action="store_true", help="Rewrite every month")
+    args = parser.parse_args()
+
+    store = DataStore(args.db)
+    archive = OHLCVArchive(args.root)
+
+    for interval in args.interval:
+        start = time.perf_counter()
+        written = archive.sync(store, args.symbol, interval, full=args.full)
+        elapsed = time.perf_counter() - start
+        months = archive.months(args.symbol, interval)
+        print(
+            f"{args.symbol} {interval}: wrote {len(written)} month(s) {written} in {elapsed:.2f}s "
+            f"({len(months)} archived: {months[0] if months else '-'} .. {months[-1] if months else '-'})"
+        )
+
+
+if __name__ == "__main__":
+    main()
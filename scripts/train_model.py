@@ -4,14 +4,16 @@ import sys
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List
+from typing import List, Union
 
 # Setup path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.infrastructure.ohlcv_archive import DEFAULT_ARCHIVE_ROOT, OHLCVArchive
 from btc_predictor.strategies.registry import StrategyRegistry
 from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.feature_store import FeatureStore
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -19,7 +21,12 @@ logger = logging.getLogger(__name__)
 STRATEGIES_DIR = Path("src/btc_predictor/strategies")
 MODELS_DIR = Path("models")
 
-def train_strategy(strategy: BaseStrategy, timeframe: int, store: DataStore):
+def train_strategy(
+    strategy: BaseStrategy,
+    timeframe: int,
+    store: Union[DataStore, OHLCVArchive],
+    feature_store: FeatureStore,
+):
     logger.info(f"Training {strategy.name} for {timeframe}m timeframe...")
     
     # Load data (60 days)
@@ -37,7 +44,9 @@ def train_strategy(strategy: BaseStrategy, timeframe: int, store: DataStore):
         
     try:
         if strategy.requires_fitting:
-            strategy.fit(df, timeframe)
+            # Strategies sharing a feature set reuse the materialized features
+            with feature_store.attach(df).activate():
+                strategy.fit(df, timeframe)
             logger.info(f"Fitted {strategy.name} {timeframe}m successfully.")
             
             # Save model
@@ -65,6 +74,8 @@ def main():
     parser.add_argument("--timeframe", type=int, help="Specific timeframe (10, 30, 60, 1440)")
     parser.add_argument("--all", action="store_true", help="Train all default timeframes (10, 30, 60, 1440)")
     parser.add_argument("--all-strategies", action="store_true", help="Train all available strategies")
+    parser.add_argument("--archive", type=str, nargs="?", const=str(DEFAULT_ARCHIVE_ROOT),
+                        help="Load OHLCV from the columnar archive (see scripts/sync_ohlcv_archive.py)")
     
     args = parser.parse_args()
     
@@ -97,14 +108,15 @@ def main():
         timeframes = [args.timeframe]
         
     # Execution
-    store = DataStore()
+    store = OHLCVArchive(args.archive) if args.archive else DataStore()
+    feature_store = FeatureStore()
     
     success_count = 0
     total_tasks = len(strategies_to_train) * len(timeframes)
     
     for strat in strategies_to_train:
         for tf in timeframes:
-            if train_strategy(strat, tf, store):
+            if train_strategy(strat, tf, store, feature_store):
                 success_count += 1
                 
     logger.info(f"Training complete. {success_count}/{total_tasks} successful.")
@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List
 
+from btc_predictor.infrastructure.rollups import DAY_MS, HOUR_MS, calibration_query, rollup_query
+
 def get_signal_dataframe(
     db_path: str = "data/btc_predictor.db",
     strategy_name: Optional[str] = None,
@@ -111,6 +113,62 @@ def get_trade_dataframe(
         df = df.sort_values('placed_at').reset_index(drop=True)
     return df
 
+def _cutoff_ms(days: Optional[int], granularity_ms: int) -> Optional[int]:
+    """``days`` ago in epoch ms, floored to the rollup granularity."""
+    if not days:
+        return None
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    return int(cutoff.timestamp() * 1000) // granularity_ms * granularity_ms
+
+def _read_rollups(db_path: str, query: str, params: list) -> pd.DataFrame:
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.OperationalError:
+        return pd.DataFrame()
+    try:
+        # No rollup tables (DB not yet migrated by DataStore): empty
+        return pd.read_sql_query(query, conn, params=params)
+    except sqlite3.OperationalError:
+        return pd.DataFrame()
+    finally:
+        conn.close()
+
+def get_rollup_dataframe(
+    db_path: str = "data/btc_predictor.db",
+    source: str = "signals",
+    strategy_name: Optional[str] = None,
+    timeframe_minutes: Optional[int] = None,
+    days: Optional[int] = None,
+    by_timeframe: bool = False,
+) -> pd.DataFrame:
+    """
+    從 strategy_rollups 萃取每小時績效 (source: signals / simulated / polymarket)。
+    預設回傳單一序列 (未指定策略 / timeframe 時為合計)，依小時排序；
+    by_timeframe=True 且未指定 timeframe 時回傳各 timeframe 的列。
+    days 以小時為單位截斷。表不存在時回傳空 DataFrame。
+    """
+    query, params = rollup_query(
+        source, strategy_name, timeframe_minutes, _cutoff_ms(days, HOUR_MS), by_timeframe=by_timeframe
+    )
+    df = _read_rollups(db_path, query, params)
+    if not df.empty:
+        df['hour'] = pd.to_datetime(df['hour_ms'], unit='ms', utc=True)
+    return df
+
+def get_calibration_rollup_dataframe(
+    db_path: str = "data/btc_predictor.db",
+    source: str = "signals",
+    strategy_name: Optional[str] = None,
+    timeframe_minutes: Optional[int] = None,
+    days: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    從 strategy_calibration_rollups 萃取 confidence 0.01 桶的筆數 / 勝場 /
+    confidence 總和 (每 strategy, timeframe, conf_bucket 一列)。days 以日為單位截斷。
+    """
+    query, params = calibration_query(source, strategy_name, timeframe_minutes, _cutoff_ms(days, DAY_MS))
+    return _read_rollups(db_path, query, params)
+
 def get_market_context(
     db_path: str = "data/btc_predictor.db",
     timestamps: Optional[List[datetime]] = None,
@@ -3,6 +3,8 @@ import numpy as np
 from typing import Optional, List, Dict, Any
 from sklearn.linear_model import LinearRegression
 
+from btc_predictor.infrastructure.rollups import DAY_MS, compose_drawdown
+
 def compute_directional_accuracy(
     df: pd.DataFrame,
     groupby: Optional[List[str]] = None,
@@ -332,3 +334,146 @@ def compute_drift_detection(df: pd.DataFrame, window_size: int = 50) -> dict:
             "da": float(rolling_da[best_idx])
         },
     }
+
+
+# --- Rollup variants -------------------------------------------------------
+# Same result shapes as above, computed from the hourly / calibration rollups
+# (analytics.extractors.get_rollup_dataframe) instead of one row per signal
+# or order. Time-based cuts are at hour granularity.
+
+def compute_directional_accuracy_from_rollups(
+    df: pd.DataFrame,
+    groupby: Optional[List[str]] = None,
+) -> dict:
+    if df.empty or 'n' not in df.columns:
+        return {"overall": {"total": 0, "correct": 0, "da": 0.0, "ci_95": 0.0}}
+
+    def _calc_stats(total, correct):
+        total, correct = int(total), int(correct)
+        if total == 0:
+            return {"total": 0, "correct": 0, "da": 0.0, "ci_95": 0.0}
+        da = correct / total
+        return {
+            "total": total,
+            "correct": correct,
+            "da": float(da),
+            "ci_95": float(1.96 * np.sqrt(da * (1 - da) / total))
+        }
+
+    res = {"overall": _calc_stats(df['n'].sum(), df['wins'].sum())}
+
+    if groupby:
+        res["by_group"] = {}
+        for keys, group in df.groupby(groupby):
+            key_str = "|".join(map(str, keys)) if isinstance(keys, tuple) else str(keys)
+            res["by_group"][key_str] = _calc_stats(group['n'].sum(), group['wins'].sum())
+
+    return res
+
+def compute_pnl_metrics_from_rollups(df: pd.DataFrame) -> dict:
+    """PnL metrics of one series' hourly rows (max drawdown from a 0 start)."""
+    df = df[df['n'] > 0] if 'n' in df.columns else df
+    if df.empty:
+        return compute_pnl_metrics(pd.DataFrame())
+
+    df = df.sort_values('hour_ms')
+    total_trades = int(df['n'].sum())
+    wins, losses = int(df['pos_n'].sum()), int(df['neg_n'].sum())
+    win_sum, loss_sum = float(df['pos_pnl_sum'].sum()), float(df['neg_pnl_sum'].sum())
+
+    daily_sums = df.groupby(df['hour_ms'] // DAY_MS * DAY_MS)['pnl_sum'].sum()
+    std_daily = daily_sums.std()
+    sharpe_like = (daily_sums.mean() / std_daily) * np.sqrt(365) if std_daily and std_daily > 0 else 0.0
+    daily_pnl = [
+        {"date": str(pd.Timestamp(day, unit='ms', tz='UTC').date()), "pnl": float(v)}
+        for day, v in daily_sums.items()
+    ]
+    # One point per hour: cumulative PnL after the hour's last trade
+    cumulative = [
+        {"trade_idx": int(i), "cum_pnl": float(val)}
+        for i, val in zip(df['n'].cumsum() - 1, df['pnl_sum'].cumsum())
+    ]
+
+    return {
+        "total_pnl": float(df['pnl_sum'].sum()),
+        "total_trades": total_trades,
+        "win_rate": float(wins / total_trades),
+        "avg_win": win_sum / wins if wins > 0 else 0.0,
+        "avg_loss": loss_sum / losses if losses > 0 else 0.0,
+        "profit_factor": win_sum / abs(loss_sum) if loss_sum < 0 else float('inf'),
+        "max_drawdown": compose_drawdown(df['pnl_sum'], df['peak'], df['trough'], df['max_drawdown']),
+        "max_drawdown_pct": 0.0,
+        "sharpe_like": float(sharpe_like),
+        "daily_pnl": daily_pnl,
+        "cumulative_pnl": cumulative,
+    }
+
+def compute_temporal_patterns_from_rollups(df: pd.DataFrame) -> dict:
+    if df.empty or 'n' not in df.columns:
+        return compute_temporal_patterns(pd.DataFrame())
+
+    hours = pd.to_datetime(df['hour_ms'], unit='ms', utc=True)
+
+    def _stat(mask):
+        t = int(df.loc[mask, 'n'].sum())
+        return {"total": t, "da": float(df.loc[mask, 'wins'].sum() / t) if t > 0 else 0.0}
+
+    by_hour = [{"hour": h, **_stat(hours.dt.hour == h)} for h in range(24)]
+    by_weekday = [
+        {"weekday": wd, **_stat(hours.dt.day_name() == wd)}
+        for wd in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    ]
+
+    # Windows end at the last settled signal; they start on an hour boundary
+    max_ts = pd.Timestamp(int(df['last_time_ms'].max()), unit='ms', tz='UTC')
+    d7 = (max_ts - pd.Timedelta(days=7)).floor('h')
+    d30 = (max_ts - pd.Timedelta(days=30)).floor('h')
+    recent_vs_all = {
+        "last_7d": _stat(hours >= d7),
+        "last_30d": _stat(hours >= d30),
+        "all_time": _stat(hours == hours),
+    }
+
+    return {
+        "by_hour": by_hour,
+        "by_weekday": by_weekday,
+        "recent_vs_all": recent_vs_all
+    }
+
+def compute_confidence_calibration_from_rollups(buckets: pd.DataFrame, hourly: pd.DataFrame) -> dict:
+    """
+    ``buckets``: calibration rollups (0.01 confidence buckets), regrouped into
+    the 0.05 buckets above; ``hourly``: hourly rollups for the Brier score.
+    """
+    if buckets.empty or hourly.empty or 'conf_bucket' not in buckets.columns:
+        return compute_confidence_calibration(pd.DataFrame())
+
+    # [0.50, 0.55), ... [0.95, 1.00]
+    in_range = buckets[buckets['conf_bucket'] >= 50]
+    grouped = in_range.groupby(in_range['conf_bucket'].clip(upper=99) // 5)[['n', 'wins', 'conf_sum']].sum()
+    buckets_info = []
+    for _, row in grouped.iterrows():
+        if row['n'] == 0:
+            continue
+        expected = row['conf_sum'] / row['n']
+        actual = row['wins'] / row['n']
+        buckets_info.append({
+            "expected": float(expected),
+            "actual": float(actual),
+            "count": int(row['n']),
+            "deviation": float(actual - expected)
+        })
+
+    # brier: mean((c - y)^2) = (sum c^2 - 2 sum c*y + sum y) / n, y in {0, 1}
+    n = hourly['n'].sum()
+    if n == 0:
+        return {"buckets": buckets_info, "brier_score": 0.0, "baseline_brier": 0.0}
+    wins = hourly['wins'].sum()
+    brier = (hourly['conf_sq_sum'].sum() - 2 * hourly['conf_win_sum'].sum() + wins) / n
+    hit_rate = wins / n
+
+    return {
+        "buckets": buckets_info,
+        "brier_score": float(brier),
+        "baseline_brier": float(hit_rate * (1 - hit_rate)),
+    }
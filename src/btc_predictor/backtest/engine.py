@@ -1,14 +1,37 @@
 import pandas as pd
 import numpy as np
-import uuid
 import copy
+import tempfile
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from joblib import Parallel, delayed
+import btc_predictor.strategies as strategies_pkg
+from btc_predictor.backtest.fold_cache import FoldCache
+from btc_predictor.backtest.trade_log import PredictionLog, TradeLog
+from btc_predictor.backtest.shared_frame import SharedFrameHandle, open_shared_frame, share_frame
 from btc_predictor.strategies.base import BaseStrategy
-from btc_predictor.models import SimulatedTrade, PredictionSignal
+from btc_predictor.strategies.feature_store import FeatureStore
+from btc_predictor.strategies.registry import StrategyRegistry
 from btc_predictor.simulation.risk import calculate_bet
-from btc_predictor.utils.config import load_constants
+from btc_predictor.utils.config import ProjectConfig, load_constants
+
+# "threading": folds share the process (GIL-bound pandas / predict loops).
+# "process": folds run in worker processes; OHLCV is shared through a
+#            memory-mapped file and strategies are rebuilt from the registry.
+BACKENDS = ("threading", "process")
+
+DEFAULT_STRATEGIES_DIR = Path(strategies_pkg.__file__).parent
+DEFAULT_MODELS_DIR = Path("models")
+
+# Per worker process: strategies rebuilt from the registry, feature stores
+_WORKER_STRATEGIES: Dict[Tuple[str, str, str], BaseStrategy] = {}
+_WORKER_FEATURE_STORES: Dict[Tuple[str, str], FeatureStore] = {}
+
+FoldResult = Union[TradeLog, Tuple[TradeLog, PredictionLog]]
+Fold = Tuple[pd.Timestamp, pd.Timestamp]
 
 def _process_fold(
     fold_start: pd.Timestamp,
@@ -18,11 +41,103 @@ def _process_fold(
     strategy: BaseStrategy,
     timeframe_minutes: int,
     payout_ratio: float,
-    settlement_condition: str = ">"
-) -> List[SimulatedTrade]:
-    """Process a single walk-forward fold."""
-    # Create a local copy of the strategy to avoid state sharing
+    settlement_condition: str = ">",
+    feature_store: Optional[FeatureStore] = None,
+    with_predictions: bool = False,
+    warm_start: bool = False,
+    copy_strategy: bool = True
+) -> FoldResult:
+    """Process a single walk-forward fold (trades, plus its PredictionLog if ``with_predictions``)."""
+    # Activated here: joblib worker threads do not inherit the caller's context
+    with feature_store.activate() if feature_store is not None else nullcontext():
+        return _run_fold(
+            fold_start, fold_end, train_days, ohlcv, strategy,
+            timeframe_minutes, payout_ratio, settlement_condition, with_predictions,
+            warm_start, copy_strategy
+        )
+
+def _process_segment(
+    segment: Sequence[Fold],
+    train_days: int,
+    ohlcv: pd.DataFrame,
+    strategy: BaseStrategy,
+    timeframe_minutes: int,
+    payout_ratio: float,
+    settlement_condition: str,
+    feature_store: Optional[FeatureStore] = None,
+    with_predictions: bool = False
+) -> List[FoldResult]:
+    """
+    Consecutive folds sharing one strategy copy: the first is fitted from
+    scratch, the others continue from the previous fold's model
+    (``warm_start_fit``). A one-fold segment is a plain ``_process_fold``.
+    """
     local_strategy = copy.deepcopy(strategy)
+    return [
+        _process_fold(
+            fold_start, fold_end, train_days, ohlcv, local_strategy, timeframe_minutes, payout_ratio,
+            settlement_condition, feature_store, with_predictions, warm_start=k > 0, copy_strategy=False
+        )
+        for k, (fold_start, fold_end) in enumerate(segment)
+    ]
+
+def _process_segment_shared(
+    segment: Sequence[Fold],
+    train_days: int,
+    frame: SharedFrameHandle,
+    strategy_ref: Union[str, BaseStrategy],
+    strategies_dir: str,
+    models_dir: str,
+    timeframe_minutes: int,
+    payout_ratio: float,
+    settlement_condition: str,
+    feature_store: Optional[FeatureStore],
+    with_predictions: bool = False
+) -> List[FoldResult]:
+    """Process-pool entry point: resolve the shared OHLCV and the strategy, then run the segment."""
+    ohlcv = open_shared_frame(frame)
+
+    if isinstance(strategy_ref, str):
+        key = (strategy_ref, strategies_dir, models_dir)
+        if key not in _WORKER_STRATEGIES:
+            _WORKER_STRATEGIES[key] = StrategyRegistry().load(strategy_ref, Path(strategies_dir), Path(models_dir))
+        strategy = _WORKER_STRATEGIES[key]
+    else:
+        strategy = strategy_ref
+
+    if feature_store is not None:
+        # Keep one store per process so materialized tables are loaded once
+        feature_store = _WORKER_FEATURE_STORES.setdefault((str(feature_store.root), feature_store.name), feature_store)
+        feature_store.attach(ohlcv, feature_store.name)
+
+    return _process_segment(
+        segment, train_days, ohlcv, strategy,
+        timeframe_minutes, payout_ratio, settlement_condition, feature_store, with_predictions
+    )
+
+def _strategy_ref(strategy: BaseStrategy, strategies_dir: Path) -> Union[str, BaseStrategy]:
+    """Registry name when workers can rebuild the strategy from it, else the (pickled) strategy."""
+    module = f"{strategies_pkg.__name__}.{strategy.name}.strategy"
+    if type(strategy).__module__ == module and (strategies_dir / strategy.name / "strategy.py").exists():
+        return strategy.name
+    return strategy
+
+def _run_fold(
+    fold_start: pd.Timestamp,
+    fold_end: pd.Timestamp,
+    train_days: int,
+    ohlcv: pd.DataFrame,
+    strategy: BaseStrategy,
+    timeframe_minutes: int,
+    payout_ratio: float,
+    settlement_condition: str,
+    with_predictions: bool = False,
+    warm_start: bool = False,
+    copy_strategy: bool = True
+) -> FoldResult:
+    # Create a local copy of the strategy to avoid state sharing
+    # (segments pass their own copy, carried from fold to fold)
+    local_strategy = copy.deepcopy(strategy) if copy_strategy else strategy
     
     # 1. Prepare data for this fold (train + test)
     # Ensure we include enough lookback for features (e.g. 14 days for safety)
@@ -34,7 +149,10 @@ def _process_fold(
     # 2. Fit strategy if needed
     if local_strategy.requires_fitting:
         train_data = fold_data[fold_data.index < fold_start]
-        local_strategy.fit(train_data, timeframe_minutes)
+        if warm_start:
+            local_strategy.warm_start_fit(train_data, timeframe_minutes)
+        else:
+            local_strategy.fit(train_data, timeframe_minutes)
         
     # 3. Predict on test data
     # test_data_window excludes the fold_end (as predictions are for periods finishing AT or BEFORE fold_end)
@@ -50,68 +168,187 @@ def _process_fold(
     # We simulate non-overlapping trades by stepping by appropriate number of rows.
     test_timestamps = test_data_window.index[::step]
     
-    fold_trades = []
-    for ts in test_timestamps:
-        # Each prediction uses data up to current timestamp
-        # Since fold_data is local and small, this is fast and thread-safe.
-        data_up_to_ts = fold_data.loc[:ts]
-        
-        signal = local_strategy.predict(data_up_to_ts, timeframe_minutes)
-        
-        # 4. Risk check & Bet calculation
-        if payout_ratio == 2.0:
-            bet = 10.0
-        else:
-            bet = calculate_bet(signal.confidence, timeframe_minutes)
-        
-        if bet > 0:
-            # 5. Create trade record
-            expiry_time = ts + timedelta(minutes=timeframe_minutes)
-            
-            # Look up settlement price in fold_data
-            if expiry_time in fold_data.index:
-                close_price = float(fold_data.loc[expiry_time, 'close'])
-                open_price = float(fold_data.loc[ts, 'close'])
-                
-                # Result logic:
-                if settlement_condition == ">=":
-                    if signal.direction == "higher":
-                        is_win = close_price >= open_price
-                    else:
-                        is_win = close_price < open_price
-                else:
-                    if signal.direction == "higher":
-                        is_win = close_price > open_price
-                    else:
-                        is_win = close_price < open_price
-                    
-                result = "win" if is_win else "lose"
-                pnl = bet * (payout_ratio - 1) if is_win else -bet
-                
-                features_used = {}
-                if signal.alpha is not None:
-                    actual_change_pct = (close_price - open_price) / open_price * 100
-                    features_used["predicted_change_pct"] = float(signal.alpha)
-                    features_used["actual_change_pct"] = float(actual_change_pct)
-                
-                trade = SimulatedTrade(
-                    id=str(uuid.uuid4()),
-                    strategy_name=local_strategy.name,
-                    direction=signal.direction,
-                    confidence=signal.confidence,
-                    timeframe_minutes=timeframe_minutes, # type: ignore
-                    bet_amount=float(bet),
-                    open_time=ts,
-                    open_price=open_price,
-                    expiry_time=expiry_time,
-                    close_price=close_price,
-                    result=result, # type: ignore
-                    pnl=float(pnl),
-                    features_used=features_used
-                )
-                fold_trades.append(trade)
+    # Score every test timestamp at once. Strategies with causal features
+    # override predict_batch to compute features a single time per fold;
+    # the default falls back to predict(fold_data.loc[:ts]) per timestamp.
+    signals = local_strategy.predict_batch(fold_data, test_timestamps, timeframe_minutes)
     
-    return fold_trades
+    n = min(len(test_timestamps), len(signals))
+    signals = signals[:n]
+    open_times = test_timestamps[:n]
+    confidence = np.fromiter((s.confidence for s in signals), dtype=float, count=n)
+
+    # 4. Settle against the close at expiry (timestamps whose expiry is outside the fold are dropped)
+    expiry_pos = fold_data.index.get_indexer(open_times + timedelta(minutes=timeframe_minutes))
+    settled = np.flatnonzero(expiry_pos >= 0)
+    close = fold_data['close'].to_numpy(dtype=float)
+    settled_times = open_times[settled]
+
+    predictions = PredictionLog.build(
+        local_strategy.name,
+        timeframe_minutes,
+        settled_times,
+        higher=np.array([signals[i].direction == "higher" for i in settled], dtype=bool),
+        confidence=confidence[settled],
+        alpha=np.array([np.nan if signals[i].alpha is None else signals[i].alpha for i in settled], dtype=float),
+        open_price=close[fold_data.index.get_indexer(settled_times)],
+        close_price=close[expiry_pos[settled]],
+    )
+    trades = _settle_fold(predictions, payout_ratio, settlement_condition)
+    return (trades, predictions) if with_predictions else trades
+
+def _settle_fold(predictions: PredictionLog, payout_ratio: float, settlement_condition: str) -> TradeLog:
+    """Risk check & bet calculation, then settlement of a fold's predictions against their closes."""
+    if payout_ratio == 2.0:
+        bet = np.full(len(predictions), 10.0)
+    else:
+        tf = predictions.timeframe_minutes
+        bet = np.fromiter((calculate_bet(c, tf) for c in predictions.confidence), dtype=float, count=len(predictions))
+    return predictions.settle(bet, payout_ratio, settlement_condition)
+
+def walk_forward_folds(
+    ohlcv: pd.DataFrame,
+    train_days: int = 60,
+    test_days: int = 7,
+    step_days: Optional[int] = None
+) -> List[Fold]:
+    """(test start, test end) of every walk-forward fold; the first starts ``train_days`` into ``ohlcv``."""
+    if step_days is None:
+        step_days = test_days
+
+    start_time = ohlcv.index[0] + timedelta(days=train_days)
+    end_time = ohlcv.index[-1]
+
+    folds = []
+    current_test_start = start_time
+    while current_test_start < end_time:
+        current_test_end = current_test_start + timedelta(days=test_days)
+        if current_test_end > end_time:
+            current_test_end = end_time
+
+        folds.append((current_test_start, current_test_end))
+        current_test_start += timedelta(days=step_days)
+    return folds
+
+def settlement_terms(timeframe_minutes: int, platform: str, config: ProjectConfig) -> Tuple[float, str]:
+    """(payout ratio, settlement condition) of a contract on ``platform``."""
+    if platform == "polymarket":
+        return 2.0, ">="
+    return config.payout_ratio(timeframe_minutes), ">"
+
+@dataclass
+class _Run:
+    """One (strategy, timeframe) walk-forward backtest being scheduled."""
+    strategy: BaseStrategy
+    timeframe_minutes: int
+    folds: List[Fold]
+    payout_ratio: float
+    settlement_condition: str
+    segment_size: int = 1
+    keys: List[str] = field(default_factory=list)
+    # Fold predictions served from the cache (settled with the computed ones)
+    cached: Dict[int, PredictionLog] = field(default_factory=dict)
+    # Segments still to run: fold indices sharing one model chain
+    pending: List[List[int]] = field(default_factory=list)
+
+def _plan_run(
+    strategy: BaseStrategy,
+    ohlcv: pd.DataFrame,
+    folds: List[Fold],
+    timeframe_minutes: int,
+    train_days: int,
+    platform: str,
+    config: ProjectConfig,
+    feature_store: Optional[FeatureStore],
+    models_dir: Optional[Path],
+    fold_cache: Optional[FoldCache],
+    warm_start: bool,
+    refit_every: int
+) -> _Run:
+    """Split the folds into segments and take the ones the fold cache already holds."""
+    payout_ratio, settlement_condition = settlement_terms(timeframe_minutes, platform, config)
+    # Segments: folds sharing one model chain (single folds unless warm-starting)
+    size = max(1, refit_every) if warm_start and strategy.requires_fitting else 1
+    run = _Run(strategy, timeframe_minutes, folds, payout_ratio, settlement_condition, size)
+    segments = [list(range(i, min(i + size, len(folds)))) for i in range(0, len(folds), size)]
+
+    if fold_cache is not None:
+        run.keys = fold_cache.fold_keys(
+            strategy, ohlcv, folds, timeframe_minutes, train_days,
+            models_dir=Path(models_dir or DEFAULT_MODELS_DIR),
+            feature_store=feature_store.name if feature_store is not None else None,
+            refit_every=size if size > 1 else None,
+        )
+        for segment in segments:
+            # A warm-started fold needs the folds before it in its segment
+            loaded = fold_cache.load_all(strategy.name, timeframe_minutes, [run.keys[i] for i in segment])
+            if loaded is not None:
+                run.cached.update(zip(segment, loaded))
+        print(f"[{strategy.name}] Fold cache: {len(run.cached)}/{len(folds)} folds reused ({timeframe_minutes}m)")
+    run.pending = [segment for segment in segments if segment[0] not in run.cached]
+    return run
+
+def _dispatch(
+    jobs: Sequence[Tuple[_Run, List[int]]],
+    ohlcv: pd.DataFrame,
+    train_days: int,
+    n_jobs: int,
+    backend: str,
+    feature_store: Optional[FeatureStore],
+    strategies_dir: Optional[Path],
+    models_dir: Optional[Path],
+    with_predictions: bool
+) -> List[List[FoldResult]]:
+    """Run (run, segment) jobs over one worker pool; results in job order."""
+    if not jobs:
+        return []
+    if backend == "process":
+        strategies_dir = Path(strategies_dir or DEFAULT_STRATEGIES_DIR)
+        models_dir = Path(models_dir or DEFAULT_MODELS_DIR)
+        refs = {id(run.strategy): _strategy_ref(run.strategy, strategies_dir) for run, _ in jobs}
+        with tempfile.TemporaryDirectory(prefix="backtest-ohlcv-") as shared_dir:
+            frame = share_frame(ohlcv, Path(shared_dir))
+            return Parallel(n_jobs=n_jobs, backend="loky", verbose=10)(
+                delayed(_process_segment_shared)(
+                    [run.folds[i] for i in segment], train_days, frame, refs[id(run.strategy)],
+                    str(strategies_dir), str(models_dir), run.timeframe_minutes, run.payout_ratio,
+                    run.settlement_condition, feature_store, with_predictions
+                ) for run, segment in jobs
+            )
+    return Parallel(n_jobs=n_jobs, backend="threading", verbose=10)(
+        delayed(_process_segment)(
+            [run.folds[i] for i in segment], train_days, ohlcv, run.strategy, run.timeframe_minutes,
+            run.payout_ratio, run.settlement_condition, feature_store, with_predictions
+        ) for run, segment in jobs
+    )
+
+def _collect(
+    run: _Run,
+    results: Sequence[List[FoldResult]],
+    fold_cache: Optional[FoldCache],
+    predictions_path: Optional[Path],
+    with_predictions: bool
+) -> TradeLog:
+    """Concatenate the fold logs of ``run`` (computed ``results`` of its pending segments, in order)."""
+    name, tf = run.strategy.name, run.timeframe_minutes
+    fold_results = [result for segment_results in results for result in segment_results]
+    computed = [i for segment in run.pending for i in segment]
+
+    if not with_predictions:
+        return TradeLog.concat(fold_results, name, tf)
+    trades: Dict[int, TradeLog] = {}
+    predictions = dict(run.cached)
+    for i, (fold_trades, fold_predictions) in zip(computed, fold_results):
+        trades[i] = fold_trades
+        predictions[i] = fold_predictions
+        if fold_cache is not None:
+            fold_cache.save(run.keys[i], fold_predictions)
+    for i in set(predictions) - set(trades):
+        trades[i] = _settle_fold(predictions[i], run.payout_ratio, run.settlement_condition)
+    order = sorted(trades)
+    if predictions_path is not None:
+        PredictionLog.concat([predictions[i] for i in order], name, tf).save(predictions_path)
+    return TradeLog.concat([trades[i] for i in order], name, tf)
 
 def run_backtest(
     strategy: BaseStrategy,
@@ -121,8 +358,16 @@ def run_backtest(
     test_days: int = 7,
     step_days: Optional[int] = None,
     n_jobs: int = -2, # Use all but one core by default
-    platform: str = "binance"
-) -> List[SimulatedTrade]:
+    platform: str = "binance",
+    feature_store: Optional[FeatureStore] = None,
+    backend: str = "threading",
+    strategies_dir: Optional[Path] = None,
+    models_dir: Optional[Path] = None,
+    predictions_path: Optional[Path] = None,
+    fold_cache: Optional[FoldCache] = None,
+    warm_start: bool = False,
+    refit_every: int = 4
+) -> TradeLog:
     """
     Run a walk-forward backtest using parallel processing for folds.
     
@@ -134,45 +379,127 @@ def run_backtest(
         test_days: Testing window size.
         step_days: How many days to step forward.
         n_jobs: Number of parallel jobs (-1: all, -2: all but one).
+        feature_store: Serve strategy features from materialized tables
+                       (attached to ``ohlcv`` if not attached yet).
+        backend: "threading" or "process" (see ``BACKENDS``). With "process",
+                 strategies from the registry are rebuilt by name in each
+                 worker (from ``strategies_dir`` / ``models_dir``); others
+                 are pickled.
+        predictions_path: Also save the raw per-timestamp model outputs of
+                 all folds there as a ``PredictionLog`` (see
+                 ``btc_predictor.backtest.replay``).
+        fold_cache: Reuse the predictions of folds whose strategy code, model
+                 files and OHLCV rows are unchanged since a previous run, and
+                 store the ones computed now (see ``FoldCache``). Bets and
+                 settlement are always recomputed from the current config.
+        warm_start: Continue training from the previous fold's model
+                 (``BaseStrategy.warm_start_fit``) instead of fitting every
+                 fold from scratch. Folds run in segments of ``refit_every``:
+                 the first fold of each segment is a full refit (bounding
+                 drift), segments run in parallel. Strategies without
+                 ``warm_start_fit`` fall back to full fits.
+
+    Returns the trades of all folds as one columnar ``TradeLog`` (indexing or
+    iterating it yields ``SimulatedTrade`` objects).
     """
-    if step_days is None:
-        step_days = test_days
-        
-    constants = load_constants()
-    
-    if platform == "polymarket":
-        payout_ratio = 2.0
-        settlement_condition = ">="
-    else:
-        payout_ratios = constants.get("event_contract", {}).get("payout_ratio", {})
-        payout_ratio = payout_ratios.get(timeframe_minutes, 1.85)
-        settlement_condition = ">"
-    
-    # 1. Start time of the first test window
-    start_time = ohlcv.index[0] + timedelta(days=train_days)
-    end_time = ohlcv.index[-1]
-    
-    # 2. Generate all folds first
-    folds = []
-    current_test_start = start_time
-    while current_test_start < end_time:
-        current_test_end = current_test_start + timedelta(days=test_days)
-        if current_test_end > end_time:
-            current_test_end = end_time
-            
-        folds.append((current_test_start, current_test_end))
-        current_test_start += timedelta(days=step_days)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
 
-    print(f"[{strategy.name}] Starting parallel walk-forward backtest ({len(folds)} folds, n_jobs={n_jobs})...")
-    
-    # 3. Parallelize over folds
-    results = Parallel(n_jobs=n_jobs, backend="threading", verbose=10)(
-        delayed(_process_fold)(
-            f_start, f_end, train_days, ohlcv, strategy, timeframe_minutes, payout_ratio, settlement_condition
-        ) for f_start, f_end in folds
+    config = ProjectConfig.of(load_constants())
+    folds = walk_forward_folds(ohlcv, train_days, test_days, step_days)
+
+    if feature_store is not None and feature_store.history is None:
+        feature_store.attach(ohlcv)
+
+    run = _plan_run(
+        strategy, ohlcv, folds, timeframe_minutes, train_days, platform, config,
+        feature_store, models_dir, fold_cache, warm_start, refit_every
     )
-    
-    # 4. Flatten the list of lists of trades
-    trades = [trade for sublist in results for trade in sublist]
-    
+    mode = f", warm start (full refit every {run.segment_size} folds)" if run.segment_size > 1 else ""
+    print(f"[{strategy.name}] Starting parallel walk-forward backtest ({sum(map(len, run.pending))} folds, n_jobs={n_jobs}, backend={backend}{mode})...")
+
+    with_predictions = predictions_path is not None or fold_cache is not None
+    results = _dispatch(
+        [(run, segment) for segment in run.pending], ohlcv, train_days, n_jobs, backend,
+        feature_store, strategies_dir, models_dir, with_predictions
+    )
+    return _collect(run, results, fold_cache, predictions_path, with_predictions)
+
+def run_backtest_matrix(
+    strategies: Sequence[BaseStrategy],
+    ohlcv: pd.DataFrame,
+    timeframes: Sequence[int],
+    train_days: int = 60,
+    test_days: int = 7,
+    step_days: Optional[int] = None,
+    n_jobs: int = -2,
+    platform: str = "binance",
+    feature_store: Optional[FeatureStore] = None,
+    backend: str = "threading",
+    strategies_dir: Optional[Path] = None,
+    models_dir: Optional[Path] = None,
+    predictions_paths: Optional[Dict[Tuple[str, int], Path]] = None,
+    fold_cache: Optional[FoldCache] = None,
+    warm_start: bool = False,
+    refit_every: int = 4
+) -> Dict[Tuple[str, int], TradeLog]:
+    """
+    Walk-forward backtests of every strategy at every timeframe in one pass.
+
+    Same results as ``run_backtest`` per (strategy, timeframe), but the runs
+    share the fold boundaries, the config, the feature store (each feature
+    set is materialized once for all strategies) and, with the "process"
+    backend, one memory-mapped copy of ``ohlcv``. The segments of all runs
+    go to a single worker pool, fitting strategies and longer segments
+    first, so workers stay busy until the whole matrix is done instead of
+    idling on the last fold of each run.
+
+    Args:
+        strategies: Strategies to test (names must be distinct).
+        timeframes: Contract timeframes; every strategy runs at each of them.
+        predictions_paths: Where to save the ``PredictionLog`` of a
+                 (strategy name, timeframe) run, if anywhere.
+        Others: as in ``run_backtest``.
+
+    Returns the ``TradeLog`` of every run, keyed by (strategy name, timeframe).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+    names = [strategy.name for strategy in strategies]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate strategy names: {names}")
+
+    config = ProjectConfig.of(load_constants())
+    folds = walk_forward_folds(ohlcv, train_days, test_days, step_days)
+
+    if feature_store is not None and feature_store.history is None:
+        feature_store.attach(ohlcv)
+
+    runs = [
+        _plan_run(
+            strategy, ohlcv, folds, tf, train_days, platform, config,
+            feature_store, models_dir, fold_cache, warm_start, refit_every
+        )
+        for strategy in strategies for tf in timeframes
+    ]
+    jobs = [(run, segment) for run in runs for segment in run.pending]
+    order = sorted(range(len(jobs)), key=lambda j: (not jobs[j][0].strategy.requires_fitting, -len(jobs[j][1])))
+    print(f"Starting walk-forward backtest matrix ({len(strategies)} strategies x {len(timeframes)} timeframes, "
+          f"{sum(len(segment) for _, segment in jobs)} folds, n_jobs={n_jobs}, backend={backend})...")
+
+    predictions_paths = predictions_paths or {}
+    with_predictions = bool(predictions_paths) or fold_cache is not None
+    results = _dispatch(
+        [jobs[j] for j in order], ohlcv, train_days, n_jobs, backend,
+        feature_store, strategies_dir, models_dir, with_predictions
+    )
+    by_job = dict(zip(order, results))
+
+    trades: Dict[Tuple[str, int], TradeLog] = {}
+    j = 0
+    for run in runs:
+        run_results = [by_job[j + k] for k in range(len(run.pending))]
+        j += len(run.pending)
+        key = (run.strategy.name, run.timeframe_minutes)
+        trades[key] = _collect(run, run_results, fold_cache, predictions_paths.get(key), with_predictions)
     return trades
@@ -0,0 +1,256 @@
+"""
+btc_predictor/backtest/fold_cache.py
+------------------------------------
+Content-addressed cache of walk-forward fold results.
+
+職責:
+- 以 (策略程式碼、模型檔、OHLCV 區間、fold 參數) 的雜湊作為每個 fold 的 key
+- 命中時直接讀回該 fold 的 PredictionLog，只重算輸入有變的 fold (例如新增的一週)
+- 結算 (下注金額、賠率) 仍於每次回測重做，調整 risk_control / payout 不會使快取失效
+
+Layout::
+
+    <root>/<strategy>/<timeframe>m/<fold key>.arrow
+
+A fold key is the SHA-256 of:
+
+- ``code``: the source of the strategy's module and, transitively, of every
+  ``btc_predictor`` module it references (model, features, labeling, ...).
+- ``artifacts``: the model files under ``<models_dir>/<strategy>/`` for
+  strategies that do not refit per fold (``requires_fitting`` is False).
+- ``package_data``: the non-Python files in the strategy's package directory
+  (e.g. ``lgbm_v1_tuned/best_params.pkl`` written by its ``tuning.py``).
+- ``libraries``: the installed versions of the model libraries
+  (``LIBRARIES``), since an upgrade changes what a fit produces.
+- ``data``: a checksum of the OHLCV rows the fold reads — from
+  ``train_days`` before the fold to its end, or from the first candle when
+  features are served from a FeatureStore (computed over the full history).
+- the fold boundaries, ``train_days``, the timeframe and ``FORMAT_VERSION``.
+
+With warm starts (``run_backtest(warm_start=True)``) a fold's model continues
+from the earlier folds of its segment, so its key also covers the segment
+layout and its data checksum starts at the segment's first training window.
+
+Appending candles leaves the keys of earlier folds unchanged as long as the
+history keeps its first candle (e.g. a fixed ``--start-date``). Strategy
+state that is none of the above (constructor arguments, patched
+attributes) is not part of the key: use a separate cache root, or
+``FoldCache.clear``, when varying it.
+
+    cache = FoldCache()
+    trades = run_backtest(strategy, df, 60, fold_cache=cache)
+    print(cache.hits, cache.misses)
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import threading
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from btc_predictor.backtest.trade_log import PredictionLog
+from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.streaming import OHLCV_COLUMNS
+
+DEFAULT_FOLD_CACHE_ROOT = Path("data/backtest_cache")
+
+# Bump when the engine changes how fold predictions are produced
+FORMAT_VERSION = 1
+
+_PACKAGE = "btc_predictor"
+
+# Distributions whose version is part of every fold key
+LIBRARIES = ("xgboost", "lightgbm", "catboost", "torch", "scikit-learn")
+
+
+def code_hash(strategy: BaseStrategy) -> str:
+    """SHA-256 over the sources of the strategy module and the ``btc_predictor`` modules it references."""
+    sources: Dict[str, str] = {}
+    pending = [type(strategy).__module__]
+    while pending:
+        name = pending.pop()
+        module = sys.modules.get(name)
+        if module is None or name in sources:
+            continue
+        try:
+            source = inspect.getsource(module)
+        except (OSError, TypeError):
+            source = ""
+        sources[name] = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        for value in vars(module).values():
+            owner = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+            if isinstance(owner, str) and (owner == _PACKAGE or owner.startswith(_PACKAGE + ".")):
+                pending.append(owner)
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(f"{name}:{sources[name]}\n".encode())
+    return digest.hexdigest()
+
+
+def artifacts_hash(strategy: BaseStrategy, models_dir: Optional[Path]) -> str:
+    """SHA-256 of the model files a pre-trained strategy predicts with ("" if it refits per fold)."""
+    if strategy.requires_fitting or models_dir is None:
+        return ""
+    directory = Path(models_dir) / strategy.name
+    paths = [p for p in directory.rglob("*") if p.is_file()] if directory.is_dir() else []
+    return _hash_files(directory, paths)
+
+
+def _hash_files(directory: Path, paths: Sequence[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(f"{path.relative_to(directory).as_posix()}\n".encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def package_data_hash(strategy: BaseStrategy) -> str:
+    """SHA-256 of the non-Python files next to the strategy's module (tuned parameters, lookup tables, ...)."""
+    module_file = getattr(sys.modules.get(type(strategy).__module__), "__file__", None)
+    if not module_file:
+        return ""
+    directory = Path(module_file).parent
+    return _hash_files(directory, [
+        p for p in directory.rglob("*")
+        if p.is_file() and p.suffix not in (".py", ".pyc") and "__pycache__" not in p.parts
+    ])
+
+
+@lru_cache(maxsize=None)
+def library_versions() -> Dict[str, Optional[str]]:
+    """Installed version of each of ``LIBRARIES`` (None if not installed)."""
+    versions: Dict[str, Optional[str]] = {}
+    for name in LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def _row_hashes(ohlcv: pd.DataFrame) -> np.ndarray:
+    """One uint64 per candle over its timestamp and OHLCV values."""
+    columns = [c for c in OHLCV_COLUMNS if c in ohlcv.columns]
+    return pd.util.hash_pandas_object(ohlcv[columns], index=True).to_numpy()
+
+
+def data_hashes(
+    ohlcv: pd.DataFrame,
+    folds: Sequence[Tuple[pd.Timestamp, pd.Timestamp]],
+    train_days: int,
+    full_history: bool = False,
+    refit_every: Optional[int] = None,
+) -> List[str]:
+    """Checksum of the candles each fold reads (see module docstring)."""
+    rows = _row_hashes(ohlcv)
+    index = ohlcv.index
+    ends = [int(index.searchsorted(fold_end, side="right")) for _, fold_end in folds]
+    if not full_history:
+        first = [i - i % refit_every if refit_every else i for i in range(len(folds))]
+        starts = [int(index.searchsorted(folds[j][0] - pd.Timedelta(days=train_days), side="left")) for j in first]
+        return [hashlib.sha256(rows[lo:hi].tobytes()).hexdigest() for lo, hi in zip(starts, ends)]
+
+    # Prefixes of one history: extend a single running digest in order of fold end
+    hashes: List[str] = [""] * len(folds)
+    digest, done = hashlib.sha256(), 0
+    for i in sorted(range(len(folds)), key=ends.__getitem__):
+        digest.update(rows[done:ends[i]].tobytes())
+        done = max(done, ends[i])
+        hashes[i] = digest.copy().hexdigest()
+    return hashes
+
+
+class FoldCache:
+    """On-disk fold results keyed by content hash.
+
+    Args:
+        root: Cache directory (default ``data/backtest_cache``).
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_FOLD_CACHE_ROOT) -> None:
+        self.root = Path(root)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def fold_keys(
+        self,
+        strategy: BaseStrategy,
+        ohlcv: pd.DataFrame,
+        folds: Sequence[Tuple[pd.Timestamp, pd.Timestamp]],
+        timeframe_minutes: int,
+        train_days: int,
+        models_dir: Optional[Path] = None,
+        feature_store: Optional[str] = None,
+        refit_every: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Key of every fold. ``feature_store``: name of the FeatureStore serving
+        features, if any; ``refit_every``: warm-start segment length, if any.
+        """
+        code, artifacts = code_hash(strategy), artifacts_hash(strategy, models_dir)
+        package_data, libraries = package_data_hash(strategy), library_versions()
+        data = data_hashes(ohlcv, folds, train_days, full_history=feature_store is not None, refit_every=refit_every)
+        keys = []
+        for i, ((fold_start, fold_end), data_hash) in enumerate(zip(folds, data)):
+            payload = {
+                "version": FORMAT_VERSION,
+                "strategy": strategy.name,
+                "timeframe": timeframe_minutes,
+                "train_days": train_days,
+                "fold": [pd.Timestamp(fold_start).isoformat(), pd.Timestamp(fold_end).isoformat()],
+                "feature_store": feature_store,
+                "code": code,
+                "artifacts": artifacts,
+                "package_data": package_data,
+                "libraries": libraries,
+                "data": data_hash,
+            }
+            if refit_every:
+                payload["warm_start"] = [refit_every, i % refit_every]
+            keys.append(hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest())
+        return keys
+
+    def load(self, strategy_name: str, timeframe_minutes: int, key: str) -> Optional[PredictionLog]:
+        path = self._path(strategy_name, timeframe_minutes, key)
+        if not path.exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return PredictionLog.load(path)
+
+    def load_all(self, strategy_name: str, timeframe_minutes: int, keys: Sequence[str]) -> Optional[List[PredictionLog]]:
+        """All of ``keys`` (e.g. one warm-start segment), or None if any is missing."""
+        paths = [self._path(strategy_name, timeframe_minutes, key) for key in keys]
+        if not all(path.exists() for path in paths):
+            self.misses += len(paths)
+            return None
+        self.hits += len(paths)
+        return [PredictionLog.load(path) for path in paths]
+
+    def save(self, key: str, predictions: PredictionLog) -> Path:
+        path = self._path(predictions.strategy_name, predictions.timeframe_minutes, key)
+        # Write next to the target and rename, so readers never see a partial file
+        tmp_path = path.with_suffix(f".arrow.{os.getpid()}-{threading.get_ident()}.tmp")
+        predictions.save(tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def clear(self, strategy_name: Optional[str] = None) -> None:
+        """Drop the cached folds of one strategy (or all of them)."""
+        target = self.root / strategy_name if strategy_name else self.root
+        shutil.rmtree(target, ignore_errors=True)
+
+    def _path(self, strategy_name: str, timeframe_minutes: int, key: str) -> Path:
+        return self.root / strategy_name / f"{timeframe_minutes}m" / f"{key}.arrow"
@@ -0,0 +1,268 @@
+"""
+btc_predictor/backtest/replay.py
+--------------------------------
+Prediction replay: re-evaluate decision rules over a saved PredictionLog
+instead of re-running ``run_backtest`` (and its model fits).
+
+職責:
+- DecisionRule: 信心閾值、下注區間、賠率、alpha 閾值、風控上限 (``risk_control``)
+- replay(): 單一規則 → TradeLog (與 run_backtest 相同的下注與結算邏輯)
+- sweep(): 規則網格 → 每個組合一列績效 (向量化於 組合 × 時點 陣列)
+
+``DecisionRule.from_config`` reproduces the engine's rule, so
+``replay(predictions, DecisionRule.from_config(tf))`` gives the same trades as
+the backtest that wrote ``predictions``. Risk limits are off there, as in the
+engine; with them on, trades are gated in time order the way
+``simulation.risk.should_trade`` gates live trades (UTC-day loss and trade
+count, consecutive losses), assuming each result is known before the next
+prediction (non-overlapping trades). ``max_consecutive_losses`` pauses trading
+for ``pause_minutes`` after the losing trade expires, then the streak restarts.
+
+    predictions = PredictionLog.load("reports/backtest_lgbm_v2_60m_x.predictions.arrow")
+    table = sweep(predictions, {
+        "confidence_threshold": np.arange(0.50, 0.70, 0.01),
+        "bet_range": [(5, 20), (10, 10)],
+        "daily_max_loss": [50, np.inf],
+    }, base=DecisionRule.from_config(60))
+"""
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from btc_predictor.backtest.trade_log import PredictionLog, TradeLog
+from btc_predictor.utils.config import ProjectConfig, load_constants
+
+DAY_NS = 24 * 3600 * 10**9
+MINUTE_NS = 60 * 10**9
+
+# Combos × predictions evaluated per block (bounds the temporary matrices)
+BLOCK_CELLS = 4_000_000
+
+RISK_LIMITS = ("daily_max_loss", "max_daily_trades", "max_consecutive_losses")
+
+
+@dataclass(frozen=True)
+class DecisionRule:
+    confidence_threshold: float = 0.6
+    bet_range: Tuple[float, float] = (5.0, 20.0)    # linear from threshold → 1.0 (calculate_bet)
+    payout_ratio: float = 1.85
+    settlement_condition: str = ">"                 # ">=" : unchanged price wins "higher" (Polymarket)
+    market_price: float = np.nan                    # entry price; NaN disables the alpha check
+    alpha_threshold: float = 0.0                    # trade only if confidence - market_price > this
+    min_predicted_change: float = 0.0               # |predicted change %| floor (regression strategies)
+    daily_max_loss: float = np.inf
+    max_daily_trades: float = np.inf
+    max_consecutive_losses: float = np.inf
+    pause_minutes: float = 60.0
+
+    @classmethod
+    def from_config(
+        cls,
+        timeframe_minutes: int,
+        platform: str = "binance",
+        risk_limits: bool = False,
+        config: Optional[ProjectConfig] = None,
+    ) -> "DecisionRule":
+        """The rule ``run_backtest`` applies (plus ``risk_control`` limits if ``risk_limits``)."""
+        config = config or ProjectConfig.of(load_constants())
+        if platform == "polymarket":
+            rule = cls(confidence_threshold=0.0, bet_range=(10.0, 10.0), payout_ratio=2.0, settlement_condition=">=")
+        else:
+            rule = cls(
+                confidence_threshold=config.confidence_threshold(timeframe_minutes),
+                bet_range=config.risk.bet_range,
+                payout_ratio=config.payout_ratio(timeframe_minutes),
+            )
+        if risk_limits:
+            rule = replace(
+                rule,
+                daily_max_loss=config.risk.daily_max_loss,
+                max_daily_trades=config.risk.max_daily_trades,
+                max_consecutive_losses=config.risk.max_consecutive_losses,
+            )
+        return rule
+
+    @property
+    def has_risk_limits(self) -> bool:
+        return any(np.isfinite(getattr(self, name)) for name in RISK_LIMITS)
+
+
+def replay(predictions: PredictionLog, rule: DecisionRule) -> TradeLog:
+    """Trades ``rule`` would have taken over ``predictions``."""
+    params = _params([rule])
+    taken, bet = _evaluate(predictions, params, record=True)[1:]
+    return predictions.settle(np.where(taken[0], bet[0], 0.0), rule.payout_ratio, rule.settlement_condition)
+
+
+def sweep(
+    predictions: PredictionLog,
+    grid: Dict[str, Sequence[Any]],
+    base: Optional[DecisionRule] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate every combination of ``grid`` (DecisionRule field → values) on
+    top of ``base``. One row per combination: the varied fields, then
+    ``total_trades``, ``total_da``, ``total_pnl``, ``mdd`` and ``sharpe`` as in
+    ``calculate_backtest_stats``, and ``max_losing_streak`` (its
+    ``max_consecutive_losses``, renamed apart from the risk limit of that name).
+    """
+    base = base or DecisionRule()
+    unknown = set(grid) - {f.name for f in fields(DecisionRule)}
+    if unknown:
+        raise ValueError(f"Unknown DecisionRule fields in grid: {sorted(unknown)}")
+
+    names = list(grid)
+    combos = list(itertools.product(*(list(grid[name]) for name in names)))
+    rules = [replace(base, **dict(zip(names, values))) for values in combos]
+
+    # Rules without risk limits need no time-ordered pass
+    summary = pd.DataFrame(index=range(len(rules)))
+    for sequential in (False, True):
+        index = [i for i, rule in enumerate(rules) if rule.has_risk_limits == sequential]
+        if not index:
+            continue
+        stats = _evaluate(predictions, _params([rules[i] for i in index]))[0]
+        for key, values in stats.items():
+            summary.loc[index, key] = values
+
+    table = pd.DataFrame(combos, columns=names)
+    table = pd.concat([table, summary], axis=1)
+    table["total_trades"] = table["total_trades"].astype(int)
+    table["max_losing_streak"] = table["max_losing_streak"].astype(int)
+    return table
+
+
+def _params(rules: Sequence[DecisionRule]) -> Dict[str, np.ndarray]:
+    """Rule fields as (K,) arrays."""
+    params = {
+        name: np.array([getattr(rule, name) for rule in rules], dtype=float)
+        for name in (
+            "confidence_threshold", "payout_ratio", "market_price", "alpha_threshold",
+            "min_predicted_change", *RISK_LIMITS, "pause_minutes",
+        )
+    }
+    params["bet_min"] = np.array([rule.bet_range[0] for rule in rules], dtype=float)
+    params["bet_max"] = np.array([rule.bet_range[1] for rule in rules], dtype=float)
+    params["at_or_above"] = np.array([rule.settlement_condition == ">=" for rule in rules])
+    params["sequential"] = np.array([rule.has_risk_limits for rule in rules])
+    return params
+
+
+def _block(predictions: PredictionLog, p: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(candidate, bet, win, pnl) matrices, combos × predictions, before risk limits."""
+    conf = predictions.confidence[None, :]
+    threshold = p["confidence_threshold"][:, None]
+
+    candidate = conf >= threshold
+    market_price = p["market_price"][:, None]
+    candidate &= np.isnan(market_price) | (conf - market_price > p["alpha_threshold"][:, None])
+    min_change = p["min_predicted_change"][:, None]
+    candidate &= (min_change <= 0) | (np.abs(predictions.alpha)[None, :] >= min_change)
+
+    # Linear bet sizing (simulation.risk.calculate_bet)
+    bet_min, bet_max = p["bet_min"][:, None], p["bet_max"][:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bet = bet_min + (bet_max - bet_min) * (conf - threshold) / (1.0 - threshold)
+    bet = np.where(conf >= 1.0, bet_max, np.round(np.clip(bet, bet_min, bet_max), 2))
+    candidate &= bet > 0
+
+    open_price, close_price = predictions.open_price, predictions.close_price
+    up_wins = np.where(p["at_or_above"][:, None], close_price >= open_price, close_price > open_price)
+    win = np.where(predictions.higher, up_wins, close_price < open_price)
+    pnl = np.where(candidate, np.where(win, bet * (p["payout_ratio"][:, None] - 1), -bet), 0.0)
+    return candidate, bet, win, pnl
+
+
+def _gate(predictions: PredictionLog, p: Dict[str, np.ndarray], candidate: np.ndarray, pnl: np.ndarray) -> np.ndarray:
+    """Apply the risk limits in time order; returns the taken mask."""
+    k = candidate.shape[0]
+    taken = np.zeros_like(candidate)
+    daily_loss, daily_trades, streak = np.zeros(k), np.zeros(k), np.zeros(k)
+    paused_until = np.full(k, np.iinfo(np.int64).min)
+    expiry = predictions.open_time + int(predictions.timeframe_minutes * MINUTE_NS)
+    pause_ns = (p["pause_minutes"] * MINUTE_NS).astype(np.int64)
+    day = predictions.open_time // DAY_NS
+
+    current_day = None
+    for i in np.flatnonzero(candidate.any(axis=0)):
+        if day[i] != current_day:
+            current_day = day[i]
+            daily_loss[:] = 0.0
+            daily_trades[:] = 0
+        take = (
+            candidate[:, i]
+            & (daily_loss < p["daily_max_loss"])
+            & (daily_trades < p["max_daily_trades"])
+            & (predictions.open_time[i] >= paused_until)
+        )
+        if not take.any():
+            continue
+        taken[:, i] = take
+        loss = np.where(take, np.minimum(pnl[:, i], 0.0), 0.0)
+        daily_loss -= loss
+        daily_trades += take
+        streak = np.where(take, np.where(loss < 0, streak + 1, 0), streak)
+        hit = streak >= p["max_consecutive_losses"]
+        if hit.any():
+            paused_until = np.where(hit, expiry[i] + pause_ns, paused_until)
+            streak = np.where(hit, 0, streak)
+    return taken
+
+
+def _summarize(taken: np.ndarray, win: np.ndarray, pnl: np.ndarray) -> Dict[str, np.ndarray]:
+    """calculate_backtest_stats' headline numbers for each row of the taken mask."""
+    pnl = np.where(taken, pnl, 0.0)
+    n = taken.sum(axis=1)
+    wins = (taken & win).sum(axis=1)
+    total = pnl.sum(axis=1)
+
+    cumulative = np.cumsum(pnl, axis=1)
+    peak = np.maximum.accumulate(np.where(taken, cumulative, -np.inf), axis=1)
+    mdd = np.where(taken, peak - cumulative, 0.0).max(axis=1, initial=0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / n
+        deviation = np.where(taken, pnl - mean[:, None], 0.0)
+        std = np.sqrt((deviation ** 2).sum(axis=1) / (n - 1))
+        sharpe = np.where((n > 1) & (std > 0), mean / std, 0.0)
+        da = np.where(n > 0, wins / n, np.nan)
+
+    # Longest losing streak among taken trades (untaken predictions do not break it)
+    losses = np.cumsum(taken & ~win, axis=1)
+    at_last_win = np.maximum.accumulate(np.where(taken & win, losses, 0), axis=1)
+    max_streak = (losses - at_last_win).max(axis=1, initial=0)
+
+    return {
+        "total_trades": n,
+        "total_da": da,
+        "total_pnl": total,
+        "mdd": mdd,
+        "sharpe": sharpe,
+        "max_losing_streak": max_streak,
+    }
+
+
+def _evaluate(
+    predictions: PredictionLog, params: Dict[str, np.ndarray], record: bool = False
+) -> Tuple[Dict[str, np.ndarray], Optional[np.ndarray], Optional[np.ndarray]]:
+    """Stats per combo (and the taken mask / bets if ``record``), in blocks of combos."""
+    k, n = len(params["confidence_threshold"]), len(predictions)
+    step = max(1, BLOCK_CELLS // max(n, 1))
+    stats, taken_blocks, bet_blocks = [], [], []
+    for start in range(0, k, step):
+        p = {name: values[start:start + step] for name, values in params.items()}
+        candidate, bet, win, pnl = _block(predictions, p)
+        taken = _gate(predictions, p, candidate, pnl) if p["sequential"].any() else candidate
+        stats.append(_summarize(taken, win, pnl))
+        if record:
+            taken_blocks.append(taken)
+            bet_blocks.append(bet)
+    merged = {key: np.concatenate([s[key] for s in stats]) for key in stats[0]} if stats else {}
+    if not record:
+        return merged, None, None
+    return merged, np.concatenate(taken_blocks), np.concatenate(bet_blocks)
@@ -0,0 +1,84 @@
+"""
+btc_predictor/backtest/shared_frame.py
+--------------------------------------
+Share a (feature-augmented) OHLCV DataFrame with worker processes without
+pickling it per task.
+
+職責:
+- 將數值欄位寫成 memory-mapped ``.npy`` (column-major float64) 與 index 檔
+- Worker 以 ``SharedFrameHandle`` 開啟，零拷貝重建唯讀 DataFrame (每個 process 快取一份)
+
+Non-numeric columns (e.g. ``symbol`` / ``interval`` from ``DataStore.get_ohlcv``)
+are not shared; strategies only consume the numeric OHLCV / feature columns.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """Picklable reference to a DataFrame written by :func:`share_frame`."""
+    values_path: str            # (n_columns, n_rows) float64
+    index_path: str             # int64 DatetimeIndex values (UTC epoch)
+    index_unit: str             # e.g. "ms"
+    index_tz: Optional[str]
+    index_name: Optional[str]
+    columns: Tuple[str, ...]
+    dtypes: Tuple[str, ...]     # original dtype per column (restored for non-float columns)
+
+
+def share_frame(df: pd.DataFrame, directory: Path) -> SharedFrameHandle:
+    """Write the numeric columns and DatetimeIndex of ``df`` under ``directory``."""
+    directory = Path(directory)
+    numeric = df.select_dtypes(include=["number", "bool"])
+    columns = tuple(numeric.columns)
+
+    values_path = directory / "values.npy"
+    values = np.lib.format.open_memmap(values_path, mode="w+", dtype=np.float64, shape=(len(columns), len(df)))
+    for i, col in enumerate(columns):
+        values[i] = numeric[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    values.flush()
+    del values
+
+    index_path = directory / "index.npy"
+    np.save(index_path, df.index.asi8)
+
+    return SharedFrameHandle(
+        values_path=str(values_path),
+        index_path=str(index_path),
+        index_unit=df.index.unit,
+        index_tz=None if df.index.tz is None else str(df.index.tz),
+        index_name=df.index.name,
+        columns=columns,
+        dtypes=tuple(str(numeric[col].dtype) for col in columns),
+    )
+
+
+# Frames opened in this process, keyed by handle (a worker serves one backtest at a time)
+_OPEN_FRAMES: Dict[SharedFrameHandle, pd.DataFrame] = {}
+
+
+def open_shared_frame(handle: SharedFrameHandle) -> pd.DataFrame:
+    """DataFrame view of a shared frame (float columns are read-only, zero-copy)."""
+    frame = _OPEN_FRAMES.get(handle)
+    if frame is not None:
+        return frame
+
+    values = np.load(handle.values_path, mmap_mode="r")
+    index = pd.DatetimeIndex(np.load(handle.index_path).view(f"datetime64[{handle.index_unit}]"), name=handle.index_name)
+    if handle.index_tz is not None:
+        index = index.tz_localize("UTC").tz_convert(handle.index_tz)
+    frame = pd.DataFrame(values.T, index=index, columns=list(handle.columns), copy=False)
+    restore = {col: dtype for col, dtype in zip(handle.columns, handle.dtypes) if dtype != "float64"}
+    if restore:
+        frame = frame.astype(restore)
+
+    _OPEN_FRAMES.clear()
+    _OPEN_FRAMES[handle] = frame
+    return frame
@@ -1,21 +1,28 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Union
 from scipy.stats import spearmanr
+from btc_predictor.backtest.trade_log import TradeLog
 from btc_predictor.models import SimulatedTrade
 
-def calculate_backtest_stats(trades: List[SimulatedTrade], test_days: int = 7) -> Dict[str, Any]:
+Trades = Union[TradeLog, List[SimulatedTrade], List[dict]]
+
+def _trade_frame(trades: Trades) -> pd.DataFrame:
+    """One row per trade: straight from the columns of a TradeLog, else from objects / dicts."""
+    if isinstance(trades, TradeLog):
+        return trades.to_frame()
+    if isinstance(trades[0], dict):
+        return pd.DataFrame(trades)
+    return pd.DataFrame([vars(t) for t in trades])
+
+def calculate_backtest_stats(trades: Trades, test_days: int = 7) -> Dict[str, Any]:
     """
-    Calculate various statistics from a list of simulated trades.
+    Calculate various statistics from a trade log or a list of simulated trades.
     """
-    if not trades:
+    if not len(trades):
         return {}
         
-    # Handle both SimulatedTrade objects and dicts
-    if isinstance(trades[0], dict):
-        df = pd.DataFrame(trades)
-    else:
-        df = pd.DataFrame([vars(t) for t in trades])
+    df = _trade_frame(trades)
     # Ensure open_time is datetime
     if not pd.api.types.is_datetime64_any_dtype(df['open_time']):
         df['open_time'] = pd.to_datetime(df['open_time'])
@@ -76,13 +83,23 @@ def calculate_backtest_stats(trades: List[SimulatedTrade], test_days: int = 7) -
         "cumulative_pnl": cumulative_pnl.tolist()
     }
 
-def compute_regression_stats(trades: List[SimulatedTrade], predictions: List[Tuple[float, float]] = None) -> Dict[str, Any]:
+def compute_regression_stats(trades: Trades, predictions: List[Tuple[float, float]] = None) -> Dict[str, Any]:
     """
     Compute regression specific stats if predicted_change_pct and actual_change_pct exist.
     """
-    if not trades:
+    if not len(trades):
         return {}
 
+    if isinstance(trades, TradeLog) and predictions is None:
+        # Columnar: trades with a predicted change carry their own pair
+        has_pred = ~np.isnan(trades.alpha)
+        return _regression_stats(pd.DataFrame({
+            "predicted": trades.alpha[has_pred],
+            "actual": trades.actual_change_pct[has_pred],
+            "is_win": trades.win[has_pred],
+            "pnl": trades.pnl[has_pred],
+        }))
+
     # Extract pred/actual pairs
     if predictions is None:
         predictions = []
@@ -98,7 +115,7 @@ def compute_regression_stats(trades: List[SimulatedTrade], predictions: List[Tup
     df_pred = pd.DataFrame(predictions, columns=["predicted", "actual"])
     # Some trades might not have pnl/direction directly in predictions list
     # So we'll join it with trades info
-    df_trades = pd.DataFrame([t if isinstance(t, dict) else vars(t) for t in trades])
+    df_trades = _trade_frame(trades)
     if 'predicted_change_pct' in df_pred.columns:
         pass # Not applicable, we just built it
     
@@ -122,6 +139,10 @@ def compute_regression_stats(trades: List[SimulatedTrade], predictions: List[Tup
                 })
         df_pred = pd.DataFrame(pred_extract)
 
+    return _regression_stats(df_pred)
+
+def _regression_stats(df_pred: pd.DataFrame) -> Dict[str, Any]:
+    """Regression stats from predicted / actual / is_win / pnl columns."""
     if df_pred.empty:
         return {}
 
@@ -0,0 +1,340 @@
+"""
+btc_predictor/backtest/trade_log.py
+-----------------------------------
+TradeLog: columnar (struct-of-arrays) trade log produced by the backtest engine.
+
+職責:
+- 以 NumPy 欄位保存一次回測的所有交易 (時間、方向、信心、價格、PnL、alpha)
+- 供 stats / merge / report 直接取用 (``to_frame``)，不必逐筆建立 dataclass
+- Arrow IPC (zstd) 存讀 (``save`` / ``load``)，取代以 JSON 傾印每筆交易
+- PredictionLog: 每個測試時點的原始模型輸出 (供 ``replay`` 重新評估決策規則)
+
+A log holds one strategy at one timeframe, so those are scalars. Times are
+int64 epoch nanoseconds (``tz`` restores timezone-aware timestamps);
+``expiry_time`` is ``open_time + timeframe_minutes``. ``alpha`` is the
+strategy's predicted change (%) or NaN when the strategy does not emit one.
+
+``SimulatedTrade`` objects are only built on demand: indexing or iterating a
+log yields them one at a time, so code written against ``List[SimulatedTrade]``
+keeps working::
+
+    log = run_backtest(strategy, ohlcv, timeframe_minutes=60)
+    stats = calculate_backtest_stats(log)      # columnar, no dataclasses
+    log.save("reports/trades.arrow")
+    first = log[0]                              # SimulatedTrade
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from btc_predictor.models import SimulatedTrade
+
+# Column dtypes, in file order
+TRADE_COLUMNS = {
+    "open_time": np.int64, "higher": bool, "confidence": float, "bet_amount": float,
+    "open_price": float, "close_price": float, "pnl": float, "win": bool, "alpha": float,
+}
+PREDICTION_COLUMNS = {
+    "open_time": np.int64, "higher": bool, "confidence": float, "alpha": float,
+    "open_price": float, "close_price": float,
+}
+
+
+class _ColumnarLog:
+    """Shared plumbing of the columnar logs: one strategy / timeframe, ``COLUMNS`` arrays, Arrow IPC."""
+
+    COLUMNS: dict = {}
+
+    strategy_name: str
+    timeframe_minutes: int
+    open_time: np.ndarray
+    tz: Optional[str]
+
+    @classmethod
+    def empty(cls, strategy_name: str, timeframe_minutes: int, tz: Optional[str] = None):
+        columns = {c: np.empty(0, dtype=dtype) for c, dtype in cls.COLUMNS.items()}
+        return cls(strategy_name, timeframe_minutes, **columns, tz=tz)
+
+    @classmethod
+    def concat(cls, logs: Sequence, strategy_name: str, timeframe_minutes: int):
+        """Concatenate fold logs (in order) of one strategy / timeframe."""
+        logs = [log for log in logs if len(log)]
+        if not logs:
+            return cls.empty(strategy_name, timeframe_minutes)
+        for log in logs:
+            if (log.strategy_name, log.timeframe_minutes) != (strategy_name, timeframe_minutes):
+                raise ValueError(
+                    f"Cannot concat {log.strategy_name} {log.timeframe_minutes}m into "
+                    f"{strategy_name} {timeframe_minutes}m"
+                )
+        columns = {c: np.concatenate([getattr(log, c) for log in logs]) for c in cls.COLUMNS}
+        return cls(strategy_name, timeframe_minutes, **columns, tz=logs[0].tz)
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def take(self, indexer: Union[slice, np.ndarray]):
+        """Rows selected by a slice, boolean mask or integer positions."""
+        columns = {c: getattr(self, c)[indexer] for c in self.COLUMNS}
+        return type(self)(self.strategy_name, self.timeframe_minutes, **columns, tz=self.tz)
+
+    def sorted_unique(self):
+        """Rows sorted by open time, keeping the first row of each duplicated open time."""
+        order = np.argsort(self.open_time, kind="stable")
+        _, first = np.unique(self.open_time[order], return_index=True)
+        return self.take(order[first])
+
+    @property
+    def open_times(self) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self.open_time.astype("datetime64[ns]"))
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz else index
+
+    @property
+    def direction(self) -> np.ndarray:
+        return np.where(self.higher, "higher", "lower")
+
+    @property
+    def actual_change_pct(self) -> np.ndarray:
+        return (self.close_price - self.open_price) / self.open_price * 100
+
+    # --- Arrow IPC --------------------------------------------------------------------
+
+    def to_arrow(self) -> pa.Table:
+        metadata = {
+            "strategy_name": self.strategy_name,
+            "timeframe_minutes": str(self.timeframe_minutes),
+            "tz": self.tz or "",
+        }
+        return pa.table({c: getattr(self, c) for c in self.COLUMNS}).replace_schema_metadata(metadata)
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table):
+        metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+        columns = {c: table.column(c).to_numpy() for c in cls.COLUMNS}
+        return cls(
+            metadata["strategy_name"], int(metadata["timeframe_minutes"]), **columns, tz=metadata.get("tz") or None
+        )
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = self.to_arrow()
+        with pa.OSFile(str(path), "wb") as sink:
+            # zstd: logs are read whole (unlike the mmap'd OHLCV archive) and times / flags compress well
+            options = pa.ipc.IpcWriteOptions(compression="zstd")
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]):
+        with pa.memory_map(str(path), "r") as source:
+            return cls.from_arrow(pa.ipc.open_file(source).read_all())
+
+
+@dataclass(frozen=True)
+class TradeLog(_ColumnarLog):
+    strategy_name: str
+    timeframe_minutes: int
+    open_time: np.ndarray      # int64 epoch ns
+    higher: np.ndarray         # bool: direction == "higher"
+    confidence: np.ndarray     # float64
+    bet_amount: np.ndarray     # float64
+    open_price: np.ndarray     # float64
+    close_price: np.ndarray    # float64
+    pnl: np.ndarray            # float64
+    win: np.ndarray            # bool
+    alpha: np.ndarray          # float64, NaN if absent
+    tz: Optional[str] = None
+
+    COLUMNS = TRADE_COLUMNS
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Union[SimulatedTrade, dict]]) -> "TradeLog":
+        """Build a log from ``SimulatedTrade`` objects or their dicts (e.g. legacy JSON reports)."""
+        records = [t if isinstance(t, dict) else vars(t) for t in trades]
+        if not records:
+            raise ValueError("from_trades needs at least one trade")
+        open_time = pd.DatetimeIndex(pd.to_datetime([r["open_time"] for r in records]))
+        alpha = [(r.get("features_used") or {}).get("predicted_change_pct") for r in records]
+        return cls(
+            strategy_name=records[0]["strategy_name"],
+            timeframe_minutes=int(records[0]["timeframe_minutes"]),
+            open_time=_epoch_ns(open_time),
+            higher=np.array([r["direction"] == "higher" for r in records]),
+            confidence=np.array([r["confidence"] for r in records], dtype=float),
+            bet_amount=np.array([r["bet_amount"] for r in records], dtype=float),
+            open_price=np.array([r["open_price"] for r in records], dtype=float),
+            close_price=np.array([np.nan if r["close_price"] is None else r["close_price"] for r in records], dtype=float),
+            pnl=np.array([np.nan if r["pnl"] is None else r["pnl"] for r in records], dtype=float),
+            win=np.array([r["result"] == "win" for r in records]),
+            alpha=np.array([np.nan if a is None else a for a in alpha], dtype=float),
+            tz=None if open_time.tz is None else str(open_time.tz),
+        )
+
+    # --- sequence of SimulatedTrade -------------------------------------------------
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray]) -> Union[SimulatedTrade, "TradeLog"]:
+        if isinstance(key, (int, np.integer)):
+            return self._trade(int(key) % len(self) if key < 0 else int(key))
+        return self.take(key)
+
+    def __iter__(self) -> Iterator[SimulatedTrade]:
+        for i in range(len(self)):
+            yield self._trade(i)
+
+    def to_trades(self) -> List[SimulatedTrade]:
+        return list(self)
+
+    def _trade(self, i: int) -> SimulatedTrade:
+        open_time = pd.Timestamp(int(self.open_time[i]))
+        if self.tz:
+            open_time = open_time.tz_localize("UTC").tz_convert(self.tz)
+        open_price, close_price = float(self.open_price[i]), float(self.close_price[i])
+        features_used = {}
+        if not np.isnan(self.alpha[i]):
+            features_used["predicted_change_pct"] = float(self.alpha[i])
+            features_used["actual_change_pct"] = (close_price - open_price) / open_price * 100
+        return SimulatedTrade(
+            id=str(uuid.uuid5(uuid.NAMESPACE_OID, f"{self.strategy_name}:{self.timeframe_minutes}:{self.open_time[i]}")),
+            strategy_name=self.strategy_name,
+            direction="higher" if self.higher[i] else "lower",
+            confidence=float(self.confidence[i]),
+            timeframe_minutes=self.timeframe_minutes,  # type: ignore
+            bet_amount=float(self.bet_amount[i]),
+            open_time=open_time,
+            open_price=open_price,
+            expiry_time=open_time + pd.Timedelta(minutes=self.timeframe_minutes),
+            close_price=close_price,
+            result="win" if self.win[i] else "lose",
+            pnl=float(self.pnl[i]),
+            features_used=features_used,
+        )
+
+    # --- columnar views -------------------------------------------------------------
+
+    @property
+    def result(self) -> np.ndarray:
+        return np.where(self.win, "win", "lose")
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per trade, with the ``SimulatedTrade`` field names stats code expects."""
+        open_time = self.open_times
+        predicted = self.alpha
+        return pd.DataFrame({
+            "strategy_name": self.strategy_name,
+            "direction": self.direction,
+            "confidence": self.confidence,
+            "timeframe_minutes": self.timeframe_minutes,
+            "bet_amount": self.bet_amount,
+            "open_time": open_time,
+            "open_price": self.open_price,
+            "expiry_time": open_time + pd.Timedelta(minutes=self.timeframe_minutes),
+            "close_price": self.close_price,
+            "result": self.result,
+            "pnl": self.pnl,
+            "predicted_change_pct": predicted,
+            "actual_change_pct": np.where(np.isnan(predicted), np.nan, self.actual_change_pct),
+        })
+
+
+@dataclass(frozen=True)
+class PredictionLog(_ColumnarLog):
+    """
+    Raw model output at every settled test timestamp of a backtest, before
+    any decision rule: direction, confidence, predicted change (``alpha``) and
+    the prices at open and expiry. ``settle`` applies the engine's rule;
+    ``btc_predictor.backtest.replay`` sweeps others without re-running models.
+    """
+    strategy_name: str
+    timeframe_minutes: int
+    open_time: np.ndarray      # int64 epoch ns
+    higher: np.ndarray         # bool: direction == "higher"
+    confidence: np.ndarray     # float64
+    alpha: np.ndarray          # float64, NaN if absent
+    open_price: np.ndarray     # float64
+    close_price: np.ndarray    # float64 (price at expiry)
+    tz: Optional[str] = None
+
+    COLUMNS = PREDICTION_COLUMNS
+
+    @classmethod
+    def build(
+        cls,
+        strategy_name: str,
+        timeframe_minutes: int,
+        open_times: pd.DatetimeIndex,
+        higher: np.ndarray,
+        confidence: np.ndarray,
+        alpha: np.ndarray,
+        open_price: np.ndarray,
+        close_price: np.ndarray,
+    ) -> "PredictionLog":
+        return cls(
+            strategy_name, timeframe_minutes, _epoch_ns(open_times), higher, confidence, alpha,
+            open_price, close_price, tz=None if open_times.tz is None else str(open_times.tz),
+        )
+
+    def __getitem__(self, key: Union[slice, np.ndarray]) -> "PredictionLog":
+        return self.take(key)
+
+    def settle(self, bet_amount: np.ndarray, payout_ratio: float, settlement_condition: str) -> TradeLog:
+        """Trades for the rows with a positive bet (``bet_amount`` aligned with the rows)."""
+        bet_amount = np.asarray(bet_amount, dtype=float)
+        keep = bet_amount > 0
+        rows = self.take(keep)
+        return build_trade_log(
+            self.strategy_name, self.timeframe_minutes, rows.open_times,
+            higher=rows.higher, confidence=rows.confidence, bet_amount=bet_amount[keep],
+            open_price=rows.open_price, close_price=rows.close_price, alpha=rows.alpha,
+            payout_ratio=payout_ratio, settlement_condition=settlement_condition,
+        )
+
+
+def _epoch_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """int64 epoch ns of a DatetimeIndex (UTC instants when tz-aware, wall time otherwise)."""
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8.copy()
+
+
+def build_trade_log(
+    strategy_name: str,
+    timeframe_minutes: int,
+    open_times: pd.DatetimeIndex,
+    higher: np.ndarray,
+    confidence: np.ndarray,
+    bet_amount: np.ndarray,
+    open_price: np.ndarray,
+    close_price: np.ndarray,
+    alpha: np.ndarray,
+    payout_ratio: float,
+    settlement_condition: str,
+) -> TradeLog:
+    """Settle aligned prediction arrays into a trade log (win / pnl under the platform rules)."""
+    if settlement_condition == ">=":
+        up_wins = close_price >= open_price
+    else:
+        up_wins = close_price > open_price
+    win = np.where(higher, up_wins, close_price < open_price)
+    return TradeLog(
+        strategy_name=strategy_name,
+        timeframe_minutes=timeframe_minutes,
+        open_time=_epoch_ns(open_times),
+        higher=higher,
+        confidence=confidence,
+        bet_amount=bet_amount,
+        open_price=open_price,
+        close_price=close_price,
+        pnl=np.where(win, bet_amount * (payout_ratio - 1), -bet_amount),
+        win=win,
+        alpha=alpha,
+        tz=None if open_times.tz is None else str(open_times.tz),
+    )
@@ -7,6 +7,7 @@ BinanceFeed: Pure data source (DataPipeline の WebSocket 部分を抽出).
 - Binance WebSocket 接続と指数退避再接続
 - 起動時の REST API 歴史データ補填
 - 1m K 線確定時にすべての登録済み callback に pd.DataFrame を配信
+  (メモリ上の OHLCVRingBuffer の view。SQLite への書き込みは write-behind)
 - 複数の subscriber をサポート (callback list)。Polymarket 系が将来 subscribe 可能。
 
 **不可** 以下の操作:
@@ -20,13 +21,18 @@ import asyncio
 import logging
 import os
 from datetime import datetime, timezone, timedelta
-from typing import Awaitable, Callable, List
+from typing import Awaitable, Callable, List, Tuple
 
 import pandas as pd
 from binance import AsyncClient, BinanceSocketManager
 
+from btc_predictor.binance.ohlcv_buffer import OHLCVRingBuffer
+
 logger = logging.getLogger(__name__)
 
+# Number of 1m candles delivered to callbacks (and kept in memory)
+OHLCV_WINDOW = 500
+
 # Type alias for callback: receives a pd.DataFrame and returns an awaitable.
 DataCallback = Callable[[pd.DataFrame], Awaitable[None]]
 
@@ -55,6 +61,11 @@ class BinanceFeed:
         self.is_running: bool = False
         # interval -> last received datetime
         self._last_kline_time: dict[str, datetime] = {}
+        # Recent 1m candles served to callbacks without touching SQLite
+        self._buffer = OHLCVRingBuffer(OHLCV_WINDOW)
+        # (interval, row) pairs waiting to be persisted by _write_behind
+        self._write_queue: asyncio.Queue[Tuple[str, dict]] = asyncio.Queue()
+        self._writer_task: asyncio.Task | None = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -64,8 +75,10 @@ class BinanceFeed:
         """Register an async callback to be called on each confirmed K-line.
 
         The callback will receive the latest OHLCV DataFrame (up to 500
-        1-minute candles, ascending order).  Multiple callbacks are
-        supported; calling order is registration order.
+        1-minute candles, ascending order, columns open/high/low/close/volume).
+        It is a read-only view of the feed's in-memory buffer: copy it before
+        modifying. Multiple callbacks are supported; calling order is
+        registration order.
 
         Args:
             callback: ``async def func(ohlcv: pd.DataFrame) -> None``
@@ -77,14 +90,16 @@ class BinanceFeed:
         """Start the feed: backfill → health checker → WebSocket loop."""
         self.is_running = True
 
-        # 1. Backfill historical data
+        # 1. Backfill historical data, then seed the in-memory window from SQLite
         try:
             await self._backfill_historical_data()
         except Exception as e:
             logger.error(f"BinanceFeed startup backfill error: {e}", exc_info=True)
+        await self._seed_buffer()
 
-        # 2. Background health-check task
+        # 2. Background health-check and OHLCV write-behind tasks
         asyncio.create_task(self._health_check())
+        self._writer_task = asyncio.create_task(self._write_behind())
 
         # 3. WebSocket loop with exponential backoff reconnection
         reconnect_delay = 5
@@ -113,13 +128,28 @@ class BinanceFeed:
                         pass
 
     async def stop(self) -> None:
-        """Signal the feed to stop and close the WebSocket client."""
+        """Signal the feed to stop, close the WebSocket client and flush pending writes."""
         self.is_running = False
         if self._client:
             try:
                 await self._client.close_connection()
             except Exception:
                 pass
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Persist every candle still waiting in the write-behind queue."""
+        batch: List[Tuple[str, dict]] = []
+        while not self._write_queue.empty():
+            batch.append(self._write_queue.get_nowait())
+        await self._save_batch(batch)
 
     # ------------------------------------------------------------------
     # Private methods
@@ -181,6 +211,40 @@ class BinanceFeed:
         finally:
             await temp_client.close_connection()
 
+    async def _seed_buffer(self) -> None:
+        """Load the most recent candles from SQLite into the in-memory window."""
+        try:
+            df = await asyncio.to_thread(
+                self.store.get_latest_ohlcv, self.symbol, "1m", limit=OHLCV_WINDOW
+            )
+            self._buffer.extend(df)
+            logger.info(f"BinanceFeed: Seeded OHLCV buffer with {len(self._buffer)} candles.")
+        except Exception as e:
+            logger.error(f"BinanceFeed: Failed to seed OHLCV buffer: {e}", exc_info=True)
+
+    async def _write_behind(self) -> None:
+        """Persist queued candles off the hot path, batching whatever has accumulated."""
+        while True:
+            batch = [await self._write_queue.get()]
+            while not self._write_queue.empty():
+                batch.append(self._write_queue.get_nowait())
+            await self._save_batch(batch)
+
+    async def _save_batch(self, batch: List[Tuple[str, dict]]) -> None:
+        by_interval: dict[str, List[dict]] = {}
+        for interval, row in batch:
+            by_interval.setdefault(interval, []).append(row)
+        for interval, rows in by_interval.items():
+            try:
+                await asyncio.to_thread(
+                    self.store.save_ohlcv, pd.DataFrame(rows), self.symbol, interval
+                )
+            except Exception as e:
+                logger.error(
+                    f"BinanceFeed: Failed to persist {len(rows)} {interval} candles: {e}",
+                    exc_info=True,
+                )
+
     async def _health_check(self) -> None:
         """Heartbeat monitor: force reconnect if no data received for > 3 minutes."""
         while self.is_running:
@@ -219,29 +283,25 @@ class BinanceFeed:
                             f"BinanceFeed: [{interval}] Kline closed at {closed_at}"
                         )
 
-                        # Persist the new candle
-                        df_row = pd.DataFrame(
-                            [
-                                {
-                                    "open_time": kline["t"],
-                                    "open": float(kline["o"]),
-                                    "high": float(kline["h"]),
-                                    "low": float(kline["l"]),
-                                    "close": float(kline["c"]),
-                                    "volume": float(kline["v"]),
-                                    "close_time": kline["T"],
-                                }
-                            ]
-                        )
-                        await asyncio.to_thread(
-                            self.store.save_ohlcv, df_row, self.symbol, interval
-                        )
-
-                        # Fetch full OHLCV window and deliver to subscribers
-                        ohlcv_df = await asyncio.to_thread(
-                            self.store.get_latest_ohlcv, self.symbol, "1m", limit=500
-                        )
-                        await self._dispatch(ohlcv_df)
+                        row = {
+                            "open_time": kline["t"],
+                            "open": float(kline["o"]),
+                            "high": float(kline["h"]),
+                            "low": float(kline["l"]),
+                            "close": float(kline["c"]),
+                            "volume": float(kline["v"]),
+                            "close_time": kline["T"],
+                        }
+                        # Persist asynchronously (write-behind)
+                        self._write_queue.put_nowait((interval, row))
+
+                        # Deliver the in-memory 1m window to subscribers
+                        if interval == "1m":
+                            self._buffer.append(
+                                row["open_time"], row["open"], row["high"],
+                                row["low"], row["close"], row["volume"],
+                            )
+                        await self._dispatch(self._buffer.view())
 
                 except Exception as e:
                     if not self.is_running:
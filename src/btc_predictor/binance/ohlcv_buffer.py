@@ -0,0 +1,116 @@
+"""
+btc_predictor/binance/ohlcv_buffer.py
+-------------------------------------
+OHLCVRingBuffer: fixed-size in-memory window of the most recent 1m candles.
+
+職責:
+- 以 NumPy 陣列保存最近 ``capacity`` 根 K 線 (column-major, float64)
+- O(1) 追加新 K 線 (同一 open_time 覆寫、較舊的忽略)
+- 以零拷貝 DataFrame view 提供給 callback (index 為 UTC DatetimeIndex)
+
+Storage is a backing array with ``capacity`` rows of slack. Appends write
+past the current window, so views handed out earlier are never modified in
+place; when the slack is used up the window is copied into a fresh array
+(amortised O(1)) and old views keep referencing the previous array.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class OHLCVRingBuffer:
+    """Most recent ``capacity`` candles, newest last.
+
+    Args:
+        capacity: Window length delivered to consumers (e.g. 500).
+    """
+
+    def __init__(self, capacity: int = 500) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._alloc()
+        self._start = 0
+        self._end = 0
+
+    def _alloc(self) -> None:
+        size = 2 * self.capacity
+        self._values = np.empty((len(OHLCV_COLUMNS), size), dtype=np.float64)
+        self._times = np.empty(size, dtype=np.int64)  # open_time, Unix ms
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        """open_time (Unix ms) of the newest candle, or None when empty."""
+        return int(self._times[self._end - 1]) if len(self) else None
+
+    def append(self, open_time: int, open_: float, high: float, low: float, close: float, volume: float) -> bool:
+        """Add one confirmed candle.
+
+        A candle with the same ``open_time`` as the newest one replaces it;
+        older candles are ignored.
+
+        Returns:
+            True if the buffer changed.
+        """
+        open_time = int(open_time)
+        last = self.last_open_time
+        if last is not None and open_time < last:
+            return False
+
+        if last is not None and open_time == last:
+            # Copy-on-write so previously returned views stay unchanged
+            self._compact(keep=len(self))
+            pos = self._end - 1
+        else:
+            if self._end == self._times.shape[0]:
+                self._compact(keep=min(len(self), self.capacity - 1))
+            pos = self._end
+            self._end += 1
+
+        self._times[pos] = open_time
+        self._values[:, pos] = (open_, high, low, close, volume)
+        if len(self) > self.capacity:
+            self._start = self._end - self.capacity
+        return True
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """Append candles from a DataFrame with ``open_time`` (ms) and OHLCV columns."""
+        if df.empty:
+            return
+        times = df["open_time"].to_numpy(dtype=np.int64)
+        values = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        for i in order:
+            self.append(times[i], *values[i])
+
+    def _compact(self, keep: int) -> None:
+        """Move the newest ``keep`` rows to the start of a freshly allocated array."""
+        old_values, old_times = self._values, self._times
+        src = slice(self._end - keep, self._end)
+        self._alloc()
+        self._values[:, :keep] = old_values[:, src]
+        self._times[:keep] = old_times[src]
+        self._start, self._end = 0, keep
+
+    def view(self) -> pd.DataFrame:
+        """DataFrame of the current window (ascending, UTC ``datetime`` index).
+
+        The OHLCV columns are read-only, zero-copy views of the buffer (each
+        column contiguous); only the small index is materialised. Buffer rows
+        are never overwritten while referenced by a view.
+        """
+        window = slice(self._start, self._end)
+        values = self._values[:, window]
+        values.flags.writeable = False
+        index = pd.DatetimeIndex(
+            self._times[window].view("datetime64[ms]"), dtype="datetime64[ms, UTC]", name="datetime"
+        )
+        return pd.DataFrame(values.T, index=index, columns=OHLCV_COLUMNS, copy=False)
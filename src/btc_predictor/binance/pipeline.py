@@ -7,8 +7,9 @@ BinanceLivePipeline: Binance EC の実行・制御骨幹.
 - StrategyRegistry と DataStore を保持する
 - BinanceFeed から配信される pd.DataFrame を受け取る callback を実装する
   (`process_new_data`)
-- 各ストラテジーの predict → PredictionSignal 保存 → 風控チェック →
-  SimulatedTrade 保存を実行する
+- 各ストラテジーの predict を並行実行し (InferenceScheduler)、
+  風控チェック → SimulatedTrade 保存 → PredictionSignal 保存を実行する
+  (書き込みは WriteBehindQueue に溜め、tick ごとに 1 transaction で commit)
 - Signal Settler の定期バックグラウンドタスクを管理する
 
 **不可** 以下の操作:
@@ -19,13 +20,16 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, List
+from typing import Any, List, Optional, Tuple
 
 import pandas as pd
 
-from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.infrastructure.store import DataStore, WriteBehindQueue
 from btc_predictor.simulation.engine import process_signal
+from btc_predictor.simulation.risk import RiskState
 from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.feature_cache import FeatureCache
+from btc_predictor.strategies.scheduler import InferenceScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -65,11 +69,21 @@ class BinanceLivePipeline:
         strategies: List[BaseStrategy],
         store: DataStore,
         bot: Any = None,
+        scheduler: Optional[InferenceScheduler] = None,
     ) -> None:
         self.strategies = strategies
         self.store = store
+        # Signal / trade inserts of one tick, committed together
+        self.writer = WriteBehindQueue(store)
+        # Daily loss / trade count / loss streak per strategy, rebuilt from
+        # the DB on first use and kept current by trades and the settler
+        self.risk_state = RiskState(store)
         self.bot = bot
         self.trigger_count: int = 0
+        # Features shared by strategies with the same feature set on one candle
+        self.feature_cache = FeatureCache()
+        # Concurrent predict of all strategies triggered on one candle
+        self.scheduler = scheduler or InferenceScheduler()
         # Optional back-reference to the BinanceFeed for forwarding read-only
         # status attributes (is_running, last_kline_time) that the Discord bot's
         # /health command accesses on `bot.pipeline`.
@@ -143,7 +157,7 @@ class BinanceLivePipeline:
 
         while True:
             try:
-                await settle_pending_trades(self.store, client, bot=effective_bot)
+                await settle_pending_trades(self.store, client, bot=effective_bot, risk_state=self.risk_state)
                 await settle_pending_signals(self.store, client)
             except Exception as e:
                 logger.error(f"BinanceLivePipeline settler error: {e}", exc_info=True)
@@ -154,7 +168,10 @@ class BinanceLivePipeline:
     # ------------------------------------------------------------------
 
     async def _trigger_strategies(self, ohlcv: pd.DataFrame, timeframe: int) -> None:
-        """Run predict → signal → trade for every strategy that supports *timeframe*.
+        """Run predict → trade → signal for every strategy that supports *timeframe*.
+
+        Predictions run concurrently (see :class:`InferenceScheduler`); the
+        resulting signals are then persisted together in one transaction.
 
         Args:
             ohlcv:     Latest OHLCV DataFrame (already fetched by the feed).
@@ -163,45 +180,67 @@ class BinanceLivePipeline:
         self.trigger_count += 1
         logger.info(f"BinanceLivePipeline: Triggering strategies for {timeframe}m…")
 
-        for strategy in self.strategies:
-            if timeframe not in strategy.available_timeframes:
-                continue
+        strategies = [s for s in self.strategies if timeframe in s.available_timeframes]
+        if not strategies:
+            return
 
-            try:
-                # 1. Prediction (CPU-intensive — offloaded to thread)
-                signal = await asyncio.to_thread(strategy.predict, ohlcv, timeframe)
-
-                # 2. Signal Layer: persist ALL signals unconditionally
-                signal_id: str | None = None
-                try:
-                    signal_id = self.store.save_prediction_signal(signal)
-                except Exception as e:
-                    logger.error(
-                        f"BinanceLivePipeline: Signal Layer save error for "
-                        f"{strategy.name}: {e}",
-                        exc_info=True,
-                    )
-
-                # 3. Execution Layer: risk check + SimulatedTrade creation
-                trade = await asyncio.to_thread(process_signal, signal, self.store)
-
-                # 4. Link signal to trade when applicable
-                if signal_id and trade:
+        # 1. Prediction (CPU-intensive — fanned out to the inference pool)
+        results = await self.scheduler.run(strategies, ohlcv, timeframe, self.feature_cache)
+        if not results:
+            return
+
+        # 2-3. Execution + Signal Layer (off the event loop), one commit per tick
+        trades = await asyncio.to_thread(self._persist_signals, results, timeframe)
+        try:
+            await self.writer.aflush()
+        except Exception as e:
+            logger.error(f"BinanceLivePipeline: Signal Layer flush error: {e}", exc_info=True)
+            return
+
+        # 4. Discord notification (committed trades only)
+        if self.bot:
+            unsaved = self.writer.unsaved_trade_ids()
+            for trade in trades:
+                if trade and trade.id not in unsaved:
                     try:
-                        self.store.update_signal_traded(signal_id, trade.id)
+                        await self.bot.send_signal(trade)
                     except Exception as e:
-                        logger.error(
-                            f"BinanceLivePipeline: Signal Layer update_traded error: {e}",
-                            exc_info=True,
-                        )
+                        logger.error(f"BinanceLivePipeline: Discord notification error: {e}", exc_info=True)
 
-                # 5. Discord notification
-                if trade and self.bot:
-                    await self.bot.send_signal(trade)
+    def _persist_signals(self, results: List[Tuple[BaseStrategy, Any]], timeframe: int) -> List[Any]:
+        """Risk check + SimulatedTrade per signal, then queue ALL signals.
 
+        Writes go to :attr:`writer`; risk checks read :attr:`risk_state`, and
+        the duplicate check sees the committed state, which is enough since a
+        strategy fires at most once per timeframe and tick. Returns the SimulatedTrade (or None) of
+        each result.
+        """
+        trades: List[Any] = []
+        for strategy, signal in results:
+            trade = None
+            try:
+                # Execution Layer: risk check + SimulatedTrade creation
+                trade = process_signal(signal, self.writer, self.risk_state)
             except Exception as e:
                 logger.error(
                     f"BinanceLivePipeline: Error triggering {strategy.name} for "
                     f"{timeframe}m: {e}",
                     exc_info=True,
                 )
+            trades.append(trade)
+
+        # Signal Layer: persist ALL signals unconditionally, linked to their trades
+        try:
+            self.writer.save_prediction_signals(
+                [signal for _, signal in results],
+                [trade.id if trade else None for trade in trades],
+            )
+        except Exception as e:
+            logger.error(f"BinanceLivePipeline: Signal Layer save error: {e}", exc_info=True)
+        return trades
+
+    async def aclose(self) -> None:
+        """Commit queued writes and stop the inference workers (call on shutdown)."""
+        await self.writer.aflush()
+        self.writer.close()
+        self.scheduler.close()
@@ -1,175 +1,214 @@
 import pandas as pd
+import numpy as np
 import asyncio
 import logging
 import json
 from datetime import datetime, timezone, timedelta
 from btc_predictor.infrastructure.store import DataStore
-from btc_predictor.utils.config import load_constants
+from btc_predictor.utils.config import ProjectConfig, load_constants
 from btc_predictor.models import SimulatedTrade
-from typing import Any
+from typing import Any, Dict, List, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
-async def _get_close_price(store: DataStore, expiry_ms: int, client=None) -> Any:
-    """Helper to fetch 1m close price from SQLite or Binance API."""
-    # 1. Try SQLite first
-    df_price = await asyncio.to_thread(
-        store.get_ohlcv, "BTCUSDT", "1m", start_time=expiry_ms, end_time=expiry_ms
+MINUTE_MS = 60_000
+# Binance returns at most 1000 candles per get_klines call
+KLINES_LIMIT = 1000
+
+
+def _parse_expiry(expiry_str: str) -> datetime:
+    expiry_dt = datetime.fromisoformat(expiry_str)
+    if expiry_dt.tzinfo is None:
+        expiry_dt = expiry_dt.replace(tzinfo=timezone.utc)
+    return expiry_dt
+
+
+def _due_rows(pending: pd.DataFrame, now: datetime, oldest: Optional[datetime] = None) -> pd.DataFrame:
+    """Rows of *pending* whose expiry has passed (and is not older than *oldest*).
+
+    Adds ``expiry_dt`` / ``expiry_ms`` columns. Rows with an unparsable
+    expiry are logged and left out.
+    """
+    expiries: List[Optional[datetime]] = []
+    for row_id, expiry_str in zip(pending['id'], pending['expiry_time']):
+        try:
+            expiries.append(_parse_expiry(expiry_str))
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid expiry_time for {row_id}: {expiry_str!r} ({e})")
+            expiries.append(None)
+
+    due = np.array([
+        e is not None and now >= e and (oldest is None or e >= oldest) for e in expiries
+    ], dtype=bool)
+    kept = [e for e, keep in zip(expiries, due) if keep]
+    rows = pending[due].copy()
+    rows['expiry_dt'] = pd.Series(kept, index=rows.index, dtype=object)
+    rows['expiry_ms'] = pd.Series([int(e.timestamp() * 1000) for e in kept], index=rows.index, dtype="int64")
+    return rows
+
+
+def _missing_runs(expiry_ms: Sequence[int]) -> List[List[int]]:
+    """Group sorted expiries into runs that one get_klines call can cover."""
+    runs: List[List[int]] = []
+    for ms in expiry_ms:
+        # +2: the candle at / after the last expiry must be inside the window
+        if runs and (ms - runs[-1][0]) // MINUTE_MS + 2 <= KLINES_LIMIT:
+            runs[-1].append(ms)
+        else:
+            runs.append([ms])
+    return runs
+
+
+async def _get_klines(client: Any, start_ms: int, limit: int) -> list:
+    if hasattr(client, 'get_klines') and asyncio.iscoroutinefunction(client.get_klines):
+        return await client.get_klines(
+            symbol="BTCUSDT", interval="1m", startTime=start_ms, limit=limit
+        )
+    return await asyncio.to_thread(
+        client.get_klines, symbol="BTCUSDT", interval="1m", startTime=start_ms, limit=limit
     )
-    
-    if not df_price.empty:
-        return float(df_price['close'].iloc[0])
-        
-    # 2. Try Binance REST API if not in SQLite
-    if client:
+
+
+async def _get_close_prices(store: DataStore, expiry_ms: Sequence[int], client=None) -> Dict[int, float]:
+    """1m close price at each expiry (epoch ms).
+
+    One SQLite range query for all expiries; expiries missing locally are
+    fetched from the Binance REST API with one ``get_klines`` call per run of
+    nearby minutes. Expiries without a price are absent from the result.
+    """
+    prices = await asyncio.to_thread(store.get_ohlcv_closes, "BTCUSDT", "1m", list(expiry_ms))
+    missing = sorted(set(expiry_ms) - prices.keys())
+    if not missing or not client:
+        return prices
+
+    for run in _missing_runs(missing):
+        limit = (run[-1] - run[0]) // MINUTE_MS + 2
         try:
-            if hasattr(client, 'get_klines') and asyncio.iscoroutinefunction(client.get_klines):
-                klines = await client.get_klines(
-                    symbol="BTCUSDT", interval="1m", startTime=expiry_ms, limit=1
-                )
-            else:
-                klines = await asyncio.to_thread(
-                    client.get_klines, symbol="BTCUSDT", interval="1m", startTime=expiry_ms, limit=1
-                )
-            
-            if klines:
-                return float(klines[0][4])
+            klines = await _get_klines(client, run[0], limit)
         except Exception as e:
-            logger.error(f"Error fetching price from Binance for {expiry_ms}: {e}")
-            
-    return None
+            logger.error(f"Error fetching prices from Binance for {run[0]}..{run[-1]}: {e}")
+            continue
+        if not klines:
+            continue
+
+        open_times = np.array([int(k[0]) for k in klines], dtype=np.int64)
+        closes = np.array([float(k[4]) for k in klines])
+        # First candle opening at or after the expiry (startTime=expiry semantics)
+        idx = np.searchsorted(open_times, run)
+        for ms, i in zip(run, idx):
+            if i < len(open_times):
+                prices[ms] = float(closes[i])
+    return prices
+
 
-async def settle_pending_trades(store: DataStore, client=None, bot: Any = None):
+async def settle_pending_trades(store: DataStore, client=None, bot: Any = None, risk_state: Any = None):
     """
     Check for pending trades and settle them if expiry time has passed.
+
+    All due trades are priced together and written in a single transaction.
+    Settled results are also applied to *risk_state* (``RiskState``) if given.
     """
     pending = await asyncio.to_thread(store.get_pending_trades)
     if pending.empty:
         return
-        
-    constants = await asyncio.to_thread(load_constants)
-    payout_ratios = constants.get("event_contract", {}).get("payout_ratio", {})
-    
+
+    config = ProjectConfig.of(await asyncio.to_thread(load_constants))
+
     now = datetime.now(timezone.utc)
-    
-    for _, row in pending.iterrows():
-        try:
-            expiry_str = row['expiry_time']
-            expiry_dt = datetime.fromisoformat(expiry_str)
-            if expiry_dt.tzinfo is None:
-                expiry_dt = expiry_dt.replace(tzinfo=timezone.utc)
-                
-            if now < expiry_dt:
-                continue
-                
-            logger.info(f"Settling trade {row['id']} (expiry: {expiry_str})...")
-            
-            expiry_ms = int(expiry_dt.timestamp() * 1000)
-            close_price = await _get_close_price(store, expiry_ms, client)
-                    
-            if close_price is not None:
-                open_price = float(row['open_price'])
-                direction = row['direction']
-                
-                if direction == "higher":
-                    is_win = close_price > open_price
-                else:
-                    is_win = close_price < open_price
-                    
-                result = "win" if is_win else "lose"
-                
-                timeframe_minutes = int(row['timeframe_minutes'])
-                payout_ratio = payout_ratios.get(timeframe_minutes, 1.85)
-                bet = float(row['bet_amount'])
-                pnl = bet * (payout_ratio - 1) if is_win else -bet
-                
-                updated = await asyncio.to_thread(
-                    store.update_simulated_trade, row['id'], close_price, result, float(pnl)
+    due = _due_rows(pending, now)
+    if due.empty:
+        return
+
+    logger.info(f"Settling {len(due)} trade(s) (expiry: {due['expiry_time'].iloc[0]} .. {due['expiry_time'].iloc[-1]})...")
+    prices = await _get_close_prices(store, due['expiry_ms'].tolist(), client)
+
+    close = due['expiry_ms'].map(prices)
+    for row_id, expiry_str in zip(due.loc[close.isna(), 'id'], due.loc[close.isna(), 'expiry_time']):
+        logger.warning(f"Could not find price for {row_id} at {expiry_str}. Will retry.")
+    priced = due[close.notna()]
+    if priced.empty:
+        return
+
+    close_price = close[close.notna()].to_numpy(dtype=float)
+    open_price = priced['open_price'].to_numpy(dtype=float)
+    timeframe = priced['timeframe_minutes'].to_numpy(dtype=int)
+    bet = priced['bet_amount'].to_numpy(dtype=float)
+    payout_ratio = np.array([config.payout_ratio(tf) for tf in timeframe], dtype=float)
+
+    is_win = np.where(priced['direction'].to_numpy() == "higher", close_price > open_price, close_price < open_price)
+    result = np.where(is_win, "win", "lose")
+    pnl = np.where(is_win, bet * (payout_ratio - 1), -bet)
+
+    updated = set(await asyncio.to_thread(
+        store.update_simulated_trades,
+        list(zip(priced['id'], close_price.tolist(), result.tolist(), pnl.tolist())),
+    ))
+
+    for i, row in enumerate(priced.to_dict("records")):
+        if row['id'] not in updated:
+            logger.warning(f"Trade {row['id']} already settled by another process. Skipping.")
+            continue
+        logger.info(f"Trade {row['id']} settled: {result[i]} | PnL: {pnl[i]:.4f}")
+        if risk_state is not None:
+            risk_state.record_settlement(row['strategy_name'], row['id'], row['open_time'], str(result[i]), float(pnl[i]))
+
+        # Discord Notification
+        if bot:
+            try:
+                trade_obj = SimulatedTrade(
+                    id=row['id'],
+                    strategy_name=row['strategy_name'],
+                    direction=row['direction'],
+                    confidence=row['confidence'],
+                    timeframe_minutes=int(timeframe[i]),
+                    bet_amount=float(bet[i]),
+                    open_time=datetime.fromisoformat(row['open_time']),
+                    open_price=float(open_price[i]),
+                    expiry_time=row['expiry_dt'],
+                    close_price=float(close_price[i]),
+                    result=str(result[i]),
+                    pnl=float(pnl[i]),
+                    features_used=json.loads(row['features_used']) if row['features_used'] else {}
                 )
-                
-                if updated:
-                    logger.info(f"Trade {row['id']} settled: {result} | PnL: {pnl:.4f}")
-                    
-                    # Discord Notification
-                    if bot:
-                        trade_obj = SimulatedTrade(
-                            id=row['id'],
-                            strategy_name=row['strategy_name'],
-                            direction=row['direction'],
-                            confidence=row['confidence'],
-                            timeframe_minutes=timeframe_minutes,
-                            bet_amount=bet,
-                            open_time=datetime.fromisoformat(row['open_time']),
-                            open_price=open_price,
-                            expiry_time=expiry_dt,
-                            close_price=close_price,
-                            result=result,
-                            pnl=float(pnl),
-                            features_used=json.loads(row['features_used']) if row['features_used'] else {}
-                        )
-                        try:
-                            await bot.send_settlement(trade_obj)
-                        except Exception as e:
-                            logger.error(f"Error sending Discord notification for {row['id']}: {e}")
-                else:
-                    logger.warning(f"Trade {row['id']} already settled by another process. Skipping.")
-            else:
-                logger.warning(f"Could not find price for {row['id']} at {expiry_str}. Will retry.")
-        except Exception as e:
-            logger.error(f"Unexpected error settling trade {row['id']}: {e}", exc_info=True)
+                await bot.send_settlement(trade_obj)
+            except Exception as e:
+                logger.error(f"Error sending Discord notification for {row['id']}: {e}")
 
 async def settle_pending_signals(store: DataStore, client=None, max_age_hours: int = 24) -> int:
     """
     結算所有已到期但未結算的 prediction signals。
+
+    所有到期 signals 一次取價、向量化判定，並於單一 transaction 寫回。
     """
     pending = await asyncio.to_thread(store.get_unsettled_signals)
     if pending.empty:
         return 0
-        
+
     now = datetime.now(timezone.utc)
     max_age_dt = now - timedelta(hours=max_age_hours)
-    count = 0
-    
-    for _, row in pending.iterrows():
-        try:
-            expiry_str = row['expiry_time']
-            expiry_dt = datetime.fromisoformat(expiry_str)
-            if expiry_dt.tzinfo is None:
-                expiry_dt = expiry_dt.replace(tzinfo=timezone.utc)
-                
-            if now < expiry_dt:
-                continue
-                
-            if expiry_dt < max_age_dt:
-                continue
-
-            expiry_ms = int(expiry_dt.timestamp() * 1000)
-            close_price = await _get_close_price(store, expiry_ms, client)
-            
-            if close_price is not None:
-                open_price = float(row['current_price'])
-                direction = row['direction']
-                
-                # Determine actual_direction
-                if close_price > open_price:
-                    actual_direction = 'higher'
-                elif close_price < open_price:
-                    actual_direction = 'lower'
-                else:
-                    actual_direction = 'draw'
-                
-                # Determine if correct
-                # 平盤算錯，與 simulated_trades 一致
-                is_correct = (direction == actual_direction)
-                
-                await asyncio.to_thread(
-                    store.settle_signal, row['id'], actual_direction, close_price, is_correct
-                )
-                count += 1
-                logger.debug(f"Signal {row['id']} settled: actual={actual_direction}, correct={is_correct}")
-        except Exception as e:
-            logger.error(f"Error settling signal {row['id']}: {e}")
-            
+    due = _due_rows(pending, now, oldest=max_age_dt)
+    if due.empty:
+        return 0
+
+    prices = await _get_close_prices(store, due['expiry_ms'].tolist(), client)
+    close = due['expiry_ms'].map(prices)
+    priced = due[close.notna()]
+    if priced.empty:
+        return 0
+
+    close_price = close[close.notna()].to_numpy(dtype=float)
+    open_price = priced['current_price'].to_numpy(dtype=float)
+    actual_direction = np.select(
+        [close_price > open_price, close_price < open_price], ["higher", "lower"], default="draw"
+    )
+    # 平盤算錯，與 simulated_trades 一致
+    is_correct = priced['direction'].to_numpy() == actual_direction
+
+    count = await asyncio.to_thread(
+        store.settle_signals,
+        list(zip(priced['id'], actual_direction.tolist(), close_price.tolist(), is_correct.tolist())),
+    )
+
     if count > 0:
         logger.info(f"Settled {count} prediction signals.")
     return count
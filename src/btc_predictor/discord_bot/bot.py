@@ -8,7 +8,8 @@ import asyncio
 import logging
 import time
 import numpy as np
-import pandas as pd
+
+from btc_predictor.infrastructure.store import day_bounds_ms
 
 logger = logging.getLogger(__name__)
 
@@ -91,8 +92,8 @@ class EventContractCog(commands.Cog):
                     
                     with self.bot.store._get_connection() as conn:
                         daily_pnl = conn.execute(
-                            "SELECT COALESCE(SUM(o.pnl), 0) FROM pm_orders o JOIN prediction_signals s ON o.signal_id = s.id WHERE s.strategy_name = ? AND o.placed_at LIKE ? AND o.pnl IS NOT NULL",
-                            (model, f"{date_str}%")
+                            "SELECT COALESCE(SUM(o.pnl), 0) FROM pm_orders o JOIN prediction_signals s ON o.signal_id = s.id WHERE s.strategy_name = ? AND o.placed_at_ms >= ? AND o.placed_at_ms < ? AND o.pnl IS NOT NULL",
+                            (model, *day_bounds_ms(date_str))
                         ).fetchone()[0]
                 else:
                     detail = await asyncio.to_thread(self.bot.store.get_strategy_detail, model, tf_value)
@@ -102,8 +103,8 @@ class EventContractCog(commands.Cog):
                     # Query today's PnL separately since get_daily_stats only gives loss
                     with self.bot.store._get_connection() as conn:
                         daily_pnl = conn.execute(
-                            "SELECT COALESCE(SUM(pnl), 0) FROM simulated_trades WHERE strategy_name = ? AND open_time LIKE ? AND result IS NOT NULL",
-                            (model, f"{date_str}%")
+                            "SELECT COALESCE(SUM(pnl), 0) FROM simulated_trades WHERE strategy_name = ? AND open_time_ms >= ? AND open_time_ms < ? AND result IS NOT NULL",
+                            (model, *day_bounds_ms(date_str))
                         ).fetchone()[0]
                 
                 title = f"📊 {model} 詳細統計"
@@ -135,26 +136,19 @@ class EventContractCog(commands.Cog):
                 total_settled = 0
                 total_pnl = 0.0
 
-                # Determine which (name, tf) pairs to show
-                pairs_to_show = []
-                with self.bot.store._get_connection() as conn:
-                    query = "SELECT DISTINCT strategy_name, timeframe_minutes FROM simulated_trades"
-                    if tf_value:
-                        query += " WHERE timeframe_minutes = ?"
-                        db_rows = conn.execute(query, (tf_value,)).fetchall()
-                    else:
-                        db_rows = conn.execute(query).fetchall()
-                    pairs_to_show = db_rows
+                # Every (name, tf) pair in one grouped, incrementally cached pass
+                stats = await asyncio.to_thread(self.bot.store.get_strategy_stats, tf_value)
+                pm_stats = {}
+                if any(name.startswith("pm_") for name, _ in stats):
+                    pm_stats = await asyncio.to_thread(self.bot.store.get_strategy_stats, tf_value, True)
 
                 # Sort by name, then tf
-                pairs_to_show.sort(key=lambda x: (x[0], x[1]))
-
-                for name, tf in pairs_to_show:
+                for name, tf in sorted(stats):
                     is_pm = name.startswith("pm_")
                     if is_pm:
-                        s = await asyncio.to_thread(self.bot.store.get_pm_strategy_detail, name, tf)
+                        s = pm_stats.get((name, tf), {"settled": 0, "pending": 0})
                     else:
-                        s = await asyncio.to_thread(self.bot.store.get_strategy_detail, name, tf)
+                        s = stats[(name, tf)]
                     if s['settled'] == 0 and s['pending'] == 0:
                         continue
                         
@@ -197,7 +191,8 @@ class EventContractCog(commands.Cog):
             return
 
         try:
-            df = await asyncio.to_thread(self.bot.store.get_settled_signals, strategy_name=strategy)
+            # 0.01 confidence buckets per (strategy, timeframe), kept at settlement
+            df = await asyncio.to_thread(self.bot.store.get_calibration_rollups, strategy_name=strategy)
             
             if df.empty:
                 await interaction.followup.send("尚無足夠已結算資料進行分析。", ephemeral=True)
@@ -210,17 +205,18 @@ class EventContractCog(commands.Cog):
             
             summary_texts = []
             for (name, tf), group in grouped:
-                total_count = len(group)
-                acc = group['is_correct'].mean()
+                total_count = int(group['n'].sum())
+                acc = group['wins'].sum() / total_count
+                bucket = group['conf_bucket']
                 
                 # ECE calculation (simplified for embed - 3 bins)
-                bins = [(0.50, 0.60), (0.60, 0.70), (0.70, 1.01)]
+                bins = [(50, 60), (60, 70), (70, 101)]
                 ece = 0.0
                 for start, end in bins:
-                    mask = (group['confidence'] >= start) & (group['confidence'] < end)
-                    bin_df = group[mask]
-                    if not bin_df.empty:
-                        ece += (len(bin_df) / total_count) * abs(bin_df['is_correct'].mean() - bin_df['confidence'].mean())
+                    bin_df = group[(bucket >= start) & (bucket < end)]
+                    n = bin_df['n'].sum()
+                    if n > 0:
+                        ece += (n / total_count) * abs(bin_df['wins'].sum() / n - bin_df['conf_sum'].sum() / n)
                 
                 # Optimal threshold search (Simplified)
                 payout = PAYOUT_RATIOS.get(tf, 1.85)
@@ -230,24 +226,20 @@ class EventContractCog(commands.Cog):
                 best_threshold = 0.50
                 current_pnl_day = 0.0
                 
-                ts_min = pd.to_datetime(group['timestamp']).min()
-                ts_max = pd.to_datetime(group['timestamp']).max()
-                duration_days = max(0.1, (ts_max - ts_min).total_seconds() / 86400)
+                duration_days = max(0.1, (group['last_time_ms'].max() - group['first_time_ms'].min()) / 86_400_000)
                 
                 threshold_range = np.arange(0.50, 0.71, 0.01)
                 for t in threshold_range:
-                    passed = group[group['confidence'] >= t]
-                    if passed.empty: continue
+                    passed = group[bucket >= round(t * 100)]
+                    n = passed['n'].sum()
+                    if n == 0: continue
                     
-                    # Estimate avg bet
-                    # Use a vectorized calculation for efficiency if possible
-                    c = passed['confidence'].values
-                    bets = 5 + (c - t) / (1.0 - t) * 15
-                    bets = np.clip(bets, 5, 20)
-                    avg_bet = np.mean(bets)
+                    # Estimate avg bet: 5 + (c - t) / (1 - t) * 15 for c >= t stays
+                    # within [5, 20], so its mean is that of the mean confidence
+                    avg_bet = 5 + (passed['conf_sum'].sum() / n - t) / (1.0 - t) * 15
                     
-                    pnl_trade = avg_bet * (passed['is_correct'].mean() * payout - 1)
-                    pnl_day = pnl_trade * (len(passed) / duration_days)
+                    pnl_trade = avg_bet * (passed['wins'].sum() / n * payout - 1)
+                    pnl_day = pnl_trade * (n / duration_days)
                     
                     if pnl_day > best_pnl_day:
                         best_pnl_day = pnl_day
@@ -265,7 +257,7 @@ class EventContractCog(commands.Cog):
             
             embed.description = "\n".join(summary_texts)
             
-            if len(df) < 200:
+            if df['n'].sum() < 200:
                 embed.set_footer(text="⚠️ 樣本量 < 200，統計信心有限\n💡 完整報告: uv run python scripts/analyze_calibration.py")
             else:
                 embed.set_footer(text="💡 完整報告: uv run python scripts/analyze_calibration.py")
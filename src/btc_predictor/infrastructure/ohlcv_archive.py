@@ -0,0 +1,190 @@
+"""
+btc_predictor/infrastructure/ohlcv_archive.py
+---------------------------------------------
+OHLCVArchive: columnar (Arrow IPC) copy of the ``ohlcv`` table for offline work.
+
+職責:
+- 以 symbol / interval / 月份分割保存 K 線 (``<root>/<symbol>/<interval>/<YYYY-MM>.arrow``)
+- 從 SQLite ``ohlcv`` 表同步 (只重寫內容有變動的月份)
+- Memory-mapped 讀取，回傳與 ``DataStore.get_ohlcv`` 相同形狀的 DataFrame
+
+Files are uncompressed Arrow IPC (Feather v2), so reads map the file and wrap
+the column buffers without decoding. Only the numeric columns are stored;
+``symbol`` / ``interval`` come from the partition path.
+
+The SQLite database stays the source of truth (the live feed writes there);
+backtests, training and analysis scripts read the archive with ``--archive``
+after running ``scripts/sync_ohlcv_archive.py``::
+
+    archive = OHLCVArchive()
+    archive.sync(DataStore(), "BTCUSDT", "1m")
+    df = archive.get_ohlcv("BTCUSDT", "1m", start_time=start_ms)
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from btc_predictor.infrastructure.store import DataStore
+
+DEFAULT_ARCHIVE_ROOT = Path("data/archive/ohlcv")
+
+# Column order of ``SELECT * FROM ohlcv`` (what DataStore.get_ohlcv returns)
+OHLCV_TABLE_COLUMNS = [
+    "symbol", "interval", "open_time", "open", "high", "low", "close", "volume", "close_time",
+]
+
+ARCHIVE_SCHEMA = pa.schema([
+    ("open_time", pa.int64()),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.float64()),
+    ("close_time", pa.int64()),
+])
+
+
+def _month_of(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime("%Y-%m")
+
+
+def _month_range_ms(month: str) -> tuple[int, int]:
+    """[start, end] open_time range (Unix ms, inclusive) of a "YYYY-MM" month."""
+    start = pd.Timestamp(f"{month}-01", tz="UTC")
+    end = start + pd.offsets.MonthBegin(1)
+    return int(start.value // 1_000_000), int(end.value // 1_000_000) - 1
+
+
+class OHLCVArchive:
+    """Month-partitioned Arrow IPC archive of OHLCV candles.
+
+    Args:
+        root: Archive directory (default ``data/archive/ohlcv``).
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_ARCHIVE_ROOT) -> None:
+        self.root = Path(root)
+
+    def partition_path(self, symbol: str, interval: str, month: str) -> Path:
+        return self.root / symbol / interval / f"{month}.arrow"
+
+    def months(self, symbol: str, interval: str) -> List[str]:
+        """Archived months ("YYYY-MM"), ascending."""
+        directory = self.root / symbol / interval
+        if not directory.is_dir():
+            return []
+        return sorted(p.stem for p in directory.glob("*.arrow"))
+
+    def _read_partition(self, symbol: str, interval: str, month: str) -> pa.Table:
+        # Buffers keep the mapping alive after the file handle is closed.
+        with pa.memory_map(str(self.partition_path(symbol, interval, month))) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def _write_partition(self, symbol: str, interval: str, month: str, df: pd.DataFrame) -> None:
+        path = self.partition_path(symbol, interval, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(
+            df[ARCHIVE_SCHEMA.names], schema=ARCHIVE_SCHEMA, preserve_index=False
+        ).replace_schema_metadata({"symbol": symbol, "interval": interval, "month": month})
+
+        # Write next to the target and rename, so readers never see a partial file
+        tmp_path = path.with_suffix(".arrow.tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def _partition_summary(self, symbol: str, interval: str, month: str) -> tuple[int, int, int]:
+        """(rows, first open_time, last open_time) of an archived month."""
+        open_time = self._read_partition(symbol, interval, month).column("open_time")
+        if len(open_time) == 0:
+            return 0, 0, 0
+        return len(open_time), open_time[0].as_py(), open_time[-1].as_py()
+
+    def sync(self, store: DataStore, symbol: str, interval: str, full: bool = False) -> List[str]:
+        """Export the ``ohlcv`` table into the archive.
+
+        Months whose row count or open_time range differ from the archived
+        partition (new candles, backfilled gaps) are rewritten; unchanged
+        months are skipped. Archived months no longer in the database are kept.
+
+        Args:
+            store:    Source database.
+            symbol:   e.g. "BTCUSDT".
+            interval: e.g. "1m".
+            full:     Rewrite every month regardless of its summary.
+
+        Returns:
+            Months ("YYYY-MM") that were written.
+        """
+        summary = store.get_ohlcv_monthly_summary(symbol, interval)
+        archived = set(self.months(symbol, interval))
+
+        written = []
+        for month, rows, first, last in summary.itertuples(index=False):
+            expected = (int(rows), int(first), int(last))
+            if not full and month in archived and self._partition_summary(symbol, interval, month) == expected:
+                continue
+
+            start_ms, end_ms = _month_range_ms(month)
+            df = store.get_ohlcv(symbol, interval, start_time=start_ms, end_time=end_ms)
+            self._write_partition(symbol, interval, month, df)
+            written.append(month)
+        return written
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Read OHLCV data from the archive (drop-in for ``DataStore.get_ohlcv``).
+
+        Same arguments and result as ``DataStore.get_ohlcv``: columns of the
+        ``ohlcv`` table, ``datetime`` (UTC) index, ascending; ``start_time`` /
+        ``end_time`` are inclusive Unix ms, ``limit`` keeps the first N rows.
+        """
+        first_month = _month_of(start_time) if start_time else None
+        last_month = _month_of(end_time) if end_time else None
+
+        tables = []
+        remaining = limit
+        for month in self.months(symbol, interval):
+            if first_month and month < first_month:
+                continue
+            if last_month and month > last_month:
+                break
+
+            table = self._read_partition(symbol, interval, month)
+            open_time = table.column("open_time").to_numpy()
+            lo = int(np.searchsorted(open_time, start_time, side="left")) if start_time else 0
+            hi = int(np.searchsorted(open_time, end_time, side="right")) if end_time else len(open_time)
+            if remaining:
+                hi = min(hi, lo + remaining)
+            if hi <= lo:
+                continue
+
+            tables.append(table.slice(lo, hi - lo))
+            if remaining:
+                remaining -= hi - lo
+                if remaining == 0:
+                    break
+
+        if not tables:
+            return pd.DataFrame(columns=OHLCV_TABLE_COLUMNS)
+
+        df = pa.concat_tables(tables).to_pandas()
+        df.insert(0, "interval", pd.Series(interval, index=df.index, dtype="str"))
+        df.insert(0, "symbol", pd.Series(symbol, index=df.index, dtype="str"))
+        df.index = pd.DatetimeIndex(pd.to_datetime(df["open_time"], unit="ms", utc=True), name="datetime")
+        return df
@@ -0,0 +1,471 @@
+"""
+btc_predictor/infrastructure/rollups.py
+---------------------------------------
+Materialized per-strategy performance rollups
+
+職責:
+- ``strategy_rollups``: 每 (source, strategy, timeframe, UTC 小時) 一列 —
+  筆數 / 勝場 / 方向分拆 / PnL 總和 / Brier 分量，以及該小時內權益路徑的
+  peak / trough / 最大回撤 (依時間串接即可得到整條曲線的最大回撤)
+- ``strategy_calibration_rollups``: 每 (source, strategy, timeframe, UTC 日,
+  confidence 0.01 桶) 的筆數 / 勝場 / confidence 總和
+- 由結算路徑上的 trigger 增量維護 (DDL 見 ``store.SCHEMA_MIGRATIONS``)，
+  ``rebuild_rollups`` 由原始列整批重建
+
+Sources:
+
+- ``signals``:    prediction_signals (settled = actual_direction set,
+  win = is_correct, no PnL)
+- ``simulated``:  simulated_trades (settled = result set, win = 'win')
+- ``polymarket``: pm_orders joined to prediction_signals (settled = pnl set,
+  win = pnl > 0)
+
+Every settled row is counted under its own (strategy, timeframe) and under
+the ``ALL_STRATEGIES`` / ``ALL_TIMEFRAMES`` aggregates, so the equity curve of
+each of those series — and its drawdown — composes exactly from its hours.
+
+The in-hour equity path assumes settlements arrive in time order. A
+settlement older than the last one in its hour marks the bucket ``dirty``;
+:func:`refresh_dirty_rollups` recomputes those paths from the raw rows (the
+store runs it in the settling transaction). Rows changed by hand, or a PnL
+corrected after settlement, need :func:`rebuild_rollups`.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+HOUR_MS = 3_600_000
+DAY_MS = 86_400_000
+
+# Aggregate keys: every settled row is also counted under these
+ALL_STRATEGIES = "*"
+ALL_TIMEFRAMES = 0
+
+ROLLUP_KEY = ("source", "strategy_name", "timeframe_minutes", "hour_ms")
+
+# Additive columns: rollup column -> value of one settled row ``v``
+ROLLUP_SUMS: Dict[str, str] = {
+    "n": "1",
+    "wins": "v.win",
+    "higher_n": "v.higher",
+    "higher_wins": "v.higher * v.win",
+    "lower_n": "v.lower",
+    "lower_wins": "v.lower * v.win",
+    "pnl_sum": "v.pnl",
+    "pos_n": "v.pnl > 0",
+    "pos_pnl_sum": "MAX(v.pnl, 0.0)",
+    "neg_n": "v.pnl < 0",
+    "neg_pnl_sum": "MIN(v.pnl, 0.0)",
+    # Brier score components: sum(c), sum(c^2), sum(c * y)
+    "conf_sum": "v.confidence",
+    "conf_sq_sum": "v.confidence * v.confidence",
+    "conf_win_sum": "v.confidence * v.win",
+}
+
+# In-hour equity path from 0 (peak >= 0 >= trough); one row: its own PnL
+ROLLUP_PATH: Dict[str, str] = {
+    "peak": "MAX(v.pnl, 0.0)",
+    "trough": "MIN(v.pnl, 0.0)",
+    "max_drawdown": "MAX(-v.pnl, 0.0)",
+}
+
+_COUNT_COLUMNS = {"n", "wins", "higher_n", "higher_wins", "lower_n", "lower_wins", "pos_n", "neg_n"}
+
+CALIBRATION_KEY = ("source", "strategy_name", "timeframe_minutes", "day_ms", "conf_bucket")
+
+ROLLUP_DDL = (
+    f"""
+    CREATE TABLE IF NOT EXISTS strategy_rollups (
+        source TEXT NOT NULL,
+        strategy_name TEXT NOT NULL,
+        timeframe_minutes INTEGER NOT NULL,
+        hour_ms INTEGER NOT NULL,
+        {", ".join(f"{col} {'INTEGER' if col in _COUNT_COLUMNS else 'REAL'} NOT NULL DEFAULT 0" for col in ROLLUP_SUMS)},
+        peak REAL NOT NULL DEFAULT 0,
+        trough REAL NOT NULL DEFAULT 0,
+        max_drawdown REAL NOT NULL DEFAULT 0,
+        last_time_ms INTEGER NOT NULL,
+        dirty INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY ({", ".join(ROLLUP_KEY)})
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS strategy_calibration_rollups (
+        source TEXT NOT NULL,
+        strategy_name TEXT NOT NULL,
+        timeframe_minutes INTEGER NOT NULL,
+        day_ms INTEGER NOT NULL,
+        conf_bucket INTEGER NOT NULL,
+        n INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        conf_sum REAL NOT NULL,
+        first_time_ms INTEGER NOT NULL,
+        last_time_ms INTEGER NOT NULL,
+        PRIMARY KEY (source, strategy_name, timeframe_minutes, day_ms, conf_bucket)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_rollups_dirty ON strategy_rollups(dirty) WHERE dirty",
+)
+
+
+class RollupSource(NamedTuple):
+    """SQL expressions of one settled-row source (``{r}``: the source row)."""
+    table: str
+    settled_column: str     # NULL until settled, set once
+    strategy: str
+    timeframe: str
+    time: str               # ISO TEXT time column of ``table``
+    time_ms: str            # its epoch-ms mirror
+    direction: str
+    win: str
+    pnl: Optional[str]      # None: no PnL (no equity path)
+    confidence: str
+    join: str = ""          # extra table joined to each row
+    join_on: str = ""
+
+    @property
+    def settled(self) -> str:
+        return f"{{r}}.{self.settled_column} IS NOT NULL"
+
+    def value_columns(self, time_ms: str) -> str:
+        """Columns of one settled row ``v`` as used by :data:`ROLLUP_SUMS`."""
+        return (
+            f"{self.strategy} AS strategy, {self.timeframe} AS timeframe, {time_ms} AS time_ms, "
+            f"COALESCE({self.win}, 0) AS win, "
+            f"COALESCE({self.direction} = 'higher', 0) AS higher, COALESCE({self.direction} = 'lower', 0) AS lower, "
+            f"COALESCE({self.pnl or '0.0'}, 0.0) AS pnl, COALESCE({self.confidence}, 0.0) AS confidence"
+        )
+
+    def rows_sql(self, columns: str, row: str = "r", where: str = "1", order: str = "") -> str:
+        """``SELECT columns`` over the source rows (``row="NEW"``: inside a trigger)."""
+        if row == "NEW":
+            tables = self.join
+            conditions = [self.join_on] if self.join else []
+        else:
+            # The source row drives the join (pending / time-range / full scans)
+            tables = f"{self.table} {row}" + (f" CROSS JOIN {self.join} ON {self.join_on}" if self.join else "")
+            conditions = []
+        sql = (
+            f"SELECT {columns}" + (f" FROM {tables}" if tables else "")
+            + " WHERE " + " AND ".join(conditions + [where])
+            + (f" ORDER BY {order}" if order else "")
+        )
+        return sql.replace("{r}", row)
+
+
+ROLLUP_SOURCES: Dict[str, RollupSource] = {
+    "signals": RollupSource(
+        table="prediction_signals", settled_column="actual_direction",
+        strategy="{r}.strategy_name", timeframe="{r}.timeframe_minutes",
+        time="timestamp", time_ms="timestamp_ms", direction="{r}.direction",
+        win="{r}.is_correct = 1", pnl=None, confidence="{r}.confidence",
+    ),
+    "simulated": RollupSource(
+        table="simulated_trades", settled_column="result",
+        strategy="{r}.strategy_name", timeframe="{r}.timeframe_minutes",
+        time="open_time", time_ms="open_time_ms", direction="{r}.direction",
+        win="{r}.result = 'win'", pnl="{r}.pnl", confidence="{r}.confidence",
+    ),
+    "polymarket": RollupSource(
+        table="pm_orders", settled_column="pnl",
+        strategy="s.strategy_name", timeframe="s.timeframe_minutes",
+        time="placed_at", time_ms="placed_at_ms", direction="s.direction",
+        win="{r}.pnl > 0", pnl="{r}.pnl", confidence="s.confidence",
+        join="prediction_signals s", join_on="s.id = {r}.signal_id",
+    ),
+}
+
+# (all strategies, all timeframes) levels each settled row is counted under
+_LEVELS = "(SELECT 0 AS all_s, 0 AS all_t UNION ALL SELECT 0, 1 UNION ALL SELECT 1, 0 UNION ALL SELECT 1, 1) k"
+
+
+def rollup_trigger_sql(name: str, time_ms: str) -> Tuple[str, ...]:
+    """
+    CREATE TRIGGER statements maintaining the rollups of source ``name``:
+    on insert of a settled row and on the NULL -> value settlement update.
+    ``time_ms`` is the epoch-ms SQL expression of ``NEW.<time>``.
+    """
+    source = ROLLUP_SOURCES[name]
+    values = source.rows_sql(source.value_columns(time_ms), row="NEW")
+    sums = ", ".join(ROLLUP_SUMS.values())
+    path = ", ".join(ROLLUP_PATH.values())
+    # Appending a bucket to an existing one: old values on the right-hand side
+    dirty = "dirty OR excluded.last_time_ms < last_time_ms" if source.pnl else "0"
+    hourly = f"""
+        INSERT INTO strategy_rollups ({", ".join(ROLLUP_KEY + tuple(ROLLUP_SUMS) + tuple(ROLLUP_PATH))}, last_time_ms)
+        SELECT '{name}',
+            CASE WHEN k.all_s THEN '{ALL_STRATEGIES}' ELSE v.strategy END,
+            CASE WHEN k.all_t THEN {ALL_TIMEFRAMES} ELSE v.timeframe END,
+            v.time_ms / {HOUR_MS} * {HOUR_MS}, {sums}, {path}, v.time_ms
+        FROM ({values}) v, {_LEVELS}
+        WHERE v.time_ms IS NOT NULL
+        ON CONFLICT ({", ".join(ROLLUP_KEY)}) DO UPDATE SET
+            {", ".join(f"{col} = {col} + excluded.{col}" for col in ROLLUP_SUMS)},
+            peak = MAX(peak, pnl_sum + excluded.peak),
+            trough = MIN(trough, pnl_sum + excluded.trough),
+            max_drawdown = MAX(max_drawdown, excluded.max_drawdown, peak - (pnl_sum + excluded.trough)),
+            last_time_ms = MAX(last_time_ms, excluded.last_time_ms),
+            dirty = {dirty};
+    """
+    calibration = f"""
+        INSERT INTO strategy_calibration_rollups ({", ".join(CALIBRATION_KEY)}, n, wins, conf_sum, first_time_ms, last_time_ms)
+        SELECT '{name}', v.strategy, v.timeframe, v.time_ms / {DAY_MS} * {DAY_MS},
+            {conf_bucket_sql("v.confidence")}, 1, v.win, v.confidence, v.time_ms, v.time_ms
+        FROM ({values}) v
+        WHERE v.time_ms IS NOT NULL
+        ON CONFLICT ({", ".join(CALIBRATION_KEY)}) DO UPDATE SET
+            n = n + 1, wins = wins + excluded.wins, conf_sum = conf_sum + excluded.conf_sum,
+            first_time_ms = MIN(first_time_ms, excluded.first_time_ms),
+            last_time_ms = MAX(last_time_ms, excluded.last_time_ms);
+    """
+    col = source.settled_column
+    return (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{source.table}_rollup_settle
+        AFTER UPDATE OF {col} ON {source.table}
+        WHEN OLD.{col} IS NULL AND NEW.{col} IS NOT NULL
+        BEGIN {hourly} {calibration} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{source.table}_rollup_insert
+        AFTER INSERT ON {source.table}
+        WHEN NEW.{col} IS NOT NULL
+        BEGIN {hourly} {calibration} END
+        """,
+    )
+
+
+def conf_bucket_sql(confidence: str) -> str:
+    """0.01-wide confidence bucket (the epsilon keeps e.g. 0.57 in bucket 57)."""
+    return f"CAST({confidence} * 100 + 1e-9 AS INTEGER)"
+
+
+def equity_path(pnl: np.ndarray) -> Tuple[float, float, float]:
+    """``(peak, trough, max_drawdown)`` of the cumulative PnL starting at 0."""
+    if len(pnl) == 0:
+        return 0.0, 0.0, 0.0
+    equity = np.cumsum(pnl)
+    running_peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+    return (
+        float(max(equity.max(), 0.0)),
+        float(min(equity.min(), 0.0)),
+        float(max((running_peak - equity).max(), 0.0)),
+    )
+
+
+def compose_drawdown(pnl_sum, peak, trough, max_drawdown) -> float:
+    """
+    Max drawdown (peak starts at 0) of consecutive buckets in time order,
+    from each bucket's PnL sum and in-bucket :func:`equity_path`.
+    """
+    pnl_sum = np.asarray(pnl_sum, dtype=np.float64)
+    if len(pnl_sum) == 0:
+        return 0.0
+    start = np.concatenate(([0.0], np.cumsum(pnl_sum)[:-1]))
+    highs = np.maximum.accumulate(start + np.asarray(peak, dtype=np.float64))
+    prior_peak = np.maximum(np.concatenate(([0.0], highs[:-1])), 0.0)
+    drops = prior_peak - (start + np.asarray(trough, dtype=np.float64))
+    return float(max(np.max(max_drawdown), drops.max(), 0.0))
+
+
+def rollup_detail(
+    conn: sqlite3.Connection,
+    source: str,
+    strategy_name: Optional[str] = None,
+    timeframe: Optional[int] = None,
+    pending: int = 0,
+) -> dict:
+    """``DataStore.get_strategy_detail`` dict of one series (``None``: the aggregate)."""
+    key = (source, strategy_name or ALL_STRATEGIES, timeframe or ALL_TIMEFRAMES)
+    where = "WHERE source = ? AND strategy_name = ? AND timeframe_minutes = ?"
+    settled, wins, higher_n, higher_wins, lower_n, lower_wins, total_pnl = conn.execute(
+        "SELECT TOTAL(n), TOTAL(wins), TOTAL(higher_n), TOTAL(higher_wins), TOTAL(lower_n), TOTAL(lower_wins), "
+        f"TOTAL(pnl_sum) FROM strategy_rollups {where}", key,
+    ).fetchone()
+    path = np.array(conn.execute(
+        f"SELECT pnl_sum, peak, trough, max_drawdown FROM strategy_rollups {where} ORDER BY hour_ms", key
+    ).fetchall(), dtype=np.float64).reshape(-1, 4)
+    settled, wins = int(settled), int(wins)
+    higher_n, higher_wins, lower_n, lower_wins = int(higher_n), int(higher_wins), int(lower_n), int(lower_wins)
+    return {
+        "settled": settled, "pending": pending,
+        "wins": wins, "da": wins / settled if settled > 0 else 0.0,
+        "higher_total": higher_n, "higher_wins": higher_wins,
+        "higher_da": higher_wins / higher_n if higher_n > 0 else 0.0,
+        "lower_total": lower_n, "lower_wins": lower_wins,
+        "lower_da": lower_wins / lower_n if lower_n > 0 else 0.0,
+        "total_pnl": total_pnl,
+        "max_drawdown": compose_drawdown(*path.T) if len(path) else 0.0,
+    }
+
+
+def rollup_query(
+    source: str,
+    strategy_name: Optional[str] = None,
+    timeframe: Optional[int] = None,
+    since_ms: Optional[int] = None,
+    by_timeframe: bool = False,
+) -> Tuple[str, list]:
+    """
+    Hourly rows of one series (``None`` strategy / timeframe: the aggregate),
+    in hour order. ``by_timeframe`` without a ``timeframe``: the rows of every
+    timeframe of the strategy instead of their aggregate.
+    """
+    query = "SELECT * FROM strategy_rollups WHERE source = ? AND strategy_name = ?"
+    params: list = [source, strategy_name or ALL_STRATEGIES]
+    if by_timeframe and not timeframe:
+        query += f" AND timeframe_minutes != {ALL_TIMEFRAMES}"
+    else:
+        query += " AND timeframe_minutes = ?"
+        params.append(timeframe or ALL_TIMEFRAMES)
+    if since_ms is not None:
+        query += " AND hour_ms >= ?"
+        params.append(since_ms)
+    return query + " ORDER BY timeframe_minutes, hour_ms", params
+
+
+def calibration_query(
+    source: str,
+    strategy_name: Optional[str] = None,
+    timeframe: Optional[int] = None,
+    since_ms: Optional[int] = None,
+) -> Tuple[str, list]:
+    """Calibration buckets per (strategy, timeframe, conf_bucket), summed over days."""
+    query = """
+        SELECT strategy_name, timeframe_minutes, conf_bucket, SUM(n) AS n, SUM(wins) AS wins,
+            SUM(conf_sum) AS conf_sum, MIN(first_time_ms) AS first_time_ms, MAX(last_time_ms) AS last_time_ms
+        FROM strategy_calibration_rollups WHERE source = ?
+    """
+    params: list = [source]
+    if strategy_name:
+        query += " AND strategy_name = ?"
+        params.append(strategy_name)
+    if timeframe:
+        query += " AND timeframe_minutes = ?"
+        params.append(timeframe)
+    if since_ms is not None:
+        query += " AND day_ms >= ?"
+        params.append(since_ms)
+    return query + " GROUP BY strategy_name, timeframe_minutes, conf_bucket", params
+
+
+def _row_sums(df: pd.DataFrame) -> pd.DataFrame:
+    """:data:`ROLLUP_SUMS` of settled rows ``v`` (as fetched with ``value_columns``)."""
+    pnl = df["pnl"]
+    return pd.DataFrame({
+        "n": 1,
+        "wins": df["win"],
+        "higher_n": df["higher"],
+        "higher_wins": df["higher"] * df["win"],
+        "lower_n": df["lower"],
+        "lower_wins": df["lower"] * df["win"],
+        "pnl_sum": pnl,
+        "pos_n": (pnl > 0).astype(np.int64),
+        "pos_pnl_sum": pnl.clip(lower=0.0),
+        "neg_n": (pnl < 0).astype(np.int64),
+        "neg_pnl_sum": pnl.clip(upper=0.0),
+        "conf_sum": df["confidence"],
+        "conf_sq_sum": df["confidence"] * df["confidence"],
+        "conf_win_sum": df["confidence"] * df["win"],
+    }, index=df.index)[list(ROLLUP_SUMS)]
+
+
+def _bucket_rows(df: pd.DataFrame, sums: pd.DataFrame, keys: list, with_path: bool) -> pd.DataFrame:
+    """Rollup columns of every (strategy, timeframe, hour) of time-ordered rows."""
+    # Sorted: inserted in primary-key order
+    buckets = sums.groupby(keys).sum()
+    buckets["last_time_ms"] = df["time_ms"].groupby(keys, sort=False).max()
+    if not with_path:
+        for col in ROLLUP_PATH:
+            buckets[col] = 0.0
+        return buckets
+    # In-hour equity path: cumulative PnL from 0 and its running peak
+    equity = sums["pnl_sum"].groupby(keys, sort=False).cumsum()
+    running_peak = equity.clip(lower=0.0).groupby(keys, sort=False).cummax()
+    paths = pd.DataFrame({"equity": equity, "drawdown": running_peak - equity}).groupby(keys, sort=False)
+    buckets["peak"] = paths["equity"].max().clip(lower=0.0)
+    buckets["trough"] = paths["equity"].min().clip(upper=0.0)
+    buckets["max_drawdown"] = paths["drawdown"].max().clip(lower=0.0)
+    return buckets
+
+
+def rebuild_rollups(conn: sqlite3.Connection, sources: Optional[Iterable[str]] = None) -> None:
+    """
+    Recompute the rollups of ``sources`` (default: all) from the raw rows.
+    Runs in the caller's transaction.
+    """
+    columns = ROLLUP_KEY + tuple(ROLLUP_SUMS) + tuple(ROLLUP_PATH) + ("last_time_ms",)
+    insert = f"INSERT INTO strategy_rollups ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    for name in sources or ROLLUP_SOURCES:
+        source = ROLLUP_SOURCES[name]
+        conn.execute("DELETE FROM strategy_rollups WHERE source = ?", (name,))
+        conn.execute("DELETE FROM strategy_calibration_rollups WHERE source = ?", (name,))
+        values = source.rows_sql(
+            source.value_columns(f"r.{source.time_ms}"),
+            where=f"{source.settled} AND r.{source.time_ms} IS NOT NULL",
+        )
+
+        conn.execute(f"""
+            INSERT INTO strategy_calibration_rollups ({", ".join(CALIBRATION_KEY)}, n, wins, conf_sum, first_time_ms, last_time_ms)
+            SELECT ?, v.strategy, v.timeframe, v.time_ms / {DAY_MS} * {DAY_MS}, {conf_bucket_sql("v.confidence")},
+                COUNT(*), TOTAL(v.win), TOTAL(v.confidence), MIN(v.time_ms), MAX(v.time_ms)
+            FROM ({values}) v
+            GROUP BY 2, 3, 4, 5
+        """, (name,))
+
+        # Settled rows in time order (ties by rowid), as the triggers see them
+        df = pd.DataFrame(
+            conn.execute(f"{values} ORDER BY r.{source.time_ms}, r.rowid").fetchall(),
+            columns=["strategy", "timeframe", "time_ms", "win", "higher", "lower", "pnl", "confidence"],
+        )
+        if df.empty:
+            continue
+        df["pnl"] = df["pnl"].astype(np.float64)
+        sums = _row_sums(df)
+        hour = df["time_ms"] // HOUR_MS * HOUR_MS
+        all_s = pd.Series(ALL_STRATEGIES, index=df.index)
+        all_t = pd.Series(ALL_TIMEFRAMES, index=df.index)
+        for strategy, timeframe in ((df["strategy"], df["timeframe"]), (df["strategy"], all_t),
+                                    (all_s, df["timeframe"]), (all_s, all_t)):
+            buckets = _bucket_rows(df, sums, [strategy, timeframe, hour], with_path=source.pnl is not None)
+            keys = buckets.index.to_frame(index=False)
+            conn.executemany(insert, zip(
+                [name] * len(buckets), keys.iloc[:, 0].tolist(), keys.iloc[:, 1].astype(int).tolist(),
+                keys.iloc[:, 2].astype(int).tolist(),
+                *(buckets[col].tolist() for col in columns[len(ROLLUP_KEY):]),
+            ))
+
+
+def refresh_dirty_rollups(conn: sqlite3.Connection) -> int:
+    """
+    Recompute the equity path of buckets marked ``dirty`` (out-of-order
+    settlements) from their raw rows. Runs in the caller's transaction;
+    returns the number of buckets refreshed.
+    """
+    dirty = conn.execute(
+        "SELECT source, strategy_name, timeframe_minutes, hour_ms FROM strategy_rollups WHERE dirty"
+    ).fetchall()
+    for name, strategy, timeframe, hour_ms in dirty:
+        source = ROLLUP_SOURCES[name]
+        where = f"{source.settled} AND r.{source.time_ms} >= ? AND r.{source.time_ms} < ?"
+        params: list = [hour_ms, hour_ms + HOUR_MS]
+        if strategy != ALL_STRATEGIES:
+            where += f" AND {source.strategy} = ?"
+            params.append(strategy)
+        if timeframe != ALL_TIMEFRAMES:
+            where += f" AND {source.timeframe} = ?"
+            params.append(timeframe)
+        pnl = conn.execute(
+            source.rows_sql(source.pnl, where=where, order=f"r.{source.time_ms}, r.rowid"), params
+        ).fetchall()
+        peak, trough, max_dd = equity_path(np.array(pnl, dtype=np.float64).reshape(-1))
+        conn.execute(
+            "UPDATE strategy_rollups SET peak = ?, trough = ?, max_drawdown = ?, dirty = 0 "
+            "WHERE source = ? AND strategy_name = ? AND timeframe_minutes = ? AND hour_ms = ?",
+            (peak, trough, max_dd, name, strategy, timeframe, hour_ms),
+        )
+    return len(dirty)
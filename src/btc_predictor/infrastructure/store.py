@@ -1,18 +1,262 @@
+import asyncio
+import atexit
+import logging
 import sqlite3
+import threading
+import weakref
 import pandas as pd
 from pathlib import Path
-from typing import List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Any, Sequence, Set, Tuple
+from datetime import datetime, timedelta, timezone
 import uuid
 
+from btc_predictor.infrastructure.rollups import (
+    ROLLUP_DDL,
+    ROLLUP_SOURCES,
+    calibration_query,
+    rebuild_rollups,
+    refresh_dirty_rollups,
+    rollup_detail,
+    rollup_query,
+    rollup_trigger_sql,
+)
+from btc_predictor.infrastructure.strategy_stats import StrategyStatsCache
+
+logger = logging.getLogger(__name__)
+
+# Applied once to every pooled connection (journal_mode=WAL is persistent and
+# set in _init_db). synchronous=NORMAL is durable under WAL except for the
+# last commits on power loss; it avoids an fsync per transaction.
+SQLITE_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": -65536,       # KiB (negative) -> 64 MiB page cache
+    "mmap_size": 268435456,     # 256 MiB memory-mapped reads
+    "temp_store": "MEMORY",
+}
+
+# Compiled statements kept per connection (sqlite3 LRU keyed by SQL text).
+STATEMENT_CACHE_SIZE = 256
+
+
+INSERT_SIMULATED_TRADE_SQL = """
+    INSERT INTO simulated_trades (
+        id, strategy_name, direction, confidence, timeframe_minutes,
+        bet_amount, open_time, open_price, expiry_time, features_used
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_PREDICTION_SIGNAL_SQL = """
+    INSERT INTO prediction_signals (
+        id, strategy_name, timestamp, timeframe_minutes, direction,
+        confidence, current_price, expiry_time,
+        market_slug, market_price_up, entry_price, alpha, order_type,
+        traded, trade_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_SIGNAL_TRADED_SQL = "UPDATE prediction_signals SET traded = 1, trade_id = ? WHERE id = ?"
+
+
+def _simulated_trade_row(trade: Any) -> tuple:
+    import json
+    return (
+        trade.id, trade.strategy_name, trade.direction, trade.confidence,
+        trade.timeframe_minutes, trade.bet_amount,
+        trade.open_time.isoformat() if isinstance(trade.open_time, datetime) else trade.open_time,
+        trade.open_price,
+        trade.expiry_time.isoformat() if isinstance(trade.expiry_time, datetime) else trade.expiry_time,
+        json.dumps(getattr(trade, 'features_used', {}))
+    )
+
+
+def _prediction_signal_row(signal: Any, signal_id: str, trade_id: Optional[str] = None) -> tuple:
+    expiry_time = signal.timestamp + timedelta(minutes=signal.timeframe_minutes)
+    return (
+        signal_id,
+        signal.strategy_name,
+        signal.timestamp.isoformat() if isinstance(signal.timestamp, datetime) else signal.timestamp,
+        signal.timeframe_minutes,
+        signal.direction,
+        signal.confidence,
+        signal.current_price,
+        expiry_time.isoformat() if isinstance(expiry_time, datetime) else expiry_time,
+        getattr(signal, 'market_slug', None),
+        getattr(signal, 'market_price_up', None),
+        getattr(signal, 'entry_price', None),
+        getattr(signal, 'alpha', None),
+        getattr(signal, 'order_type', None),
+        1 if trade_id else 0,
+        trade_id,
+    )
+
+
+def _epoch_ms_sql(column: str) -> str:
+    """SQL expression converting an ISO 8601 TEXT column to epoch ms (NULL if unparsable)."""
+    return f"CAST(ROUND((julianday({column}) - 2440587.5) * 86400000.0) AS INTEGER)"
+
+
+def day_bounds_ms(date_str: str) -> Tuple[int, int]:
+    """``[start, end)`` epoch ms of the UTC day ``YYYY-MM-DD``."""
+    start = int(datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return start, start + 86_400_000
+
+
+# ISO TEXT time columns mirrored as INTEGER epoch ms: table -> {text column: ms column}
+EPOCH_MS_COLUMNS = {
+    "simulated_trades": {"open_time": "open_time_ms", "expiry_time": "expiry_time_ms"},
+    "prediction_signals": {"timestamp": "timestamp_ms", "expiry_time": "expiry_time_ms"},
+    "pm_orders": {"placed_at": "placed_at_ms"},
+}
+
+
+def _migrate_epoch_columns(conn: sqlite3.Connection) -> None:
+    for table, columns in EPOCH_MS_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for text_col, ms_col in columns.items():
+            if ms_col not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {ms_col} INTEGER")
+        assignments = ", ".join(f"{ms} = {_epoch_ms_sql(text)}" for text, ms in columns.items())
+        missing = " OR ".join(f"{ms} IS NULL" for ms in columns.values())
+        conn.execute(f"UPDATE {table} SET {assignments} WHERE {missing}")
+        # Every insert path (including raw SQL and pandas.to_sql) gets the ms columns
+        new_assignments = ", ".join(f"{ms} = {_epoch_ms_sql('NEW.' + text)}" for text, ms in columns.items())
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_epoch_ms AFTER INSERT ON {table}
+            WHEN {" OR ".join(f"NEW.{ms} IS NULL" for ms in columns.values())}
+            BEGIN
+                UPDATE {table} SET {new_assignments} WHERE rowid = NEW.rowid;
+            END
+        """)
+
+
+def _migrate_covering_indexes(conn: sqlite3.Connection) -> None:
+    # Daily risk stats and loss streaks: strategy + open-time range / order
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_strategy_time ON simulated_trades(strategy_name, open_time_ms, result, pnl)")
+    # Strategy / timeframe statistics
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_strategy_tf_time ON simulated_trades(strategy_name, timeframe_minutes, open_time_ms, direction, result, pnl)")
+    # Settler: unsettled trades / signals by expiry
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_unsettled ON simulated_trades(expiry_time_ms) WHERE close_price IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_unsettled_ms ON prediction_signals(expiry_time_ms) WHERE actual_direction IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_strategy_tf_time ON prediction_signals(strategy_name, timeframe_minutes, timestamp_ms)")
+    # Polymarket: joins from prediction_signals, and daily / recent PnL by placed time
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pm_orders_signal ON pm_orders(signal_id, placed_at_ms, pnl)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pm_orders_placed ON pm_orders(placed_at_ms, signal_id, pnl)")
+    # Superseded by the indexes above
+    conn.execute("DROP INDEX IF EXISTS idx_signals_unsettled")
+    conn.execute("DROP INDEX IF EXISTS idx_signals_strategy")
+    conn.execute("ANALYZE")
+
+
+def _migrate_signal_entry_price(conn: sqlite3.Connection) -> None:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(prediction_signals)")}
+    if "entry_price" not in existing:
+        conn.execute("ALTER TABLE prediction_signals ADD COLUMN entry_price FLOAT")
+
+
+def _migrate_rollups(conn: sqlite3.Connection) -> None:
+    for statement in ROLLUP_DDL:
+        conn.execute(statement)
+    # Maintained by the settlement path (see infrastructure/rollups.py)
+    for name, source in ROLLUP_SOURCES.items():
+        for statement in rollup_trigger_sql(name, _epoch_ms_sql(f"NEW.{source.time}")):
+            conn.execute(statement)
+    # Dirty-bucket refresh of the all-strategy series, open Polymarket orders
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_open_time ON simulated_trades(open_time_ms)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pm_orders_open ON pm_orders(signal_id) WHERE pnl IS NULL")
+    rebuild_rollups(conn)
+
+
+# Ordered schema migrations applied by DataStore._init_db; the applied
+# version is kept in PRAGMA user_version. Append only — never renumber.
+SCHEMA_MIGRATIONS: Tuple[Tuple[int, str, Callable[[sqlite3.Connection], None]], ...] = (
+    (1, "integer epoch-ms time columns", _migrate_epoch_columns),
+    (2, "covering indexes for hot queries", _migrate_covering_indexes),
+    (3, "performance rollup tables", _migrate_rollups),
+    (4, "prediction_signals.entry_price", _migrate_signal_entry_price),
+)
+
+
+class ConnectionPool:
+    """Thread-aware pool of long-lived SQLite connections.
+
+    Each thread gets its own connection (sqlite3 connections must not be used
+    concurrently), created on first use with ``SQLITE_PRAGMAS`` applied.
+    Connections stay open so sqlite3's per-connection statement cache keeps
+    hot queries compiled. A connection is released when its thread exits or
+    when :meth:`close_all` is called.
+    """
+
+    def __init__(self, db_path: Path, pragmas: Optional[dict] = None, cached_statements: int = STATEMENT_CACHE_SIZE):
+        self.db_path = db_path
+        self.pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: "weakref.WeakKeyDictionary[threading.Thread, sqlite3.Connection]" = weakref.WeakKeyDictionary()
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and not self._is_open(conn):
+            # A caller closed the connection (legacy per-call usage); replace it.
+            conn = None
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    @staticmethod
+    def _is_open(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.total_changes
+        except sqlite3.ProgrammingError:
+            return False
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close_all() may close from another
+        # thread; each connection is otherwise used by its owning thread.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value};")
+        return conn
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
 class DataStore:
+    MIGRATIONS = SCHEMA_MIGRATIONS
+
     def __init__(self, db_path: str = "data/btc_predictor.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = ConnectionPool(self.db_path)
+        # Incremental get_strategy_stats per source, created on first use
+        self._stats_caches: Dict[str, StrategyStatsCache] = {}
         self._init_db()
 
-    def _get_connection(self):
-        return sqlite3.connect(self.db_path)
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's pooled connection.
+
+        Use as ``with self._get_connection() as conn:`` — the context manager
+        commits / rolls back the transaction but does not close the connection.
+        """
+        return self._pool.get()
+
+    def close(self) -> None:
+        """Close all pooled connections (they are reopened on next use)."""
+        self._pool.close_all()
 
     def _init_db(self):
         """Initialize SQLite tables based on ARCHITECTURE.md."""
@@ -71,6 +315,7 @@ class DataStore:
                     -- Polymarket 擴展欄位
                     market_slug       TEXT,
                     market_price_up   FLOAT,
+                    entry_price       FLOAT,                -- 實際進場價 (Gamma 或 order book best ask)
                     alpha             FLOAT,
                     order_type        TEXT,
                     -- 與 Execution Layer 的關聯
@@ -92,8 +337,7 @@ class DataStore:
             
             # Create indexing for faster retrieval if needed
             conn.execute("CREATE INDEX IF NOT EXISTS idx_ohlcv_time ON ohlcv (open_time);")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_unsettled ON prediction_signals(expiry_time) WHERE actual_direction IS NULL;")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_signals_strategy ON prediction_signals(strategy_name, timeframe_minutes);")
+            # Indexes on prediction_signals / simulated_trades / pm_orders: see SCHEMA_MIGRATIONS
 
             # Polymarket Markets
             conn.execute("""
@@ -131,6 +375,36 @@ class DataStore:
                 );
             """)
             conn.commit()
+            self._migrate(conn)
+            # False only for subclasses pinning MIGRATIONS before the rollups
+            self._has_rollups = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'strategy_rollups'"
+            ).fetchone() is not None
+
+    @property
+    def schema_version(self) -> int:
+        with self._get_connection() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Apply pending ``MIGRATIONS``, each in its own transaction.
+
+        ``BEGIN IMMEDIATE`` takes the write lock before the version is read,
+        so concurrent processes opening the same DB apply each step once.
+        """
+        for version, description, apply in self.MIGRATIONS:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    conn.commit()
+                    continue
+                logger.info(f"DataStore: applying schema migration {version} ({description}) to {self.db_path}")
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
     def save_ohlcv(self, df: pd.DataFrame, symbol: str, interval: str):
         """
@@ -232,23 +506,45 @@ class DataStore:
             
         return df
 
+    def get_ohlcv_closes(self, symbol: str, interval: str, open_times: Sequence[int]) -> Dict[int, float]:
+        """
+        Close price of the candles opening at ``open_times`` (epoch ms), from a
+        single range query. Missing candles are absent from the result.
+        """
+        if len(open_times) == 0:
+            return {}
+        query = """
+            SELECT open_time, close FROM ohlcv
+            WHERE symbol = ? AND interval = ? AND open_time BETWEEN ? AND ?
+        """
+        params = [symbol, interval, int(min(open_times)), int(max(open_times))]
+        with self._get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        wanted = {int(t) for t in open_times}
+        return {open_time: float(close) for open_time, close in rows if open_time in wanted}
+
+    def get_ohlcv_monthly_summary(self, symbol: str, interval: str) -> pd.DataFrame:
+        """
+        Per-month (UTC) row count and open_time range of OHLCV data.
+        Columns: month ("YYYY-MM"), rows, first_open_time, last_open_time.
+        """
+        query = """
+            SELECT strftime('%Y-%m', open_time / 1000, 'unixepoch') AS month,
+                   COUNT(*) AS rows,
+                   MIN(open_time) AS first_open_time,
+                   MAX(open_time) AS last_open_time
+            FROM ohlcv
+            WHERE symbol = ? AND interval = ?
+            GROUP BY month
+            ORDER BY month ASC
+        """
+        with self._get_connection() as conn:
+            return pd.read_sql_query(query, conn, params=[symbol, interval])
+
     def save_simulated_trade(self, trade: Any):
         """Save a new simulated trade to the database."""
-        import json
         with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO simulated_trades (
-                    id, strategy_name, direction, confidence, timeframe_minutes,
-                    bet_amount, open_time, open_price, expiry_time, features_used
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trade.id, trade.strategy_name, trade.direction, trade.confidence,
-                trade.timeframe_minutes, trade.bet_amount, 
-                trade.open_time.isoformat() if isinstance(trade.open_time, datetime) else trade.open_time,
-                trade.open_price,
-                trade.expiry_time.isoformat() if isinstance(trade.expiry_time, datetime) else trade.expiry_time,
-                json.dumps(getattr(trade, 'features_used', {}))
-            ))
+            conn.execute(INSERT_SIMULATED_TRADE_SQL, _simulated_trade_row(trade))
 
     def check_trade_exists(self, strategy_name: str, timeframe_minutes: int, open_time: datetime) -> bool:
         """Check if a trade already exists for the given strategy and time."""
@@ -274,8 +570,28 @@ class DataStore:
                 SET close_price = ?, result = ?, pnl = ?
                 WHERE id = ? AND close_price IS NULL
             """, (close_price, result, pnl, trade_id))
+            self._refresh_rollups(conn)
             return cursor.rowcount > 0
 
+    def update_simulated_trades(self, settlements: Iterable[Tuple[str, float, str, float]]) -> List[str]:
+        """
+        Batch version of :meth:`update_simulated_trade` in one transaction.
+        ``settlements`` holds ``(trade_id, close_price, result, pnl)`` tuples;
+        returns the ids actually updated (trades still unsettled).
+        """
+        updated = []
+        with self._get_connection() as conn:
+            for trade_id, close_price, result, pnl in settlements:
+                cursor = conn.execute("""
+                    UPDATE simulated_trades 
+                    SET close_price = ?, result = ?, pnl = ?
+                    WHERE id = ? AND close_price IS NULL
+                """, (close_price, result, pnl, trade_id))
+                if cursor.rowcount > 0:
+                    updated.append(trade_id)
+            self._refresh_rollups(conn)
+        return updated
+
     def get_strategy_summary(self, strategy_name: str) -> dict:
         """回傳指定策略的累計統計摘要。"""
         with self._get_connection() as conn:
@@ -301,71 +617,69 @@ class DataStore:
 
     def get_strategy_detail(self, strategy_name: str, timeframe: int = None) -> dict:
         """回傳指定策略的詳細統計，包含方向分拆和 drawdown。"""
-        base_where = "WHERE strategy_name = ? AND result IS NOT NULL"
-        params = [strategy_name]
+        return self._strategy_detail("simulated", strategy_name, timeframe)
+
+    def get_strategy_stats(self, timeframe: int = None, polymarket: bool = False) -> Dict[Tuple[str, int], dict]:
+        """
+        所有 (策略, timeframe) 的 ``get_strategy_detail`` 統計 (Polymarket:
+        ``get_pm_strategy_detail``)。第一次讀全表，之後只讀新增 / 新結算的列。
+        """
+        source = "polymarket" if polymarket else "simulated"
+        cache = self._stats_caches.get(source)
+        if cache is None:
+            cache = self._stats_caches.setdefault(source, StrategyStatsCache(self, source))
+        return cache.get(timeframe)
+
+    def _strategy_detail(self, source: str, strategy_name: str, timeframe: Optional[int]) -> dict:
+        # Settled stats from the hourly rollups; only open rows are counted
+        spec = ROLLUP_SOURCES[source]
+        where, params = f"{{r}}.{spec.settled_column} IS NULL AND {spec.strategy} = ?", [strategy_name]
         if timeframe:
-            base_where += " AND timeframe_minutes = ?"
+            where += f" AND {spec.timeframe} = ?"
             params.append(timeframe)
+        with self._get_connection() as conn:
+            self._refresh_rollups(conn)
+            pending = conn.execute(spec.rows_sql("COUNT(*)", where=where), params).fetchone()[0]
+            return rollup_detail(conn, source, strategy_name, timeframe, pending)
+
+    def _refresh_rollups(self, conn: sqlite3.Connection) -> None:
+        """Recompute out-of-order rollup buckets in the caller's transaction."""
+        if self._has_rollups:
+            refresh_dirty_rollups(conn)
 
+    def get_rollups(
+        self,
+        source: str = "simulated",
+        strategy_name: Optional[str] = None,
+        timeframe: Optional[int] = None,
+        since_ms: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        每小時的績效 rollup (``source``: signals / simulated / polymarket)。
+        ``strategy_name`` / ``timeframe`` 為 None 時取所有策略 / timeframe 的合計。
+        """
+        query, params = rollup_query(source, strategy_name, timeframe, since_ms)
         with self._get_connection() as conn:
-            row = conn.execute(f"""
-                SELECT COUNT(*) as settled,
-                    COALESCE(SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END), 0) as wins,
-                    COALESCE(SUM(pnl), 0) as total_pnl
-                FROM simulated_trades {base_where}
-            """, params).fetchone()
-
-            higher = conn.execute(f"""
-                SELECT COUNT(*),
-                    COALESCE(SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END), 0)
-                FROM simulated_trades {base_where} AND direction = 'higher'
-            """, params).fetchone()
-
-            lower = conn.execute(f"""
-                SELECT COUNT(*),
-                    COALESCE(SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END), 0)
-                FROM simulated_trades {base_where} AND direction = 'lower'
-            """, params).fetchone()
-
-            pending_where = "WHERE strategy_name = ? AND result IS NULL"
-            pending_params = [strategy_name]
-            if timeframe:
-                pending_where += " AND timeframe_minutes = ?"
-                pending_params.append(timeframe)
-            pending = conn.execute(f"""
-                SELECT COUNT(*) FROM simulated_trades {pending_where}
-            """, pending_params).fetchone()[0]
-
-            pnl_rows = conn.execute(f"""
-                SELECT pnl FROM simulated_trades {base_where}
-                ORDER BY open_time ASC
-            """, params).fetchall()
-
-        settled, wins, total_pnl = row
-        da = wins / settled if settled > 0 else 0.0
-        h_total, h_wins = higher
-        l_total, l_wins = lower
-        higher_da = h_wins / h_total if h_total > 0 else 0.0
-        lower_da = l_wins / l_total if l_total > 0 else 0.0
-
-        cumulative = peak = max_dd = 0.0
-        for (p,) in pnl_rows:
-            cumulative += p
-            if cumulative > peak:
-                peak = cumulative
-            dd = peak - cumulative
-            if dd > max_dd:
-                max_dd = dd
+            self._refresh_rollups(conn)
+            return pd.read_sql_query(query, conn, params=params)
 
-        return {
-            "settled": settled, "pending": pending,
-            "wins": wins, "da": da,
-            "higher_total": h_total, "higher_wins": h_wins,
-            "higher_da": higher_da,
-            "lower_total": l_total, "lower_wins": l_wins,
-            "lower_da": lower_da,
-            "total_pnl": total_pnl, "max_drawdown": max_dd,
-        }
+    def get_calibration_rollups(
+        self,
+        source: str = "signals",
+        strategy_name: Optional[str] = None,
+        timeframe: Optional[int] = None,
+        since_ms: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """每 (策略, timeframe, confidence 0.01 桶) 的筆數 / 勝場 / confidence 總和。"""
+        query, params = calibration_query(source, strategy_name, timeframe, since_ms)
+        with self._get_connection() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def rebuild_rollups(self, sources: Optional[Iterable[str]] = None) -> None:
+        """由原始列重建 rollups (預設全部 source)。"""
+        with self._get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild_rollups(conn, sources)
 
     def get_daily_stats(self, strategy_name: str, date_str: str) -> dict:
         """
@@ -377,17 +691,17 @@ class DataStore:
                 SUM(CASE WHEN pnl < 0 THEN -pnl ELSE 0 END) as daily_loss,
                 COUNT(*) as daily_trades
             FROM simulated_trades
-            WHERE strategy_name = ? AND open_time LIKE ?
+            WHERE strategy_name = ? AND open_time_ms >= ? AND open_time_ms < ?
         """
         
         with self._get_connection() as conn:
-            row = conn.execute(query, (strategy_name, f"{date_str}%")).fetchone()
+            row = conn.execute(query, (strategy_name, *day_bounds_ms(date_str))).fetchone()
             
             # For consecutive losses, we need the recent trades
             trades_query = """
                 SELECT result FROM simulated_trades
                 WHERE strategy_name = ? 
-                ORDER BY open_time DESC
+                ORDER BY open_time_ms DESC
                 LIMIT 20
             """
             recent_results = conn.execute(trades_query, (strategy_name,)).fetchall()
@@ -407,6 +721,25 @@ class DataStore:
                 "consecutive_losses": consecutive_losses
             }
 
+    def get_risk_snapshot(self, date_str: str, recent_limit: int = 20) -> List[Tuple[str, str, str, Optional[str], Optional[float], int]]:
+        """
+        Rows needed to rebuild ``RiskState`` in one query: every trade opened
+        on *date_str* plus the *recent_limit* most recent trades of each
+        strategy, as ``(strategy_name, id, open_time, result, pnl, rank)``
+        (rank 1 = most recent ``open_time`` of the strategy).
+        """
+        query = """
+            SELECT strategy_name, id, open_time, result, pnl, rank FROM (
+                SELECT strategy_name, id, open_time, result, pnl,
+                       open_time_ms,
+                       ROW_NUMBER() OVER (PARTITION BY strategy_name ORDER BY open_time_ms DESC) AS rank
+                FROM simulated_trades
+            )
+            WHERE rank <= ? OR (open_time_ms >= ? AND open_time_ms < ?)
+        """
+        with self._get_connection() as conn:
+            return conn.execute(query, (recent_limit, *day_bounds_ms(date_str))).fetchall()
+
     def get_pm_strategy_summary(self, strategy_name: str) -> dict:
         """回傳指定 Polymarket 策略的累計統計摘要。"""
         with self._get_connection() as conn:
@@ -433,83 +766,7 @@ class DataStore:
 
     def get_pm_strategy_detail(self, strategy_name: str, timeframe: int = None) -> dict:
         """回傳指定 Polymarket 策略的詳細統計。"""
-        base_where = "WHERE s.strategy_name = ? AND o.pnl IS NOT NULL"
-        params = [strategy_name]
-        if timeframe:
-            base_where += " AND s.timeframe_minutes = ?"
-            params.append(timeframe)
-
-        with self._get_connection() as conn:
-            row = conn.execute(f"""
-                SELECT COUNT(*) as settled,
-                    COALESCE(SUM(CASE WHEN o.pnl > 0 THEN 1 ELSE 0 END), 0) as wins,
-                    COALESCE(SUM(o.pnl), 0) as total_pnl
-                FROM pm_orders o
-                JOIN prediction_signals s ON o.signal_id = s.id
-                {base_where}
-            """, params).fetchone()
-
-            higher = conn.execute(f"""
-                SELECT COUNT(*),
-                    COALESCE(SUM(CASE WHEN o.pnl > 0 THEN 1 ELSE 0 END), 0)
-                FROM pm_orders o
-                JOIN prediction_signals s ON o.signal_id = s.id
-                {base_where} AND s.direction = 'higher'
-            """, params).fetchone()
-
-            lower = conn.execute(f"""
-                SELECT COUNT(*),
-                    COALESCE(SUM(CASE WHEN o.pnl > 0 THEN 1 ELSE 0 END), 0)
-                FROM pm_orders o
-                JOIN prediction_signals s ON o.signal_id = s.id
-                {base_where} AND s.direction = 'lower'
-            """, params).fetchone()
-
-            pending_where = "WHERE s.strategy_name = ? AND o.pnl IS NULL"
-            pending_params = [strategy_name]
-            if timeframe:
-                pending_where += " AND s.timeframe_minutes = ?"
-                pending_params.append(timeframe)
-            pending = conn.execute(f"""
-                SELECT COUNT(*) 
-                FROM pm_orders o
-                JOIN prediction_signals s ON o.signal_id = s.id
-                {pending_where}
-            """, pending_params).fetchone()[0]
-
-            pnl_rows = conn.execute(f"""
-                SELECT o.pnl 
-                FROM pm_orders o
-                JOIN prediction_signals s ON o.signal_id = s.id
-                {base_where}
-                ORDER BY o.placed_at ASC
-            """, params).fetchall()
-
-        settled, wins, total_pnl = row
-        da = wins / settled if settled > 0 else 0.0
-        h_total, h_wins = higher
-        l_total, l_wins = lower
-        higher_da = h_wins / h_total if h_total > 0 else 0.0
-        lower_da = l_wins / l_total if l_total > 0 else 0.0
-
-        cumulative = peak = max_dd = 0.0
-        for (p,) in pnl_rows:
-            cumulative += p
-            if cumulative > peak:
-                peak = cumulative
-            dd = peak - cumulative
-            if dd > max_dd:
-                max_dd = dd
-
-        return {
-            "settled": settled, "pending": pending,
-            "wins": wins, "da": da,
-            "higher_total": h_total, "higher_wins": h_wins,
-            "higher_da": higher_da,
-            "lower_total": l_total, "lower_wins": l_wins,
-            "lower_da": lower_da,
-            "total_pnl": total_pnl, "max_drawdown": max_dd,
-        }
+        return self._strategy_detail("polymarket", strategy_name, timeframe)
 
     def get_pm_daily_stats(self, strategy_name: str, date_str: str) -> dict:
         """Get daily statistics for Polymarket risk control."""
@@ -519,19 +776,19 @@ class DataStore:
                 COUNT(*) as daily_trades
             FROM pm_orders o
             JOIN prediction_signals s ON o.signal_id = s.id
-            WHERE s.strategy_name = ? AND o.placed_at LIKE ?
+            WHERE s.strategy_name = ? AND o.placed_at_ms >= ? AND o.placed_at_ms < ?
         """
         
         with self._get_connection() as conn:
-            row = conn.execute(query, (strategy_name, f"{date_str}%")).fetchone()
+            row = conn.execute(query, (strategy_name, *day_bounds_ms(date_str))).fetchone()
             
             # For consecutive losses, we need the recent trades
             trades_query = """
                 SELECT o.pnl 
                 FROM pm_orders o
-                JOIN prediction_signals s ON o.signal_id = s.id
+                CROSS JOIN prediction_signals s ON o.signal_id = s.id  -- newest orders first, stop at 20
                 WHERE s.strategy_name = ? AND o.pnl IS NOT NULL
-                ORDER BY o.placed_at DESC
+                ORDER BY o.placed_at_ms DESC
                 LIMIT 20
             """
             recent_results = conn.execute(trades_query, (strategy_name,)).fetchall()
@@ -557,7 +814,7 @@ class DataStore:
         with self._get_connection() as conn:
             return pd.read_sql_query("""
                 SELECT * FROM simulated_trades WHERE close_price IS NULL
-                ORDER BY expiry_time ASC
+                ORDER BY expiry_time_ms ASC
             """, conn)
 
     def get_table_counts(self) -> dict[str, int]:
@@ -576,52 +833,44 @@ class DataStore:
 
     def save_prediction_signal(self, signal: Any) -> str:
         """無條件儲存預測信號，回傳 signal_id。"""
-        signal_id = str(uuid.uuid4())
-        expiry_time = signal.timestamp + timedelta(minutes=signal.timeframe_minutes)
-        
-        market_slug = getattr(signal, 'market_slug', None)
-        market_price_up = getattr(signal, 'market_price_up', None)
-        alpha = getattr(signal, 'alpha', None)
-        order_type = getattr(signal, 'order_type', None)
+        return self.save_prediction_signals([signal])[0]
+
+    def save_prediction_signals(
+        self,
+        signals: Sequence[Any],
+        trade_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[str]:
+        """
+        於單一 transaction 儲存多筆預測信號 (同一根 K 棒的所有策略)，
+        依輸入順序回傳 signal_id。
 
+        Args:
+            signals: PredictionSignal 序列
+            trade_ids: 與 signals 對應的 SimulatedTrade id (None = 未下單)；
+                有值者直接寫入 traded = 1 / trade_id
+        """
+        if trade_ids is None:
+            trade_ids = [None] * len(signals)
+        signal_ids = [str(uuid.uuid4()) for _ in signals]
+        rows = [
+            _prediction_signal_row(signal, signal_id, trade_id)
+            for signal, signal_id, trade_id in zip(signals, signal_ids, trade_ids)
+        ]
         with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO prediction_signals (
-                    id, strategy_name, timestamp, timeframe_minutes, direction,
-                    confidence, current_price, expiry_time,
-                    market_slug, market_price_up, alpha, order_type
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal_id, 
-                signal.strategy_name,
-                signal.timestamp.isoformat() if isinstance(signal.timestamp, datetime) else signal.timestamp,
-                signal.timeframe_minutes,
-                signal.direction,
-                signal.confidence,
-                signal.current_price,
-                expiry_time.isoformat() if isinstance(expiry_time, datetime) else expiry_time,
-                market_slug,
-                market_price_up,
-                alpha,
-                order_type
-            ))
-        return signal_id
+            conn.executemany(INSERT_PREDICTION_SIGNAL_SQL, rows)
+        return signal_ids
 
     def update_signal_traded(self, signal_id: str, trade_id: str) -> None:
         """標記 signal 已產生對應的 SimulatedTrade。"""
         with self._get_connection() as conn:
-            conn.execute("""
-                UPDATE prediction_signals 
-                SET traded = 1, trade_id = ? 
-                WHERE id = ?
-            """, (trade_id, signal_id))
+            conn.execute(UPDATE_SIGNAL_TRADED_SQL, (trade_id, signal_id))
 
     def get_unsettled_signals(self) -> pd.DataFrame:
         """取得尚未結算的 signals。"""
         query = """
             SELECT * FROM prediction_signals
             WHERE actual_direction IS NULL
-            ORDER BY expiry_time ASC
+            ORDER BY expiry_time_ms ASC
         """
         with self._get_connection() as conn:
             return pd.read_sql_query(query, conn)
@@ -667,6 +916,25 @@ class DataStore:
                 SET actual_direction = ?, close_price = ?, is_correct = ?
                 WHERE id = ?
             """, (actual_direction, close_price, is_correct, signal_id))
+            self._refresh_rollups(conn)
+
+    def settle_signals(self, settlements: Iterable[Tuple[str, str, float, bool]]) -> int:
+        """
+        批次寫入 signals 的實際結果 (單一 transaction)。
+        ``settlements`` 為 ``(signal_id, actual_direction, close_price, is_correct)``；
+        回傳實際結算的筆數 (已結算者略過)。
+        """
+        with self._get_connection() as conn:
+            cursor = conn.executemany("""
+                UPDATE prediction_signals
+                SET actual_direction = ?, close_price = ?, is_correct = ?
+                WHERE id = ? AND actual_direction IS NULL
+            """, [
+                (actual_direction, close_price, is_correct, signal_id)
+                for signal_id, actual_direction, close_price, is_correct in settlements
+            ])
+            self._refresh_rollups(conn)
+            return cursor.rowcount
 
     def get_signal_stats(self) -> dict:
         """取得 Signal Layer 統計。"""
@@ -751,8 +1019,10 @@ class DataStore:
             ORDER BY end_time ASC
         """
         with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(query, (now_str,)).fetchall()
+            # Row factory on a dedicated cursor: the pooled connection is shared
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.execute(query, (now_str,)).fetchall()
             
             # Filter by timeframe in python for simplicity if needed, 
             # or just return the first one that fits the end_time alignment.
@@ -801,14 +1071,31 @@ class DataStore:
         
         with self._get_connection() as conn:
             conn.execute(query, params)
+            self._refresh_rollups(conn)
 
     def save_polymarket_execution_context(self, signal: Any, trade: Any, order: Any) -> None:
         """
         Atomically save a prediction signal and (if applicable) its corresponding 
         SimulatedTrade and PolymarketOrder within a single database transaction. 
         """
+        self.save_polymarket_execution_contexts([(signal, trade, order)])
+
+    def save_polymarket_execution_contexts(self, contexts: Iterable[Tuple[Any, Any, Any]]) -> List[str]:
+        """
+        Save several ``(signal, trade, order)`` execution contexts (one tick of
+        every strategy) in a single database transaction; ``trade`` / ``order``
+        may be None. Returns the new signal ids in input order.
+        """
+        signal_ids: List[str] = []
+        with self._get_connection() as conn:
+            for signal, trade, order in contexts:
+                signal_ids.append(self._insert_polymarket_execution_context(conn, signal, trade, order))
+        return signal_ids
+
+    @staticmethod
+    def _insert_polymarket_execution_context(conn: sqlite3.Connection, signal: Any, trade: Any, order: Any) -> str:
         import json
-        
+
         timestamp_dt = signal.timestamp
         if isinstance(timestamp_dt, pd.Timestamp):
             timestamp_dt = timestamp_dt.to_pydatetime()
@@ -818,61 +1105,219 @@ class DataStore:
         signal_id = str(uuid.uuid4())
         market_slug = getattr(signal, 'market_slug', None)
         market_price_up = getattr(signal, 'market_price_up', None)
+        entry_price = getattr(signal, 'entry_price', None)
         alpha = getattr(signal, 'alpha', None)
         order_type_signal = getattr(signal, 'order_type', None)
 
-        with self._get_connection() as conn:
-            # 1. Save Prediction Signal
+        # 1. Save Prediction Signal
+        conn.execute("""
+            INSERT INTO prediction_signals (
+                id, strategy_name, timestamp, timeframe_minutes, direction,
+                confidence, current_price, expiry_time, traded, trade_id,
+                market_slug, market_price_up, entry_price, alpha, order_type
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            signal_id, 
+            signal.strategy_name,
+            timestamp_dt.isoformat(),
+            signal.timeframe_minutes,
+            signal.direction,
+            signal.confidence,
+            signal.current_price,
+            expiry_time.isoformat(),
+            1 if trade else 0,
+            trade.id if trade else None,
+            market_slug,
+            market_price_up,
+            entry_price,
+            alpha,
+            order_type_signal
+        ))
+
+        if trade and order:
+            # 2. Save SimulatedTrade
+            order.signal_id = signal_id
+            
+            features_json = json.dumps(getattr(trade, 'features_used', {}))
+            op_time = trade.open_time.isoformat() if isinstance(trade.open_time, datetime) else trade.open_time
+            exp_time = trade.expiry_time.isoformat() if isinstance(trade.expiry_time, datetime) else trade.expiry_time
+            
             conn.execute("""
-                INSERT INTO prediction_signals (
-                    id, strategy_name, timestamp, timeframe_minutes, direction,
-                    confidence, current_price, expiry_time, traded, trade_id,
-                    market_slug, market_price_up, alpha, order_type
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO simulated_trades (
+                    id, strategy_name, direction, confidence, timeframe_minutes,
+                    bet_amount, open_time, open_price, expiry_time, features_used
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                signal_id, 
-                signal.strategy_name,
-                timestamp_dt.isoformat(),
-                signal.timeframe_minutes,
-                signal.direction,
-                signal.confidence,
-                signal.current_price,
-                expiry_time.isoformat(),
-                1 if trade else 0,
-                trade.id if trade else None,
-                market_slug,
-                market_price_up,
-                alpha,
-                order_type_signal
+                trade.id, trade.strategy_name, trade.direction, trade.confidence,
+                trade.timeframe_minutes, trade.bet_amount, op_time, trade.open_price, exp_time, features_json
             ))
 
-            if trade and order:
-                # 2. Save SimulatedTrade
-                order.signal_id = signal_id
-                
-                features_json = json.dumps(getattr(trade, 'features_used', {}))
-                op_time = trade.open_time.isoformat() if isinstance(trade.open_time, datetime) else trade.open_time
-                exp_time = trade.expiry_time.isoformat() if isinstance(trade.expiry_time, datetime) else trade.expiry_time
-                
-                conn.execute("""
-                    INSERT INTO simulated_trades (
-                        id, strategy_name, direction, confidence, timeframe_minutes,
-                        bet_amount, open_time, open_price, expiry_time, features_used
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    trade.id, trade.strategy_name, trade.direction, trade.confidence,
-                    trade.timeframe_minutes, trade.bet_amount, op_time, trade.open_price, exp_time, features_json
-                ))
-
-                # 3. Save PolymarketOrder
-                pl_time = order.placed_at.isoformat() if isinstance(order.placed_at, datetime) else order.placed_at
-                conn.execute("""
-                    INSERT INTO pm_orders (
-                        order_id, signal_id, token_id, side, price, size,
-                        order_type, status, placed_at, filled_at, fill_price, fill_size
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    order.order_id, order.signal_id, order.token_id, 
-                    order.side, order.price, order.size,
-                    order.order_type, order.status, pl_time, None, None, None
-                ))
+            # 3. Save PolymarketOrder
+            pl_time = order.placed_at.isoformat() if isinstance(order.placed_at, datetime) else order.placed_at
+            conn.execute("""
+                INSERT INTO pm_orders (
+                    order_id, signal_id, token_id, side, price, size,
+                    order_type, status, placed_at, filled_at, fill_price, fill_size
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                order.order_id, order.signal_id, order.token_id, 
+                order.side, order.price, order.size,
+                order.order_type, order.status, pl_time, None, None, None
+            ))
+        return signal_id
+
+
+# Queues not yet closed; flushed by the atexit hook so an interpreter exit
+# without an explicit close() does not lose buffered rows.
+_OPEN_QUEUES: "weakref.WeakSet[WriteBehindQueue]" = weakref.WeakSet()
+
+
+def _flush_open_queues() -> None:
+    for queue in list(_OPEN_QUEUES):
+        try:
+            queue.close()
+        except Exception:
+            logger.exception("WriteBehindQueue: flush at exit failed")
+
+
+atexit.register(_flush_open_queues)
+
+
+class WriteBehindQueue:
+    """Write-behind buffer for the live pipelines' per-tick inserts.
+
+    Exposes the ``DataStore`` write methods used on a trigger tick
+    (``save_simulated_trade``, ``save_prediction_signal(s)``,
+    ``update_signal_traded``); they only queue rows. :meth:`flush` /
+    :meth:`aflush` commit everything queued in ONE transaction. Every other
+    attribute (getters, ``check_trade_exists`` …) is read from the wrapped
+    store, so the queue can be passed wherever a ``DataStore`` is expected.
+
+    Queued rows are visible to the getters once flushed — pipelines flush at
+    the end of each tick. When the batch transaction fails, the rows are
+    committed one by one: a row the DB rejects (constraint violation, bad
+    binding) is logged and dropped, and a row that keeps failing is dropped
+    after ``max_attempts`` flushes, so one bad row cannot block the rows
+    queued behind it. :meth:`close` (also run at interpreter exit) flushes
+    what is left.
+    """
+
+    def __init__(self, store: DataStore, max_attempts: int = 3) -> None:
+        self.store = store
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Serialises flushes so rows are committed in queue order
+        self._flush_lock = threading.Lock()
+        # (sql, row, failed flushes so far)
+        self._pending: List[Tuple[str, tuple, int]] = []
+        # Rows dropped by the last flush
+        self.rejected: List[Tuple[str, tuple]] = []
+        self.transactions: int = 0
+        _OPEN_QUEUES.add(self)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "store":
+            raise AttributeError(name)
+        return getattr(self.store, name)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _enqueue(self, sql: str, rows: Iterable[tuple]) -> None:
+        with self._lock:
+            self._pending.extend((sql, row, 0) for row in rows)
+
+    # ------------------------------------------------------------------
+    # Queued writes (same signatures as DataStore)
+    # ------------------------------------------------------------------
+
+    def save_simulated_trade(self, trade: Any) -> None:
+        self._enqueue(INSERT_SIMULATED_TRADE_SQL, [_simulated_trade_row(trade)])
+
+    def save_prediction_signal(self, signal: Any) -> str:
+        return self.save_prediction_signals([signal])[0]
+
+    def save_prediction_signals(
+        self,
+        signals: Sequence[Any],
+        trade_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[str]:
+        if trade_ids is None:
+            trade_ids = [None] * len(signals)
+        signal_ids = [str(uuid.uuid4()) for _ in signals]
+        self._enqueue(INSERT_PREDICTION_SIGNAL_SQL, [
+            _prediction_signal_row(signal, signal_id, trade_id)
+            for signal, signal_id, trade_id in zip(signals, signal_ids, trade_ids)
+        ])
+        return signal_ids
+
+    def update_signal_traded(self, signal_id: str, trade_id: str) -> None:
+        self._enqueue(UPDATE_SIGNAL_TRADED_SQL, [(trade_id, signal_id)])
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Commit all queued rows in one transaction; returns the committed row count."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            self.rejected = []
+            if not batch:
+                return 0
+            try:
+                self._commit(batch)
+            except Exception as e:
+                logger.warning(f"WriteBehindQueue: batch of {len(batch)} rows failed ({e}), committing row by row")
+                return self._commit_rows(batch)
+            self.transactions += 1
+            return len(batch)
+
+    def _commit(self, batch: List[Tuple[str, tuple, int]]) -> None:
+        with self.store._get_connection() as conn:
+            # Consecutive rows of the same statement go through one executemany
+            start = 0
+            for end in range(1, len(batch) + 1):
+                if end == len(batch) or batch[end][0] != batch[start][0]:
+                    conn.executemany(batch[start][0], [row for _, row, _ in batch[start:end]])
+                    start = end
+
+    def _commit_rows(self, batch: List[Tuple[str, tuple, int]]) -> int:
+        committed = 0
+        retry: List[Tuple[str, tuple, int]] = []
+        for sql, row, attempts in batch:
+            try:
+                self._commit([(sql, row, attempts)])
+            except (sqlite3.IntegrityError, sqlite3.InterfaceError) as e:
+                # Fails the same way every time: retrying would only block the queue
+                logger.error(f"WriteBehindQueue: dropping rejected row {row!r}: {e}")
+                self.rejected.append((sql, row))
+            except Exception as e:
+                if attempts + 1 >= self.max_attempts:
+                    logger.error(f"WriteBehindQueue: dropping row {row!r} after {attempts + 1} failed flushes: {e}")
+                    self.rejected.append((sql, row))
+                else:
+                    retry.append((sql, row, attempts + 1))
+            else:
+                committed += 1
+                self.transactions += 1
+        if retry:
+            with self._lock:
+                self._pending[:0] = retry
+        return committed
+
+    def unsaved_trade_ids(self) -> Set[str]:
+        """Ids of queued trades that are not committed: still queued or dropped by the last flush."""
+        with self._lock:
+            rows = [(sql, row) for sql, row, _ in self._pending] + self.rejected
+        return {row[0] for sql, row in rows if sql == INSERT_SIMULATED_TRADE_SQL}
+
+    async def aflush(self) -> int:
+        """:meth:`flush` off the event loop."""
+        return await asyncio.to_thread(self.flush)
+
+    def close(self) -> None:
+        """Flush what is left and stop tracking the queue for the exit hook."""
+        self.flush()
+        _OPEN_QUEUES.discard(self)
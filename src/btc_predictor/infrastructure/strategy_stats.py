@@ -0,0 +1,300 @@
+"""
+btc_predictor/infrastructure/strategy_stats.py
+----------------------------------------------
+Grouped trade statistics for every (strategy, timeframe) at once
+
+職責:
+- 一次 GROUP BY 聚合取得所有 (strategy, timeframe) 的筆數 / 勝場 / 方向分拆
+  / PnL，加上一次依組別與時間排序的 PnL 讀取，以 NumPy 向量化計算最大回撤
+  (定義同 ``DataStore.get_strategy_detail``)
+- ``StrategyStatsCache``: 之後每次只讀取新插入的列與先前未結算的列，
+  只更新有變動的組別；沒有新結算時只是兩個 rowid 查詢
+
+Sources:
+
+- ``simulated``:  simulated_trades (settled = result set, win = 'win',
+  curve ordered by open_time)
+- ``polymarket``: pm_orders joined to prediction_signals (settled = pnl set,
+  win = pnl > 0, curve ordered by placed_at)
+
+Rows are never deleted and a settled row is not settled again; a pending row
+becomes settled at most once. A settlement that lands before the end of its
+group's curve (an older trade settling late) re-reads that group's curve.
+The cache is per process.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+GroupKey = Tuple[str, int]
+
+# SQLite's default host-parameter limit is 999 on older builds
+_IN_CHUNK = 900
+
+
+class StatsSource(NamedTuple):
+    """SQL expressions of one trade source."""
+    table: str
+    rowid: str
+    strategy: str
+    timeframe: str
+    time: str
+    direction: str
+    settled: str
+    win: str
+    pnl: str
+    curve_order: str    # order of the PnL curve within a group
+
+    def rows_sql(self, where: str = "") -> str:
+        """rowid, strategy, timeframe, time_ms, higher, lower, settled, win, pnl"""
+        return f"""
+            SELECT {self.rowid}, {self.strategy}, {self.timeframe}, {self.time},
+                {self.direction} = 'higher', {self.direction} = 'lower', {self.settled}, {self.win}, {self.pnl}
+            FROM {self.table} {where}
+        """
+
+    def grouped_sql(self) -> str:
+        """Counters of every group (same order as :attr:`GroupStats.COUNTERS`)."""
+        settled, win = self.settled, self.win
+        higher, lower = f"{self.direction} = 'higher'", f"{self.direction} = 'lower'"
+        return f"""
+            SELECT {self.strategy}, {self.timeframe},
+                SUM({settled}), SUM(NOT {settled}), COALESCE(SUM({settled} AND {win}), 0),
+                SUM({settled} AND {higher}), COALESCE(SUM({settled} AND {win} AND {higher}), 0),
+                SUM({settled} AND {lower}), COALESCE(SUM({settled} AND {win} AND {lower}), 0),
+                TOTAL(CASE WHEN {settled} THEN {self.pnl} END),
+                MAX(CASE WHEN {settled} THEN {self.time} END)
+            FROM {self.table}
+            GROUP BY {self.strategy}, {self.timeframe}
+            ORDER BY {self.strategy}, {self.timeframe}
+        """
+
+    def curve_sql(self, where: str = "") -> str:
+        """Settled PnL in curve order, groups in :meth:`grouped_sql` order."""
+        return f"""
+            SELECT {self.pnl} FROM {self.table}
+            WHERE {self.settled} {where}
+            ORDER BY {self.strategy}, {self.timeframe}, {self.curve_order}
+        """
+
+
+STATS_SOURCES: Dict[str, StatsSource] = {
+    "simulated": StatsSource(
+        table="simulated_trades", rowid="rowid",
+        strategy="strategy_name", timeframe="timeframe_minutes", time="open_time_ms",
+        direction="direction", settled="result IS NOT NULL", win="result = 'win'", pnl="pnl",
+        # (strategy, timeframe, open_time_ms) index order; ties by rowid
+        curve_order="open_time_ms",
+    ),
+    "polymarket": StatsSource(
+        table="pm_orders o JOIN prediction_signals s ON o.signal_id = s.id", rowid="o.rowid",
+        strategy="s.strategy_name", timeframe="s.timeframe_minutes", time="o.placed_at_ms",
+        direction="s.direction", settled="o.pnl IS NOT NULL", win="o.pnl > 0", pnl="o.pnl",
+        curve_order="o.placed_at_ms, o.rowid",
+    ),
+}
+
+
+def max_drawdown(pnl: np.ndarray) -> float:
+    """Largest fall of the cumulative PnL from its running peak (peak starts at 0)."""
+    if len(pnl) == 0:
+        return 0.0
+    equity = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+    return float(max((peak - equity).max(), 0.0))
+
+
+class TradeRows(NamedTuple):
+    """Columns of :meth:`StatsSource.rows_sql` as arrays."""
+    rowid: np.ndarray
+    strategy: np.ndarray
+    timeframe: np.ndarray
+    time_ms: np.ndarray
+    higher: np.ndarray
+    lower: np.ndarray
+    settled: np.ndarray
+    win: np.ndarray
+    pnl: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "TradeRows":
+        if not rows:
+            return cls(*(np.empty(0, dtype=dtype) for dtype in (
+                np.int64, object, np.int64, np.int64, bool, bool, bool, bool, np.float64)))
+        rowid, strategy, timeframe, time_ms, higher, lower, settled, win, pnl = zip(*rows)
+        return cls(
+            np.asarray(rowid, dtype=np.int64),
+            np.asarray(strategy, dtype=object),
+            np.asarray(timeframe, dtype=np.int64),
+            np.asarray([-1 if t is None else t for t in time_ms], dtype=np.int64),
+            np.asarray(higher, dtype=np.float64) == 1,
+            np.asarray(lower, dtype=np.float64) == 1,
+            np.asarray(settled, dtype=bool),
+            np.asarray(win, dtype=np.float64) == 1,   # NULL (pending) -> nan -> False
+            np.nan_to_num(np.asarray(pnl, dtype=np.float64)),
+        )
+
+
+class GroupStats:
+    """Counters and settled PnL curve of one (strategy, timeframe)."""
+
+    COUNTERS = ("settled", "pending", "wins", "higher_total", "higher_wins", "lower_total", "lower_wins")
+    __slots__ = COUNTERS + ("total_pnl", "last_time_ms", "pnl", "max_drawdown")
+
+    def __init__(self) -> None:
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.total_pnl = 0.0
+        self.last_time_ms: Optional[int] = None
+        self.pnl = np.empty(0, dtype=np.float64)
+        self.max_drawdown = 0.0
+
+    def add(self, rows: TradeRows) -> bool:
+        """Count ``rows`` (in curve order); False if the curve must be re-read."""
+        settled = rows.settled
+        self.pending += int((~settled).sum())
+        if not settled.any():
+            return True
+        won = settled & rows.win
+        self.settled += int(settled.sum())
+        self.wins += int(won.sum())
+        self.higher_total += int((settled & rows.higher).sum())
+        self.higher_wins += int((won & rows.higher).sum())
+        self.lower_total += int((settled & rows.lower).sum())
+        self.lower_wins += int((won & rows.lower).sum())
+        self.total_pnl += float(rows.pnl[settled].sum())
+
+        time_ms = rows.time_ms[settled]
+        in_order = self.last_time_ms is None or int(time_ms[0]) > self.last_time_ms
+        self.last_time_ms = int(time_ms[-1]) if in_order else max(int(time_ms[-1]), self.last_time_ms)
+        if in_order:
+            self.set_curve(np.concatenate((self.pnl, rows.pnl[settled])))
+        return in_order
+
+    def set_curve(self, pnl: np.ndarray) -> None:
+        self.pnl = pnl
+        self.max_drawdown = max_drawdown(pnl)
+
+    def as_dict(self) -> dict:
+        return {
+            "settled": self.settled, "pending": self.pending,
+            "wins": self.wins, "da": self.wins / self.settled if self.settled > 0 else 0.0,
+            "higher_total": self.higher_total, "higher_wins": self.higher_wins,
+            "higher_da": self.higher_wins / self.higher_total if self.higher_total > 0 else 0.0,
+            "lower_total": self.lower_total, "lower_wins": self.lower_wins,
+            "lower_da": self.lower_wins / self.lower_total if self.lower_total > 0 else 0.0,
+            "total_pnl": self.total_pnl, "max_drawdown": self.max_drawdown,
+        }
+
+
+class StrategyStatsCache:
+    """Incrementally maintained stats of every (strategy, timeframe).
+
+    The first :meth:`get` runs one grouped aggregation plus one ordered PnL
+    read for all groups (in one read transaction); later calls read only rows
+    inserted since (``rowid`` above the last one seen) and the rows that were
+    still pending.
+
+    Args:
+        store:  ``DataStore`` (anything with ``_get_connection``).
+        source: Key of :data:`STATS_SOURCES`.
+    """
+
+    def __init__(self, store: Any, source: str = "simulated") -> None:
+        self.store = store
+        self.source = STATS_SOURCES[source]
+        self.groups: Dict[GroupKey, GroupStats] = {}
+        self._pending: Dict[int, GroupKey] = {}
+        self._max_rowid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, timeframe: Optional[int] = None) -> Dict[GroupKey, dict]:
+        """``{(strategy, timeframe): detail dict}``, refreshed first."""
+        with self._lock:
+            if self._max_rowid is None:
+                self._load()
+            else:
+                self._refresh()
+            return {
+                key: group.as_dict() for key, group in self.groups.items()
+                if timeframe is None or key[1] == timeframe
+            }
+
+    def _load(self) -> None:
+        source = self.source
+        with self.store._get_connection() as conn:
+            # One snapshot for all reads (WAL: writers are not blocked)
+            conn.execute("BEGIN")
+            try:
+                max_rowid = conn.execute(f"SELECT COALESCE(MAX({source.rowid}), 0) FROM {source.table}").fetchone()[0]
+                grouped = conn.execute(source.grouped_sql()).fetchall()
+                pnl = np.array(conn.execute(source.curve_sql()).fetchall(), dtype=np.float64).reshape(-1)
+                pending = conn.execute(
+                    f"SELECT {source.rowid}, {source.strategy}, {source.timeframe} "
+                    f"FROM {source.table} WHERE NOT ({source.settled})"
+                ).fetchall()
+            finally:
+                conn.execute("COMMIT")
+
+        pnl = np.nan_to_num(pnl)
+        offset = 0
+        for strategy, timeframe, *counters, total_pnl, last_time_ms in grouped:
+            group = self.groups[(strategy, timeframe)] = GroupStats()
+            for name, value in zip(GroupStats.COUNTERS, counters):
+                setattr(group, name, int(value))
+            group.total_pnl = float(total_pnl)
+            group.last_time_ms = last_time_ms
+            group.set_curve(pnl[offset:offset + group.settled])
+            offset += group.settled
+        self._pending = {rowid: (strategy, timeframe) for rowid, strategy, timeframe in pending}
+        self._max_rowid = max_rowid
+
+    def _refresh(self) -> None:
+        source = self.source
+        with self.store._get_connection() as conn:
+            fetched = conn.execute(source.rows_sql(f"WHERE {source.rowid} > ?"), (self._max_rowid,)).fetchall()
+            pending = list(self._pending)
+            for i in range(0, len(pending), _IN_CHUNK):
+                chunk = pending[i:i + _IN_CHUNK]
+                fetched += conn.execute(
+                    source.rows_sql(f"WHERE {source.rowid} IN ({', '.join('?' * len(chunk))}) AND {source.settled}"),
+                    chunk,
+                ).fetchall()
+        if not fetched:
+            return
+
+        # (strategy, timeframe, time, rowid): curve order within each group
+        fetched.sort(key=lambda row: (row[1], row[2], row[3] or 0, row[0]))
+        stale = []
+        start = 0
+        for end in range(1, len(fetched) + 1):
+            if end < len(fetched) and fetched[end][1:3] == fetched[start][1:3]:
+                continue
+            key: GroupKey = tuple(fetched[start][1:3])
+            rows = TradeRows.from_rows(fetched[start:end])
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = GroupStats()
+            for rowid in rows.rowid.tolist():
+                if self._pending.pop(rowid, None) is not None:
+                    group.pending -= 1      # counted again below if still pending
+                self._max_rowid = max(self._max_rowid, rowid)
+            if not group.add(rows):
+                stale.append(key)
+            for rowid in rows.rowid[~rows.settled].tolist():
+                self._pending[rowid] = key
+            start = end
+
+        for key in stale:
+            self._reload_curve(key)
+
+    def _reload_curve(self, key: GroupKey) -> None:
+        source = self.source
+        with self.store._get_connection() as conn:
+            pnl = conn.execute(
+                source.curve_sql(f"AND {source.strategy} = ? AND {source.timeframe} = ?"), key
+            ).fetchall()
+        self.groups[key].set_curve(np.nan_to_num(np.array(pnl, dtype=np.float64).reshape(-1)))
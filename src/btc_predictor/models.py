@@ -16,6 +16,7 @@ class PredictionSignal:
     # === Polymarket 擴展欄位 ===
     market_slug: str | None = None
     market_price_up: float | None = None
+    entry_price: float | None = None                    # 進場價 (alpha = confidence - entry_price)
     alpha: float | None = None
     order_type: Literal["GTC", "FOK", "GTD"] | None = None
 
@@ -1,9 +1,83 @@
+import asyncio
 import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
 import httpx
-from typing import Any, Dict, List, Optional
+import numpy as np
+
+from btc_predictor.polymarket.http_pool import PooledHTTPClient
 
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class OrderbookBatch:
+    """
+    Parsed top of book for many tokens, one array slot per token (NaN when a
+    side is empty or the fetch failed).
+
+    ``fill_price[i, j]`` is the average price paid to buy ``depth_usd[j]``
+    dollars of token i by walking its asks (NaN if the book is too thin).
+    ``books`` holds the raw responses only when requested.
+    """
+    token_ids: List[str]
+    best_bid: np.ndarray
+    best_ask: np.ndarray
+    spread: np.ndarray
+    midpoint: np.ndarray
+    bid_size: np.ndarray
+    ask_size: np.ndarray
+    depth_usd: tuple
+    fill_price: np.ndarray
+    books: Optional[List[Dict[str, Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def quote(self, token_id: str) -> Optional[Dict[str, float]]:
+        """Scalar view of one token's row, or None if it was not fetched."""
+        try:
+            i = self.token_ids.index(token_id)
+        except ValueError:
+            return None
+        return {
+            "best_bid": float(self.best_bid[i]),
+            "best_ask": float(self.best_ask[i]),
+            "spread": float(self.spread[i]),
+            "midpoint": float(self.midpoint[i]),
+        }
+
+
+def _levels(orders: List[Dict[str, Any]]) -> np.ndarray:
+    """(price, size) rows of one book side; unparsable levels are dropped."""
+    rows = []
+    for order in orders or []:
+        try:
+            rows.append((float(order["price"]), float(order["size"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return np.array(rows, dtype=float).reshape(-1, 2)
+
+
+def _fill_prices(asks: np.ndarray, depth_usd: Sequence[float]) -> np.ndarray:
+    """Average price to buy each USD notional, walking asks from the cheapest."""
+    out = np.full(len(depth_usd), np.nan)
+    if not len(asks):
+        return out
+    asks = asks[np.argsort(asks[:, 0], kind="stable")]
+    price, size = asks[:, 0], asks[:, 1]
+    notional = np.cumsum(price * size)
+    shares = np.cumsum(size)
+    for j, usd in enumerate(depth_usd):
+        k = np.searchsorted(notional, usd)  # first level that completes the fill
+        if k >= len(notional) or price[k] <= 0:
+            continue
+        before_usd = notional[k - 1] if k else 0.0
+        before_shares = shares[k - 1] if k else 0.0
+        out[j] = usd / (before_shares + (usd - before_usd) / price[k])
+    return out
+
+
 class CLOBClient:
     """
     Client for Polymarket CLOB API (Read-only).
@@ -11,24 +85,45 @@ class CLOBClient:
     """
     BASE_URL = "https://clob.polymarket.com"
 
-    def __init__(self, timeout: float = 10.0):
+    # Seconds a response is reused by later identical requests
+    CACHE_TTL = 1.0
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        base_url: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.timeout = timeout
+        self.http = PooledHTTPClient(
+            base_url or self.BASE_URL,
+            timeout=timeout,
+            cache_ttl=self.CACHE_TTL if cache_ttl is None else cache_ttl,
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
 
     async def get_markets(self) -> List[Dict[str, Any]]:
         """
         Fetch all available markets from CLOB.
         """
-        url = f"{self.BASE_URL}/markets"
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, timeout=self.timeout)
-                resp.raise_for_status()
-                # The response is a list of markets in the 'data' field sometimes, 
-                # but based on vps_verify.py, it's often a list directly or in 'data'
-                data = resp.json()
-                if isinstance(data, dict) and "data" in data:
-                    return data["data"]
-                return data
+            data = await self.http.get_json("/markets")
+            # The response is a list of markets in the 'data' field sometimes, 
+            # but based on vps_verify.py, it's often a list directly or in 'data'
+            if isinstance(data, dict) and "data" in data:
+                return data["data"]
+            return data
         except httpx.TimeoutException:
             logger.warning("CLOB API timeout while fetching markets")
             return []
@@ -43,12 +138,8 @@ class CLOBClient:
         """
         Fetch specific market details from CLOB.
         """
-        url = f"{self.BASE_URL}/markets/{condition_id}"
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, timeout=self.timeout)
-                resp.raise_for_status()
-                return resp.json()
+            return await self.http.get_json(f"/markets/{condition_id}")
         except httpx.TimeoutException:
             logger.warning(f"CLOB API timeout while fetching market {condition_id}")
             return None
@@ -65,13 +156,9 @@ class CLOBClient:
         """
         Fetch order book for a specific token.
         """
-        url = f"{self.BASE_URL}/book"
         params = {"token_id": token_id}
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, params=params, timeout=self.timeout)
-                resp.raise_for_status()
-                return resp.json()
+            return await self.http.get_json("/book", params)
         except httpx.TimeoutException:
             logger.warning(f"CLOB API timeout while fetching book for {token_id}")
             return {}
@@ -82,6 +169,54 @@ class CLOBClient:
             logger.error(f"Unexpected error fetching CLOB book for {token_id}: {e}", exc_info=True)
             return {}
 
+    async def get_orderbooks(
+        self,
+        token_ids: Sequence[str],
+        max_concurrency: int = 16,
+        depth_usd: Sequence[float] = (50.0, 100.0),
+        keep_books: bool = False,
+    ) -> OrderbookBatch:
+        """
+        Fetch many order books concurrently (at most ``max_concurrency`` in
+        flight) and parse them into an ``OrderbookBatch``. Failed fetches
+        leave NaN in their slots.
+        """
+        token_ids = list(token_ids)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(token_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_orderbook(token_id)
+
+        books = await asyncio.gather(*(fetch(t) for t in token_ids))
+
+        n, depth_usd = len(token_ids), tuple(depth_usd)
+        best_bid, best_ask = np.full(n, np.nan), np.full(n, np.nan)
+        bid_size, ask_size = np.zeros(n), np.zeros(n)
+        fill_price = np.full((n, len(depth_usd)), np.nan)
+        for i, book in enumerate(books):
+            bids, asks = _levels(book.get("bids")), _levels(book.get("asks"))
+            if len(bids):
+                best_bid[i] = bids[:, 0].max()
+                bid_size[i] = bids[:, 1].sum()
+            if len(asks):
+                best_ask[i] = asks[:, 0].min()
+                ask_size[i] = asks[:, 1].sum()
+                fill_price[i] = _fill_prices(asks, depth_usd)
+
+        return OrderbookBatch(
+            token_ids=token_ids,
+            best_bid=best_bid,
+            best_ask=best_ask,
+            spread=best_ask - best_bid,
+            midpoint=(best_ask + best_bid) / 2.0,
+            bid_size=bid_size,
+            ask_size=ask_size,
+            depth_usd=depth_usd,
+            fill_price=fill_price,
+            books=list(books) if keep_books else None,
+        )
+
     async def get_price(self, token_id: str) -> Optional[float]:
         """
         Get the current mid price (roughly) from the order book.
@@ -3,6 +3,8 @@ import httpx
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+from btc_predictor.polymarket.http_pool import PooledHTTPClient
+
 logger = logging.getLogger(__name__)
 
 class GammaClient:
@@ -12,14 +14,38 @@ class GammaClient:
     """
     BASE_URL = "https://gamma-api.polymarket.com"
 
-    def __init__(self, timeout: float = 10.0):
+    # Seconds a response is reused by later identical requests
+    CACHE_TTL = 5.0
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        base_url: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.timeout = timeout
+        self.http = PooledHTTPClient(
+            base_url or self.BASE_URL,
+            timeout=timeout,
+            cache_ttl=self.CACHE_TTL if cache_ttl is None else cache_ttl,
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
 
     async def fetch_events(self, query: str = "Bitcoin", active: bool = True, closed: bool = False, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Fetch events from Gamma API.
         """
-        url = f"{self.BASE_URL}/events"
         params = {
             "tag_id": 1312, # Crypto Prices
             "active": "true" if active else "false",
@@ -27,11 +53,8 @@ class GammaClient:
             "limit": limit
         }
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, params=params, timeout=self.timeout)
-                resp.raise_for_status()
-                events = resp.json()
-                return [e for e in events if query.lower() in e.get('title', '').lower()]
+            events = await self.http.get_json("/events", params)
+            return [e for e in events if query.lower() in e.get('title', '').lower()]
         except httpx.TimeoutException:
             logger.warning("Gamma API timeout while fetching events", exc_info=True)
             return []
@@ -46,14 +69,10 @@ class GammaClient:
         """
         Fetch market details by condition ID.
         """
-        url = f"{self.BASE_URL}/markets"
         params = {"condition_id": condition_id}
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, params=params, timeout=self.timeout)
-                resp.raise_for_status()
-                markets = resp.json()
-                return markets[0] if markets else None
+            markets = await self.http.get_json("/markets", params)
+            return markets[0] if markets else None
         except httpx.TimeoutException:
             logger.warning(f"Gamma API timeout while fetching market {condition_id}")
             return None
@@ -0,0 +1,119 @@
+"""
+src/btc_predictor/polymarket/http_pool.py
+------------------------------------------
+Polymarket REST 共用連線池
+
+職責:
+- 每個 API client 持有一個長壽命 httpx.AsyncClient (HTTP/2 + keep-alive)
+- 合併同時進行中的相同 GET 請求 (同一 URL + params 只發一次)
+- 以短 TTL 快取 JSON 回應 (寫入時清除過期項目，並限制快取筆數)
+
+Responses handed out are shared between coalesced callers and cache hits —
+treat them as read-only. Failed requests are never cached; every waiter of a
+coalesced request sees the same exception.
+"""
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional ``h2`` package (httpx[http2]); fall back to HTTP/1.1 keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class PooledHTTPClient:
+    """Long-lived pooled GET client with request coalescing and a short-TTL JSON cache."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        cache_ttl: float = 1.0,
+        max_connections: int = 20,
+        max_cache_entries: int = 1024,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.max_connections = max_connections
+        self.max_cache_entries = max_cache_entries
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[_Key, asyncio.Future] = {}
+        self._cache: Dict[_Key, Tuple[float, Any]] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client, created on first use (inside the running loop)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None, ttl: Optional[float] = None) -> Any:
+        """
+        GET ``base_url + path`` and return the decoded JSON body.
+        Raises httpx exceptions like ``AsyncClient.get`` + ``raise_for_status``.
+        """
+        key = (path, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        ttl = self.cache_ttl if ttl is None else ttl
+        now = time.monotonic()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                return cached[1]
+            del self._cache[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(path, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t, ttl))
+        # Shielded: a cancelled caller does not cancel the request other callers share
+        return await asyncio.shield(task)
+
+    async def _fetch(self, path: str, params: Optional[Dict[str, Any]]) -> Any:
+        resp = await self.client.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _finish(self, key: _Key, task: asyncio.Future, ttl: float) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if ttl > 0:
+            now = time.monotonic()
+            # Keys that are never requested again (e.g. /book of expired markets' tokens) go here
+            expired = [k for k, (expires, _) in self._cache.items() if expires <= now]
+            for k in expired:
+                del self._cache[k]
+            self._cache.pop(key, None)
+            while self._cache and len(self._cache) >= self.max_cache_entries:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = (now + ttl, task.result())
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._cache.clear()
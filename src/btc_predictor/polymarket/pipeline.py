@@ -2,15 +2,20 @@ import asyncio
 import logging
 import uuid
 import json
-from typing import Any, List
+import math
+from typing import Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 import pandas as pd
 
 from btc_predictor.infrastructure.store import DataStore
 from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.feature_cache import FeatureCache
+from btc_predictor.strategies.scheduler import InferenceScheduler
 from btc_predictor.polymarket.tracker import PolymarketTracker
+from btc_predictor.polymarket.clob_client import CLOBClient, OrderbookBatch
 from btc_predictor.models import PredictionSignal, SimulatedTrade, PolymarketOrder
+from btc_predictor.simulation.risk import RiskState
 from btc_predictor.utils.config import load_constants
 
 logger = logging.getLogger(__name__)
@@ -31,12 +36,24 @@ class PolymarketLivePipeline:
         store: DataStore,
         tracker: PolymarketTracker,
         bot: Any = None,
+        scheduler: Optional[InferenceScheduler] = None,
+        clob_client: Optional[CLOBClient] = None,
     ) -> None:
         self.strategies = strategies
         self.store = store
         self.tracker = tracker
         self.bot = bot
         self.trigger_count: int = 0
+        # Features shared by strategies with the same feature set on one candle
+        self.feature_cache = FeatureCache()
+        # Concurrent predict of all strategies triggered on one candle
+        self.scheduler = scheduler or InferenceScheduler()
+        # Risk counters, reloaded from the DB every tick: this process runs no
+        # settler, so settlements only reach it through the DB
+        self.risk_state = RiskState(store)
+        # Opt-in: price entries at the live order book's best ask instead of
+        # Gamma's close_price (alpha_thresholds were tuned against the latter)
+        self.clob_client = clob_client
         self._feed: Any = None
         
         constants = load_constants()
@@ -80,114 +97,163 @@ class PolymarketLivePipeline:
         self.trigger_count += 1
         logger.info(f"PolymarketLivePipeline: Triggering strategies for {timeframe}m…")
 
-        for strategy in self.strategies:
-            if timeframe not in strategy.available_timeframes:
-                continue
+        strategies = [s for s in self.strategies if timeframe in s.available_timeframes]
+        if not strategies:
+            return
+
+        # Order books of the active market load while the strategies predict
+        books_task = None
+        pm_market = self.tracker.get_active_market(timeframe) if self.clob_client else None
+        if pm_market:
+            books_task = asyncio.create_task(self.clob_client.get_orderbooks(
+                [pm_market.get("up_token_id"), pm_market.get("down_token_id")]
+            ))
 
+        # 1. Prediction (CPU-intensive — fanned out to the inference pool)
+        results = await self.scheduler.run(strategies, ohlcv, timeframe, self.feature_cache)
+
+        books = None
+        if books_task is not None:
             try:
-                # 1. Prediction (CPU-intensive — offloaded to thread)
-                signal: PredictionSignal = await asyncio.to_thread(strategy.predict, ohlcv, timeframe)
+                books = await books_task
+            except Exception as e:
+                logger.error(f"PolymarketLivePipeline: Orderbook fetch error: {e}", exc_info=True)
 
-                # 2. Decision & Simulate Stage
-                pm_market = self.tracker.get_active_market(timeframe)
-                
-                market_price = None
-                market_slug = None
-                
-                if pm_market:
-                    market_slug = pm_market.get("slug")
-                    market_price_up = pm_market.get("close_price")
-                    if market_price_up is not None:
-                        if signal.direction == "higher":
-                            market_price = market_price_up
-                        else:
-                            market_price = 1.0 - market_price_up
-                        
-                        signal.market_slug = market_slug
-                        signal.market_price_up = market_price_up
-                        signal.alpha = signal.confidence - market_price
-
-                # Check Risk (daily loss, max trades, consecutive losses)
-                from btc_predictor.simulation.risk import should_trade
-                
-                from datetime import timezone
-                # Get stats for today
-                today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-                daily_stats = self.store.get_daily_stats(strategy.name, today_str)
-                can_trade = should_trade(
-                    daily_stats.get("daily_loss", 0.0),
-                    daily_stats.get("consecutive_losses", 0),
-                    daily_stats.get("daily_trades", 0)
-                )
-
-                strat_threshold = self.alpha_thresholds.get(strategy.name)
-                if isinstance(strat_threshold, dict):
-                    threshold = strat_threshold.get(timeframe)
+        # One snapshot query per tick picks up trades settled by the Binance process
+        try:
+            await asyncio.to_thread(self.risk_state.load)
+        except Exception as e:
+            logger.error(f"PolymarketLivePipeline: Risk state reload error: {e}", exc_info=True)
+
+        contexts = []
+        for strategy, signal in results:
+            try:
+                contexts.append(self._execution_context(strategy, signal, timeframe, books))
+            except Exception as e:
+                logger.error(f"PolymarketLivePipeline: Error triggering {strategy.name} for {timeframe}m: {e}", exc_info=True)
+        if not contexts:
+            return
+
+        # Execute one transaction for the whole tick
+        saved = contexts
+        try:
+            self.store.save_polymarket_execution_contexts(contexts)
+        except Exception as e:
+            logger.error(f"PolymarketLivePipeline: DB Transaction error: {e}", exc_info=True)
+            # Retry one transaction per strategy so a single bad row does not drop the tick
+            saved = []
+            for context in contexts:
+                try:
+                    self.store.save_polymarket_execution_context(*context)
+                    saved.append(context)
+                except Exception as e:
+                    logger.error(f"PolymarketLivePipeline: DB Transaction error for {context[0].strategy_name}: {e}", exc_info=True)
+
+        for signal, trade, order in saved:
+            if trade and order:
+                self.risk_state.record_trade(trade)
+                logger.info(f"PolymarketLivePipeline: Placed SimulatedTrade {trade.id} and PolymarketOrder {order.order_id} for {signal.strategy_name} ({timeframe}m)")
+                if self.bot:
+                    try:
+                        await self.bot.send_signal(trade)
+                    except Exception as e:
+                        logger.error(f"PolymarketLivePipeline: Discord notification error: {e}", exc_info=True)
+
+    def _execution_context(
+        self, strategy: BaseStrategy, signal: PredictionSignal, timeframe: int,
+        books: Optional[OrderbookBatch] = None,
+    ) -> Tuple[PredictionSignal, Optional[SimulatedTrade], Optional[PolymarketOrder]]:
+        """
+        Market enrichment, risk and alpha check for one signal → (signal, trade, order).
+        With ``books``, the price paid is the best ask of the token bought;
+        ``signal.entry_price`` records the price alpha was computed against.
+        """
+        # 2. Decision & Simulate Stage
+        pm_market = self.tracker.get_active_market(timeframe)
+        
+        market_price = None
+        market_slug = None
+        
+        if pm_market:
+            market_slug = pm_market.get("slug")
+            market_price_up = pm_market.get("close_price")
+            if market_price_up is not None:
+                if signal.direction == "higher":
+                    market_price = market_price_up
                 else:
-                    threshold = strat_threshold
-                        
-                threshold = threshold if threshold is not None else 0.02
+                    market_price = 1.0 - market_price_up
+
+            token_key = "up_token_id" if signal.direction == "higher" else "down_token_id"
+            quote = books.quote(pm_market.get(token_key)) if books is not None else None
+            if quote is not None and math.isfinite(quote["best_ask"]):
+                market_price = quote["best_ask"]
+
+            if market_price is not None:
+                signal.market_slug = market_slug
+                signal.market_price_up = market_price_up
+                signal.entry_price = market_price
+                signal.alpha = signal.confidence - market_price
+
+        # Check Risk (daily loss, max trades, consecutive losses)
+        from datetime import timezone
+        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        can_trade = self.risk_state.can_trade(strategy.name, today_str)
+
+        strat_threshold = self.alpha_thresholds.get(strategy.name)
+        if isinstance(strat_threshold, dict):
+            threshold = strat_threshold.get(timeframe)
+        else:
+            threshold = strat_threshold
                 
-                trade = None
-                order = None
-                trade_id = None
-                order_id = None
-                bet_amount = float(self.risk_cfg.get("bet_range", [10, 100])[0])
-
-                should_bet = signal.alpha is not None and signal.alpha > threshold and can_trade
-
-                if should_bet:
-                    trade_id = str(uuid.uuid4())
-                    
-                    # Convert pandas timestamp to standard datetime to avoid timezone issues/bugs
-                    timestamp_dt = signal.timestamp
-                    if isinstance(timestamp_dt, pd.Timestamp):
-                        timestamp_dt = timestamp_dt.to_pydatetime()
-                        
-                    expiry_dt = timestamp_dt + timedelta(minutes=timeframe)
-                        
-                    trade = SimulatedTrade(
-                        id=trade_id,
-                        strategy_name=strategy.name,
-                        direction=signal.direction,
-                        confidence=signal.confidence,
-                        timeframe_minutes=signal.timeframe_minutes,
-                        bet_amount=bet_amount,
-                        open_time=timestamp_dt,
-                        open_price=signal.current_price,
-                        expiry_time=expiry_dt,
-                        features_used=signal.features_used
-                    )
-                    
-                    side = "BUY"
-                    up_token_id = pm_market.get("up_token_id") if pm_market else "mock_token_up"
-                    down_token_id = pm_market.get("down_token_id") if pm_market else "mock_token_down"
-                    token_id = up_token_id if signal.direction == "higher" else down_token_id
-                    
-                    order_id = str(uuid.uuid4())
-                    order = PolymarketOrder(
-                        signal_id="PLACEHOLDER", # Will be replaced
-                        order_id=order_id,
-                        token_id=token_id,
-                        side=side,
-                        price=market_price if market_price else 0.5,
-                        size=bet_amount / (market_price if market_price else 0.5),
-                        order_type="GTC",
-                        status="OPEN",
-                        placed_at=timestamp_dt
-                    )
-
-                # Execute transaction using DataStore connection
-                try:
-                    self.store.save_polymarket_execution_context(signal, trade, order)
-                    if should_bet and trade and order:
-                        logger.info(f"PolymarketLivePipeline: Placed SimulatedTrade {trade.id} and PolymarketOrder {order.order_id} for {strategy.name} ({timeframe}m)")
-                        if self.bot:
-                            await self.bot.send_signal(trade)
+        threshold = threshold if threshold is not None else 0.02
+        
+        trade = None
+        order = None
+        trade_id = None
+        order_id = None
+        bet_amount = float(self.risk_cfg.get("bet_range", [10, 100])[0])
 
-                except Exception as e:
-                    logger.error(f"PolymarketLivePipeline: DB Transaction error: {e}", exc_info=True)
+        should_bet = signal.alpha is not None and signal.alpha > threshold and can_trade
 
-            except Exception as e:
-                logger.error(f"PolymarketLivePipeline: Error triggering {strategy.name} for {timeframe}m: {e}", exc_info=True)
+        if should_bet:
+            trade_id = str(uuid.uuid4())
+            
+            # Convert pandas timestamp to standard datetime to avoid timezone issues/bugs
+            timestamp_dt = signal.timestamp
+            if isinstance(timestamp_dt, pd.Timestamp):
+                timestamp_dt = timestamp_dt.to_pydatetime()
+                
+            expiry_dt = timestamp_dt + timedelta(minutes=timeframe)
+                
+            trade = SimulatedTrade(
+                id=trade_id,
+                strategy_name=strategy.name,
+                direction=signal.direction,
+                confidence=signal.confidence,
+                timeframe_minutes=signal.timeframe_minutes,
+                bet_amount=bet_amount,
+                open_time=timestamp_dt,
+                open_price=signal.current_price,
+                expiry_time=expiry_dt,
+                features_used=signal.features_used
+            )
+            
+            side = "BUY"
+            up_token_id = pm_market.get("up_token_id") if pm_market else "mock_token_up"
+            down_token_id = pm_market.get("down_token_id") if pm_market else "mock_token_down"
+            token_id = up_token_id if signal.direction == "higher" else down_token_id
+            
+            order_id = str(uuid.uuid4())
+            order = PolymarketOrder(
+                signal_id="PLACEHOLDER", # Will be replaced
+                order_id=order_id,
+                token_id=token_id,
+                side=side,
+                price=market_price if market_price else 0.5,
+                size=bet_amount / (market_price if market_price else 0.5),
+                order_type="GTC",
+                status="OPEN",
+                placed_at=timestamp_dt
+            )
 
+        return signal, trade, order
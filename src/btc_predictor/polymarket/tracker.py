@@ -1,7 +1,7 @@
 import logging
 import asyncio
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from btc_predictor.polymarket.gamma_client import GammaClient
 from btc_predictor.infrastructure.store import DataStore
 
@@ -10,10 +10,18 @@ logger = logging.getLogger(__name__)
 class PolymarketTracker:
     """
     Tracks Polymarket market lifecycles and syncs them to DataStore.
+
+    Active markets are also kept in memory, keyed by (timeframe, end_time), so
+    ``get_active_market`` is a dictionary read on the prediction path. The
+    index is refreshed by ``sync_active_markets``; DataStore is written off
+    the event loop and only consulted for timeframes no sync has covered yet.
     """
     def __init__(self, gamma_client: GammaClient, store: DataStore):
         self.gamma_client = gamma_client
         self.store = store
+        # (timeframe_minutes, end_time) -> market row as saved to pm_markets
+        self._markets: Dict[Tuple[int, datetime], Dict[str, Any]] = {}
+        self._synced_timeframes: set = set()
 
     async def sync_active_markets(self, timeframes: List[int] = [5, 15]):
         """
@@ -23,7 +31,7 @@ class PolymarketTracker:
         logger.info(f"Syncing active Polymarket BTC markets for timeframes: {timeframes}")
         raw_markets = await self.gamma_client.get_active_5m_btc_markets()
         
-        synced_count = 0
+        synced: List[Tuple[Tuple[int, datetime], Dict[str, Any]]] = []
         for m in raw_markets:
             try:
                 # Parse start/end times to determine timeframe
@@ -40,13 +48,13 @@ class PolymarketTracker:
                 duration_min = round((end_dt - start_dt).total_seconds() / 60)
                 
                 # Check if it matches requested timeframes (with some slack)
-                matched = False
+                matched = None
                 for tf in timeframes:
                     if abs(duration_min - tf) <= 1:
-                        matched = True
+                        matched = tf
                         break
                 
-                if not matched:
+                if matched is None:
                     continue
 
                 # Extract token IDs. Usually tokens[0] is 'Yes' (Up), tokens[1] is 'No' (Down)
@@ -78,19 +86,49 @@ class PolymarketTracker:
                     "close_price": float(m_price) if m_price is not None else None
                 }
                 
-                self.store.save_pm_market(market_data)
-                synced_count += 1
+                synced.append(((matched, self._as_utc(end_dt)), market_data))
                 
             except Exception as e:
                 logger.error(f"Error processing market {m.get('slug')}: {e}", exc_info=True)
 
-        logger.info(f"Successfully synced {synced_count} markets to DataStore.")
+        # Swap in the refreshed index before persisting: lookups never wait on SQLite
+        now = datetime.now(timezone.utc)
+        markets = {key: m for key, m in self._markets.items() if key[1] > now}
+        markets.update(synced)
+        self._markets = markets
+        self._synced_timeframes.update(timeframes)
+
+        await asyncio.to_thread(self._persist, [m for _, m in synced])
+        logger.info(f"Successfully synced {len(synced)} markets to DataStore.")
+
+    def _persist(self, markets: List[Dict[str, Any]]) -> None:
+        for market in markets:
+            try:
+                self.store.save_pm_market(market)
+            except Exception as e:
+                logger.error(f"Error saving market {market.get('slug')}: {e}", exc_info=True)
 
     def get_active_market(self, timeframe_minutes: int) -> Optional[Dict[str, Any]]:
         """
         Retrieve the latest tradeable market for the given timeframe.
+
+        Served from the in-memory index (soonest unresolved market that has not
+        expired) once a sync has covered the timeframe; DataStore otherwise.
         """
-        return self.store.get_active_pm_market(timeframe_minutes)
+        if timeframe_minutes not in self._synced_timeframes:
+            return self.store.get_active_pm_market(timeframe_minutes)
+        now = datetime.now(timezone.utc)
+        best = None
+        for (tf, end_time), market in self._markets.items():
+            if tf == timeframe_minutes and end_time > now and market.get("outcome") is None:
+                if best is None or end_time < best[0]:
+                    best = (end_time, market)
+        return dict(best[1]) if best else None
+
+    @staticmethod
+    def _as_utc(dt: datetime) -> datetime:
+        """Naive datetimes from Gamma are UTC."""
+        return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
 
     def _parse_iso_datetime(self, dt_str: str) -> datetime:
         """Helper to parse ISO datetime strings, handling 'Z' suffix."""
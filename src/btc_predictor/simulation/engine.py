@@ -2,21 +2,27 @@ import uuid
 import logging
 from datetime import datetime, timedelta, timezone
 from btc_predictor.models import PredictionSignal, SimulatedTrade
-from btc_predictor.simulation.risk import should_trade, calculate_bet
+from btc_predictor.simulation.risk import RiskState, should_trade, calculate_bet
 from btc_predictor.infrastructure.store import DataStore
 
 logger = logging.getLogger(__name__)
 
-def process_signal(signal: PredictionSignal, store: DataStore) -> SimulatedTrade | None:
+def process_signal(signal: PredictionSignal, store: DataStore, risk_state: RiskState | None = None) -> SimulatedTrade | None:
     """
     Process a new prediction signal: risk check, bet sizing, and persistence.
+
+    With *risk_state* the risk check reads its in-memory counters instead of
+    querying ``store.get_daily_stats``, and the created trade is recorded there.
     """
     # 1. Get daily stats for risk control
     # Use signal timestamp (UTC)
     now = signal.timestamp if signal.timestamp else datetime.now(timezone.utc)
     
     date_str = now.strftime("%Y-%m-%d")
-    stats = store.get_daily_stats(signal.strategy_name, date_str)
+    if risk_state is not None:
+        stats = risk_state.daily_stats(signal.strategy_name, date_str)
+    else:
+        stats = store.get_daily_stats(signal.strategy_name, date_str)
     
     # 2. Risk check
     allowed = should_trade(
@@ -58,6 +64,8 @@ def process_signal(signal: PredictionSignal, store: DataStore) -> SimulatedTrade
     
     # 5. Persist to DB
     store.save_simulated_trade(trade)
+    if risk_state is not None:
+        risk_state.record_trade(trade)
     logger.info(f"[{signal.strategy_name}] Created simulated trade: {trade.direction} {trade.bet_amount} USDT (Conf: {trade.confidence:.4f})")
     
     return trade
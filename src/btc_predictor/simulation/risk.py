@@ -1,4 +1,8 @@
-from btc_predictor.utils.config import load_constants
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from btc_predictor.utils.config import ProjectConfig, load_constants
 
 def should_trade(daily_loss: float, consecutive_losses: int, daily_trades: int) -> bool:
     """
@@ -12,25 +16,21 @@ def should_trade(daily_loss: float, consecutive_losses: int, daily_trades: int)
     Returns:
         bool: True if trade is allowed, False otherwise.
     """
-    constants = load_constants()
-    risk_cfg = constants.get("risk_control", {})
+    risk = ProjectConfig.of(load_constants()).risk
     
     # 1. Daily max loss check
-    max_loss = risk_cfg.get("daily_max_loss", 50)
-    if daily_loss >= max_loss:
+    if daily_loss >= risk.daily_max_loss:
         return False
         
     # 2. Max daily trades check
-    max_trades = risk_cfg.get("max_daily_trades", 30)
-    if daily_trades >= max_trades:
+    if daily_trades >= risk.max_daily_trades:
         return False
         
     # 3. Consecutive losses check
     # Note: The requirement says "max_consecutive_losses: 8 # 連敗 N 筆暫停 1 小時"
     # For now, we return False if it's hit. The 1-hour pause logic might be handled by the caller
     # or we might need more state. Simple check for now.
-    max_consecutive = risk_cfg.get("max_consecutive_losses", 8)
-    if consecutive_losses >= max_consecutive:
+    if consecutive_losses >= risk.max_consecutive_losses:
         return False
         
     return True
@@ -46,12 +46,10 @@ def calculate_bet(confidence: float, timeframe_minutes: int) -> float:
     Returns:
         float: Bet amount in USDT.
     """
-    constants = load_constants()
-    risk_cfg = constants.get("risk_control", {})
-    thresholds = constants.get("confidence_thresholds", {})
+    config = ProjectConfig.of(load_constants())
     
     # Get threshold for the timeframe
-    threshold = thresholds.get(timeframe_minutes, 0.6) # Default to 0.6 if not found
+    threshold = config.confidence_threshold(timeframe_minutes) # Default to 0.6 if not found
     
     # If confidence is below threshold, bet is 0 (or should_trade handles this?)
     # Usually, if we call calculate_bet, we expect a trade. 
@@ -59,9 +57,7 @@ def calculate_bet(confidence: float, timeframe_minutes: int) -> float:
     if confidence < threshold:
         return 0.0
         
-    bet_range = risk_cfg.get("bet_range", [5, 20])
-    min_bet = bet_range[0]
-    max_bet = bet_range[1]
+    min_bet, max_bet = config.risk.bet_range
     
     # "confidence_to_bet": "linear" # 閾值→5, 1.0→20
     # Map [threshold, 1.0] to [min_bet, max_bet]
@@ -76,3 +72,125 @@ def calculate_bet(confidence: float, timeframe_minutes: int) -> float:
     bet = max(float(min_bet), min(float(max_bet), bet))
     
     return round(bet, 2)
+
+
+# Same depth as DataStore.get_daily_stats' recent-results query
+RECENT_RESULTS_LIMIT = 20
+
+
+def _iso(value: Any) -> str:
+    # Stored form of simulated_trades.open_time
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+class RiskState:
+    """In-memory risk counters per strategy, replacing per-signal ``get_daily_stats`` queries.
+
+    Tracks, for the current UTC day, each strategy's daily loss and trade
+    count (trades grouped by the date of ``open_time``, as in
+    ``DataStore.get_daily_stats``) and the results of its last
+    ``RECENT_RESULTS_LIMIT`` trades for the consecutive-loss streak.
+
+    - Rebuilt from ``simulated_trades`` on first use (or :meth:`load`).
+    - Kept current through :meth:`record_trade` (trade created) and
+      :meth:`record_settlement` (trade settled).
+    - Rolls over when a later date is requested: the day's counters restart
+      at zero. Dates other than the current day are answered by the store.
+
+    Settlements written by another process are only seen after :meth:`load`:
+    the Polymarket pipeline, whose trades are settled by the Binance
+    process's settler, reloads at the start of every trigger tick.
+    """
+
+    def __init__(self, store: Any = None, recent_limit: int = RECENT_RESULTS_LIMIT) -> None:
+        self.store = store
+        self.recent_limit = recent_limit
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._day: Optional[str] = None
+        # strategy -> [daily_loss, daily_trades] for self._day
+        self._daily: Dict[str, List[float]] = {}
+        # strategy -> {trade_id: [open_time_iso, result]} (most recent trades)
+        self._recent: Dict[str, Dict[str, List[Any]]] = {}
+
+    def load(self, now: Optional[datetime] = None) -> "RiskState":
+        """Rebuild all counters from the store for the UTC day of *now*."""
+        day = (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+        rows = self.store.get_risk_snapshot(day, self.recent_limit) if self.store is not None else []
+        with self._lock:
+            self._day = day
+            self._daily = {}
+            self._recent = {}
+            for strategy_name, trade_id, open_time, result, pnl, rank in rows:
+                if open_time.startswith(day):
+                    daily = self._daily.setdefault(strategy_name, [0.0, 0])
+                    daily[0] += -pnl if pnl is not None and pnl < 0 else 0.0
+                    daily[1] += 1
+                if rank <= self.recent_limit:
+                    self._recent.setdefault(strategy_name, {})[trade_id] = [open_time, result]
+            self._loaded = True
+        return self
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def roll_over(self, date_str: str) -> None:
+        """Start a new UTC day (no-op unless *date_str* is later than the current day)."""
+        with self._lock:
+            if self._day is None or date_str > self._day:
+                self._day = date_str
+                self._daily = {}
+
+    def daily_stats(self, strategy_name: str, date_str: str) -> dict:
+        """Same result as ``DataStore.get_daily_stats``, from memory for the current day."""
+        self._ensure_loaded()
+        self.roll_over(date_str)
+        if date_str != self._day:
+            return self.store.get_daily_stats(strategy_name, date_str)
+        with self._lock:
+            daily_loss, daily_trades = self._daily.get(strategy_name, (0.0, 0))
+            return {
+                "daily_loss": daily_loss,
+                "daily_trades": daily_trades,
+                "consecutive_losses": self._consecutive_losses(strategy_name),
+            }
+
+    def can_trade(self, strategy_name: str, date_str: str) -> bool:
+        stats = self.daily_stats(strategy_name, date_str)
+        return should_trade(stats["daily_loss"], stats["consecutive_losses"], stats["daily_trades"])
+
+    def _consecutive_losses(self, strategy_name: str) -> int:
+        recent = sorted(self._recent.get(strategy_name, {}).values(), key=lambda r: r[0], reverse=True)
+        streak = 0
+        for _, result in recent:
+            if result == "lose":
+                streak += 1
+            elif result == "win":
+                break
+        return streak
+
+    def record_trade(self, trade: Any) -> None:
+        """Count a newly created SimulatedTrade."""
+        self._ensure_loaded()
+        open_time = _iso(trade.open_time)
+        self.roll_over(open_time[:10])
+        with self._lock:
+            if open_time.startswith(self._day):
+                self._daily.setdefault(trade.strategy_name, [0.0, 0])[1] += 1
+            recent = self._recent.setdefault(trade.strategy_name, {})
+            recent[trade.id] = [open_time, getattr(trade, "result", None)]
+            if len(recent) > self.recent_limit:
+                oldest = min(recent, key=lambda k: recent[k][0])
+                del recent[oldest]
+
+    def record_settlement(self, strategy_name: str, trade_id: str, open_time: Any, result: str, pnl: float) -> None:
+        """Apply a settled trade's result / PnL."""
+        self._ensure_loaded()
+        open_time = _iso(open_time)
+        with self._lock:
+            if pnl < 0 and self._day is not None and open_time.startswith(self._day):
+                self._daily.setdefault(strategy_name, [0.0, 0])[0] += -pnl
+            entry = self._recent.get(strategy_name, {}).get(trade_id)
+            if entry is not None:
+                entry[1] = result
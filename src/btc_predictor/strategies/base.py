@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
 import pandas as pd
+from typing import Any, Callable, Dict, List
+import numpy as np
 from btc_predictor.models import PredictionSignal
+from btc_predictor.strategies.feature_store import stored_features
+
+# warm_start_fit: fewer new labeled rows than this keep the current model
+WARM_START_MIN_SAMPLES = 100
 
 class BaseStrategy(ABC):
     """所有預測策略的基類。"""
@@ -41,6 +47,25 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def warm_start_fit(
+        self,
+        ohlcv: pd.DataFrame,
+        timeframe_minutes: int,
+    ) -> None:
+        """
+        從目前的模型繼續訓練（walk-forward 回測的 warm start 模式）。
+
+        ``ohlcv`` 與 :meth:`fit` 相同，是新 fold 的完整訓練窗口；支援的策略
+        只用上次訓練之後的新資料列繼續 boosting / fine-tune，尚無模型時
+        退回完整 :meth:`fit`。預設實作即完整 :meth:`fit`。
+
+        Args:
+            ohlcv: 包含 open, high, low, close, volume 欄位的 DataFrame，
+                   index 為 datetime (UTC)，按時間升序排列。
+            timeframe_minutes: 訓練目標的到期時間框架。
+        """
+        self.fit(ohlcv, timeframe_minutes)
+
     @abstractmethod
     def predict(
         self,
@@ -59,3 +84,156 @@ class BaseStrategy(ABC):
             PredictionSignal，包含方向、信心度等資訊。
         """
         pass
+
+    def predict_batch(
+        self,
+        ohlcv: pd.DataFrame,
+        timestamps: pd.DatetimeIndex,
+        timeframe_minutes: int,
+    ) -> List[PredictionSignal]:
+        """
+        對多個時間點一次輸出預測信號（回測用）。
+
+        預設實作逐一以 ``ohlcv.loc[:ts]`` 呼叫 :meth:`predict`，結果與逐筆
+        呼叫完全相同。特徵為純因果計算的策略可 override 此方法：整段
+        ``ohlcv`` 只計算一次特徵，再以單次 model call 對所有 ``timestamps``
+        評分。Override 時每個 ts 的預測只能使用 ts 及之前的數據。
+
+        Args:
+            ohlcv: 包含 open, high, low, close, volume 欄位的 DataFrame，
+                   index 為 datetime (UTC)，按時間升序排列。可包含晚於
+                   ``timestamps`` 的資料列。
+            timestamps: 需要預測的時間點，必須存在於 ``ohlcv.index``。
+            timeframe_minutes: 預測的到期時間框架。
+
+        Returns:
+            與 ``timestamps`` 一一對應的 PredictionSignal list。
+        """
+        return [self.predict(ohlcv.loc[:ts], timeframe_minutes) for ts in timestamps]
+
+
+class CausalBatchStrategy(BaseStrategy):
+    """
+    以因果特徵預測上漲機率的方向策略共用的 :meth:`predict_batch`。
+
+    子類別以 class attribute 指定特徵 (features module 的 ``FEATURE_SET`` /
+    ``generate_features`` / ``get_feature_columns``)，並提供 ``self.models``
+    (timeframe -> model) 與 ``self._predictors`` (``PredictorCache``)。整段
+    ``ohlcv`` 只計算一次特徵、以單次 model call 對所有 timestamps 評分。
+
+    子類別若再 override :meth:`predict`，batch 改走逐筆 ``predict`` 以保持語意。
+    """
+
+    feature_set: str
+    compute_features: Callable[[pd.DataFrame], pd.DataFrame]
+    feature_columns: Callable[[], List[str]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The batch path mirrors the predict of the class declaring the features
+        if "feature_set" in vars(cls):
+            cls._batch_predict = cls.predict
+
+    def _calibrate(self, probs_higher: np.ndarray, timeframe_minutes: int) -> np.ndarray:
+        """上漲機率的校正 (預設不校正)。"""
+        return probs_higher
+
+    def _signal_fields(
+        self,
+        ts: pd.Timestamp,
+        timeframe_minutes: int,
+        prob_higher: float,
+        feature_cols: List[str],
+    ) -> Dict[str, Any]:
+        """PredictionSignal 的額外欄位。"""
+        return {"features_used": {}}
+
+    def predict_batch(
+        self,
+        ohlcv: pd.DataFrame,
+        timestamps: pd.DatetimeIndex,
+        timeframe_minutes: int,
+    ) -> List[PredictionSignal]:
+        """Score every timestamp with one (causal) feature pass and one model call."""
+        if type(self).predict is not type(self)._batch_predict:
+            # Subclass overrides predict; keep its semantics.
+            return super().predict_batch(ohlcv, timestamps, timeframe_minutes)
+        model = self.models.get(timeframe_minutes)
+        if model is None:
+            raise ValueError(f"Model not trained for {timeframe_minutes}m")
+
+        if len(timestamps) == 0:
+            return []
+
+        feature_cols = self.feature_columns()
+        feat_df = stored_features(self.feature_set, ohlcv, self.compute_features)
+        X = feat_df.loc[timestamps, feature_cols]
+        probs_higher = self._predictors.get(timeframe_minutes, model).predict_frame(X)
+        probs_higher = self._calibrate(probs_higher, timeframe_minutes)
+        closes = ohlcv.loc[timestamps, 'close'].to_numpy(dtype=float)
+
+        signals = []
+        for ts, prob_higher, current_price in zip(timestamps, probs_higher, closes):
+            if prob_higher > 0.5:
+                direction = "higher"
+                confidence = prob_higher
+            else:
+                direction = "lower"
+                confidence = 1.0 - prob_higher
+
+            signals.append(PredictionSignal(
+                strategy_name=self.name,
+                timestamp=ts,
+                timeframe_minutes=timeframe_minutes,
+                direction=direction,
+                confidence=float(confidence),
+                current_price=float(current_price),
+                **self._signal_fields(ts, timeframe_minutes, prob_higher, feature_cols)
+            ))
+        return signals
+
+
+class WarmStartMixin:
+    """
+    :meth:`fit` / :meth:`warm_start_fit` 共用實作 (置於 ``BaseStrategy`` 之前)。
+
+    記錄每個 timeframe 最後一筆訓練標籤的時間；warm start 只以之後的新資料列
+    繼續訓練，新資料少於 ``WARM_START_MIN_SAMPLES`` 時保留目前模型。
+
+    子類別提供:
+    - ``train_model`` / ``continue_training``: class attribute (model module 的函式)
+    - ``_training_data(ohlcv, tf)`` → ``(data, times)``: ``data`` 為 DataFrame
+      或 array tuple，每列對應 ``times`` 的一個標籤時間
+    - ``_split(data)`` → ``train_model`` / ``continue_training`` 的位置參數
+    """
+
+    train_model: Callable[..., Any]
+    continue_training: Callable[..., Any]
+
+    @property
+    def _trained_until(self) -> Dict[int, pd.Timestamp]:
+        return self.__dict__.setdefault("_trained_until_by_tf", {})
+
+    @staticmethod
+    def _select(data: Any, mask: np.ndarray) -> Any:
+        if isinstance(data, tuple):
+            return tuple(part[mask] for part in data)
+        return data[mask]
+
+    def fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
+        data, times = self._training_data(ohlcv, timeframe_minutes)
+        self.models[timeframe_minutes] = self.train_model(*self._split(data))
+        self._trained_until[timeframe_minutes] = times[-1]
+
+    def warm_start_fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
+        model = self.models.get(timeframe_minutes)
+        trained_until = self._trained_until.get(timeframe_minutes)
+        if model is None or trained_until is None:
+            return self.fit(ohlcv, timeframe_minutes)
+
+        data, times = self._training_data(ohlcv, timeframe_minutes)
+        new = np.asarray(times > trained_until)
+        if new.sum() < WARM_START_MIN_SAMPLES:
+            return
+        self.models[timeframe_minutes] = self.continue_training(model, *self._split(self._select(data, new)))
+        self._trained_until[timeframe_minutes] = times[-1]
@@ -3,6 +3,11 @@ import numpy as np
 import talib
 from typing import List
 
+from btc_predictor.strategies.streaming import StandardFeatureEngine
+
+# Identity for the shared feature cache (identical generators share it)
+FEATURE_SET = "standard_v1"
+
 def generate_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Generate features for XGBoost model from OHLCV data.
@@ -121,3 +126,8 @@ def get_feature_columns() -> List[str]:
         cols.append(f'vol_ratio_{n}m')
         
     return cols
+
+
+def create_streaming_engine() -> StandardFeatureEngine:
+    """Incremental engine whose rows match :func:`generate_features` (used by live ``predict``)."""
+    return StandardFeatureEngine(precomputed_markers=('rsi_14', 'macd'))
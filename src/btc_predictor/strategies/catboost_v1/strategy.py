@@ -4,24 +4,34 @@ import numpy as np
 from datetime import datetime
 from typing import Optional, List
 from pathlib import Path
-from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.base import CausalBatchStrategy
 from btc_predictor.models import PredictionSignal
-from btc_predictor.strategies.catboost_v1.features import generate_features, get_feature_columns
+from btc_predictor.strategies.catboost_v1.features import FEATURE_SET, generate_features, get_feature_columns, create_streaming_engine
+from btc_predictor.strategies.inference import PredictorCache
+from btc_predictor.strategies.feature_cache import cached_features
+from btc_predictor.strategies.feature_store import stored_features
+from btc_predictor.strategies.streaming import shared_engine
 from btc_predictor.strategies.catboost_v1.model import train_model, load_model, save_model
 from btc_predictor.infrastructure.labeling import add_direction_labels
 
 logger = logging.getLogger(__name__)
 
-class CatBoostDirectionStrategy(BaseStrategy):
+class CatBoostDirectionStrategy(CausalBatchStrategy):
     """
     CatBoost Strategy:
     - Uses CatBoost for direction classification.
     - Standard features.
     - Early stopping with validation set.
     """
+    feature_set = FEATURE_SET
+    compute_features = staticmethod(generate_features)
+    feature_columns = staticmethod(get_feature_columns)
+
     def __init__(self, model_path: Optional[str] = None, model=None):
         self._name = "catboost_v1"
         self.models = {}  # timeframe -> model
+        self._features = shared_engine(FEATURE_SET, create_streaming_engine)  # incremental live features
+        self._predictors = PredictorCache(get_feature_columns())  # native inference per timeframe
         
         if model:
             self.models[10] = model # Default for testing
@@ -63,7 +73,7 @@ class CatBoostDirectionStrategy(BaseStrategy):
             save_model(model, path)
 
     def fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
-        feat_df = generate_features(ohlcv)
+        feat_df = stored_features(FEATURE_SET, ohlcv, generate_features)
         labeled_df = add_direction_labels(feat_df, timeframe_minutes)
         feature_cols = get_feature_columns()
         
@@ -93,14 +103,10 @@ class CatBoostDirectionStrategy(BaseStrategy):
         if model is None:
             raise ValueError(f"Model not trained for {timeframe_minutes}m")
             
-        feat_df = generate_features(ohlcv)
-        # Squeeze to get last row as 2D array
-        latest_features = feat_df.iloc[[-1]] 
-        X = latest_features[get_feature_columns()]
+        latest_features = cached_features(FEATURE_SET, ohlcv, self._features.sync)
         
-        # predict_proba returns [prob_0, prob_1]
-        probs = model.predict_proba(X)[0]
-        prob_higher = probs[1]
+        # Probability of label 1 (native model, float32 row in feature-column order)
+        prob_higher = self._predictors.get(timeframe_minutes, model).predict_frame(latest_features)[0]
         
         if prob_higher > 0.5:
             direction = "higher"
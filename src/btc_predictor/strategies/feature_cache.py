@@ -0,0 +1,120 @@
+"""
+btc_predictor/strategies/feature_cache.py
+-----------------------------------------
+Per-tick feature cache shared by all strategies triggered on the same candle.
+
+Several strategies compute the same feature set (the standard set is copied
+into xgboost_v1 / xgboost_v2 / lgbm_v1 / lgbm_v1_tuned / catboost_v1 / pm_v1,
+and every ``pm_*_reg_v1`` model uses ``pm_common``). Within one trigger the
+first strategy computes the features and the others reuse the result.
+
+Usage (pipelines)::
+
+    self.feature_cache = FeatureCache()
+    ...
+    with self.feature_cache.activate(ohlcv):
+        signal = await asyncio.to_thread(strategy.predict, ohlcv, timeframe)
+
+Usage (strategies)::
+
+    latest_features = cached_features(FEATURE_SET, ohlcv, self._features.sync)
+
+Outside an active cache (backtests, scripts, tests) ``cached_features`` simply
+calls ``compute``. The active cache is held in a ``ContextVar`` so it follows
+``asyncio.to_thread`` into worker threads.
+
+Cached values are shared between strategies and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple, TypeVar
+
+import pandas as pd
+
+T = TypeVar("T")
+
+_ACTIVE: ContextVar[Optional["FeatureCache"]] = ContextVar("feature_cache", default=None)
+
+
+class FeatureCache:
+    """Feature results keyed by (feature set, window start, last candle timestamp).
+
+    Entries are dropped as soon as a newer candle is seen, so the cache only
+    ever holds the results of the current tick.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[Hashable, ...], Any] = {}
+        self._key_locks: Dict[Tuple[Hashable, ...], threading.Lock] = {}
+        self._tick: Optional[pd.Timestamp] = None
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def start_tick(self, last_ts: pd.Timestamp) -> None:
+        """Drop entries belonging to an older candle."""
+        with self._lock:
+            if self._tick != last_ts:
+                self._entries.clear()
+                self._key_locks.clear()
+                self._tick = last_ts
+
+    @contextmanager
+    def activate(self, ohlcv: Optional[pd.DataFrame] = None) -> Iterator["FeatureCache"]:
+        """Make this cache visible to ``cached_features`` for the enclosed block."""
+        if ohlcv is not None and not ohlcv.empty:
+            self.start_tick(ohlcv.index[-1])
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+
+    def get(self, feature_set: str, ohlcv: pd.DataFrame, compute: Callable[[pd.DataFrame], T]) -> T:
+        """Return ``compute(ohlcv)``, computing it at most once per key.
+
+        Concurrent callers with the same key wait for the first computation
+        instead of repeating it.
+        """
+        key = (feature_set, ohlcv.index[0], ohlcv.index[-1], len(ohlcv))
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    return self._entries[key]
+            value = compute(ohlcv)
+            with self._lock:
+                self.misses += 1
+                if self._tick is None or key[2] == self._tick:
+                    self._entries[key] = value
+            return value
+
+
+def get_active_cache() -> Optional[FeatureCache]:
+    return _ACTIVE.get()
+
+
+def cached_features(feature_set: str, ohlcv: pd.DataFrame, compute: Callable[[pd.DataFrame], T]) -> T:
+    """Compute features through the active per-tick cache, if any.
+
+    Args:
+        feature_set: Identity of the feature generator (``FEATURE_SET`` in the
+                     strategy's features module). Generators sharing an id must
+                     produce identical output for the same input.
+        ohlcv:       Exact input passed to ``compute`` (window start/end and
+                     length are part of the key).
+        compute:     Function producing the features from ``ohlcv``.
+    """
+    cache = _ACTIVE.get()
+    if cache is None or ohlcv.empty:
+        return compute(ohlcv)
+    return cache.get(feature_set, ohlcv, compute)
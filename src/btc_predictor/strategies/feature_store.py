@@ -0,0 +1,323 @@
+"""
+btc_predictor/strategies/feature_store.py
+-----------------------------------------
+Materialized features over the full OHLCV history, persisted across runs.
+
+Training and backtests call ``generate_features`` on many overlapping slices
+of the same history (every fold, every timeframe, every strategy sharing a
+feature set). The feature store computes each feature set once over the whole
+history, writes it to disk as an Arrow IPC table and serves the rows of any
+contiguous slice from that table.
+
+Layout::
+
+    <root>/<feature_set>/<module hash>/<name>_<first candle>.arrow
+
+- ``module hash``: SHA-256 of the source of the module defining the generator,
+  so editing the features code starts a new version instead of serving stale
+  values.
+- ``name`` / ``first candle``: the data the table was built from (e.g.
+  ``BTCUSDT_1m``); the last candle is in the file metadata. When the history
+  grows, only the new candles (plus ``APPEND_LOOKBACK`` rows of warm-up) are
+  computed and appended.
+
+Usage (scripts)::
+
+    feature_store = FeatureStore().attach(df)
+    with feature_store.activate():
+        strategy.fit(df, timeframe)
+
+    trades = run_backtest(strategy, df, timeframe, feature_store=feature_store)
+
+Usage (strategies)::
+
+    feat_df = stored_features(FEATURE_SET, ohlcv, generate_features)
+
+Served rows are computed over the full history, so rows near the start of a
+slice carry warmed-up indicator values instead of the NaN / seeding effects
+``generate_features(slice)`` would show. Outside an active store, or when the
+slice is not part of the attached history, ``compute(ohlcv)`` is called.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from btc_predictor.strategies.streaming import OHLCV_COLUMNS
+
+DEFAULT_FEATURE_STORE_ROOT = Path("data/features")
+
+# Candles recomputed before the first new one when appending, so rolling
+# windows and EMA-type indicators are warmed up (longest window is 60).
+APPEND_LOOKBACK = 1000
+
+# OBV is a running sum from the first input candle; served slices restart it
+# (and recompute its rate of change) like StreamingFeatureEngine._rebase.
+_OBV_RET = re.compile(r"obv_ret_(\d+)m")
+
+_ACTIVE: ContextVar[Optional["FeatureStore"]] = ContextVar("feature_store", default=None)
+
+Compute = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+@lru_cache(maxsize=None)
+def module_hash(compute: Compute) -> str:
+    """Short SHA-256 of the source of the module that defines ``compute``."""
+    module = inspect.getmodule(compute)
+    source = inspect.getsource(module) if module is not None else inspect.getsource(compute)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+
+
+def _dataset_name(ohlcv: pd.DataFrame) -> str:
+    if "symbol" in ohlcv.columns and "interval" in ohlcv.columns and not ohlcv.empty:
+        return f"{ohlcv['symbol'].iloc[0]}_{ohlcv['interval'].iloc[0]}"
+    return "ohlcv"
+
+
+def _rebase_obv(features: pd.DataFrame, ohlcv: pd.DataFrame) -> pd.DataFrame:
+    """OBV (and ``obv_ret_<n>m``) as ``generate_features(ohlcv)`` computes them."""
+    obv = features["obv"] - features["obv"].iloc[0] + float(ohlcv["volume"].iloc[0])
+    updates = {"obv": obv}
+    for col in features.columns:
+        match = _OBV_RET.fullmatch(col)
+        if match:
+            updates[col] = obv.pct_change(int(match.group(1)))
+    return features.assign(**updates)
+
+
+def _stamp(ts: pd.Timestamp) -> str:
+    return ts.strftime("%Y%m%dT%H%M")
+
+
+class FeatureStore:
+    """Versioned on-disk feature tables for one attached OHLCV history.
+
+    Args:
+        root: Store directory (default ``data/features``).
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_FEATURE_STORE_ROOT) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._history: Optional[pd.DataFrame] = None
+        self._name = "ohlcv"
+        self.hits: int = 0
+        self.misses: int = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def attach(self, ohlcv: pd.DataFrame, name: Optional[str] = None) -> "FeatureStore":
+        """Use ``ohlcv`` as the full history features are materialized over.
+
+        Attaching the same history again keeps the loaded tables.
+        """
+        history = ohlcv[OHLCV_COLUMNS]
+        name = name or _dataset_name(ohlcv)
+        with self._lock:
+            current = self._history
+            same = (
+                current is not None and name == self._name and len(current) == len(history)
+                and current.index.equals(history.index)
+            )
+            if not same:
+                self._frames.clear()
+                self._key_locks.clear()
+            self._history = history
+            self._name = name
+        return self
+
+    def __getstate__(self) -> dict:
+        # Sent to backtest worker processes: they re-attach to their own copy
+        # of the history and load tables from disk.
+        return {"root": self.root, "name": self._name}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["root"])
+        self._name = state["name"]
+
+    @property
+    def name(self) -> str:
+        """Dataset name used in table file names (e.g. ``BTCUSDT_1m``)."""
+        return self._name
+
+    @property
+    def history(self) -> Optional[pd.DataFrame]:
+        """Attached OHLCV history (OHLCV columns only), or None."""
+        return self._history
+
+    @contextmanager
+    def activate(self) -> Iterator["FeatureStore"]:
+        """Make this store visible to ``stored_features`` for the enclosed block."""
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+
+    def materialize(self, feature_set: str, compute: Compute) -> pd.DataFrame:
+        """Features over the whole attached history (loaded, appended or computed)."""
+        if self._history is None:
+            raise ValueError("FeatureStore has no history attached")
+        key = (feature_set, module_hash(compute))
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                return frame
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                frame = self._frames.get(key)
+            if frame is None:
+                frame = self._load_or_build(key, compute)
+                with self._lock:
+                    self._frames[key] = frame
+            return frame
+
+    def get(self, feature_set: str, ohlcv: pd.DataFrame, compute: Compute) -> pd.DataFrame:
+        """``compute(ohlcv)`` served from the materialized table when possible.
+
+        ``ohlcv`` must be a contiguous slice of the attached history (same
+        timestamps and closes); otherwise the features are computed directly.
+        Columns of ``ohlcv`` are kept and the feature columns are added or
+        replaced, like ``generate_features`` does.
+        """
+        history = self._history
+        if history is None or ohlcv.empty or not isinstance(ohlcv.index, pd.DatetimeIndex):
+            return compute(ohlcv)
+
+        lo = int(history.index.searchsorted(ohlcv.index[0]))
+        hi = lo + len(ohlcv)
+        if hi > len(history) or not history.index[lo:hi].equals(ohlcv.index) or not np.array_equal(
+            history["close"].to_numpy()[lo:hi], ohlcv["close"].to_numpy(dtype=float)
+        ):
+            with self._lock:
+                self.misses += 1
+            return compute(ohlcv)
+
+        frame = self.materialize(feature_set, compute)
+        with self._lock:
+            self.hits += 1
+        features = frame.iloc[lo:hi]
+        features = features[[c for c in features.columns if c not in OHLCV_COLUMNS]]
+        if "obv" in features.columns:
+            features = _rebase_obv(features, ohlcv)
+        return pd.concat([ohlcv.drop(columns=features.columns, errors="ignore"), features], axis=1)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _directory(self, key: Tuple[str, str]) -> Path:
+        return self.root / key[0] / key[1]
+
+    def _candidates(self, key: Tuple[str, str]) -> List[Path]:
+        """Stored tables of this dataset that start at or before the history, latest start first."""
+        directory = self._directory(key)
+        if not directory.is_dir():
+            return []
+        first = _stamp(self._history.index[0])
+        prefix = f"{self._name}_"
+        paths = [p for p in directory.glob(f"{prefix}*.arrow") if p.stem[len(prefix):] <= first]
+        return sorted(paths, key=lambda p: p.stem, reverse=True)
+
+    def _load_or_build(self, key: Tuple[str, str], compute: Compute) -> pd.DataFrame:
+        history = self._history
+        for path in self._candidates(key):
+            stored = self._read(path)
+            frame = self._extend(stored, compute)
+            if frame is not None:
+                if len(frame) > len(stored):
+                    self._write(path, frame)
+                lo = int(frame.index.searchsorted(history.index[0]))
+                return frame.iloc[lo:lo + len(history)]
+
+        frame = compute(history)
+        self._write(self._directory(key) / f"{self._name}_{_stamp(history.index[0])}.arrow", frame)
+        return frame
+
+    def _extend(self, stored: pd.DataFrame, compute: Compute) -> Optional[pd.DataFrame]:
+        """Append candles of the history newer than ``stored``.
+
+        Returns None if ``stored`` does not cover the start of the history or
+        disagrees with it on the overlapping candles.
+        """
+        history = self._history
+        lo = int(stored.index.searchsorted(history.index[0]))
+        overlap = stored.iloc[lo:lo + len(history)]
+        if overlap.empty or overlap.index[0] != history.index[0]:
+            return None
+        head = history.iloc[:len(overlap)]
+        if not overlap.index.equals(head.index) or not np.array_equal(
+            overlap["close"].to_numpy(), head["close"].to_numpy()
+        ):
+            return None
+
+        new = history.iloc[len(overlap):]
+        if new.empty or lo + len(overlap) < len(stored):
+            # Nothing newer, or the history ends inside the stored table
+            return stored
+        warmup = stored[OHLCV_COLUMNS].iloc[-APPEND_LOOKBACK:]
+        appended = compute(pd.concat([warmup, new]))
+        if "obv" in appended.columns:
+            # Continue the stored running sum instead of restarting at the warm-up
+            appended["obv"] += stored["obv"].iloc[-len(warmup)] - appended["obv"].iloc[0]
+        frame = pd.concat([stored, appended.iloc[len(warmup):][stored.columns]])
+        return _rebase_obv(frame, frame) if "obv" in frame.columns else frame
+
+    @staticmethod
+    def _read(path: Path) -> pd.DataFrame:
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    @staticmethod
+    def _write(path: Path, frame: pd.DataFrame) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"last_candle"] = frame.index[-1].isoformat().encode()
+        table = table.replace_schema_metadata(metadata)
+
+        # Write next to the target and rename, so readers never see a partial
+        # file (per-writer temp name: backtest workers may materialize at once)
+        tmp_path = path.with_suffix(f".arrow.{os.getpid()}-{threading.get_ident()}.tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+
+def get_active_store() -> Optional[FeatureStore]:
+    return _ACTIVE.get()
+
+
+def stored_features(feature_set: str, ohlcv: pd.DataFrame, compute: Compute) -> pd.DataFrame:
+    """Features of ``ohlcv`` through the active feature store, if any.
+
+    Args:
+        feature_set: Identity of the feature generator (``FEATURE_SET`` in the
+                     strategy's features module).
+        ohlcv:       Input passed to ``compute``.
+        compute:     Function producing the features from ``ohlcv``
+                     (typically ``generate_features``).
+    """
+    store = _ACTIVE.get()
+    if store is None:
+        return compute(ohlcv)
+    return store.get(feature_set, ohlcv, compute)
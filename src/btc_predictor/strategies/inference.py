@@ -0,0 +1,177 @@
+"""
+btc_predictor/strategies/inference.py
+-------------------------------------
+Native inference adapters for tree models
+
+職責:
+- 將已訓練 / 載入的 XGBoost、LightGBM、CatBoost 模型 (``.pkl`` / ``.json`` /
+  ``.txt`` / ``.cbm``) 包成原生 predictor，繞過 sklearn wrapper 的
+  DataFrame 驗證與轉換
+- 輸入為固定欄位順序的 C-contiguous float32 ndarray (單筆或批次)
+- 依 model 物件快取 predictor，``self.models[tf]`` 被替換時自動重建
+
+Native paths:
+
+- XGBoost:  ``Booster.inplace_predict`` (no DMatrix), same iteration range as
+  the sklearn wrapper (``best_iteration`` after early stopping)
+- LightGBM: ``Booster.predict`` on the ndarray (``best_iteration`` by default)
+- CatBoost: ``CatBoost.predict`` on the ndarray (a single row is passed 1-D)
+
+Other objects (e.g. test doubles exposing ``predict_proba``) fall back to the
+model's own method on a DataFrame. Features are cast to float32, which is
+what XGBoost and CatBoost compare against internally; LightGBM thresholds are
+float64, so its outputs match the wrapper up to float32 rounding of inputs.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+Output = Literal["proba", "value"]
+
+
+def to_float32(features: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """``features[columns]`` as a C-contiguous float32 array (rows x columns)."""
+    if len(features) != 1:
+        return np.ascontiguousarray(features[list(columns)].to_numpy(dtype=np.float32, na_value=np.nan))
+    # Live single row: converting the whole row once and picking positions is
+    # several times cheaper than building the column-selected DataFrame.
+    position = {name: i for i, name in enumerate(features.columns.tolist())}
+    row = features.to_numpy()[:, [position[c] for c in columns]]
+    return np.ascontiguousarray(row, dtype=np.float32)
+
+
+class TreePredictor:
+    """Predictor of one trained model over a fixed feature order.
+
+    Args:
+        model:           Trained model (wrapper or native booster).
+        feature_columns: Column order of the arrays passed to :meth:`predict`.
+        output:          ``"proba"``: probability of label 1 (classifiers);
+                         ``"value"``: raw prediction (regressors).
+    """
+
+    def __init__(self, model: Any, feature_columns: Sequence[str], output: Output = "proba") -> None:
+        self.model = model
+        self.feature_columns: Tuple[str, ...] = tuple(feature_columns)
+        self.output = output
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """One output per row of ``X`` (float32, ``feature_columns`` order)."""
+        raise NotImplementedError
+
+    def predict_frame(self, features: pd.DataFrame) -> np.ndarray:
+        """:meth:`predict` on the ``feature_columns`` of a feature DataFrame."""
+        return self.predict(to_float32(features, self.feature_columns))
+
+    def _check_features(self, names: Optional[Sequence[str]]) -> None:
+        # Models trained on DataFrames remember their columns; positional
+        # arrays are only valid in exactly that order. Auto-generated names
+        # (model trained on an array) only need the same width.
+        if not names or tuple(names) == self.feature_columns:
+            return
+        if len(names) != len(self.feature_columns) or not set(names).isdisjoint(self.feature_columns):
+            raise ValueError(
+                f"{type(self.model).__name__} was trained on features {list(names)}, "
+                f"expected {list(self.feature_columns)}"
+            )
+
+
+class XGBoostPredictor(TreePredictor):
+    def __init__(self, model: Any, feature_columns: Sequence[str], output: Output = "proba") -> None:
+        import xgboost as xgb
+
+        super().__init__(model, feature_columns, output)
+        self.booster: xgb.Booster = model if isinstance(model, xgb.Booster) else model.get_booster()
+        self._check_features(self.booster.feature_names)
+        best = self.booster.attr("best_iteration")
+        self._iteration_range = (0, int(best) + 1) if best is not None else (0, 0)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # binary:logistic already outputs P(label 1)
+        return self.booster.inplace_predict(X, iteration_range=self._iteration_range, validate_features=False)
+
+
+class LightGBMPredictor(TreePredictor):
+    def __init__(self, model: Any, feature_columns: Sequence[str], output: Output = "proba") -> None:
+        import lightgbm as lgb
+
+        super().__init__(model, feature_columns, output)
+        self.booster: lgb.Booster = model if isinstance(model, lgb.Booster) else model.booster_
+        self._check_features(self.booster.feature_name())
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # binary objective already outputs P(label 1)
+        return self.booster.predict(X, validate_features=False)
+
+
+class CatBoostPredictor(TreePredictor):
+    def __init__(self, model: Any, feature_columns: Sequence[str], output: Output = "proba") -> None:
+        super().__init__(model, feature_columns, output)
+        self._check_features(model.feature_names_)
+        self._prediction_type = "Probability" if output == "proba" else None
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # One object as a 1-D array skips most of CatBoost's pool construction
+        data = X[0] if len(X) == 1 else X
+        if self._prediction_type is None:
+            out = self.model.predict(data)
+        else:
+            out = self.model.predict(data, prediction_type=self._prediction_type)
+        out = np.asarray(out).reshape(len(X), -1)
+        return out[:, -1]
+
+
+class FallbackPredictor(TreePredictor):
+    """Calls the model's own ``predict_proba`` / ``predict`` on a DataFrame."""
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.predict_frame(pd.DataFrame(X, columns=list(self.feature_columns)))
+
+    def predict_frame(self, features: pd.DataFrame) -> np.ndarray:
+        X = features[list(self.feature_columns)]
+        if self.output == "proba":
+            return np.asarray(self.model.predict_proba(X))[:, 1]
+        return np.asarray(self.model.predict(X))
+
+
+def native_predictor(model: Any, feature_columns: Sequence[str], output: Output = "proba") -> TreePredictor:
+    """Fastest available :class:`TreePredictor` for ``model``."""
+    module = type(model).__module__.split(".")[0]
+    if module == "xgboost":
+        return XGBoostPredictor(model, feature_columns, output)
+    if module == "lightgbm":
+        return LightGBMPredictor(model, feature_columns, output)
+    if module == "catboost":
+        return CatBoostPredictor(model, feature_columns, output)
+    return FallbackPredictor(model, feature_columns, output)
+
+
+class PredictorCache:
+    """Per-timeframe predictors of a strategy, rebuilt when its model changes.
+
+    Args:
+        feature_columns: Feature order the strategy's models were trained on.
+        output:          See :class:`TreePredictor`.
+    """
+
+    def __init__(self, feature_columns: Sequence[str], output: Output = "proba") -> None:
+        self.feature_columns = tuple(feature_columns)
+        self.output = output
+        self._predictors: Dict[int, TreePredictor] = {}
+
+    def __getstate__(self) -> dict:
+        # Strategies are pickled to backtest workers; predictors are rebuilt there
+        return {"feature_columns": self.feature_columns, "output": self.output}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["feature_columns"], state["output"])
+
+    def get(self, timeframe_minutes: int, model: Any) -> TreePredictor:
+        predictor = self._predictors.get(timeframe_minutes)
+        if predictor is None or predictor.model is not model:
+            predictor = native_predictor(model, self.feature_columns, self.output)
+            self._predictors[timeframe_minutes] = predictor
+        return predictor
@@ -1,18 +1,28 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from pathlib import Path
-from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.base import CausalBatchStrategy
 from btc_predictor.models import PredictionSignal
-from btc_predictor.strategies.lgbm_v1.features import generate_features, get_feature_columns
-from btc_predictor.strategies.lgbm_v1.model import predict_higher_probability, load_model, train_model
+from btc_predictor.strategies.lgbm_v1.features import FEATURE_SET, generate_features, get_feature_columns, create_streaming_engine
+from btc_predictor.strategies.inference import PredictorCache
+from btc_predictor.strategies.feature_cache import cached_features
+from btc_predictor.strategies.feature_store import stored_features
+from btc_predictor.strategies.streaming import shared_engine
+from btc_predictor.strategies.lgbm_v1.model import load_model, train_model
 from btc_predictor.infrastructure.labeling import add_direction_labels
 
-class LGBMDirectionStrategy(BaseStrategy):
+class LGBMDirectionStrategy(CausalBatchStrategy):
+    feature_set = FEATURE_SET
+    compute_features = staticmethod(generate_features)
+    feature_columns = staticmethod(get_feature_columns)
+
     def __init__(self, model_path: Optional[str] = None):
         self._name = "lgbm_v1"
         self.models = {}  # timeframe -> model
+        self._features = shared_engine(FEATURE_SET, create_streaming_engine)  # incremental live features
+        self._predictors = PredictorCache(get_feature_columns())  # native inference per timeframe
         
         if model_path:
             p = Path(model_path)
@@ -49,7 +59,7 @@ class LGBMDirectionStrategy(BaseStrategy):
                     print(f"Failed to load model {file_path}: {e}")
 
     def fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
-        feat_df = generate_features(ohlcv)
+        feat_df = stored_features(FEATURE_SET, ohlcv, generate_features)
         labeled_df = add_direction_labels(feat_df, timeframe_minutes)
         feature_cols = get_feature_columns()
         labeled_df = labeled_df.dropna(subset=["label"] + feature_cols)
@@ -82,12 +92,8 @@ class LGBMDirectionStrategy(BaseStrategy):
         if model is None:
             raise ValueError(f"Model not trained for timeframe {timeframe_minutes}")
             
-        feat_df = generate_features(ohlcv)
-        latest_features = feat_df.iloc[[-1]]
-        feature_cols = get_feature_columns()
-        X = latest_features[feature_cols]
-        
-        prob_higher = predict_higher_probability(model, X)[0]
+        latest_features = cached_features(FEATURE_SET, ohlcv, self._features.sync)
+        prob_higher = self._predictors.get(timeframe_minutes, model).predict_frame(latest_features)[0]
         
         if prob_higher > 0.5:
             direction = "higher"
@@ -3,6 +3,11 @@ import numpy as np
 import talib
 from typing import List
 
+from btc_predictor.strategies.streaming import StandardFeatureEngine
+
+# Identity for the shared feature cache (identical generators share it)
+FEATURE_SET = "lgbm_v2"
+
 def generate_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Generate optimized feature set for LGBM v2.
@@ -80,3 +85,8 @@ def get_feature_columns() -> List[str]:
         'atr_14', 'macd_signal', 'macd', 'macd_hist', 
         'rsi_14', 'bb_pct_b', 'bb_dist', 'obv_ret_5m'
     ]
+
+
+def create_streaming_engine() -> StandardFeatureEngine:
+    """Incremental engine whose rows match :func:`generate_features` (used by live ``predict``)."""
+    return StandardFeatureEngine(precomputed_markers=('rsi_14', 'vol_60m'))
@@ -3,13 +3,17 @@ import numpy as np
 from datetime import datetime
 from typing import Optional, List
 from pathlib import Path
-from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.base import CausalBatchStrategy
 from btc_predictor.models import PredictionSignal
-from btc_predictor.strategies.lgbm_v2.features import generate_features, get_feature_columns
+from btc_predictor.strategies.lgbm_v2.features import FEATURE_SET, generate_features, get_feature_columns, create_streaming_engine
+from btc_predictor.strategies.inference import PredictorCache
+from btc_predictor.strategies.feature_cache import cached_features
+from btc_predictor.strategies.feature_store import stored_features
+from btc_predictor.strategies.streaming import shared_engine
 from btc_predictor.strategies.lgbm_v2.model import train_model_with_calibration, load_calibrated_model, save_calibrated_model
 from btc_predictor.infrastructure.labeling import add_direction_labels
 
-class LGBMDirectionStrategyV2(BaseStrategy):
+class LGBMDirectionStrategyV2(CausalBatchStrategy):
     """
     LightGBM Strategy V2:
     - Expanded data (180 days training)
@@ -17,9 +21,15 @@ class LGBMDirectionStrategyV2(BaseStrategy):
     - Early Stopping with Purged Validation Gap
     - Probability Calibration via Isotonic Regression
     """
+    feature_set = FEATURE_SET
+    compute_features = staticmethod(generate_features)
+    feature_columns = staticmethod(get_feature_columns)
+
     def __init__(self, model_path: Optional[str] = None):
         self._name = "lgbm_v2"
         self.models = {}      # timeframe -> model
+        self._features = shared_engine(FEATURE_SET, create_streaming_engine)  # incremental live features
+        self._predictors = PredictorCache(get_feature_columns())  # native inference per timeframe
         self.calibrators = {} # timeframe -> iso_reg
         
         if model_path:
@@ -59,7 +69,7 @@ class LGBMDirectionStrategyV2(BaseStrategy):
 
     def fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
         # 1. Generate features
-        feat_df = generate_features(ohlcv)
+        feat_df = stored_features(FEATURE_SET, ohlcv, generate_features)
         
         # 2. Add labels
         labeled_df = add_direction_labels(feat_df, timeframe_minutes)
@@ -102,12 +112,10 @@ class LGBMDirectionStrategyV2(BaseStrategy):
         if model is None:
             raise ValueError(f"Model not trained for {timeframe_minutes}m")
             
-        feat_df = generate_features(ohlcv)
-        latest_features = feat_df.iloc[[-1]]
-        X = latest_features[get_feature_columns()]
+        latest_features = cached_features(FEATURE_SET, ohlcv, self._features.sync)
         
         # Raw probability
-        prob_higher = model.predict_proba(X)[0, 1]
+        prob_higher = self._predictors.get(timeframe_minutes, model).predict_frame(latest_features)[0]
         
         # Calibrate if calibrator exists
         iso_reg = self.calibrators.get(timeframe_minutes)
@@ -131,3 +139,10 @@ class LGBMDirectionStrategyV2(BaseStrategy):
             current_price=float(ohlcv['close'].iloc[-1]),
             features_used={}
         )
+
+    def _calibrate(self, probs_higher: np.ndarray, timeframe_minutes: int) -> np.ndarray:
+        # Calibrate if calibrator exists
+        iso_reg = self.calibrators.get(timeframe_minutes)
+        if iso_reg:
+            probs_higher = iso_reg.transform(probs_higher)
+        return probs_higher
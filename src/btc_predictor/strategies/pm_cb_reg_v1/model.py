@@ -2,14 +2,21 @@ from catboost import CatBoostRegressor
 from typing import Tuple
 import pandas as pd
 
-def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> CatBoostRegressor:
-    model = CatBoostRegressor(
+# Warm start (walk-forward): extra boosting rounds on the new data only
+WARM_START_ROUNDS = 200
+WARM_START_EARLY_STOPPING = 50
+
+def _regressor(iterations: int = 1000) -> CatBoostRegressor:
+    return CatBoostRegressor(
         loss_function='Huber:delta=1.0',
-        iterations=1000,
+        iterations=iterations,
         learning_rate=0.05,
         depth=5,
         verbose=False
     )
+
+def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> CatBoostRegressor:
+    model = _regressor()
     val_size = max(1, int(len(X_train)*0.2))
     Xt, yt = X_train.iloc[:-val_size], y_train.iloc[:-val_size]
     Xv, yv = X_train.iloc[-val_size:], y_train.iloc[-val_size:]
@@ -17,6 +24,16 @@ def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> CatBoostRegressor:
     model.fit(Xt, yt, eval_set=(Xv, yv), early_stopping_rounds=100, verbose=False)
     return model
 
+def continue_training(model: CatBoostRegressor, X_new: pd.DataFrame, y_new: pd.Series) -> CatBoostRegressor:
+    """Boost up to WARM_START_ROUNDS more trees on ``X_new`` on top of ``model``."""
+    warm = _regressor(WARM_START_ROUNDS)
+    val_size = max(1, int(len(X_new)*0.2))
+    Xt, yt = X_new.iloc[:-val_size], y_new.iloc[:-val_size]
+    Xv, yv = X_new.iloc[-val_size:], y_new.iloc[-val_size:]
+
+    warm.fit(Xt, yt, eval_set=(Xv, yv), early_stopping_rounds=WARM_START_EARLY_STOPPING, verbose=False, init_model=model)
+    return warm
+
 def save_model(model: CatBoostRegressor, path: str):
     model.save_model(path)
 
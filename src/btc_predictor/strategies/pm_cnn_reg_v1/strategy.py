@@ -3,15 +3,19 @@ import pandas as pd
 import numpy as np
 from typing import Optional, List
 from pathlib import Path
-from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.base import BaseStrategy, WarmStartMixin
 from btc_predictor.models import PredictionSignal
 from btc_predictor.infrastructure.labeling import add_regression_labels
-from btc_predictor.strategies.pm_cnn_reg_v1.model import train_model, load_model, save_model
-from btc_predictor.strategies.pm_common.features_window import generate_window_features, get_window_columns
+from btc_predictor.strategies.pm_cnn_reg_v1.model import train_model, fine_tune_model, load_model, save_model
+from btc_predictor.strategies.pm_common.features_window import FEATURE_SET, generate_window_features, get_window_columns
+from btc_predictor.strategies.feature_cache import cached_features
 
 logger = logging.getLogger(__name__)
 
-class PMCNNRegV1Strategy(BaseStrategy):
+class PMCNNRegV1Strategy(WarmStartMixin, BaseStrategy):
+    train_model = staticmethod(train_model)
+    continue_training = staticmethod(fine_tune_model)
+
     def __init__(self, model_path: Optional[str] = None, model=None):
         self._name = "pm_cnn_reg_v1"
         self.models = {}
@@ -52,7 +56,7 @@ class PMCNNRegV1Strategy(BaseStrategy):
                 path = path.replace(".pkl", ".pt")
             save_model(model, path)
 
-    def fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
+    def _training_data(self, ohlcv: pd.DataFrame, timeframe_minutes: int):
         X, valid_indices = generate_window_features(ohlcv)
         if len(X) == 0:
             raise ValueError("Insufficient data to generate windows.")
@@ -68,11 +72,15 @@ class PMCNNRegV1Strategy(BaseStrategy):
         
         if len(X_clean) < 100:
             raise ValueError(f"Insufficient samples for training ({len(X_clean)})")
-            
+        return (X_clean, y_clean), pd.DatetimeIndex(valid_indices)[valid_mask]
+
+    @staticmethod
+    def _split(data):
+        X_clean, y_clean = data
         val_size = max(1, int(len(X_clean) * 0.2))
         X_train, y_train = X_clean[:-val_size], y_clean[:-val_size]
         X_val, y_val = X_clean[-val_size:], y_clean[-val_size:]
-        self.models[timeframe_minutes] = train_model(X_train, y_train, (X_val, y_val))
+        return X_train, y_train, (X_val, y_val)
 
     def predict(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> PredictionSignal:
         model = self.models.get(timeframe_minutes)
@@ -81,7 +89,7 @@ class PMCNNRegV1Strategy(BaseStrategy):
             
         # Generate single window for prediction
         # To just get last window, pass last 30 rows
-        X, _ = generate_window_features(ohlcv.iloc[-100:])
+        X, _ = cached_features(FEATURE_SET, ohlcv.iloc[-100:], generate_window_features)
         if len(X) == 0:
             raise ValueError("Insufficient data for inference window.")
         predicted_change = model.predict(X[-1:])[0] / 100.0
@@ -1,7 +1,16 @@
 import pandas as pd
 import numpy as np
 import talib
-from typing import List
+from typing import Dict, List
+
+from btc_predictor.strategies.streaming import (
+    ATR, EMA, OBV, RSI, BBands, Lag, RollingWindow, StreamingFeatureEngine,
+    finite_or_nan, safe_div, time_features,
+)
+
+# Identity for the shared feature cache
+FEATURE_SET = "pm_short_v1"
+
 
 def generate_features(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -107,3 +116,62 @@ def get_feature_columns() -> List[str]:
         'obv', 'obv_ret_3m',
         'hour_sin', 'hour_cos', 'day_sin', 'day_cos'
     ]
+
+
+class ShortFeatureEngine(StreamingFeatureEngine):
+    """Streaming version of :func:`generate_features` (Feature Set A)."""
+
+    OBV_RET_LAG = 3
+
+    def _reset_indicators(self) -> None:
+        self._close_lag = Lag(5)
+        self._ret_std = {n: RollingWindow(n) for n in [3, 5, 10]}
+        self._volume_mean = {n: RollingWindow(n) for n in [3, 5]}
+        self._rsi = RSI(7)
+        self._ema = {n: EMA(n) for n in [3, 8, 13]}
+        self._bbands = BBands(10, 2.0)
+        self._atr = ATR(7)
+        self._obv = OBV()
+
+    def _compute(self, ts, open_, high, low, close, volume) -> Dict[str, float]:
+        f: Dict[str, float] = {}
+        self._close_lag.update(close)
+
+        for n in [1, 2, 3, 5]:
+            f[f'ret_{n}m'] = safe_div(close, self._close_lag.get(n)) - 1
+
+        for n, window in self._ret_std.items():
+            window.update(f['ret_1m'])
+            f[f'vol_{n}m'] = window.std
+
+        f['rsi_7'] = self._rsi.update(close)
+        for n, ema in self._ema.items():
+            f[f'ema_{n}'] = ema.update(close)
+        f['ema_3_8_diff'] = f['ema_3'] - f['ema_8']
+        f['ema_8_13_diff'] = f['ema_8'] - f['ema_13']
+
+        f['bb_upper_10'], f['bb_middle_10'], f['bb_lower_10'] = self._bbands.update(close)
+        bb_range = f['bb_upper_10'] - f['bb_lower_10']
+        f['bb_pct_b_10'] = finite_or_nan(safe_div(close - f['bb_lower_10'], bb_range))
+        f['bb_dist_10'] = finite_or_nan(safe_div(close - f['bb_middle_10'], f['bb_middle_10']))
+
+        f['atr_7'] = self._atr.update(high, low, close)
+
+        for n, window in self._volume_mean.items():
+            window.update(volume)
+            f[f'vol_ratio_{n}m'] = finite_or_nan(safe_div(volume, window.mean))
+
+        rng = high - low
+        f['candle_body_ratio'] = finite_or_nan(safe_div(abs(close - open_), rng))
+        f['candle_range_pct'] = finite_or_nan(safe_div(rng, close))
+
+        f['obv'] = self._obv.update(close, volume)
+        f['obv_ret_3m'] = self._obv_ret(f['obv'])
+
+        f.update(time_features(ts))
+        return f
+
+
+def create_streaming_engine() -> ShortFeatureEngine:
+    """Incremental engine whose rows match :func:`generate_features`."""
+    return ShortFeatureEngine()
@@ -2,6 +2,9 @@ import pandas as pd
 import numpy as np
 from typing import Tuple, List
 
+# Identity for the shared feature cache
+FEATURE_SET = "pm_window_v1"
+
 def generate_window_features(df: pd.DataFrame, window_size: int = 30) -> Tuple[np.ndarray, pd.DatetimeIndex]:
     """
     Generate normalized raw window input for CNN/LSTM from OHLCV data.
@@ -1,16 +1,23 @@
 import lightgbm as lgb
-from typing import Tuple
+from typing import Tuple, Union
 import pandas as pd
 
-def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> lgb.LGBMRegressor:
-    model = lgb.LGBMRegressor(
+# Warm start (walk-forward): extra boosting rounds on the new data only
+WARM_START_ROUNDS = 200
+WARM_START_EARLY_STOPPING = 50
+
+def _regressor(n_estimators: int = 1000) -> lgb.LGBMRegressor:
+    return lgb.LGBMRegressor(
         objective='huber',
         max_depth=5,
         learning_rate=0.05,
-        n_estimators=1000,
+        n_estimators=n_estimators,
         n_jobs=-1,
         verbose=-1
     )
+
+def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> lgb.LGBMRegressor:
+    model = _regressor()
     val_size = max(1, int(len(X_train)*0.2))
     Xt, yt = X_train.iloc[:-val_size], y_train.iloc[:-val_size]
     Xv, yv = X_train.iloc[-val_size:], y_train.iloc[-val_size:]
@@ -22,6 +29,23 @@ def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> lgb.LGBMRegressor:
     )
     return model
 
+def continue_training(model: Union[lgb.LGBMRegressor, lgb.Booster], X_new: pd.DataFrame, y_new: pd.Series) -> lgb.LGBMRegressor:
+    """Boost up to WARM_START_ROUNDS more trees on ``X_new`` on top of ``model`` (cut at its best iteration)."""
+    booster = model if isinstance(model, lgb.Booster) else model.booster_
+    init_model = lgb.Booster(model_str=booster.model_to_string())  # best iteration only, if early-stopped
+    warm = _regressor(WARM_START_ROUNDS)
+    val_size = max(1, int(len(X_new)*0.2))
+    Xt, yt = X_new.iloc[:-val_size], y_new.iloc[:-val_size]
+    Xv, yv = X_new.iloc[-val_size:], y_new.iloc[-val_size:]
+
+    warm.fit(
+        Xt, yt,
+        eval_set=[(Xv, yv)],
+        callbacks=[lgb.early_stopping(WARM_START_EARLY_STOPPING, verbose=False)],
+        init_model=init_model
+    )
+    return warm
+
 def save_model(model: lgb.LGBMRegressor, path: str):
     model.booster_.save_model(path)
 
@@ -1,10 +1,15 @@
+import copy
 import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import TensorDataset, DataLoader
 import numpy as np
 
-def train_pytorch(model, X_train, y_train, X_val, y_val, epochs=20, batch_size=256):
+# Warm start (walk-forward): a few low-LR epochs on the new data only
+WARM_START_EPOCHS = 5
+WARM_START_LR = 3e-4
+
+def train_pytorch(model, X_train, y_train, X_val, y_val, epochs=20, batch_size=256, lr=1e-3):
     X_t = torch.tensor(X_train, dtype=torch.float32)
     y_t = torch.tensor(y_train, dtype=torch.float32).unsqueeze(1)
     X_v = torch.tensor(X_val, dtype=torch.float32)
@@ -14,7 +19,7 @@ def train_pytorch(model, X_train, y_train, X_val, y_val, epochs=20, batch_size=2
     val_dl = DataLoader(TensorDataset(X_v, y_v), batch_size=batch_size)
     
     criterion = nn.HuberLoss(delta=1.0)
-    optimizer = optim.Adam(model.parameters(), lr=1e-3)
+    optimizer = optim.Adam(model.parameters(), lr=lr)
     
     best_loss = float('inf')
     best_weights = model.state_dict()
@@ -82,6 +87,12 @@ def train_model(X_train, y_train, val_data) -> LSTMRegressorWrapper:
     model = train_pytorch(model, X_train, y_train, X_val, y_val)
     return LSTMRegressorWrapper(model)
 
+def fine_tune_model(model: LSTMRegressorWrapper, X_train, y_train, val_data) -> LSTMRegressorWrapper:
+    """Continue training a copy of ``model`` on new data (WARM_START_EPOCHS at WARM_START_LR)."""
+    X_val, y_val = val_data
+    net = train_pytorch(copy.deepcopy(model.model), X_train, y_train, X_val, y_val, epochs=WARM_START_EPOCHS, lr=WARM_START_LR)
+    return LSTMRegressorWrapper(net)
+
 def save_model(model: LSTMRegressorWrapper, path: str):
     torch.save(model.model.state_dict(), path)
 
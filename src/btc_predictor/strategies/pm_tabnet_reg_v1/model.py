@@ -4,6 +4,11 @@ import pandas as pd
 import numpy as np
 import torch
 import os
+import copy
+
+# Warm start (walk-forward): a few epochs on the new data only
+WARM_START_EPOCHS = 5
+WARM_START_PATIENCE = 3
 
 def train_model(X_train: pd.DataFrame, y_train: pd.Series, val_data: Tuple[pd.DataFrame, pd.Series]) -> TabNetRegressor:
     model = TabNetRegressor(
@@ -31,6 +36,24 @@ def train_model(X_train: pd.DataFrame, y_train: pd.Series, val_data: Tuple[pd.Da
     )
     return model
 
+def continue_training(model: TabNetRegressor, X_train: pd.DataFrame, y_train: pd.Series, val_data: Tuple[pd.DataFrame, pd.Series]) -> TabNetRegressor:
+    """Continue training a copy of ``model`` on new data (``warm_start`` keeps its weights)."""
+    warm = copy.deepcopy(model)
+    X_val, y_val = val_data
+
+    warm.fit(
+        X_train=X_train.values, y_train=y_train.values.reshape(-1, 1),
+        eval_set=[(X_val.values, y_val.values.reshape(-1, 1))],
+        eval_name=['val'],
+        eval_metric=['mae'],
+        max_epochs=WARM_START_EPOCHS,
+        patience=WARM_START_PATIENCE,
+        batch_size=256,
+        virtual_batch_size=128,
+        warm_start=True
+    )
+    return warm
+
 def save_model(model: TabNetRegressor, path: str):
     base_path = path.replace(".zip", "")
     model.save_model(base_path)
@@ -3,15 +3,20 @@ import pandas as pd
 import numpy as np
 from typing import Optional, List
 from pathlib import Path
-from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.base import BaseStrategy, WarmStartMixin
 from btc_predictor.models import PredictionSignal
 from btc_predictor.infrastructure.labeling import add_regression_labels
-from btc_predictor.strategies.pm_tabnet_reg_v1.model import train_model, load_model, save_model
-from btc_predictor.strategies.pm_common.features_short import generate_features, get_feature_columns
+from btc_predictor.strategies.pm_tabnet_reg_v1.model import train_model, continue_training, load_model, save_model
+from btc_predictor.strategies.pm_common.features_short import FEATURE_SET, generate_features, get_feature_columns
+from btc_predictor.strategies.feature_cache import cached_features
+from btc_predictor.strategies.feature_store import stored_features
 
 logger = logging.getLogger(__name__)
 
-class PMTabNetRegV1Strategy(BaseStrategy):
+class PMTabNetRegV1Strategy(WarmStartMixin, BaseStrategy):
+    train_model = staticmethod(train_model)
+    continue_training = staticmethod(continue_training)
+
     def __init__(self, model_path: Optional[str] = None, model=None):
         self._name = "pm_tabnet_reg_v1"
         self.models = {}
@@ -52,29 +57,33 @@ class PMTabNetRegV1Strategy(BaseStrategy):
                 path = path.replace(".pkl", ".zip")
             save_model(model, path)
 
-    def fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
-        feat_df = generate_features(ohlcv)
+    def _training_data(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> pd.DataFrame:
+        feat_df = stored_features(FEATURE_SET, ohlcv, generate_features)
         labeled_df = add_regression_labels(feat_df, timeframe_minutes)
         feature_cols = get_feature_columns()
         
         data = labeled_df.dropna(subset=['price_change_pct'] + feature_cols)
         if len(data) < 100:
             raise ValueError(f"Insufficient samples for training ({len(data)})")
-            
+        return data, data.index
+
+    @staticmethod
+    def _split(data: pd.DataFrame):
+        feature_cols = get_feature_columns()
         val_size = max(1, int(len(data) * 0.2))
         train_df = data.iloc[:-val_size]
         val_df = data.iloc[-val_size:]
         
         X_train, y_train = train_df[feature_cols], train_df['price_change_pct'] * 100.0
         X_val, y_val = val_df[feature_cols], val_df['price_change_pct'] * 100.0
-        self.models[timeframe_minutes] = train_model(X_train, y_train, (X_val, y_val))
+        return X_train, y_train, (X_val, y_val)
 
     def predict(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> PredictionSignal:
         model = self.models.get(timeframe_minutes)
         if model is None:
             raise ValueError(f"Model not trained for {timeframe_minutes}m")
             
-        feat_df = generate_features(ohlcv.iloc[-100:])
+        feat_df = cached_features(FEATURE_SET, ohlcv.iloc[-100:], generate_features)
         X = feat_df[get_feature_columns()].iloc[[-1]]
         predicted_change = float(model.predict(X.values).flatten()[0]) / 100.0
         
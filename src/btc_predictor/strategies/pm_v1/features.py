@@ -1 +1 @@
-from btc_predictor.strategies.catboost_v1.features import generate_features, get_feature_columns
+from btc_predictor.strategies.catboost_v1.features import FEATURE_SET, generate_features, get_feature_columns, create_streaming_engine
@@ -1,24 +1,34 @@
 import logging
 import pandas as pd
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from pathlib import Path
-from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.base import CausalBatchStrategy
 from btc_predictor.models import PredictionSignal
-from btc_predictor.strategies.pm_v1.features import generate_features, get_feature_columns
+from btc_predictor.strategies.pm_v1.features import FEATURE_SET, generate_features, get_feature_columns, create_streaming_engine
+from btc_predictor.strategies.inference import PredictorCache
+from btc_predictor.strategies.feature_cache import cached_features
+from btc_predictor.strategies.feature_store import stored_features
+from btc_predictor.strategies.streaming import shared_engine
 from btc_predictor.strategies.pm_v1.model import train_model, load_model, save_model
 from btc_predictor.infrastructure.labeling import add_direction_labels
 
 logger = logging.getLogger(__name__)
 
-class PMV1Strategy(BaseStrategy):
+class PMV1Strategy(CausalBatchStrategy):
     """
     Polymarket v1 Strategy:
     - Uses CatBoost for direction classification.
     - Uses ">=" settlement condition for training.
     """
+    feature_set = FEATURE_SET
+    compute_features = staticmethod(generate_features)
+    feature_columns = staticmethod(get_feature_columns)
+
     def __init__(self, model_path: Optional[str] = None, model=None):
         self._name = "pm_v1"
         self.models = {}  # timeframe -> model
+        self._features = shared_engine(FEATURE_SET, create_streaming_engine)  # incremental live features
+        self._predictors = PredictorCache(get_feature_columns())  # native inference per timeframe
         
         if model:
             self.models[10] = model
@@ -59,7 +69,7 @@ class PMV1Strategy(BaseStrategy):
             save_model(model, path)
 
     def fit(self, ohlcv: pd.DataFrame, timeframe_minutes: int) -> None:
-        feat_df = generate_features(ohlcv)
+        feat_df = stored_features(FEATURE_SET, ohlcv, generate_features)
         # Use >= settlement condition for Polymarket
         labeled_df = add_direction_labels(feat_df, timeframe_minutes, settlement_condition=">=")
         feature_cols = get_feature_columns()
@@ -88,12 +98,10 @@ class PMV1Strategy(BaseStrategy):
         if model is None:
             raise ValueError(f"Model not trained for {timeframe_minutes}m")
             
-        feat_df = generate_features(ohlcv)
-        latest_features = feat_df.iloc[[-1]] 
-        X = latest_features[get_feature_columns()]
+        latest_features = cached_features(FEATURE_SET, ohlcv, self._features.sync)
         
-        probs = model.predict_proba(X)[0]
-        prob_higher = probs[1]
+        # Probability of label 1 (native model, float32 row in feature-column order)
+        prob_higher = self._predictors.get(timeframe_minutes, model).predict_frame(latest_features)[0]
         
         if prob_higher > 0.5:
             direction = "higher"
@@ -119,3 +127,19 @@ class PMV1Strategy(BaseStrategy):
             market_price_up=market_price_up,
             alpha=alpha
         )
+
+    def _signal_fields(
+        self,
+        ts: pd.Timestamp,
+        timeframe_minutes: int,
+        prob_higher: float,
+        feature_cols: List[str],
+    ) -> Dict[str, Any]:
+        # In backtest, we use 0.5 as proxy market price for UP outcome
+        market_price_up = 0.5
+        return {
+            "features_used": feature_cols,
+            "market_slug": f"btc-price-at-{ts.strftime('%Y%m%d%H%M')}-{timeframe_minutes}m",
+            "market_price_up": market_price_up,
+            "alpha": prob_higher - market_price_up,
+        }
@@ -2,6 +2,10 @@ import xgboost as xgb
 from typing import Tuple
 import pandas as pd
 
+# Warm start (walk-forward): extra boosting rounds on the new data only
+WARM_START_ROUNDS = 200
+WARM_START_EARLY_STOPPING = 50
+
 def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> xgb.XGBRegressor:
     model = xgb.XGBRegressor(
         objective='reg:pseudohubererror',
@@ -19,6 +23,22 @@ def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> xgb.XGBRegressor:
     model.fit(Xt, yt, eval_set=[(Xv, yv)], verbose=False)
     return model
 
+def continue_training(model: xgb.XGBRegressor, X_new: pd.DataFrame, y_new: pd.Series) -> xgb.XGBRegressor:
+    """Boost up to WARM_START_ROUNDS more trees on ``X_new`` on top of ``model`` (cut at its best iteration)."""
+    booster = model.get_booster()
+    best = booster.attr("best_iteration")
+    if best is not None:
+        booster = booster[:int(best) + 1]
+    params = model.get_params()
+    params.update(n_estimators=WARM_START_ROUNDS, early_stopping_rounds=WARM_START_EARLY_STOPPING)
+    warm = xgb.XGBRegressor(**params)
+    val_size = max(1, int(len(X_new)*0.2))
+    Xt, yt = X_new.iloc[:-val_size], y_new.iloc[:-val_size]
+    Xv, yv = X_new.iloc[-val_size:], y_new.iloc[-val_size:]
+
+    warm.fit(Xt, yt, eval_set=[(Xv, yv)], xgb_model=booster, verbose=False)
+    return warm
+
 def save_model(model: xgb.XGBRegressor, path: str):
     model.save_model(path)
 
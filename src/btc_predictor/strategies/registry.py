@@ -4,7 +4,7 @@ import inspect
 import sys
 import logging
 from pathlib import Path
-from typing import List, Dict, Type
+from typing import List, Dict, Optional, Type
 from btc_predictor.strategies.base import BaseStrategy
 
 logger = logging.getLogger(__name__)
@@ -41,51 +41,69 @@ class StrategyRegistry:
             dir_name = item.name
             if dir_name.startswith("_") or dir_name == "__pycache__":
                 continue
+
+            instance = self._load_directory(item, models_dir)
+            if instance is not None:
+                self.register(instance)
+
+    def load(self, name: str, strategies_dir: Path, models_dir: Path) -> BaseStrategy:
+        """
+        只載入 strategies_dir/{name} 一個策略 (含模型) 並註冊。
+        用於 backtest worker process 依名稱重建策略，避免 discover 全部策略。
+        """
+        instance = self._load_directory(Path(strategies_dir) / name, Path(models_dir))
+        if instance is None:
+            raise KeyError(f"Strategy '{name}' not found")
+        self.register(instance)
+        return instance
+
+    def _load_directory(self, item: Path, models_dir: Path) -> Optional[BaseStrategy]:
+        """Import item/strategy.py, instantiate its BaseStrategy subclass and load its models."""
+        dir_name = item.name
+        strategy_file = item / "strategy.py"
+        if not strategy_file.exists():
+            logger.warning(f"Skipping {dir_name}: strategies.py not found")
+            return None
+        
+        # Construct module path
+        module_name = f"btc_predictor.strategies.{dir_name}.strategy"
+        
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            logger.error(f"Failed to import module {module_name}: {e}")
+            return None
             
-            strategy_file = item / "strategy.py"
-            if not strategy_file.exists():
-                logger.warning(f"Skipping {dir_name}: strategies.py not found")
-                continue
+        # Find BaseStrategy subclass
+        strategy_class: Type[BaseStrategy] = None
+        for name, obj in inspect.getmembers(module):
+            if inspect.isclass(obj) and issubclass(obj, BaseStrategy) and not inspect.isabstract(obj):
+                strategy_class = obj
+                break
+        
+        if not strategy_class:
+            logger.warning(f"No BaseStrategy subclass found in {module_name}")
+            return None
             
-            # Construct module path
-            module_name = f"btc_predictor.strategies.{dir_name}.strategy"
+        try:
+            # Instantiate strategy using default constructor
+            instance = strategy_class()
             
-            try:
-                module = importlib.import_module(module_name)
-            except ImportError as e:
-                logger.error(f"Failed to import module {module_name}: {e}")
-                continue
-                
-            # Find BaseStrategy subclass
-            strategy_class: Type[BaseStrategy] = None
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, BaseStrategy) and obj is not BaseStrategy:
-                    strategy_class = obj
-                    break
+            # Check for models directory
+            strat_models_dir = models_dir / instance.name
+            if strat_models_dir.exists() and strat_models_dir.is_dir():
+                # Attempt to invoke load_models_from_dir if it exists (Convention)
+                if hasattr(instance, "load_models_from_dir"):
+                     # Call the method I added to XGBoostDirectionStrategy
+                    getattr(instance, "load_models_from_dir")(strat_models_dir)
+                else:
+                    logger.debug(f"Strategy {instance.name} does not have load_models_from_dir method.")
             
-            if not strategy_class:
-                logger.warning(f"No BaseStrategy subclass found in {module_name}")
-                continue
-                
-            try:
-                # Instantiate strategy using default constructor
-                instance = strategy_class()
-                
-                # Check for models directory
-                strat_models_dir = models_dir / instance.name
-                if strat_models_dir.exists() and strat_models_dir.is_dir():
-                    # Attempt to invoke load_models_from_dir if it exists (Convention)
-                    if hasattr(instance, "load_models_from_dir"):
-                         # Call the method I added to XGBoostDirectionStrategy
-                        getattr(instance, "load_models_from_dir")(strat_models_dir)
-                    else:
-                        logger.debug(f"Strategy {instance.name} does not have load_models_from_dir method.")
-                
-                self.register(instance)
+            return instance
 
-            except Exception as e:
-                logger.error(f"Error loading strategy from {dir_name}: {e}")
-                continue
+        except Exception as e:
+            logger.error(f"Error loading strategy from {dir_name}: {e}")
+            return None
 
     def get(self, name: str) -> BaseStrategy:
         """根據名稱取得策略實例。"""
@@ -0,0 +1,151 @@
+"""
+btc_predictor/strategies/scheduler.py
+-------------------------------------
+Concurrent inference for all strategies triggered on the same candle
+
+職責:
+- 同一次觸發的所有策略同時執行 ``predict`` (有上限的 thread pool)，
+  最後一個策略的 signal 延遲約為最慢的單一模型，而非所有模型延遲的總和
+- 每個策略獨立 timeout (自觸發起算)；逾時 / 例外只略過該策略並記錄 log
+- 共享的 FeatureCache 經 ``contextvars`` 帶入 worker threads
+
+Threads cannot be interrupted: a timed-out ``predict`` that already started
+keeps running and its result is dropped. Until it returns, later triggers
+skip that strategy, so a stuck model cannot occupy every worker.
+
+Usage (pipelines)::
+
+    self.scheduler = InferenceScheduler()
+    ...
+    for strategy, signal in await self.scheduler.run(strategies, ohlcv, timeframe, self.feature_cache):
+        ...
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.feature_cache import FeatureCache
+
+logger = logging.getLogger(__name__)
+
+# Tree models release the GIL while predicting; more workers than this only
+# adds contention on small hosts.
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+
+def _timed_predict(strategy: BaseStrategy, ohlcv: pd.DataFrame, timeframe: int) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    signal = strategy.predict(ohlcv, timeframe)
+    return signal, time.perf_counter() - start
+
+
+class InferenceScheduler:
+    """Fans ``strategy.predict`` out over a bounded thread pool.
+
+    Args:
+        max_workers: Size of the inference thread pool.
+        timeout:     Seconds (from the start of a trigger) after which a
+                     strategy's prediction is abandoned.
+        timeouts:    Per-strategy overrides of ``timeout``, keyed by name.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        timeouts: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.timeouts: Dict[str, float] = dict(timeouts or {})
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Latest submitted prediction per strategy name
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._executor
+
+    def timeout_for(self, strategy: BaseStrategy) -> float:
+        return self.timeouts.get(strategy.name, self.timeout)
+
+    async def run(
+        self,
+        strategies: Sequence[BaseStrategy],
+        ohlcv: pd.DataFrame,
+        timeframe: int,
+        feature_cache: Optional[FeatureCache] = None,
+    ) -> List[Tuple[BaseStrategy, Any]]:
+        """Predict with every strategy concurrently.
+
+        Returns:
+            ``(strategy, signal)`` for each strategy that finished in time, in
+            the order of ``strategies``.
+        """
+        submitted: List[Tuple[BaseStrategy, concurrent.futures.Future]] = []
+        for strategy in strategies:
+            previous = self._inflight.get(strategy.name)
+            if previous is not None and not previous.done():
+                logger.warning(
+                    f"InferenceScheduler: {strategy.name} is still running an abandoned "
+                    f"prediction, skipping {timeframe}m"
+                )
+                continue
+            if feature_cache is not None:
+                with feature_cache.activate(ohlcv):
+                    context = contextvars.copy_context()
+            else:
+                context = contextvars.copy_context()
+            future = self.executor.submit(context.run, _timed_predict, strategy, ohlcv, timeframe)
+            self._inflight[strategy.name] = future
+            submitted.append((strategy, future))
+
+        if not submitted:
+            return []
+
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(
+            self._wait(strategy, future, timeframe) for strategy, future in submitted
+        ))
+        results = [(strategy, outcome[0]) for (strategy, _), outcome in zip(submitted, outcomes) if outcome]
+        logger.info(
+            f"InferenceScheduler: {len(results)}/{len(submitted)} strategies predicted "
+            f"{timeframe}m in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        return results
+
+    async def _wait(
+        self, strategy: BaseStrategy, future: concurrent.futures.Future, timeframe: int
+    ) -> Optional[Tuple[Any, float]]:
+        timeout = self.timeout_for(strategy)
+        try:
+            # On timeout wait_for cancels the wrapper, which cancels the
+            # executor future if the prediction has not started yet.
+            signal, latency = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"InferenceScheduler: {strategy.name} timed out after {timeout:.1f}s for {timeframe}m")
+            return None
+        except Exception as e:
+            logger.error(f"InferenceScheduler: Error predicting {strategy.name} for {timeframe}m: {e}", exc_info=True)
+            return None
+        logger.debug(f"InferenceScheduler: {strategy.name} {timeframe}m predicted in {latency * 1000:.1f} ms")
+        return signal, latency
+
+    def close(self) -> None:
+        """Stop the worker threads; queued predictions are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._inflight.clear()
@@ -0,0 +1,636 @@
+"""
+btc_predictor/strategies/streaming.py
+-------------------------------------
+Incremental (streaming) counterparts of the TA-Lib / pandas feature code in
+``strategies/*/features.py``.
+
+Every indicator keeps O(1) state and is updated once per confirmed 1m candle,
+replicating the exact recurrences (including warm-up / seeding rules) of the
+batch implementation:
+
+- RSI / ATR:  Wilder smoothing seeded with the simple mean of the first period.
+- EMA:        seeded with the SMA of the first ``period`` values (TA-Lib).
+- MACD:       TA-Lib aligns both EMAs on the slow lookback, so the fast EMA is
+              seeded with the SMA of closes ``[slow-fast, slow)``, not ``[0, fast)``.
+- BBANDS:     window sums recomputed per candle in TA-Lib's order (O(period)),
+              avoiding the cancellation of a running sum of squares.
+- OBV:        cumulative signed volume anchored at the first candle.
+- rolling:    pandas fixed-window mean / std (ddof=1).
+
+Feeding a series candle by candle therefore yields the same rows as calling
+``generate_features`` on the whole series (up to float rounding).
+
+Feature-set specific engines are exposed through ``create_streaming_engine()``
+in the corresponding ``features.py``.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+NAN = float("nan")
+
+
+def safe_div(a: float, b: float) -> float:
+    """Float division with numpy semantics (x/0 -> ±inf, 0/0 -> nan)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(a) / np.float64(b))
+
+
+def finite_or_nan(x: float) -> float:
+    """Equivalent of ``.replace([np.inf, -np.inf], np.nan)`` for a scalar."""
+    return x if not math.isinf(x) else NAN
+
+
+# ----------------------------------------------------------------------
+# Indicator primitives
+# ----------------------------------------------------------------------
+
+class Lag:
+    """Keeps the last ``maxlen`` values; ``get(n)`` returns the value n steps back."""
+
+    def __init__(self, maxlen: int) -> None:
+        self._values: deque = deque(maxlen=maxlen + 1)
+
+    def update(self, x: float) -> None:
+        self._values.append(x)
+
+    def get(self, n: int) -> float:
+        if n >= len(self._values):
+            return NAN
+        return self._values[-1 - n]
+
+
+class RollingWindow:
+    """pandas ``rolling(window=n)`` mean and std (ddof=1) with ``min_periods=n``.
+
+    Follows the add/remove updates of pandas' fixed-window aggregations
+    (Kahan-compensated sum, compensated Welford variance, flat-run detection)
+    so results are bit-compatible with the batch path. NaN inputs are skipped.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: deque = deque()
+        self._nobs = 0
+        self._neg_ct = 0
+        # mean state
+        self._sum = 0.0
+        self._sum_comp_add = 0.0
+        self._sum_comp_remove = 0.0
+        # var state
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._var_comp_add = 0.0
+        self._var_comp_remove = 0.0
+        # run of identical values (pandas returns exact results for flat windows)
+        self._same_count = 0
+        self._prev_value = NAN
+
+    def update(self, x: float) -> None:
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(x)
+        self._add(x)
+
+    def _add(self, x: float) -> None:
+        if x != x:
+            return
+        self._nobs += 1
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct += 1
+        if x == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = x
+
+        y = x - self._sum_comp_add
+        t = self._sum + y
+        self._sum_comp_add = t - self._sum - y
+        self._sum = t
+
+        prev_mean = self._mean - self._var_comp_add
+        y = x - self._var_comp_add
+        t = y - self._mean
+        self._var_comp_add = t + self._mean - y
+        self._mean = self._mean + t / self._nobs
+        self._ssqdm = self._ssqdm + (x - prev_mean) * (x - self._mean)
+
+    def _remove(self, x: float) -> None:
+        if x != x:
+            return
+        self._nobs -= 1
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct -= 1
+
+        y = -x - self._sum_comp_remove
+        t = self._sum + y
+        self._sum_comp_remove = t - self._sum - y
+        self._sum = t
+
+        if self._nobs:
+            prev_mean = self._mean - self._var_comp_remove
+            y = x - self._var_comp_remove
+            t = y - self._mean
+            self._var_comp_remove = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssqdm = self._ssqdm - (x - prev_mean) * (x - self._mean)
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+    @property
+    def mean(self) -> float:
+        if self._nobs < self.window or self._nobs == 0:
+            return NAN
+        if self._same_count >= self._nobs:
+            return self._prev_value
+        result = self._sum / self._nobs
+        if self._neg_ct == 0 and result < 0:
+            return 0.0
+        if self._neg_ct == self._nobs and result > 0:
+            return 0.0
+        return result
+
+    @property
+    def std(self) -> float:
+        if self._nobs < self.window or self._nobs <= 1:
+            return NAN
+        if self._same_count >= self._nobs:
+            return 0.0
+        var = self._ssqdm / (self._nobs - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class EMA:
+    """TA-Lib EMA: seeded with the SMA of the first ``period`` values."""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self._seed: List[float] = []
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if self.value != self.value:
+            self._seed.append(x)
+            if len(self._seed) == self.period:
+                total = 0.0
+                for v in self._seed:
+                    total += v
+                self.value = total / self.period
+                self._seed = []
+            return self.value
+        self.value = ((x - self.value) * self.k) + self.value
+        return self.value
+
+
+class RSI:
+    """TA-Lib RSI (Wilder smoothing, first value at index ``period``)."""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._prev_close = NAN
+        self._count = 0
+        self._gain = 0.0
+        self._loss = 0.0
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        prev = self._prev_close
+        self._prev_close = close
+        self._count += 1
+        if self._count == 1:
+            return NAN
+
+        diff = close - prev
+        if self._count <= self.period + 1:
+            if diff < 0:
+                self._loss -= diff
+            else:
+                self._gain += diff
+            if self._count < self.period + 1:
+                return NAN
+            self._loss /= self.period
+            self._gain /= self.period
+        else:
+            self._loss *= (self.period - 1)
+            self._gain *= (self.period - 1)
+            if diff < 0:
+                self._loss -= diff
+            else:
+                self._gain += diff
+            self._loss /= self.period
+            self._gain /= self.period
+
+        total = self._gain + self._loss
+        self.value = 100.0 * (self._gain / total) if not (-1e-8 < total < 1e-8) else 0.0
+        return self.value
+
+
+class ATR:
+    """TA-Lib ATR: SMA of the first ``period`` true ranges, then Wilder smoothing."""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._prev_close = NAN
+        self._seed: List[float] = []
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close = self._prev_close
+        self._prev_close = close
+        if prev_close != prev_close:
+            return NAN
+
+        tr = high - low
+        v2 = abs(prev_close - high)
+        if v2 > tr:
+            tr = v2
+        v3 = abs(prev_close - low)
+        if v3 > tr:
+            tr = v3
+
+        if self.value != self.value:
+            self._seed.append(tr)
+            if len(self._seed) == self.period:
+                total = 0.0
+                for v in self._seed:
+                    total += v
+                self.value = total / self.period
+                self._seed = []
+            return self.value
+
+        atr = self.value * (self.period - 1)
+        atr += tr
+        atr /= self.period
+        self.value = atr
+        return self.value
+
+
+class MACD:
+    """TA-Lib MACD; all three outputs start at index ``slow + signal - 2``."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self.fast_period = fast
+        self.slow_period = slow
+        self.k_fast = 2.0 / (fast + 1)
+        self.k_slow = 2.0 / (slow + 1)
+        self._signal = EMA(signal)
+        self._seed: List[float] = []
+        self._fast = NAN
+        self._slow = NAN
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        if self._slow != self._slow:
+            self._seed.append(close)
+            if len(self._seed) < self.slow_period:
+                return NAN, NAN, NAN
+            total = 0.0
+            for v in self._seed:
+                total += v
+            self._slow = total / self.slow_period
+            total = 0.0
+            for v in self._seed[self.slow_period - self.fast_period:]:
+                total += v
+            self._fast = total / self.fast_period
+            self._seed = []
+        else:
+            self._slow = ((close - self._slow) * self.k_slow) + self._slow
+            self._fast = ((close - self._fast) * self.k_fast) + self._fast
+
+        macd = self._fast - self._slow
+        signal = self._signal.update(macd)
+        if signal != signal:
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+
+class BBands:
+    """TA-Lib BBANDS (SMA middle band, symmetric deviations).
+
+    TA-Lib derives the deviation from a running sum of squares, which suffers
+    from cancellation that grows with the length of the stream. The window
+    sums are therefore recomputed per candle (O(period)) in TA-Lib's order,
+    i.e. as if a fresh batch started ``period`` candles ago.
+    """
+
+    def __init__(self, period: int = 20, nbdev: float = 2.0) -> None:
+        self.period = period
+        self.nbdev = nbdev
+        self._window: deque = deque(maxlen=period)
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        self._window.append(close)
+        if len(self._window) < self.period:
+            return NAN, NAN, NAN
+
+        total = 0.0
+        total2 = 0.0
+        for v in self._window:
+            total += v
+            total2 += v * v
+        middle = total / self.period
+        mean2 = total2 / self.period - middle * middle
+        std = math.sqrt(mean2) if not mean2 < 0.00000001 else 0.0
+        dev = std * self.nbdev
+        return middle + dev, middle, middle - dev
+
+
+class OBV:
+    """TA-Lib OBV anchored at the first candle (OBV[0] = volume[0])."""
+
+    def __init__(self) -> None:
+        self._prev_close = NAN
+        self.value = NAN
+
+    def update(self, close: float, volume: float) -> float:
+        if self.value != self.value:
+            self.value = volume
+        elif close > self._prev_close:
+            self.value += volume
+        elif close < self._prev_close:
+            self.value -= volume
+        self._prev_close = close
+        return self.value
+
+
+# ----------------------------------------------------------------------
+# Engine base class
+# ----------------------------------------------------------------------
+
+class StreamingFeatureEngine:
+    """Stateful feature engine updated once per confirmed candle.
+
+    Subclasses implement :meth:`_reset_indicators` and :meth:`_compute`.
+    Features that depend on where the batch window starts (OBV is a
+    cumulative sum) are re-based in :meth:`_rebase` so that :meth:`sync`
+    matches ``generate_features(ohlcv).iloc[[-1]]`` for a sliding window.
+
+    Args:
+        history: Number of recent candles whose OBV / volume are retained for
+                 window re-anchoring. Must exceed the live window length;
+                 longer frames are served when they start at the engine's
+                 first candle (rebuilt from the frame if necessary).
+        precomputed_markers: Columns whose presence means ``ohlcv`` already
+                 carries the features (the batch early-return used in
+                 backtests); :meth:`sync` then returns the last row as-is.
+    """
+
+    OBV_RET_LAG: Optional[int] = None
+
+    def __init__(self, history: int = 2048, precomputed_markers: Tuple[str, ...] = ()) -> None:
+        self.history = history
+        self.precomputed_markers = tuple(precomputed_markers)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self) -> Dict:
+        # Locks cannot be copied/pickled (run_backtest deep-copies strategies).
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # --- public API -----------------------------------------------------
+
+    def reset(self) -> None:
+        """Drop all indicator state."""
+        self._count = 0
+        self._first_ts: Optional[pd.Timestamp] = None
+        self._last_ts: Optional[pd.Timestamp] = None
+        self._latest: Dict[str, float] = {}
+        self._ts_pos: Dict[pd.Timestamp, int] = {}
+        self._ts_order: deque = deque()
+        self._obv_hist: deque = deque(maxlen=self.history)
+        self._volume_hist: deque = deque(maxlen=self.history)
+        self._reset_indicators()
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        return self._last_ts
+
+    def update(
+        self,
+        ts: pd.Timestamp,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> Dict[str, float]:
+        """Consume one candle and return its feature row (anchored at the first candle)."""
+        ts = pd.Timestamp(ts)
+        features = self._compute(ts, float(open_), float(high), float(low), float(close), float(volume))
+        if self._count == 0:
+            self._first_ts = ts
+
+        self._ts_pos[ts] = self._count
+        self._ts_order.append(ts)
+        if len(self._ts_order) > self.history:
+            del self._ts_pos[self._ts_order.popleft()]
+        self._obv_hist.append(features.get("obv", NAN))
+        self._volume_hist.append(float(volume))
+
+        self._count += 1
+        self._last_ts = ts
+        self._latest = features
+        return features
+
+    def sync(self, ohlcv: pd.DataFrame) -> pd.DataFrame:
+        """Bring the engine up to ``ohlcv.index[-1]`` and return its feature row.
+
+        Only candles newer than the last processed one are consumed, so a live
+        window that advanced by one candle costs O(1). If ``ohlcv`` does not
+        continue the engine's history (gap, rewind or unknown window start) the
+        engine is rebuilt from ``ohlcv``.
+
+        Returns:
+            One-row DataFrame equivalent to ``generate_features(ohlcv).iloc[[-1]]``.
+        """
+        if not isinstance(ohlcv.index, pd.DatetimeIndex):
+            ohlcv = ohlcv.copy()
+            ohlcv.index = pd.to_datetime(ohlcv.index)
+
+        if self.precomputed_markers and all(c in ohlcv.columns for c in self.precomputed_markers):
+            return ohlcv.iloc[[-1]]
+
+        with self._lock:
+            seen = self._seen_rows(ohlcv)
+            if seen < 0:
+                self.reset()
+                seen = 0
+
+            if seen < len(ohlcv):
+                index = ohlcv.index[seen:]
+                values = ohlcv[OHLCV_COLUMNS].to_numpy(dtype=float)[seen:]
+                for ts, row in zip(index, values):
+                    self.update(ts, *row)
+
+            if ohlcv.index[0] == self._first_ts:
+                # Features are anchored at the first candle already (the
+                # window may be longer than the retained history)
+                features = dict(self._latest)
+            else:
+                anchor = self._pos_offset(self._ts_pos[ohlcv.index[0]])
+                features = self._rebase(dict(self._latest), anchor)
+
+        last = ohlcv.iloc[[-1]]
+        values = np.fromiter(features.values(), dtype=float, count=len(features))
+        feat = pd.DataFrame(values[None, :], index=last.index, columns=list(features))
+        if any(c in features for c in last.columns):
+            last = last[[c for c in last.columns if c not in features]]
+        return pd.concat([last, feat], axis=1)
+
+    # --- helpers ----------------------------------------------------------
+
+    def _seen_rows(self, ohlcv: pd.DataFrame) -> int:
+        """Number of leading ``ohlcv`` rows already consumed, or -1 if it does not continue our history."""
+        if self._last_ts is None or ohlcv.empty:
+            return -1
+        start_pos = 0 if ohlcv.index[0] == self._first_ts else self._ts_pos.get(ohlcv.index[0])
+        if start_pos is None:
+            return -1
+        # Rows in the window up to the last processed candle must be exactly
+        # the candles the engine has seen since the window start.
+        seen = self._count - start_pos
+        if seen > len(ohlcv) or ohlcv.index[seen - 1] != self._last_ts:
+            return -1
+        return seen
+
+    def _pos_offset(self, pos: int) -> int:
+        """Translate an absolute candle position to an index in the history deques."""
+        return pos - (self._count - len(self._obv_hist))
+
+    def _obv_since(self, anchor: int, lag: int = 0) -> float:
+        """OBV as a batch computation starting at history index ``anchor`` would see it."""
+        idx = len(self._obv_hist) - 1 - lag
+        if idx < anchor:
+            return NAN
+        return self._obv_hist[idx] - self._obv_hist[anchor] + self._volume_hist[anchor]
+
+    # --- subclass hooks ---------------------------------------------------
+
+    def _reset_indicators(self) -> None:
+        raise NotImplementedError
+
+    def _compute(
+        self, ts: pd.Timestamp, open_: float, high: float, low: float, close: float, volume: float
+    ) -> Dict[str, float]:
+        raise NotImplementedError
+
+    def _rebase(self, features: Dict[str, float], anchor: int) -> Dict[str, float]:
+        """Re-anchor the cumulative OBV (and its rate of change) to the window start."""
+        if anchor == 0 or "obv" not in features:
+            return features
+        features["obv"] = self._obv_since(anchor)
+        if self.OBV_RET_LAG:
+            lagged = self._obv_since(anchor, lag=self.OBV_RET_LAG)
+            features[f"obv_ret_{self.OBV_RET_LAG}m"] = safe_div(features["obv"], lagged) - 1
+        return features
+
+    def _obv_ret(self, obv: float) -> float:
+        """``pct_change(OBV_RET_LAG)`` of OBV for the candle being computed."""
+        lag = self.OBV_RET_LAG
+        prev = self._obv_hist[-lag] if lag and len(self._obv_hist) >= lag else NAN
+        return safe_div(obv, prev) - 1
+
+
+
+_SHARED_ENGINES: Dict[str, StreamingFeatureEngine] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_engine(feature_set: str, factory: Callable[[], StreamingFeatureEngine]) -> StreamingFeatureEngine:
+    """Process-wide engine for ``feature_set``.
+
+    Strategies with the same feature set advance a single engine, so in a live
+    tick the state is updated once no matter which strategy runs first.
+    """
+    with _SHARED_LOCK:
+        engine = _SHARED_ENGINES.get(feature_set)
+        if engine is None:
+            engine = _SHARED_ENGINES[feature_set] = factory()
+        return engine
+
+def time_features(ts: pd.Timestamp) -> Dict[str, float]:
+    hour = ts.hour
+    day = ts.dayofweek
+    return {
+        "hour_sin": float(np.sin(2 * np.pi * hour / 24)),
+        "hour_cos": float(np.cos(2 * np.pi * hour / 24)),
+        "day_sin": float(np.sin(2 * np.pi * day / 7)),
+        "day_cos": float(np.cos(2 * np.pi * day / 7)),
+    }
+
+
+class StandardFeatureEngine(StreamingFeatureEngine):
+    """Streaming version of the standard 1m feature set.
+
+    Mirrors ``generate_features`` in xgboost_v1 / xgboost_v2 / lgbm_v1 /
+    lgbm_v1_tuned / catboost_v1 (and pm_v1), and is a superset of lgbm_v2's.
+    """
+
+    RETURN_WINDOWS = [1, 3, 5, 10, 30, 60]
+    OBV_RET_LAG = 5
+    VOL_WINDOWS = [5, 10, 30, 60]
+    VOLUME_WINDOWS = [5, 10, 30]
+
+    def _reset_indicators(self) -> None:
+        self._close_lag = Lag(max(self.RETURN_WINDOWS))
+        self._ret_std = {n: RollingWindow(n) for n in self.VOL_WINDOWS}
+        self._volume_mean = {n: RollingWindow(n) for n in self.VOLUME_WINDOWS}
+        self._rsi = RSI(14)
+        self._macd = MACD(12, 26, 9)
+        self._bbands = BBands(20, 2.0)
+        self._atr = ATR(14)
+        self._obv = OBV()
+        self._prev_macd_hist = NAN
+
+    def _compute(self, ts, open_, high, low, close, volume):
+        f: Dict[str, float] = {}
+        self._close_lag.update(close)
+
+        for n in self.RETURN_WINDOWS:
+            prev = self._close_lag.get(n)
+            ratio = safe_div(close, prev)
+            f[f"ret_{n}m"] = ratio - 1
+            f[f"log_ret_{n}m"] = float(np.log(ratio)) if ratio == ratio else NAN
+
+        for n, window in self._ret_std.items():
+            window.update(f["ret_1m"])
+            f[f"vol_{n}m"] = window.std
+
+        f["rsi_14"] = self._rsi.update(close)
+        f["macd"], f["macd_signal"], f["macd_hist"] = self._macd.update(close)
+        f["bb_upper"], f["bb_middle"], f["bb_lower"] = self._bbands.update(close)
+        f["atr_14"] = self._atr.update(high, low, close)
+
+        f["rsi_dist"] = f["rsi_14"] - 50
+        f["macd_hist_slope"] = f["macd_hist"] - self._prev_macd_hist
+        self._prev_macd_hist = f["macd_hist"]
+
+        bb_range = f["bb_upper"] - f["bb_lower"]
+        f["bb_pct_b"] = (close - f["bb_lower"]) / bb_range if bb_range != 0 else NAN
+        f["bb_dist"] = safe_div(close - f["bb_middle"], f["bb_middle"])
+
+        f.update(time_features(ts))
+
+        for n, window in self._volume_mean.items():
+            window.update(volume)
+            f[f"vol_ratio_{n}m"] = safe_div(volume, window.mean)
+
+        f["obv"] = self._obv.update(close, volume)
+        f["obv_ret_5m"] = self._obv_ret(f["obv"])
+        return f
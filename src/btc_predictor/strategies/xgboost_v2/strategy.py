@@ -1,18 +1,28 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from pathlib import Path
-from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.base import CausalBatchStrategy
 from btc_predictor.models import PredictionSignal
-from btc_predictor.strategies.xgboost_v2.features import generate_features, get_feature_columns
-from btc_predictor.strategies.xgboost_v2.model import predict_higher_probability, load_model, train_model
+from btc_predictor.strategies.xgboost_v2.features import FEATURE_SET, generate_features, get_feature_columns, create_streaming_engine
+from btc_predictor.strategies.inference import PredictorCache
+from btc_predictor.strategies.feature_cache import cached_features
+from btc_predictor.strategies.feature_store import stored_features
+from btc_predictor.strategies.streaming import shared_engine
+from btc_predictor.strategies.xgboost_v2.model import load_model, train_model
 from btc_predictor.infrastructure.labeling import add_direction_labels
 
-class XGBoostDirectionStrategyV2(BaseStrategy):
+class XGBoostDirectionStrategyV2(CausalBatchStrategy):
+    feature_set = FEATURE_SET
+    compute_features = staticmethod(generate_features)
+    feature_columns = staticmethod(get_feature_columns)
+
     def __init__(self, model_path: Optional[str] = None, model=None):
         self._name = "xgboost_v2"
         self.models = {}  # timeframe -> model
+        self._features = shared_engine(FEATURE_SET, create_streaming_engine)  # incremental live features
+        self._predictors = PredictorCache(get_feature_columns())  # native inference per timeframe
         
         # Backward compatibility for single model loading
         if model_path:
@@ -76,7 +86,7 @@ class XGBoostDirectionStrategyV2(BaseStrategy):
         Train the XGBoost model using the provided data.
         """
         # 1. Generate features
-        feat_df = generate_features(ohlcv)
+        feat_df = stored_features(FEATURE_SET, ohlcv, generate_features)
         
         # 2. Add labels
         labeled_df = add_direction_labels(feat_df, timeframe_minutes)
@@ -136,18 +146,11 @@ class XGBoostDirectionStrategyV2(BaseStrategy):
             # Raising error is safer to detect issues.
             raise ValueError(f"Model not loaded/trained for XGBoostDirectionStrategy timeframe {timeframe_minutes}")
             
-        # 1. Generate features
-        feat_df = generate_features(ohlcv)
-        
-        # 2. Get the last row (latest data)
-        latest_features = feat_df.iloc[[-1]]
-        
-        # 3. Select relevant feature columns
-        feature_cols = get_feature_columns()
-        X = latest_features[feature_cols]
+        # 1-2. Features of the latest row (incremental, same values as generate_features)
+        latest_features = cached_features(FEATURE_SET, ohlcv, self._features.sync)
         
-        # 4. Predict probability
-        prob_higher = predict_higher_probability(model, X)[0]
+        # 3-4. Predict probability (native booster, float32 row in feature-column order)
+        prob_higher = self._predictors.get(timeframe_minutes, model).predict_frame(latest_features)[0]
         
         # 5. Determine direction and confidence
         if prob_higher > 0.5:
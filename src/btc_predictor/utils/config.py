@@ -1,20 +1,132 @@
+import os
+import threading
 import yaml
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
+
+# Assuming the project root is 3 levels up from this file
+DEFAULT_CONFIG_PATH = Path(__file__).parents[3] / "config" / "project_constants.yaml"
+
+
+def _config_path() -> Path:
+    config_path = DEFAULT_CONFIG_PATH
 
-def load_constants() -> dict[str, Any]:
-    """
-    Load project constants from config/project_constants.yaml
-    """
-    # Assuming the project root is 3 levels up from this file
-    config_path = Path(__file__).parents[3] / "config" / "project_constants.yaml"
-    
     if not config_path.exists():
         # Fallback for different execution contexts
         config_path = Path("config/project_constants.yaml")
-        
+
     if not config_path.exists():
         raise FileNotFoundError(f"Could not find config/project_constants.yaml at {config_path.absolute()}")
-        
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return config_path
+
+
+@dataclass(frozen=True)
+class RiskConfig:
+    """``risk_control`` section (defaults match the previous inline fallbacks)."""
+    bet_range: Tuple[float, float] = (5.0, 20.0)
+    daily_max_loss: float = 50.0
+    max_consecutive_losses: int = 8
+    max_daily_trades: int = 30
+
+    @classmethod
+    def from_dict(cls, risk_cfg: Dict[str, Any]) -> "RiskConfig":
+        bet_range = risk_cfg.get("bet_range", [5, 20])
+        return cls(
+            bet_range=(float(bet_range[0]), float(bet_range[1])),
+            daily_max_loss=float(risk_cfg.get("daily_max_loss", 50)),
+            max_consecutive_losses=int(risk_cfg.get("max_consecutive_losses", 8)),
+            max_daily_trades=int(risk_cfg.get("max_daily_trades", 30)),
+        )
+
+
+class ProjectConfig:
+    """Typed, read-only view over the parsed ``project_constants.yaml``.
+
+    ``raw`` is the dict ``load_constants`` returns; it is shared by every
+    caller and must not be mutated.
+    """
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self.raw = raw
+        self.risk = RiskConfig.from_dict(raw.get("risk_control") or {})
+        self._thresholds: Dict[int, float] = {
+            int(tf): float(v) for tf, v in (raw.get("confidence_thresholds") or {}).items()
+        }
+        self._payout_ratios: Dict[int, float] = {
+            int(tf): float(v) for tf, v in ((raw.get("event_contract") or {}).get("payout_ratio") or {}).items()
+        }
+
+    @classmethod
+    def of(cls, raw: Dict[str, Any]) -> "ProjectConfig":
+        """View of ``raw``; the cached instance when ``raw`` is the loaded config."""
+        cached = _CACHE.config
+        if cached is not None and cached.raw is raw:
+            return cached
+        return cls(raw)
+
+    def confidence_threshold(self, timeframe_minutes: int, default: float = 0.6) -> float:
+        return self._thresholds.get(int(timeframe_minutes), default)
+
+    def payout_ratio(self, timeframe_minutes: int, default: float = 1.85) -> float:
+        return self._payout_ratios.get(int(timeframe_minutes), default)
+
+
+class _ConfigCache:
+    """Process-wide parsed config, re-read only when the file changes (mtime / size)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._path: Optional[Path] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self.config: Optional[ProjectConfig] = None
+
+    def get(self) -> ProjectConfig:
+        try:
+            path = self._path or _config_path()
+            stat = os.stat(path)
+        except FileNotFoundError:
+            # Moved / deleted since the last load: resolve again (raises if gone)
+            self._path = None
+            path = _config_path()
+            stat = os.stat(path)
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        config = self.config
+        if config is not None and path == self._path and signature == self._signature:
+            return config
+
+        with self._lock:
+            if self.config is None or path != self._path or signature != self._signature:
+                with open(path, "r", encoding="utf-8") as f:
+                    raw = yaml.safe_load(f)
+                self.config = ProjectConfig(raw)
+                self._path = path
+                self._signature = signature
+            return self.config
+
+    def clear(self) -> None:
+        with self._lock:
+            self._path = None
+            self._signature = None
+            self.config = None
+
+
+_CACHE = _ConfigCache()
+
+
+def load_config() -> ProjectConfig:
+    """
+    Cached project config; the YAML is parsed again only after the file changes.
+    """
+    return _CACHE.get()
+
+
+def load_constants() -> dict[str, Any]:
+    """
+    Load project constants from config/project_constants.yaml
+
+    Served from the process-wide cache (see ``load_config``); treat the
+    returned dict as read-only.
+    """
+    return load_config().raw
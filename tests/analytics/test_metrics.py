@@ -88,3 +88,68 @@ def test_compute_drift():
     })
     res = compute_drift_detection(df, window_size=50)
     assert len(res['rolling_da']) == 51
+
+def test_rollup_metrics_match_row_level(tmp_path):
+    import random
+    from btc_predictor.analytics.extractors import (
+        get_calibration_rollup_dataframe, get_rollup_dataframe, get_signal_dataframe, get_trade_dataframe
+    )
+    from btc_predictor.analytics.metrics import (
+        compute_confidence_calibration_from_rollups, compute_directional_accuracy_from_rollups,
+        compute_pnl_metrics_from_rollups, compute_temporal_patterns_from_rollups
+    )
+    from btc_predictor.infrastructure.store import DataStore
+    from btc_predictor.models import PolymarketOrder, PredictionSignal, SimulatedTrade
+
+    db_path = str(tmp_path / "rollups.db")
+    store = DataStore(db_path)
+    rng = random.Random(3)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    contexts, settlements = [], []
+    for i in range(400):
+        ts = start + timedelta(minutes=37 * i)
+        tf = (5, 15, 60)[i % 3]
+        signal = PredictionSignal(f"pm_v{i % 2}", ts, tf, "higher" if i % 4 else "lower",
+                                  rng.uniform(0.5, 0.95), 100.0)
+        trade = SimulatedTrade(id=f"t{i}", strategy_name=signal.strategy_name, direction=signal.direction,
+                               confidence=signal.confidence, timeframe_minutes=tf, bet_amount=5.0,
+                               open_time=ts, open_price=100.0, expiry_time=ts + timedelta(minutes=tf))
+        order = PolymarketOrder(signal_id="", order_id=f"o{i}", token_id="tok", side="BUY", price=0.5,
+                                size=10, order_type="GTC", status="OPEN", placed_at=ts)
+        contexts.append((signal, trade, order))
+    signal_ids = store.save_polymarket_execution_contexts(contexts)
+    # Settle out of order (longer timeframes settle after later short ones)
+    order = sorted(range(400), key=lambda i: i + rng.randint(0, 6))
+    for i in order:
+        correct = rng.random() < 0.55
+        settlements.append((signal_ids[i], "higher", 101.0, correct))
+        store.update_pm_order(f"o{i}", "FILLED", pnl=round(rng.uniform(0.5, 5), 2) if correct else -5.0)
+    store.settle_signals(settlements)
+    store.close()
+
+    signals = get_signal_dataframe(db_path)
+    rollups = get_rollup_dataframe(db_path, "signals", by_timeframe=True)
+    assert compute_directional_accuracy_from_rollups(rollups, groupby=['timeframe_minutes']) == \
+        compute_directional_accuracy(signals, groupby=['timeframe_minutes'])
+
+    temporal = compute_temporal_patterns_from_rollups(rollups)
+    expected = compute_temporal_patterns(signals)
+    assert temporal["by_hour"] == expected["by_hour"] and temporal["by_weekday"] == expected["by_weekday"]
+    assert temporal["recent_vs_all"]["all_time"] == expected["recent_vs_all"]["all_time"]
+
+    calibration = compute_confidence_calibration_from_rollups(get_calibration_rollup_dataframe(db_path), rollups)
+    expected = compute_confidence_calibration(signals)
+    assert [b["count"] for b in calibration["buckets"]] == [b["count"] for b in expected["buckets"]]
+    assert [b["actual"] for b in calibration["buckets"]] == pytest.approx([b["actual"] for b in expected["buckets"]])
+    assert calibration["brier_score"] == pytest.approx(expected["brier_score"])
+    assert calibration["baseline_brier"] == pytest.approx(expected["baseline_brier"])
+
+    for strategy in (None, "pm_v1"):
+        pnl = compute_pnl_metrics_from_rollups(get_rollup_dataframe(db_path, "polymarket", strategy))
+        expected = compute_pnl_metrics(get_trade_dataframe(db_path, strategy))
+        for key in ("total_pnl", "total_trades", "win_rate", "avg_win", "avg_loss", "profit_factor", "sharpe_like"):
+            assert pnl[key] == pytest.approx(expected[key]), key
+        # Drawdown from a 0 start (the row-level curve's first point may be negative)
+        cum = np.concatenate(([0.0], [p["cum_pnl"] for p in expected["cumulative_pnl"]]))
+        assert pnl["max_drawdown"] == pytest.approx(float((np.maximum.accumulate(cum) - cum).max()))
+        assert pnl["daily_pnl"] == [{"date": d["date"], "pnl": pytest.approx(d["pnl"])} for d in expected["daily_pnl"]]
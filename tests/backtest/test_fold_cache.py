@@ -0,0 +1,90 @@
+import pandas as pd
+from unittest.mock import patch
+
+from btc_predictor.backtest.engine import run_backtest
+from btc_predictor.backtest import fold_cache
+from btc_predictor.backtest.fold_cache import FoldCache, artifacts_hash, code_hash, package_data_hash
+from btc_predictor.strategies.pm_dummy_reg_v1.strategy import DummyRegressionStrategy
+from tests.backtest.test_process_backend import MOCK_CONSTANTS, ohlcv  # noqa: F401
+from tests.test_backtest_engine import BatchMockStrategy
+
+
+def _run(strategy, data, cache, **kwargs):
+    with patch("btc_predictor.backtest.engine.load_constants", return_value=MOCK_CONSTANTS), \
+         patch("btc_predictor.simulation.risk.load_constants", return_value=MOCK_CONSTANTS):
+        return run_backtest(
+            strategy, data, timeframe_minutes=10, train_days=2, test_days=2, n_jobs=1,
+            fold_cache=cache, **kwargs,
+        )
+
+
+def test_fold_cache_reuses_unchanged_folds(ohlcv, tmp_path):  # noqa: F811
+    strategy = BatchMockStrategy()
+    shorter = ohlcv[ohlcv.index < ohlcv.index[0] + pd.Timedelta(days=7)]
+
+    cache = FoldCache(tmp_path / "cache")
+    cold = _run(strategy, shorter, cache)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    warm = _run(strategy, shorter, cache)
+    assert (cache.hits, cache.misses) == (3, 3)
+    assert warm.to_frame().equals(cold.to_frame())
+
+    # Two more days: the first two folds are unchanged, the last one and the new one recompute
+    extended = _run(strategy, ohlcv, cache, predictions_path=tmp_path / "p.arrow")
+    assert (cache.hits, cache.misses) == (5, 5)
+    uncached = _run(strategy, ohlcv, None)
+    assert extended.to_frame().equals(uncached.to_frame())
+    assert len(uncached) > len(cold)
+
+    # Different walk-forward parameters never share folds
+    cache.hits = cache.misses = 0
+    with patch("btc_predictor.backtest.engine.load_constants", return_value=MOCK_CONSTANTS), \
+         patch("btc_predictor.simulation.risk.load_constants", return_value=MOCK_CONSTANTS):
+        run_backtest(strategy, ohlcv, timeframe_minutes=10, train_days=3, test_days=2, n_jobs=1, fold_cache=cache)
+    assert cache.hits == 0
+
+
+def test_cache_key_covers_code_and_model_files(tmp_path):
+    dummy, mock = DummyRegressionStrategy(), BatchMockStrategy()
+    assert code_hash(dummy) == code_hash(DummyRegressionStrategy()) != code_hash(mock)
+
+    # Model files only matter for strategies that do not refit per fold
+    assert artifacts_hash(mock, tmp_path) == ""
+    before = artifacts_hash(dummy, tmp_path)
+    (tmp_path / dummy.name).mkdir()
+    (tmp_path / dummy.name / "15m.txt").write_text("model v1")
+    v1 = artifacts_hash(dummy, tmp_path)
+    (tmp_path / dummy.name / "15m.txt").write_text("model v2")
+    assert len({before, v1, artifacts_hash(dummy, tmp_path)}) == 3
+
+
+def test_cache_key_covers_package_data_and_libraries(ohlcv, tmp_path, monkeypatch):  # noqa: F811
+    # A strategy package with a tuned-parameters file next to its module
+    package = tmp_path / "tuned_mock"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "strategy.py").write_text(
+        "from tests.test_backtest_engine import BatchMockStrategy\n"
+        "class TunedMockStrategy(BatchMockStrategy):\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    from tuned_mock.strategy import TunedMockStrategy
+    strategy = TunedMockStrategy()
+
+    folds = [(ohlcv.index[0] + pd.Timedelta(days=2), ohlcv.index[0] + pd.Timedelta(days=4))]
+    keys = lambda: FoldCache(tmp_path / "cache").fold_keys(strategy, ohlcv, folds, 10, 2)
+
+    before = (package_data_hash(strategy), keys())
+    (package / "best_params.pkl").write_bytes(b"params v1")
+    v1 = (package_data_hash(strategy), keys())
+    (package / "best_params.pkl").write_bytes(b"params v2")
+    v2 = (package_data_hash(strategy), keys())
+    assert len({before[0], v1[0], v2[0]}) == 3
+    assert len({before[1][0], v1[1][0], v2[1][0]}) == 3
+
+    # A model library upgrade invalidates every fold
+    upgraded = {**fold_cache.library_versions(), "xgboost": "99.0.0"}
+    monkeypatch.setattr(fold_cache, "library_versions", lambda: upgraded)
+    assert keys() != v2[1]
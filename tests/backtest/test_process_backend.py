@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from btc_predictor.backtest.engine import _strategy_ref, run_backtest, DEFAULT_STRATEGIES_DIR
+from btc_predictor.backtest.shared_frame import open_shared_frame, share_frame
+from btc_predictor.strategies.pm_dummy_reg_v1.strategy import DummyRegressionStrategy
+from tests.test_backtest_engine import BatchMockStrategy
+
+MOCK_CONSTANTS = {
+    "event_contract": {"payout_ratio": {10: 1.8}},
+    "risk_control": {"bet_range": [5, 20]},
+    "confidence_thresholds": {10: 0.6},
+}
+
+
+@pytest.fixture
+def ohlcv():
+    periods = 9 * 24 * 60
+    index = pd.date_range("2025-01-01", periods=periods, freq="1min", tz="UTC", name="datetime")
+    close = 95000 + np.cumsum(np.random.default_rng(5).normal(0, 20, periods))
+    return pd.DataFrame({
+        "symbol": "BTCUSDT",
+        "open_time": index.asi8 // 1_000_000,
+        "open": close, "high": close + 5, "low": close - 5, "close": close, "volume": 1.0,
+    }, index=index)
+
+
+def test_share_frame_roundtrip(tmp_path, ohlcv):
+    frame = open_shared_frame(share_frame(ohlcv, tmp_path))
+
+    pd.testing.assert_frame_equal(frame, ohlcv.drop(columns=["symbol"]), check_freq=False)
+    assert not frame["close"].to_numpy().flags.writeable
+
+
+def test_strategy_ref_uses_registry_name_for_discoverable_strategies():
+    assert _strategy_ref(DummyRegressionStrategy(), DEFAULT_STRATEGIES_DIR) == "pm_dummy_reg_v1"
+    mock = BatchMockStrategy()
+    assert _strategy_ref(mock, DEFAULT_STRATEGIES_DIR) is mock
+
+
+@pytest.mark.parametrize("strategy", [DummyRegressionStrategy(), BatchMockStrategy()], ids=["registry", "pickled"])
+def test_process_backend_matches_threading(ohlcv, tmp_path, strategy):
+    def run(backend):
+        with patch("btc_predictor.backtest.engine.load_constants", return_value=MOCK_CONSTANTS), \
+             patch("btc_predictor.simulation.risk.load_constants", return_value=MOCK_CONSTANTS):
+            return run_backtest(
+                strategy, ohlcv, timeframe_minutes=10, train_days=2, test_days=2,
+                n_jobs=2, backend=backend, models_dir=tmp_path,
+            )
+
+    threaded, processed = run("threading"), run("process")
+
+    assert len(processed) == len(threaded) > 0
+    for a, b in zip(threaded, processed):
+        assert (a.open_time, a.direction, a.result, a.pnl) == (b.open_time, b.direction, b.result, b.pnl)
+
+
+def test_run_backtest_rejects_unknown_backend(ohlcv):
+    with pytest.raises(ValueError, match="backend"):
+        run_backtest(BatchMockStrategy(), ohlcv, timeframe_minutes=10, train_days=2, backend="dask")
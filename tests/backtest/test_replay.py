@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from dataclasses import replace
+from unittest.mock import patch
+
+from btc_predictor.backtest.engine import run_backtest
+from btc_predictor.backtest.replay import DecisionRule, replay, sweep
+from btc_predictor.backtest.stats import calculate_backtest_stats
+from btc_predictor.backtest.trade_log import PredictionLog
+from btc_predictor.utils.config import ProjectConfig
+from tests.backtest.test_process_backend import MOCK_CONSTANTS, ohlcv  # noqa: F401
+from tests.test_backtest_engine import BatchMockStrategy
+
+HEADLINE = {
+    "total_trades": "total_trades", "total_da": "total_da", "total_pnl": "total_pnl",
+    "mdd": "mdd", "sharpe": "sharpe", "max_losing_streak": "max_consecutive_losses",
+}
+
+
+def _predictions(n=3000, seed=11):
+    rng = np.random.default_rng(seed)
+    open_times = pd.date_range("2025-01-01", periods=n, freq="10min", tz="UTC")
+    open_price = 100 + rng.normal(0, 1, n).cumsum()
+    return PredictionLog.build(
+        "s", 10, open_times,
+        higher=rng.random(n) < 0.5,
+        confidence=rng.uniform(0.45, 0.95, n),
+        alpha=rng.normal(0, 0.3, n),
+        open_price=open_price,
+        close_price=open_price + rng.normal(0, 0.3, n),
+    )
+
+
+def test_replay_reproduces_backtest_trades(ohlcv, tmp_path):  # noqa: F811
+    path = tmp_path / "run.predictions.arrow"
+    with patch("btc_predictor.backtest.engine.load_constants", return_value=MOCK_CONSTANTS), \
+         patch("btc_predictor.simulation.risk.load_constants", return_value=MOCK_CONSTANTS):
+        trades = run_backtest(
+            BatchMockStrategy(), ohlcv, timeframe_minutes=10, train_days=2, test_days=2,
+            n_jobs=1, predictions_path=path,
+        )
+
+    predictions = PredictionLog.load(path)
+    assert len(predictions) >= len(trades) > 0
+    rule = DecisionRule.from_config(10, config=ProjectConfig.of(MOCK_CONSTANTS))
+    replayed = replay(predictions, rule)
+    assert replayed.to_frame().equals(trades.to_frame())
+
+
+def test_sweep_rows_match_replayed_stats():
+    predictions = _predictions()
+    base = DecisionRule(payout_ratio=1.8)
+    grid = {
+        "confidence_threshold": [0.55, 0.6, 0.7],
+        "bet_range": [(5, 20), (10, 10)],
+        "market_price": [np.nan, 0.55],
+        "daily_max_loss": [np.inf, 40],
+        "max_consecutive_losses": [np.inf, 3],
+    }
+    table = sweep(predictions, grid, base=base)
+    assert len(table) == 48
+
+    for row in table.itertuples(index=False):
+        rule = replace(base, **{name: getattr(row, name) for name in grid})
+        stats = calculate_backtest_stats(replay(predictions, rule))
+        for column, key in HEADLINE.items():
+            assert getattr(row, column) == pytest.approx(stats[key]), (rule, key)
+
+
+def test_risk_limits_gate_trades_in_time_order():
+    predictions = _predictions()
+    free = replay(predictions, DecisionRule(confidence_threshold=0.5))
+    rule = DecisionRule(confidence_threshold=0.5, daily_max_loss=30, max_daily_trades=20, max_consecutive_losses=2)
+    gated = replay(predictions, rule).to_frame()
+    assert 0 < len(gated) < len(free)
+
+    days = gated["open_time"].dt.floor("D")
+    assert gated.groupby(days).size().max() <= 20
+    # The daily loss cap only blocks trades once it has been reached
+    loss_before = gated["pnl"].clip(upper=0).groupby(days).transform(lambda s: -s.cumsum().shift(fill_value=0))
+    assert (loss_before < 30).all()
+    # Two losses in a row pause trading until an hour after the second one expires
+    lost = gated["pnl"] < 0
+    streak_end = lost & lost.shift(fill_value=False) & ~lost.shift(2, fill_value=False)
+    for i in np.flatnonzero(streak_end)[:-1]:
+        gap = gated["open_time"].iloc[i + 1] - gated["open_time"].iloc[i]
+        assert gap >= pd.Timedelta(minutes=70)
+
+    with pytest.raises(ValueError):
+        sweep(predictions, {"threshold": [0.6]})
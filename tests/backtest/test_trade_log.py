@@ -0,0 +1,76 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_predictor.backtest.stats import calculate_backtest_stats, compute_regression_stats
+from btc_predictor.backtest.trade_log import TradeLog, build_trade_log
+
+
+def _log(n=200, tz="UTC", seed=3):
+    rng = np.random.default_rng(seed)
+    open_times = pd.date_range("2025-01-01", periods=n, freq="10min", tz=tz)
+    open_price = 100 + rng.normal(0, 1, n).cumsum()
+    close_price = open_price + rng.normal(0, 0.5, n)
+    alpha = rng.normal(0, 0.3, n)
+    alpha[::4] = np.nan
+    return build_trade_log(
+        "s", 10, open_times,
+        higher=rng.random(n) < 0.5,
+        confidence=rng.uniform(0.5, 1.0, n),
+        bet_amount=rng.uniform(5, 20, n).round(2),
+        open_price=open_price,
+        close_price=close_price,
+        alpha=alpha,
+        payout_ratio=1.85,
+        settlement_condition=">",
+    )
+
+
+def test_trade_log_materializes_simulated_trades():
+    log = _log()
+    trades = log.to_trades()
+    assert len(trades) == len(log) == 200
+
+    t = log[5]
+    assert t.open_time == pd.Timestamp("2025-01-01 00:50", tz="UTC")
+    assert t.expiry_time - t.open_time == pd.Timedelta(minutes=10)
+    won = t.close_price > t.open_price if t.direction == "higher" else t.close_price < t.open_price
+    assert t.result == ("win" if won else "lose")
+    assert t.pnl == pytest.approx(t.bet_amount * 0.85 if won else -t.bet_amount)
+    assert "predicted_change_pct" in t.features_used and log[4].features_used == {}
+    assert log[-1].open_time == trades[-1].open_time and t.id == trades[5].id
+
+    # Round trip through the dataclasses
+    rebuilt = TradeLog.from_trades(trades)
+    for column in ("open_time", "higher", "win", "pnl"):
+        np.testing.assert_array_equal(getattr(rebuilt, column), getattr(log, column))
+    np.testing.assert_allclose(rebuilt.alpha, log.alpha)
+
+
+def test_stats_match_between_log_and_trades():
+    log = _log()
+    trades = log.to_trades()
+    assert calculate_backtest_stats(log) == calculate_backtest_stats(trades)
+    columnar, per_trade = compute_regression_stats(log), compute_regression_stats(trades)
+    assert columnar.keys() == per_trade.keys()
+    for key in ("mae", "rmse", "direction_da", "top_quartile_da", "top_quartile_pnl"):
+        assert columnar[key] == pytest.approx(per_trade[key])
+    assert columnar["alpha_curve"] == per_trade["alpha_curve"]
+
+
+def test_trade_log_arrow_round_trip_and_merge(tmp_path):
+    log = _log(tz=None)
+    path = log.save(tmp_path / "trades.arrow")
+    loaded = TradeLog.load(path)
+    assert (loaded.strategy_name, loaded.timeframe_minutes, loaded.tz) == ("s", 10, None)
+    assert loaded.to_frame().equals(log.to_frame())
+    assert path.stat().st_size < 60 * len(log) + 4096
+
+    # Overlapping segments: sorted by time, first copy of each open time kept
+    merged = TradeLog.concat([log[100:], log[:150]], "s", 10).sorted_unique()
+    assert len(merged) == 200
+    np.testing.assert_array_equal(merged.open_time, log.open_time)
+    with pytest.raises(ValueError):
+        TradeLog.concat([log, dataclasses.replace(log, strategy_name="other")], "s", 10)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_predictor.infrastructure.ohlcv_archive import OHLCVArchive
+from btc_predictor.infrastructure.store import DataStore
+
+MINUTE_MS = 60_000
+
+
+def _candles(start: str, periods: int) -> pd.DataFrame:
+    open_time = pd.Timestamp(start, tz="UTC").value // 1_000_000 + np.arange(periods, dtype=np.int64) * MINUTE_MS
+    close = 95000 + np.cumsum(np.random.default_rng(3).normal(0, 20, periods))
+    return pd.DataFrame({
+        "open_time": open_time,
+        "open": close - 1,
+        "high": close + 5,
+        "low": close - 5,
+        "close": close,
+        "volume": np.linspace(1, 2, periods),
+        "close_time": open_time + MINUTE_MS - 1,
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DataStore(str(tmp_path / "test.db"))
+    # Spans a month boundary: Jan 31 22:20 -> Feb 1 ~01:40
+    store.save_ohlcv(_candles("2025-01-31 22:20", 200), "BTCUSDT", "1m")
+    return store
+
+
+@pytest.fixture
+def archive(tmp_path, store):
+    archive = OHLCVArchive(tmp_path / "archive")
+    archive.sync(store, "BTCUSDT", "1m")
+    return archive
+
+
+def test_sync_partitions_by_month(archive):
+    assert archive.months("BTCUSDT", "1m") == ["2025-01", "2025-02"]
+    assert archive.partition_path("BTCUSDT", "1m", "2025-01").is_file()
+    assert archive.months("BTCUSDT", "5m") == []
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"limit": 50},
+    {"limit": 150},
+    {"start_time": 1738369800000},                          # 2025-02-01 00:30
+    {"end_time": 1738369800000},
+    {"start_time": 1738365000000, "end_time": 1738369000000, "limit": 40},  # across the boundary
+])
+def test_get_ohlcv_matches_store(store, archive, kwargs):
+    expected = store.get_ohlcv("BTCUSDT", "1m", **kwargs)
+    actual = archive.get_ohlcv("BTCUSDT", "1m", **kwargs)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_get_ohlcv_empty_range(archive):
+    df = archive.get_ohlcv("BTCUSDT", "1m", start_time=1800000000000)
+    assert df.empty
+    assert "close" in df.columns
+
+
+def test_sync_rewrites_only_changed_months(store, archive):
+    assert archive.sync(store, "BTCUSDT", "1m") == []
+
+    # New candles arrive in February
+    store.save_ohlcv(_candles("2025-02-01 01:40", 30), "BTCUSDT", "1m")
+    assert archive.sync(store, "BTCUSDT", "1m") == ["2025-02"]
+    pd.testing.assert_frame_equal(
+        archive.get_ohlcv("BTCUSDT", "1m"), store.get_ohlcv("BTCUSDT", "1m")
+    )
+
+    assert archive.sync(store, "BTCUSDT", "1m", full=True) == ["2025-01", "2025-02"]
@@ -0,0 +1,76 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from btc_predictor.infrastructure.rollups import compose_drawdown, equity_path
+from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.models import SimulatedTrade
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _rollups(store):
+    """Rollup rows: {key: values}, hourly then calibration."""
+    with store._get_connection() as conn:
+        return [
+            {row[:width]: row[width:] for row in conn.execute(f"SELECT * FROM {table}")}
+            for table, width in (("strategy_rollups", 4), ("strategy_calibration_rollups", 5))
+        ]
+
+
+def test_compose_drawdown_matches_full_curve():
+    rng = np.random.default_rng(5)
+    for _ in range(50):
+        pnl = rng.normal(0, 5, rng.integers(1, 60))
+        cuts = np.sort(rng.choice(np.arange(1, len(pnl) + 1), rng.integers(1, len(pnl) + 1), replace=False))
+        buckets = [equity_path(part) + (part.sum(),) for part in np.split(pnl, cuts) if len(part)]
+        peak, trough, max_dd, pnl_sum = zip(*buckets)
+        assert compose_drawdown(pnl_sum, peak, trough, max_dd) == pytest.approx(equity_path(pnl)[2])
+
+
+def test_rollups_follow_settlements_and_match_rebuild(tmp_path):
+    store = DataStore(str(tmp_path / "rollups.db"))
+    rng = random.Random(11)
+    trades = []
+    for i in range(400):
+        open_time = START + timedelta(minutes=rng.randint(0, 600))
+        tf = (10, 30, 60)[i % 3]
+        trades.append(SimulatedTrade(
+            id=f"t{i}", strategy_name=f"s{i % 2}", direction="higher" if i % 5 else "lower",
+            confidence=rng.uniform(0.5, 0.9), timeframe_minutes=tf, bet_amount=10.0, open_time=open_time,
+            open_price=100.0, expiry_time=open_time + timedelta(minutes=tf),
+        ))
+    for trade in trades:
+        store.save_simulated_trade(trade)
+
+    # Settled by expiry: longer timeframes land after newer short ones
+    by_expiry = sorted(trades, key=lambda t: t.expiry_time)
+    for start in range(0, 350, 50):
+        store.update_simulated_trades(
+            (t.id, 101.0, "win" if rng.random() < 0.55 else "lose", rng.choice([8.5, -10.0, 3.25]))
+            for t in by_expiry[start:start + 50]
+        )
+    with store._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM strategy_rollups WHERE dirty").fetchone()[0] == 0
+        rows = conn.execute(
+            "SELECT strategy_name, result, pnl FROM simulated_trades ORDER BY open_time_ms, rowid"
+        ).fetchall()
+
+    for strategy in ("s0", "s1"):
+        settled = [r for r in rows if r[0] == strategy and r[1] is not None]
+        detail = store.get_strategy_detail(strategy)
+        assert (detail["settled"], detail["pending"]) == (len(settled), sum(r[0] == strategy for r in rows) - len(settled))
+        assert detail["wins"] == sum(r[1] == "win" for r in settled)
+        assert detail["total_pnl"] == pytest.approx(sum(r[2] for r in settled))
+        assert detail["max_drawdown"] == pytest.approx(equity_path(np.array([r[2] for r in settled]))[2])
+    everything = store.get_rollups("simulated")
+    assert everything["n"].sum() == 350
+
+    maintained = _rollups(store)
+    store.rebuild_rollups()
+    for before, after in zip(maintained, _rollups(store)):
+        assert set(after) == set(before)
+        for key, values in before.items():
+            assert after[key] == pytest.approx(values), key
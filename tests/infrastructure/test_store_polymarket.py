@@ -36,6 +36,11 @@ def test_pm_markets_crud(temp_store):
     m = temp_store.get_active_pm_market(5)
     assert m["price_to_beat"] == 51000.0
 
+    # The pooled connection keeps returning plain tuples for other queries
+    with temp_store._get_connection() as conn:
+        assert conn.row_factory is None
+        assert conn.execute("SELECT slug FROM pm_markets").fetchall() == [("btc-5m-test",)]
+
 def test_pm_orders_crud(temp_store):
     # Setup a signal first if needed (though pm_orders references it, 
     # SQLite doesn't strictly enforce FB unless specified, and the schema uses REFERENCES)
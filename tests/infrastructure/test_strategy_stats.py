@@ -0,0 +1,120 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.models import PolymarketOrder, PredictionSignal, SimulatedTrade
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DataStore(str(tmp_path / "stats.db"))
+
+
+def _expected(store, strategy, timeframe):
+    """Reference: the per-pair queries and Python drawdown loop."""
+    with store._get_connection() as conn:
+        rows = conn.execute(
+            "SELECT direction, result, pnl FROM simulated_trades "
+            "WHERE strategy_name = ? AND timeframe_minutes = ? ORDER BY open_time_ms",
+            (strategy, timeframe),
+        ).fetchall()
+    settled = [r for r in rows if r[1] is not None]
+    cumulative = peak = max_dd = 0.0
+    for _, _, pnl in settled:
+        cumulative += pnl
+        peak = max(peak, cumulative)
+        max_dd = max(max_dd, peak - cumulative)
+    return {
+        "settled": len(settled),
+        "pending": len(rows) - len(settled),
+        "wins": sum(r[1] == "win" for r in settled),
+        "higher_total": sum(r[0] == "higher" for r in settled),
+        "lower_wins": sum(r[0] == "lower" and r[1] == "win" for r in settled),
+        "total_pnl": pytest.approx(sum(r[2] for r in settled)),
+        "max_drawdown": pytest.approx(max_dd),
+    }
+
+
+def _check(store, stats):
+    with store._get_connection() as conn:
+        pairs = conn.execute("SELECT DISTINCT strategy_name, timeframe_minutes FROM simulated_trades").fetchall()
+    assert set(stats) == set(pairs)
+    for pair in pairs:
+        expected = _expected(store, *pair)
+        assert {k: stats[pair][k] for k in expected} == expected, pair
+        assert stats[pair] == store.get_strategy_detail(*pair)
+
+
+def _trade(i, strategy, timeframe, minutes):
+    open_time = START + timedelta(minutes=minutes)
+    return SimulatedTrade(
+        id=f"t{i}", strategy_name=strategy, direction="higher" if i % 3 else "lower", confidence=0.6,
+        timeframe_minutes=timeframe, bet_amount=10.0, open_time=open_time, open_price=100.0,
+        expiry_time=open_time + timedelta(minutes=timeframe),
+    )
+
+
+def test_strategy_stats_incremental_matches_per_pair_detail(store):
+    rng = random.Random(7)
+    pending = []
+    for i in range(300):
+        trade = _trade(i, f"s{i % 3}", (10, 30)[i % 2], i)
+        store.save_simulated_trade(trade)
+        pending.append(trade.id)
+
+    def settle(ids):
+        store.update_simulated_trades(
+            (tid, 101.0, "win" if rng.random() < 0.55 else "lose", rng.choice([8.5, -10.0])) for tid in ids
+        )
+
+    settle(pending[:250])
+    _check(store, store.get_strategy_stats())
+    cache = store._stats_caches["simulated"]
+    assert len(cache._pending) == 50
+
+    # New trades plus settlements, including ones older than settled rows
+    for i in range(300, 320):
+        store.save_simulated_trade(_trade(i, "s_new" if i % 2 else "s0", 10, i))
+    settle(pending[260:300] + pending[250:255] + [f"t{i}" for i in range(300, 310)])
+    stats = store.get_strategy_stats()
+    _check(store, stats)
+    assert len(cache._pending) == 5 + 10
+
+    # Older trades settling after newer ones re-read their group's curve
+    settle(pending[255:260])
+    _check(store, store.get_strategy_stats())
+    assert len(cache._pending) == 10
+
+    assert set(store.get_strategy_stats(timeframe=30)) == {pair for pair in stats if pair[1] == 30}
+
+
+def test_strategy_stats_polymarket_source(store):
+    for i, (tf, pnl) in enumerate([(5, 10.0), (5, -4.0), (15, None), (5, 3.0)]):
+        ts = START + timedelta(minutes=i)
+        signal = PredictionSignal("pm_v1", ts, tf, "higher" if i % 2 else "lower", 0.7, 100.0)
+        trade = SimulatedTrade(
+            id=f"t{i}", strategy_name="pm_v1", direction=signal.direction, confidence=0.7,
+            timeframe_minutes=tf, bet_amount=5.0, open_time=ts, open_price=100.0,
+            expiry_time=ts + timedelta(minutes=tf),
+        )
+        order = PolymarketOrder(
+            signal_id="", order_id=f"o{i}", token_id="tok", side="BUY", price=0.5, size=10,
+            order_type="GTC", status="OPEN", placed_at=ts,
+        )
+        store.save_polymarket_execution_context(signal, trade, order)
+        if pnl is not None:
+            store.update_pm_order(f"o{i}", status="FILLED", pnl=pnl)
+
+    stats = store.get_strategy_stats(polymarket=True)
+    assert stats[("pm_v1", 5)] == store.get_pm_strategy_detail("pm_v1", 5)
+    assert (stats[("pm_v1", 5)]["settled"], stats[("pm_v1", 5)]["max_drawdown"]) == (3, 4.0)
+    assert stats[("pm_v1", 15)]["pending"] == 1
+
+    store.update_pm_order("o2", status="FILLED", pnl=-2.0)
+    stats = store.get_strategy_stats(polymarket=True)
+    assert stats[("pm_v1", 15)] == store.get_pm_strategy_detail("pm_v1", 15)
+    assert (stats[("pm_v1", 15)]["settled"], stats[("pm_v1", 15)]["pending"]) == (1, 0)
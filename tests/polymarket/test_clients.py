@@ -1,3 +1,6 @@
+import asyncio
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, patch
 from btc_predictor.polymarket.gamma_client import GammaClient
@@ -71,3 +74,38 @@ async def test_clob_get_price(clob_client):
         price = await clob_client.get_price("token_123")
         
         assert price == pytest.approx(0.5)
+
+@pytest.mark.asyncio
+async def test_clob_get_orderbooks_batch(clob_client):
+    books = {
+        "up": {
+            "bids": [{"price": "0.45", "size": "10"}, {"price": "0.47", "size": "20"}],
+            "asks": [{"price": "0.60", "size": "100"}, {"price": "0.50", "size": "100"}],
+        },
+        "one_sided": {"bids": [{"price": "0.30", "size": "5"}], "asks": []},
+        "failed": {},
+    }
+    in_flight = peak = 0
+
+    async def fake_orderbook(token_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return books[token_id]
+
+    with patch.object(CLOBClient, "get_orderbook", side_effect=fake_orderbook):
+        batch = await clob_client.get_orderbooks(["up", "one_sided", "failed"] * 3, max_concurrency=2)
+
+    assert peak == 2
+    assert len(batch) == 9 and batch.books is None
+    assert batch.best_bid[0] == 0.47 and batch.best_ask[0] == 0.50
+    assert batch.spread[0] == pytest.approx(0.03)
+    assert (batch.bid_size[0], batch.ask_size[0]) == (30.0, 200.0)
+    # $50 fills at 0.50; $100 takes all 100 @0.50 plus 50/0.60 shares
+    assert batch.fill_price[0] == pytest.approx([0.50, 100 / (100 + 50 / 0.60)])
+    assert batch.best_bid[1] == 0.30 and np.isnan(batch.best_ask[1]) and np.isnan(batch.spread[1])
+    assert np.isnan(batch.fill_price[2]).all()
+    assert batch.quote("up")["midpoint"] == pytest.approx(0.485)
+    assert batch.quote("unknown") is None
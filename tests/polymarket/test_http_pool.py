@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from btc_predictor.polymarket.clob_client import CLOBClient
+from btc_predictor.polymarket.gamma_client import GammaClient
+from btc_predictor.polymarket.http_pool import PooledHTTPClient
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 stand-in for the Gamma and CLOB endpoints."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.server.requests.append((url.path, query))
+        time.sleep(0.05)  # keeps concurrent callers in flight together
+        if url.path == "/book" and query.get("token_id") == "broken":
+            status, body = 500, {}
+        elif url.path == "/book":
+            status, body = 200, {"asset_id": query["token_id"], "bids": [{"price": "0.48", "size": "10"}], "asks": []}
+        else:
+            status, body = 200, [{"title": "Bitcoin Up or Down", "markets": [{"slug": "btc-5m"}]}]
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    httpd.daemon_threads = True
+    httpd.connections, httpd.requests = 0, []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.asyncio
+async def test_clob_coalesces_and_caches_orderbooks(server):
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    async with CLOBClient(base_url=base_url, cache_ttl=0.3) as clob:
+        books = await asyncio.gather(*(clob.get_orderbook(t) for t in ["a"] * 8 + ["b"] * 4))
+        assert [b["asset_id"] for b in books] == ["a"] * 8 + ["b"] * 4
+        assert sorted(q["token_id"] for _, q in server.requests) == ["a", "b"]
+
+        # Within the TTL: served from cache; after it: fetched again on a kept-alive connection
+        await clob.get_orderbook("a")
+        assert len(server.requests) == 2
+        await asyncio.sleep(0.35)
+        await clob.get_orderbook("a")
+        assert len(server.requests) == 3
+
+        # Errors reach every coalesced caller and are not cached
+        assert await asyncio.gather(*(clob.get_orderbook("broken") for _ in range(3))) == [{}] * 3
+        assert await clob.get_orderbook("broken") == {}
+        assert len(server.requests) == 5
+    assert server.connections <= 2
+
+
+@pytest.mark.asyncio
+async def test_gamma_reuses_pooled_connection(server):
+    gamma = GammaClient(base_url=f"http://127.0.0.1:{server.server_port}", cache_ttl=0)
+    for _ in range(5):
+        markets = await gamma.get_active_5m_btc_markets()
+        assert markets == [{"slug": "btc-5m"}]
+    await gamma.aclose()
+    assert len(server.requests) == 5
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_drops_expired_and_caps_entries(server):
+    http = PooledHTTPClient(f"http://127.0.0.1:{server.server_port}", cache_ttl=0.5, max_cache_entries=3)
+    for token in ["a", "b", "c"]:
+        await http.get_json("/book", params={"token_id": token})
+    assert len(http._cache) == 3
+
+    # Tokens never asked for again do not linger once their TTL has passed
+    await asyncio.sleep(0.55)
+    await http.get_json("/book", params={"token_id": "d"})
+    assert list(http._cache) == [("/book", (("token_id", "d"),))]
+
+    # Full cache: the oldest entry makes room
+    for token in ["e", "f", "g"]:
+        await http.get_json("/book", params={"token_id": token}, ttl=60)
+    assert [key[1][0][1] for key in http._cache] == ["e", "f", "g"]
+    await http.aclose()
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import AsyncMock, patch
 import sqlite3
 import asyncio
 import pandas as pd
@@ -6,6 +7,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from btc_predictor.infrastructure.store import DataStore
+from btc_predictor.polymarket.clob_client import CLOBClient
 from btc_predictor.polymarket.pipeline import PolymarketLivePipeline
 from btc_predictor.models import PredictionSignal
 from btc_predictor.strategies.base import BaseStrategy
@@ -98,6 +100,8 @@ async def test_polymarket_pipeline_execution(temp_store):
         sig = dict(signals[0])
         assert sig["strategy_name"] == "dummy_pm"
         assert sig["traded"] == 1
+        assert sig["entry_price"] == 0.4
+        assert sig["alpha"] == pytest.approx(0.9 - 0.4)
         
         trades = conn.execute("SELECT * FROM simulated_trades").fetchall()
         assert len(trades) == 1, "Expected exactly 1 simulated trade to be saved"
@@ -143,3 +147,61 @@ async def test_polymarket_pipeline_handles_missing_market(temp_store, caplog):
         
         # Wait, the logic is: default fallback to 0.5
         # confidence: 0.9, market_price: 0.5. alpha: 0.9 - 0.5 = 0.4 > 0.1 -> still bet!
+
+@pytest.mark.asyncio
+async def test_polymarket_pipeline_prices_from_orderbook(temp_store):
+    clob = CLOBClient()
+    pipeline = PolymarketLivePipeline(
+        strategies=[DummyStrategy()],
+        store=temp_store,
+        tracker=MockTracker(),
+        clob_client=clob,
+    )
+    pipeline.alpha_thresholds = {"dummy_pm": {5: 0.1}}
+    pipeline.risk_cfg = {"bet_range": [10, 100], "daily_max_loss": 500, "max_daily_trades": 100, "max_consecutive_losses": 8}
+
+    books = {
+        "up123": {"bids": [{"price": "0.41", "size": "50"}], "asks": [{"price": "0.43", "size": "50"}]},
+        "dn123": {"bids": [{"price": "0.56", "size": "50"}], "asks": [{"price": "0.58", "size": "50"}]},
+    }
+    dt = datetime(2024, 1, 1, 0, 4, 0, tzinfo=timezone.utc)
+    df = pd.DataFrame({"open": [1], "high": [1], "low": [1], "close": [1], "volume": [1]}, index=[dt])
+
+    with patch.object(CLOBClient, "get_orderbook", new_callable=AsyncMock, side_effect=lambda t: books[t]) as get_book:
+        await pipeline.process_new_data(df)
+    assert sorted(c.args[0] for c in get_book.call_args_list) == ["dn123", "up123"]
+
+    with temp_store._get_connection() as conn:
+        price, = conn.execute("SELECT price FROM pm_orders").fetchone()
+        alpha, entry_price, market_price_up = conn.execute(
+            "SELECT alpha, entry_price, market_price_up FROM prediction_signals"
+        ).fetchone()
+    # "higher" buys the up token at its best ask rather than Gamma's close_price,
+    # and the signal records the price its alpha was computed against
+    assert price == entry_price == 0.43
+    assert alpha == pytest.approx(0.9 - 0.43)
+    assert market_price_up == 0.4
+
+@pytest.mark.asyncio
+async def test_polymarket_pipeline_sees_external_settlements(temp_store):
+    pipeline = PolymarketLivePipeline(
+        strategies=[DummyStrategy()],
+        store=temp_store,
+        tracker=MockTracker()
+    )
+    pipeline.alpha_thresholds = {"dummy_pm": {5: 0.1}}
+
+    today = datetime.now(timezone.utc).replace(hour=0, minute=4, second=0, microsecond=0)
+    ohlcv = lambda dt: pd.DataFrame({"open": [1], "high": [1], "low": [1], "close": [1], "volume": [1]}, index=[dt])
+
+    await pipeline.process_new_data(ohlcv(today))
+    with temp_store._get_connection() as conn:
+        (trade_id,), = conn.execute("SELECT id FROM simulated_trades").fetchall()
+
+    # The Binance process's settler books a loss above daily_max_loss
+    DataStore(db_path=str(temp_store.db_path)).update_simulated_trade(trade_id, 99000.0, "lose", -60.0)
+
+    await pipeline.process_new_data(ohlcv(today + pd.Timedelta(minutes=5)))
+    with temp_store._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM simulated_trades").fetchone() == (1,)
+        assert conn.execute("SELECT COUNT(*) FROM prediction_signals").fetchone() == (2,)
@@ -63,3 +63,40 @@ def test_get_active_market_delegation(mock_gamma, mock_store):
     res = tracker.get_active_market(5)
     assert res["slug"] == "found"
     mock_store.get_active_pm_market.assert_called_with(5)
+
+@pytest.mark.asyncio
+async def test_get_active_market_served_from_index(mock_gamma, mock_store):
+    tracker = PolymarketTracker(mock_gamma, mock_store)
+    now = datetime.now(timezone.utc)
+
+    def raw(slug, start, minutes, price):
+        return {
+            "slug": slug,
+            "startDate": start.isoformat(),
+            "endDate": (start + timedelta(minutes=minutes)).isoformat(),
+            "tokens": [{"tokenId": f"up_{slug}", "price": price}, {"tokenId": f"down_{slug}"}],
+        }
+
+    mock_gamma.get_active_5m_btc_markets.return_value = [
+        raw("later", now, 5, 0.4),
+        raw("soon", now - timedelta(minutes=3), 5, 0.55),
+        raw("expired", now - timedelta(minutes=6), 5, 0.9),
+        raw("quarter", now, 15, 0.5),
+    ]
+    await tracker.sync_active_markets(timeframes=[5, 15])
+
+    assert tracker.get_active_market(5)["slug"] == "soon"
+    assert tracker.get_active_market(5)["close_price"] == 0.55
+    assert tracker.get_active_market(15)["slug"] == "quarter"
+    mock_store.get_active_pm_market.assert_not_called()
+
+    # A later sync refreshes prices; markets it no longer lists stay until they expire
+    mock_gamma.get_active_5m_btc_markets.return_value = [raw("soon", now - timedelta(minutes=3), 5, 0.6)]
+    await tracker.sync_active_markets(timeframes=[5])
+    assert tracker.get_active_market(5)["close_price"] == 0.6
+    assert tracker.get_active_market(15)["slug"] == "quarter"
+    assert mock_store.save_pm_market.call_count == 5
+
+    # Timeframes never synced still come from the store
+    tracker.get_active_market(60)
+    mock_store.get_active_pm_market.assert_called_once_with(60)
@@ -0,0 +1,78 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from btc_predictor.strategies.feature_cache import FeatureCache, cached_features, get_active_cache
+
+
+def _ohlcv(start: str = "2025-01-01", periods: int = 10) -> pd.DataFrame:
+    idx = pd.date_range(start, periods=periods, freq="1min", tz="UTC")
+    return pd.DataFrame({"close": range(periods)}, index=idx, dtype=float)
+
+
+def test_cached_features_without_active_cache_always_computes():
+    compute = MagicMock(return_value="feat")
+    df = _ohlcv()
+
+    assert cached_features("set_a", df, compute) == "feat"
+    assert cached_features("set_a", df, compute) == "feat"
+    assert compute.call_count == 2
+    assert get_active_cache() is None
+
+
+def test_cached_features_shares_result_within_tick():
+    cache = FeatureCache()
+    compute = MagicMock(return_value="feat")
+    df = _ohlcv()
+
+    with cache.activate(df):
+        first = cached_features("set_a", df, compute)
+        second = cached_features("set_a", df, compute)
+
+    assert first is second
+    compute.assert_called_once()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_features_keys_by_feature_set_and_window():
+    cache = FeatureCache()
+    compute = MagicMock(side_effect=lambda df: len(df))
+    df = _ohlcv(periods=200)
+
+    with cache.activate(df):
+        assert cached_features("set_a", df, compute) == 200
+        assert cached_features("set_b", df, compute) == 200
+        # Same last candle but a shorter window (e.g. pm_*_reg_v1 use iloc[-100:])
+        assert cached_features("set_a", df.iloc[-100:], compute) == 100
+
+    assert compute.call_count == 3
+
+
+def test_feature_cache_drops_entries_on_new_candle():
+    cache = FeatureCache()
+    compute = MagicMock(return_value="feat")
+    df = _ohlcv(periods=11)
+
+    with cache.activate(df.iloc[:10]):
+        cached_features("set_a", df.iloc[:10], compute)
+    with cache.activate(df.iloc[1:]):
+        cached_features("set_a", df.iloc[1:], compute)
+        cached_features("set_a", df.iloc[1:], compute)
+
+    assert compute.call_count == 2
+    assert len(cache._entries) == 1
+
+
+@pytest.mark.asyncio
+async def test_feature_cache_visible_in_to_thread():
+    cache = FeatureCache()
+    compute = MagicMock(return_value="feat")
+    df = _ohlcv()
+
+    with cache.activate(df):
+        await asyncio.to_thread(cached_features, "set_a", df, compute)
+        await asyncio.to_thread(cached_features, "set_a", df, compute)
+
+    compute.assert_called_once()
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_predictor.strategies import feature_store as fs
+from btc_predictor.strategies.feature_store import FeatureStore, stored_features
+from btc_predictor.strategies.xgboost_v1 import features as standard_features
+
+FEATURE_SET = standard_features.FEATURE_SET
+
+
+@pytest.fixture
+def sample_ohlcv():
+    periods = 1500
+    times = pd.date_range("2025-01-01", periods=periods, freq="1min", tz="UTC")
+    rng = np.random.default_rng(11)
+    close = 95000 + np.cumsum(rng.normal(0, 25, periods))
+    return pd.DataFrame({
+        "open": close + rng.normal(0, 5, periods),
+        "high": close + np.abs(rng.normal(0, 10, periods)),
+        "low": close - np.abs(rng.normal(0, 10, periods)),
+        "close": close,
+        "volume": np.abs(rng.normal(10, 3, periods)),
+    }, index=times)
+
+
+class CountingCompute:
+    """generate_features that records the length of every input."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, df):
+        self.calls.append(len(df))
+        return standard_features.generate_features(df)
+
+
+@pytest.fixture
+def compute(monkeypatch):
+    counting = CountingCompute()
+    # Version tables by the real features module
+    digest = fs.module_hash(standard_features.generate_features)
+    monkeypatch.setattr(fs, "module_hash", lambda _: digest)
+    return counting
+
+
+def _assert_features_close(actual, expected):
+    for col in standard_features.get_feature_columns():
+        np.testing.assert_allclose(
+            actual[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float),
+            rtol=1e-7, atol=1e-7, equal_nan=True, err_msg=col,
+        )
+
+
+def _expected_slice(ohlcv, lo, hi):
+    """Full-history features, with OBV restarted at the slice like generate_features(slice)."""
+    expected = standard_features.generate_features(ohlcv).iloc[lo:hi].copy()
+    window = standard_features.generate_features(ohlcv.iloc[lo:hi])
+    for col in ("obv", "obv_ret_5m"):
+        expected[col] = window[col]
+    return expected
+
+
+def test_get_serves_slices_from_one_materialization(tmp_path, sample_ohlcv, compute):
+    store = FeatureStore(tmp_path).attach(sample_ohlcv)
+
+    for lo, hi in [(300, 800), (0, 1500), (1000, 1200)]:
+        served = store.get(FEATURE_SET, sample_ohlcv.iloc[lo:hi], compute)
+        _assert_features_close(served, _expected_slice(sample_ohlcv, lo, hi))
+        assert list(served.columns) == list(standard_features.generate_features(sample_ohlcv).columns)
+
+    assert compute.calls == [len(sample_ohlcv)]
+    assert store.hits == 3
+
+
+def test_materialization_is_reused_across_runs(tmp_path, sample_ohlcv, compute):
+    FeatureStore(tmp_path).attach(sample_ohlcv).materialize(FEATURE_SET, compute)
+    assert len(list(tmp_path.rglob("*.arrow"))) == 1
+
+    store = FeatureStore(tmp_path).attach(sample_ohlcv.iloc[200:])
+    served = store.get(FEATURE_SET, sample_ohlcv.iloc[500:900], compute)
+
+    assert compute.calls == [len(sample_ohlcv)]
+    _assert_features_close(served, _expected_slice(sample_ohlcv, 500, 900))
+
+
+def test_new_candles_are_appended(tmp_path, sample_ohlcv, compute, monkeypatch):
+    monkeypatch.setattr(fs, "APPEND_LOOKBACK", 300)
+    FeatureStore(tmp_path).attach(sample_ohlcv.iloc[:1200]).materialize(FEATURE_SET, compute)
+
+    store = FeatureStore(tmp_path).attach(sample_ohlcv)
+    frame = store.materialize(FEATURE_SET, compute)
+
+    assert compute.calls == [1200, 300 + 300]
+    assert len(list(tmp_path.rglob("*.arrow"))) == 1
+    _assert_features_close(frame, standard_features.generate_features(sample_ohlcv))
+    _assert_features_close(
+        store.get(FEATURE_SET, sample_ohlcv.iloc[1100:], compute), _expected_slice(sample_ohlcv, 1100, 1500)
+    )
+
+
+def test_get_computes_directly_for_foreign_data(tmp_path, sample_ohlcv, compute):
+    store = FeatureStore(tmp_path).attach(sample_ohlcv)
+    other = sample_ohlcv.iloc[100:400].copy()
+    other["close"] += 1.0
+
+    served = store.get(FEATURE_SET, other, compute)
+
+    assert compute.calls == [300]
+    assert store.misses == 1
+    pd.testing.assert_frame_equal(served, standard_features.generate_features(other))
+
+
+def test_stored_features_uses_active_store(tmp_path, sample_ohlcv, compute):
+    store = FeatureStore(tmp_path).attach(sample_ohlcv)
+
+    stored_features(FEATURE_SET, sample_ohlcv.iloc[:500], compute)
+    assert compute.calls == [500]  # no active store
+
+    with store.activate():
+        stored_features(FEATURE_SET, sample_ohlcv.iloc[:500], compute)
+        stored_features(FEATURE_SET, sample_ohlcv.iloc[500:], compute)
+    assert compute.calls == [500, len(sample_ohlcv)]
@@ -0,0 +1,112 @@
+import catboost as cb
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from btc_predictor.strategies.inference import (
+    CatBoostPredictor,
+    FallbackPredictor,
+    LightGBMPredictor,
+    PredictorCache,
+    XGBoostPredictor,
+    native_predictor,
+    to_float32,
+)
+
+COLUMNS = [f"f{i}" for i in range(8)]
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(5)
+    # float32-representable inputs, so native and wrapper see identical values
+    X = pd.DataFrame(rng.normal(size=(600, len(COLUMNS))).astype(np.float32).astype(np.float64), columns=COLUMNS)
+    y_cls = (X["f0"] + 0.5 * X["f1"] + rng.normal(0, 0.5, len(X)) > 0).astype(int)
+    y_reg = X["f0"] * 2 - X["f2"] + rng.normal(0, 0.1, len(X))
+    return X, y_cls, y_reg
+
+
+def _classifiers(X, y):
+    return [
+        xgb.XGBClassifier(n_estimators=40, max_depth=3, n_jobs=1).fit(X, y),
+        xgb.XGBClassifier(n_estimators=200, max_depth=3, n_jobs=1, early_stopping_rounds=5).fit(
+            X.iloc[:500], y.iloc[:500], eval_set=[(X.iloc[500:], y.iloc[500:])], verbose=False
+        ),
+        lgb.LGBMClassifier(n_estimators=40, verbose=-1, n_jobs=1).fit(X, y),
+        cb.CatBoostClassifier(iterations=40, depth=3, verbose=False, thread_count=1).fit(X, y),
+    ]
+
+
+def _regressors(X, y):
+    return [
+        xgb.XGBRegressor(n_estimators=40, max_depth=3, n_jobs=1).fit(X, y),
+        lgb.LGBMRegressor(n_estimators=40, verbose=-1, n_jobs=1).fit(X, y).booster_,
+        cb.CatBoostRegressor(iterations=40, depth=3, verbose=False, thread_count=1).fit(X, y),
+    ]
+
+
+def test_native_predictor_classifiers_match_predict_proba(data):
+    X, y, _ = data
+    # Extra non-feature columns (like live OHLCV rows) and a different column order
+    frame = X[COLUMNS[::-1]].assign(symbol="BTCUSDT", close=1.0)
+    for model in _classifiers(X, y):
+        predictor = native_predictor(model, COLUMNS)
+        assert not isinstance(predictor, FallbackPredictor)
+        expected = model.predict_proba(X)[:, 1]
+        np.testing.assert_allclose(predictor.predict_frame(frame), expected, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(predictor.predict_frame(frame.iloc[[-1]]), expected[-1:], rtol=1e-5, atol=1e-6)
+
+
+def test_native_predictor_regressors_match_predict(data):
+    X, _, y = data
+    for model in _regressors(X, y):
+        predictor = native_predictor(model, COLUMNS, output="value")
+        expected = model.predict(X)
+        np.testing.assert_allclose(predictor.predict_frame(X), expected, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(predictor.predict(to_float32(X.iloc[[0]], COLUMNS)), expected[:1], rtol=1e-5, atol=1e-6)
+
+
+def test_native_predictor_dispatch(data):
+    X, y, _ = data
+    xgb_model, _, lgb_model, cb_model = _classifiers(X, y)
+    assert isinstance(native_predictor(xgb_model, COLUMNS), XGBoostPredictor)
+    assert isinstance(native_predictor(lgb_model, COLUMNS), LightGBMPredictor)
+    assert isinstance(native_predictor(cb_model, COLUMNS), CatBoostPredictor)
+
+
+def test_native_predictor_rejects_other_feature_order(data):
+    X, y, _ = data
+    model = lgb.LGBMClassifier(n_estimators=5, verbose=-1).fit(X, y)
+    with pytest.raises(ValueError, match="trained on features"):
+        native_predictor(model, COLUMNS[::-1])
+
+
+def test_to_float32_is_contiguous_in_column_order():
+    frame = pd.DataFrame({"b": [1.0, 2.0], "a": [3.0, np.nan], "symbol": ["x", "y"]})
+    for rows in (frame, frame.iloc[[1]]):
+        arr = to_float32(rows, ["a", "b"])
+        assert arr.dtype == np.float32 and arr.flags.c_contiguous
+        np.testing.assert_array_equal(arr, rows[["a", "b"]].to_numpy(dtype=np.float32))
+
+
+def test_fallback_predictor_uses_predict_proba():
+    class MockModel:
+        def predict_proba(self, X):
+            assert list(X.columns) == ["a"]
+            return np.array([[0.4, 0.6]] * len(X))
+
+    predictor = native_predictor(MockModel(), ["a"])
+    assert isinstance(predictor, FallbackPredictor)
+    assert predictor.predict_frame(pd.DataFrame({"a": [1.0], "b": [2.0]}))[0] == pytest.approx(0.6)
+
+
+def test_predictor_cache_rebuilds_when_model_changes(data):
+    X, y, _ = data
+    first, _, second, _ = _classifiers(X, y)
+    cache = PredictorCache(COLUMNS)
+
+    predictor = cache.get(10, first)
+    assert cache.get(10, first) is predictor
+    assert isinstance(cache.get(10, second), LightGBMPredictor)
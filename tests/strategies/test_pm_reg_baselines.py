@@ -62,3 +62,40 @@ def test_regression_baseline_fit_predict(strategy_class, sample_ohlcv, tmp_path)
     
     new_pred = new_strategy.predict(sample_ohlcv, timeframe_minutes=timeframe)
     assert new_pred.direction in ["higher", "lower"]
+
+@pytest.mark.parametrize("strategy_class", [
+    PMXGBRegV1Strategy,
+    PMLGBMRegV1Strategy,
+    PMCBRegV1Strategy,
+    PMMLPRegV1Strategy,
+    PMCNNRegV1Strategy,
+    PMLSTMRegV1Strategy,
+    PMTabNetRegV1Strategy
+])
+def test_regression_baseline_warm_start(strategy_class, tmp_path):
+    dates = pd.date_range("2024-01-01 00:00:00", periods=400, freq="1min", tz="UTC")
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, 400))
+    ohlcv = pd.DataFrame({
+        "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": rng.uniform(10, 100, 400)
+    }, index=dates)
+    timeframe = 5
+
+    # No model yet: full fit
+    strategy = strategy_class()
+    strategy.warm_start_fit(ohlcv.iloc[:250], timeframe_minutes=timeframe)
+    first = strategy.models[timeframe]
+
+    # Too few new rows: the model is kept
+    strategy.warm_start_fit(ohlcv.iloc[:300], timeframe_minutes=timeframe)
+    assert strategy.models[timeframe] is first
+
+    # Continues from the fitted model on the rows after its last label
+    strategy.warm_start_fit(ohlcv, timeframe_minutes=timeframe)
+    assert strategy.models[timeframe] is not first
+    prediction = strategy.predict(ohlcv, timeframe_minutes=timeframe)
+    assert prediction.direction in ["higher", "lower"]
+
+    # Warm-started models save and load like fitted ones
+    strategy.save_model(timeframe, str(tmp_path / f"{timeframe}m.pkl"))
+    assert timeframe in strategy_class(model_path=str(tmp_path)).available_timeframes
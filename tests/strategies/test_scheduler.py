@@ -0,0 +1,89 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from btc_predictor.strategies.feature_cache import FeatureCache, cached_features
+from btc_predictor.strategies.scheduler import InferenceScheduler
+
+
+def _ohlcv(periods: int = 10) -> pd.DataFrame:
+    idx = pd.date_range("2025-01-01", periods=periods, freq="1min", tz="UTC")
+    return pd.DataFrame({"close": range(periods)}, index=idx, dtype=float)
+
+
+def _strategy(name: str, predict) -> MagicMock:
+    strategy = MagicMock()
+    strategy.name = name
+    strategy.predict.side_effect = predict
+    return strategy
+
+
+def _sleeping(name: str, seconds: float) -> MagicMock:
+    def predict(ohlcv, timeframe):
+        time.sleep(seconds)
+        return f"{name}-{timeframe}"
+    return _strategy(name, predict)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_strategies_concurrently():
+    scheduler = InferenceScheduler(max_workers=4)
+    strategies = [_sleeping(f"s{i}", 0.2) for i in range(4)]
+
+    start = time.perf_counter()
+    results = await scheduler.run(strategies, _ohlcv(), 10)
+    elapsed = time.perf_counter() - start
+
+    assert [(s.name, signal) for s, signal in results] == [(f"s{i}", f"s{i}-10") for i in range(4)]
+    # One model's latency, not the sum of four
+    assert elapsed < 0.6
+    scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_drops_timed_out_and_failing_strategies():
+    release = threading.Event()
+
+    def stuck(ohlcv, timeframe):
+        release.wait(5)
+        return "late"
+
+    def broken(ohlcv, timeframe):
+        raise RuntimeError("boom")
+
+    scheduler = InferenceScheduler(max_workers=4, timeout=5.0, timeouts={"stuck": 0.1})
+    fast = _sleeping("fast", 0.0)
+    slow = _strategy("stuck", stuck)
+    results = await scheduler.run([slow, _strategy("broken", broken), fast], _ohlcv(), 10)
+    assert [s.name for s, _ in results] == ["fast"]
+
+    # The abandoned prediction is still running: the next trigger skips it
+    results = await scheduler.run([slow, fast], _ohlcv(), 30)
+    assert [s.name for s, _ in results] == ["fast"]
+    assert slow.predict.call_count == 1
+
+    release.set()
+    scheduler._inflight["stuck"].result(timeout=5)
+    results = await scheduler.run([slow], _ohlcv(), 60)
+    assert [signal for _, signal in results] == ["late"]
+    scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_shares_feature_cache_across_workers():
+    cache = FeatureCache()
+    compute = MagicMock(side_effect=lambda df: time.sleep(0.05) or "feat")
+
+    def predict(ohlcv, timeframe):
+        return cached_features("shared_set", ohlcv, compute)
+
+    scheduler = InferenceScheduler(max_workers=3)
+    results = await scheduler.run([_strategy(f"s{i}", predict) for i in range(3)], _ohlcv(), 10, cache)
+
+    assert [signal for _, signal in results] == ["feat"] * 3
+    compute.assert_called_once()
+    assert cache.hits == 2
+    scheduler.close()
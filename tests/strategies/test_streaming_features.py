@@ -0,0 +1,126 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_predictor.strategies.pm_common import features_short
+from btc_predictor.strategies.xgboost_v1 import features as standard_features
+
+OHLCV = ["open", "high", "low", "close", "volume"]
+
+
+@pytest.fixture
+def sample_ohlcv():
+    """1m OHLCV with a flat stretch and zero-volume candles to exercise edge cases."""
+    periods = 1200
+    times = pd.date_range("2025-01-01", periods=periods, freq="1min", tz="UTC")
+    rng = np.random.default_rng(7)
+    close = 95000 + np.cumsum(rng.normal(0, 25, periods))
+    df = pd.DataFrame({
+        "open": close + rng.normal(0, 5, periods),
+        "high": close + np.abs(rng.normal(0, 10, periods)),
+        "low": close - np.abs(rng.normal(0, 10, periods)),
+        "close": close,
+        "volume": np.abs(rng.normal(10, 3, periods)),
+    }, index=times)
+    df.iloc[300:330, :4] = 95000.0
+    df.iloc[400:410, 4] = 0.0
+    return df
+
+
+def _assert_frames_close(actual: pd.DataFrame, expected: pd.DataFrame, cols):
+    for col in cols:
+        np.testing.assert_allclose(
+            actual[col].to_numpy(dtype=float),
+            expected[col].to_numpy(dtype=float),
+            rtol=1e-7, atol=1e-7, equal_nan=True, err_msg=col,
+        )
+
+
+@pytest.mark.parametrize("module", [standard_features, features_short])
+def test_update_matches_batch_features(sample_ohlcv, module):
+    engine = module.create_streaming_engine()
+    rows = [engine.update(ts, *values) for ts, values in zip(sample_ohlcv.index, sample_ohlcv[OHLCV].to_numpy())]
+    streamed = pd.DataFrame(rows, index=sample_ohlcv.index)
+
+    _assert_frames_close(streamed, module.generate_features(sample_ohlcv), module.get_feature_columns())
+
+
+@pytest.mark.parametrize("module", [standard_features, features_short])
+def test_sync_sliding_window_matches_batch_last_row(sample_ohlcv, module):
+    engine = module.create_streaming_engine()
+    window = 500
+    for end in range(window, window + 40):
+        live = sample_ohlcv.iloc[end - window:end]
+        row = engine.sync(live)
+        expected = module.generate_features(live).iloc[[-1]]
+        assert row.index[0] == live.index[-1]
+        _assert_frames_close(row, expected, module.get_feature_columns())
+
+
+def test_sync_processes_only_new_candles(sample_ohlcv, mocker):
+    engine = standard_features.create_streaming_engine()
+    engine.sync(sample_ohlcv.iloc[:500])
+    spy = mocker.spy(engine, "update")
+
+    engine.sync(sample_ohlcv.iloc[1:501])
+    assert spy.call_count == 1
+
+    # Same window again (e.g. another timeframe on the same tick): no work
+    engine.sync(sample_ohlcv.iloc[1:501])
+    assert spy.call_count == 1
+
+
+def test_sync_rebuilds_on_gap(sample_ohlcv):
+    engine = standard_features.create_streaming_engine()
+    engine.sync(sample_ohlcv.iloc[:500])
+
+    # Jump forward: the window no longer overlaps the engine's history
+    live = sample_ohlcv.iloc[600:1100]
+    row = engine.sync(live)
+    expected = standard_features.generate_features(live).iloc[[-1]]
+    _assert_frames_close(row, expected, standard_features.get_feature_columns())
+
+
+def test_sync_passthrough_when_features_precomputed(sample_ohlcv):
+    feat = standard_features.generate_features(sample_ohlcv)
+    engine = standard_features.create_streaming_engine()
+
+    row = engine.sync(feat)
+    pd.testing.assert_frame_equal(row, feat.iloc[[-1]])
+    assert engine.last_timestamp is None
+
+
+def test_engine_deepcopy_keeps_state(sample_ohlcv):
+    engine = standard_features.create_streaming_engine()
+    engine.sync(sample_ohlcv.iloc[:500])
+
+    clone = copy.deepcopy(engine)
+    assert clone.last_timestamp == engine.last_timestamp
+    _assert_frames_close(
+        clone.sync(sample_ohlcv.iloc[1:501]),
+        engine.sync(sample_ohlcv.iloc[1:501]),
+        standard_features.get_feature_columns(),
+    )
+
+
+def test_sync_frame_longer_than_history(sample_ohlcv, mocker):
+    engine = standard_features.create_streaming_engine()
+    engine.history = 256
+    engine.reset()
+    cols = standard_features.get_feature_columns()
+
+    # Full frames (scripts, backtest callers) exceed the retained history
+    row = engine.sync(sample_ohlcv.iloc[:1000])
+    _assert_frames_close(row, standard_features.generate_features(sample_ohlcv.iloc[:1000]).iloc[[-1]], cols)
+
+    # A growing full frame still only consumes the new candles
+    spy = mocker.spy(engine, "update")
+    row = engine.sync(sample_ohlcv.iloc[:1001])
+    assert spy.call_count == 1
+    _assert_frames_close(row, standard_features.generate_features(sample_ohlcv.iloc[:1001]).iloc[[-1]], cols)
+
+    # A long window whose start was evicted is rebuilt from the window
+    live = sample_ohlcv.iloc[100:1100]
+    _assert_frames_close(engine.sync(live), standard_features.generate_features(live).iloc[[-1]], cols)
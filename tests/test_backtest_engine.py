@@ -2,8 +2,9 @@ import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from btc_predictor.backtest.engine import run_backtest
+from btc_predictor.backtest.engine import run_backtest, run_backtest_matrix
 from btc_predictor.strategies.base import BaseStrategy
+from btc_predictor.strategies.feature_store import FeatureStore, stored_features
 from btc_predictor.models import PredictionSignal
 from unittest.mock import MagicMock, patch
 
@@ -85,3 +86,152 @@ def test_run_backtest_basic(dummy_ohlcv):
         # In a rising market (np.linspace), higher should win
         assert t0.result == "win"
         assert t0.pnl > 0
+
+class BatchMockStrategy(MockStrategy):
+    def predict(self, ohlcv, timeframe_minutes):
+        raise AssertionError("predict should not be called when predict_batch is implemented")
+
+    def predict_batch(self, ohlcv, timestamps, timeframe_minutes):
+        return [
+            PredictionSignal(
+                strategy_name=self.name,
+                timestamp=ts,
+                timeframe_minutes=timeframe_minutes, # type: ignore
+                direction="higher",
+                confidence=0.7,
+                current_price=float(ohlcv.loc[ts, 'close'])
+            )
+            for ts in timestamps
+        ]
+
+def test_run_backtest_uses_predict_batch(dummy_ohlcv):
+    strategy = BatchMockStrategy()
+    mock_constants = {
+        "event_contract": {"payout_ratio": {10: 1.8}},
+        "risk_control": {"bet_range": [5, 20]},
+        "confidence_thresholds": {10: 0.6},
+    }
+    
+    with patch("btc_predictor.backtest.engine.load_constants", return_value=mock_constants), \
+         patch("btc_predictor.simulation.risk.load_constants", return_value=mock_constants):
+        trades = run_backtest(
+            strategy,
+            dummy_ohlcv,
+            timeframe_minutes=10,
+            train_days=60,
+            test_days=7,
+            n_jobs=1
+        )
+        
+    # Same trade set as the per-timestamp path in test_run_backtest_basic
+    assert len(trades) == 1440
+    assert all(t.result == "win" for t in trades)
+
+class FeatureStoreMockStrategy(BatchMockStrategy):
+    feature_inputs = []
+
+    @staticmethod
+    def _features(ohlcv):
+        FeatureStoreMockStrategy.feature_inputs.append(len(ohlcv))
+        return ohlcv.assign(ret_1m=ohlcv['close'].pct_change())
+
+    def fit(self, ohlcv, timeframe_minutes):
+        stored_features("mock_v1", ohlcv, self._features)
+
+    def predict_batch(self, ohlcv, timestamps, timeframe_minutes):
+        stored_features("mock_v1", ohlcv, self._features)
+        return super().predict_batch(ohlcv, timestamps, timeframe_minutes)
+
+def test_run_backtest_feature_store_materializes_once(dummy_ohlcv, tmp_path):
+    strategy = FeatureStoreMockStrategy()
+    FeatureStoreMockStrategy.feature_inputs = []
+    mock_constants = {
+        "event_contract": {"payout_ratio": {10: 1.8}},
+        "risk_control": {"bet_range": [5, 20]},
+        "confidence_thresholds": {10: 0.6},
+    }
+    feature_store = FeatureStore(tmp_path)
+
+    with patch("btc_predictor.backtest.engine.load_constants", return_value=mock_constants), \
+         patch("btc_predictor.simulation.risk.load_constants", return_value=mock_constants):
+        trades = run_backtest(
+            strategy,
+            dummy_ohlcv,
+            timeframe_minutes=10,
+            train_days=60,
+            test_days=7,
+            feature_store=feature_store
+        )
+
+    assert len(trades) == 1440
+    # Two folds x (fit + predict_batch) served from one full-history pass
+    assert FeatureStoreMockStrategy.feature_inputs == [len(dummy_ohlcv)]
+    assert feature_store.hits == 4
+
+class WarmStartMockStrategy(BatchMockStrategy):
+    calls = []
+
+    def fit(self, ohlcv, timeframe_minutes):
+        self.generation = 0
+        WarmStartMockStrategy.calls.append(("fit", self.generation))
+
+    def warm_start_fit(self, ohlcv, timeframe_minutes):
+        self.generation += 1
+        WarmStartMockStrategy.calls.append(("warm", self.generation))
+
+def test_run_backtest_warm_start_segments(dummy_ohlcv):
+    WarmStartMockStrategy.calls = []
+    mock_constants = {
+        "event_contract": {"payout_ratio": {10: 1.8}},
+        "risk_control": {"bet_range": [5, 20]},
+        "confidence_thresholds": {10: 0.6},
+    }
+
+    with patch("btc_predictor.backtest.engine.load_constants", return_value=mock_constants), \
+         patch("btc_predictor.simulation.risk.load_constants", return_value=mock_constants):
+        cold = run_backtest(BatchMockStrategy(), dummy_ohlcv, timeframe_minutes=10, train_days=60, test_days=2, n_jobs=1)
+        warm = run_backtest(
+            WarmStartMockStrategy(), dummy_ohlcv, timeframe_minutes=10, train_days=60, test_days=2,
+            n_jobs=1, warm_start=True, refit_every=2
+        )
+
+    # 5 folds: a full refit every 2 folds, each warm start continues the previous fold's model
+    assert WarmStartMockStrategy.calls == [("fit", 0), ("warm", 1), ("fit", 0), ("warm", 1), ("fit", 0)]
+    assert warm.to_frame().equals(cold.to_frame())
+
+class OtherFeatureStoreMockStrategy(FeatureStoreMockStrategy):
+    @property
+    def name(self) -> str:
+        return "other_mock_strategy"
+
+def test_run_backtest_matrix_matches_single_runs(dummy_ohlcv, tmp_path):
+    FeatureStoreMockStrategy.feature_inputs = []
+    mock_constants = {
+        "event_contract": {"payout_ratio": {10: 1.8, 30: 1.85}},
+        "risk_control": {"bet_range": [5, 20]},
+        "confidence_thresholds": {10: 0.6, 30: 0.6},
+    }
+    strategies = [FeatureStoreMockStrategy(), OtherFeatureStoreMockStrategy()]
+    feature_store = FeatureStore(tmp_path)
+
+    with patch("btc_predictor.backtest.engine.load_constants", return_value=mock_constants), \
+         patch("btc_predictor.simulation.risk.load_constants", return_value=mock_constants):
+        results = run_backtest_matrix(
+            strategies, dummy_ohlcv, timeframes=[10, 30], train_days=60, test_days=2,
+            n_jobs=2, feature_store=feature_store
+        )
+        # 2 strategies x 2 timeframes x 5 folds, one feature pass for all of them
+        assert FeatureStoreMockStrategy.feature_inputs == [len(dummy_ohlcv)]
+        assert feature_store.hits == 40
+
+        assert sorted(results) == [
+            ("mock_strategy", 10), ("mock_strategy", 30), ("other_mock_strategy", 10), ("other_mock_strategy", 30)
+        ]
+        for strategy in strategies:
+            for tf in (10, 30):
+                single = run_backtest(strategy, dummy_ohlcv, timeframe_minutes=tf, train_days=60, test_days=2, n_jobs=1)
+                assert results[(strategy.name, tf)].to_frame().equals(single.to_frame())
+        assert len(results[("mock_strategy", 10)]) == 3 * len(results[("mock_strategy", 30)])
+
+        with pytest.raises(ValueError):
+            run_backtest_matrix([strategies[0], FeatureStoreMockStrategy()], dummy_ohlcv, timeframes=[10])
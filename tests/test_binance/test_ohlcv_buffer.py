@@ -0,0 +1,159 @@
+"""
+tests/test_binance/test_ohlcv_buffer.py
+---------------------------------------
+Unit tests for OHLCVRingBuffer and BinanceFeed's in-memory window / write-behind.
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_predictor.binance.feed import BinanceFeed
+from btc_predictor.binance.ohlcv_buffer import OHLCVRingBuffer
+from btc_predictor.infrastructure.store import DataStore
+
+T0 = 1704067200000  # 2024-01-01 00:00 UTC
+
+
+def _rows(n: int, start: int = 0) -> pd.DataFrame:
+    i = np.arange(start, start + n)
+    return pd.DataFrame({
+        "open_time": T0 + i * 60_000,
+        "open": 100.0 + i,
+        "high": 101.0 + i,
+        "low": 99.0 + i,
+        "close": 100.5 + i,
+        "volume": 10.0 + i,
+        "close_time": T0 + i * 60_000 + 59_999,
+    })
+
+
+def test_buffer_keeps_latest_capacity_rows():
+    buf = OHLCVRingBuffer(capacity=5)
+    buf.extend(_rows(12))
+
+    view = buf.view()
+    assert len(view) == 5
+    assert view["close"].tolist() == pytest.approx([107.5, 108.5, 109.5, 110.5, 111.5])
+    assert view.index[0] == pd.Timestamp("2024-01-01 00:07", tz="UTC")
+    assert view.index.is_monotonic_increasing
+
+
+def test_buffer_view_is_zero_copy_and_read_only():
+    buf = OHLCVRingBuffer(capacity=5)
+    buf.extend(_rows(3))
+
+    close = buf.view()["close"].to_numpy()
+    assert np.shares_memory(close, buf._values)
+    assert close.flags["C_CONTIGUOUS"]
+    assert not close.flags.writeable
+
+
+def test_buffer_old_views_unchanged_by_appends():
+    buf = OHLCVRingBuffer(capacity=3)
+    buf.extend(_rows(3))
+    old = buf.view()
+    snapshot = old.copy()
+
+    # Enough appends to force a compaction of the backing array
+    for _, r in _rows(10, start=3).iterrows():
+        buf.append(r["open_time"], r["open"], r["high"], r["low"], r["close"], r["volume"])
+    buf.append(T0 + 12 * 60_000, 1.0, 1.0, 1.0, 1.0, 1.0)  # replace newest
+
+    pd.testing.assert_frame_equal(old, snapshot)
+    assert buf.view()["close"].iloc[-1] == pytest.approx(1.0)
+
+
+def test_buffer_replaces_same_candle_and_ignores_older():
+    buf = OHLCVRingBuffer(capacity=5)
+    buf.extend(_rows(3))
+
+    assert buf.append(T0 + 2 * 60_000, 1.0, 2.0, 0.5, 1.5, 7.0) is True
+    assert buf.append(T0, 9.0, 9.0, 9.0, 9.0, 9.0) is False
+
+    view = buf.view()
+    assert len(view) == 3
+    assert view["close"].iloc[-1] == pytest.approx(1.5)
+    assert view["close"].iloc[0] == pytest.approx(100.5)
+
+
+def test_buffer_view_matches_get_latest_ohlcv(tmp_path):
+    store = DataStore(str(tmp_path / "buf.db"))
+    store.save_ohlcv(_rows(20), "BTCUSDT", "1m")
+    db_df = store.get_latest_ohlcv("BTCUSDT", "1m", limit=10)
+
+    buf = OHLCVRingBuffer(capacity=10)
+    buf.extend(db_df)
+    view = buf.view()
+
+    pd.testing.assert_frame_equal(
+        view, db_df[["open", "high", "low", "close", "volume"]], check_index_type=False, check_names=False,
+    )
+    assert (view.index == db_df.index).all()
+
+
+@pytest.mark.asyncio
+async def test_feed_seeds_buffer_and_flushes_write_behind(tmp_path):
+    store = DataStore(str(tmp_path / "feed.db"))
+    store.save_ohlcv(_rows(5), "BTCUSDT", "1m")
+
+    feed = BinanceFeed("BTCUSDT", store)
+    await feed._seed_buffer()
+    assert len(feed._buffer) == 5
+
+    for _, r in _rows(2, start=5).iterrows():
+        feed._write_queue.put_nowait(("1m", r.to_dict()))
+    await feed.flush()
+
+    assert len(store.get_ohlcv("BTCUSDT", "1m")) == 7
+
+
+@pytest.mark.asyncio
+async def test_kline_stream_dispatches_buffer_without_db_read(tmp_path):
+    store = DataStore(str(tmp_path / "stream.db"))
+    store.save_ohlcv(_rows(5), "BTCUSDT", "1m")
+    feed = BinanceFeed("BTCUSDT", store)
+    await feed._seed_buffer()
+    feed.is_running = True
+
+    received = []
+
+    async def callback(ohlcv):
+        received.append(ohlcv)
+
+    feed.register_callback(callback)
+
+    kline = {"k": {"x": True, "t": T0 + 5 * 60_000, "T": T0 + 5 * 60_000 + 59_999,
+                   "o": "105", "h": "106", "l": "104", "c": "105.5", "v": "15"}}
+
+    async def recv():
+        if received:
+            feed.is_running = False
+            return None
+        return kline
+
+    stream = MagicMock()
+    stream.recv = recv
+
+    class _Socket:
+        async def __aenter__(self):
+            return stream
+
+        async def __aexit__(self, *exc):
+            return False
+
+    feed._bm = MagicMock()
+    feed._bm.kline_socket.return_value = _Socket()
+    store.get_latest_ohlcv = MagicMock(side_effect=AssertionError("hot path must not read SQLite"))
+
+    await feed._handle_kline_stream("1m")
+
+    assert len(received) == 1
+    assert received[0]["close"].iloc[-1] == pytest.approx(105.5)
+    assert len(received[0]) == 6
+    # Persisted asynchronously
+    assert feed._write_queue.qsize() == 1
+    await feed.flush()
+    assert len(store.get_ohlcv("BTCUSDT", "1m")) == 6
@@ -143,3 +143,138 @@ async def test_process_new_data_dispatches_correct_timeframes():
 
     # strat supports 10m and 30m → predict should be called twice (once per triggered timeframe)
     assert strat.predict.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_trigger_strategies_shares_feature_computation():
+    """同一根 K 棒上相同特徵集的策略只計算一次特徵"""
+    import pandas as pd
+    from btc_predictor.strategies.feature_cache import cached_features
+
+    mock_store = MagicMock()
+    mock_store.save_prediction_signal.return_value = "sig-shared"
+    compute = MagicMock(return_value=pd.DataFrame({"f": [1.0]}))
+
+    def make_strategy(name: str) -> MagicMock:
+        strat = MagicMock()
+        strat.name = name
+        strat.available_timeframes = [10]
+
+        def predict(ohlcv, timeframe):
+            cached_features("shared_set", ohlcv, compute)
+            return MagicMock()
+
+        strat.predict.side_effect = predict
+        return strat
+
+    pipeline = BinanceLivePipeline(
+        strategies=[make_strategy("a"), make_strategy("b"), make_strategy("c")],
+        store=mock_store,
+    )
+    idx = pd.DatetimeIndex([datetime(2024, 1, 1, 1, 9, tzinfo=timezone.utc)], name="open_time")
+    ohlcv = pd.DataFrame(
+        {"open": [1.0], "high": [2.0], "low": [0.5], "close": [1.5], "volume": [100.0]},
+        index=idx,
+    )
+
+    with patch("btc_predictor.binance.pipeline.process_signal", return_value=None):
+        await pipeline._trigger_strategies(ohlcv, 10)
+
+    compute.assert_called_once()
+    assert pipeline.feature_cache.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_trigger_strategies_persists_tick_in_one_transaction(tmp_path):
+    """同一 tick 所有策略的 signals / trades 於單一 transaction 儲存，並互相連結"""
+    import pandas as pd
+    from btc_predictor.infrastructure.store import DataStore
+    from btc_predictor.models import PredictionSignal, SimulatedTrade
+
+    store = DataStore(str(tmp_path / "tick.db"))
+    ts = datetime(2024, 1, 1, 1, 9, tzinfo=timezone.utc)
+    strategies = []
+    for name in ("a", "b", "c"):
+        strat = MagicMock()
+        strat.name = name
+        strat.available_timeframes = [10]
+        strat.predict.return_value = PredictionSignal(name, ts, 10, "higher", 0.7, 100.0)
+        strategies.append(strat)
+
+    pipeline = BinanceLivePipeline(strategies=strategies, store=store)
+    ohlcv = pd.DataFrame(
+        {"open": [1.0], "high": [2.0], "low": [0.5], "close": [1.5], "volume": [100.0]},
+        index=pd.DatetimeIndex([ts], name="open_time"),
+    )
+
+    def process(signal, writer, risk_state=None):
+        if signal.strategy_name != "b":
+            return None
+        trade = SimulatedTrade(
+            id="trade-b", strategy_name="b", direction="higher", confidence=0.7,
+            timeframe_minutes=10, bet_amount=5.0, open_time=ts, open_price=100.0,
+            expiry_time=ts,
+        )
+        writer.save_simulated_trade(trade)
+        return trade
+
+    with patch("btc_predictor.binance.pipeline.process_signal", side_effect=process):
+        await pipeline._trigger_strategies(ohlcv, 10)
+
+    assert pipeline.writer.transactions == 1
+    assert len(pipeline.writer) == 0
+    with store._get_connection() as conn:
+        signals = sorted(conn.execute("SELECT strategy_name, traded, trade_id FROM prediction_signals").fetchall())
+        trades = conn.execute("SELECT id FROM simulated_trades").fetchall()
+    assert signals == [("a", 0, None), ("b", 1, "trade-b"), ("c", 0, None)]
+    assert trades == [("trade-b",)]
+    await pipeline.aclose()
+
+
+@pytest.mark.asyncio
+async def test_trigger_strategies_notifies_committed_trades_only(tmp_path):
+    """被 DB 拒絕而丟棄的 trade 不發送 Discord 通知，也不阻擋其他列"""
+    import pandas as pd
+    from btc_predictor.infrastructure.store import DataStore
+    from btc_predictor.models import PredictionSignal, SimulatedTrade
+
+    store = DataStore(str(tmp_path / "tick.db"))
+    ts = datetime(2024, 1, 1, 1, 9, tzinfo=timezone.utc)
+
+    def make_trade(name):
+        return SimulatedTrade(
+            id=f"trade-{name}", strategy_name=name, direction="higher", confidence=0.7,
+            timeframe_minutes=10, bet_amount=5.0, open_time=ts, open_price=100.0,
+            expiry_time=ts,
+        )
+
+    store.save_simulated_trade(make_trade("a"))  # trade-a already exists → rejected on flush
+    strategies = []
+    for name in ("a", "b"):
+        strat = MagicMock()
+        strat.name = name
+        strat.available_timeframes = [10]
+        strat.predict.return_value = PredictionSignal(name, ts, 10, "higher", 0.7, 100.0)
+        strategies.append(strat)
+
+    bot = MagicMock()
+    bot.send_signal = AsyncMock()
+    pipeline = BinanceLivePipeline(strategies=strategies, store=store, bot=bot)
+    ohlcv = pd.DataFrame(
+        {"open": [1.0], "high": [2.0], "low": [0.5], "close": [1.5], "volume": [100.0]},
+        index=pd.DatetimeIndex([ts], name="open_time"),
+    )
+
+    def process(signal, writer, risk_state=None):
+        trade = make_trade(signal.strategy_name)
+        writer.save_simulated_trade(trade)
+        return trade
+
+    with patch("btc_predictor.binance.pipeline.process_signal", side_effect=process):
+        await pipeline._trigger_strategies(ohlcv, 10)
+
+    assert [call.args[0].id for call in bot.send_signal.await_args_list] == ["trade-b"]
+    assert len(pipeline.writer) == 0
+    with store._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM prediction_signals").fetchone() == (2,)
+    await pipeline.aclose()
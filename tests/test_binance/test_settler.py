@@ -3,6 +3,7 @@ import pandas as pd
 from datetime import datetime, timezone, timedelta
 from btc_predictor.infrastructure.store import DataStore
 from btc_predictor.binance.settler import settle_pending_trades
+from btc_predictor.utils.config import load_constants
 from dataclasses import dataclass
 from typing import Optional
 
@@ -107,3 +108,95 @@ async def test_settle_trades_flat_price(temp_db):
     assert t2['pnl'] == -10.0
     assert t3['pnl'] == pytest.approx(10.0 * (1.85 - 1))
     assert t4['pnl'] == pytest.approx(10.0 * (1.85 - 1))
+
+
+def _save_candles(store, start_ms, closes):
+    open_time = [start_ms + i * 60_000 for i in range(len(closes))]
+    store.save_ohlcv(pd.DataFrame({
+        "open_time": open_time,
+        "open": closes,
+        "high": closes,
+        "low": closes,
+        "close": closes,
+        "volume": [1.0] * len(closes),
+        "close_time": [t + 59_999 for t in open_time],
+    }), "BTCUSDT", "1m")
+
+
+class FakeKlinesClient:
+    """get_klines over a fixed set of candles, recording each call."""
+
+    def __init__(self, start_ms, closes):
+        self.candles = [[start_ms + i * 60_000, 0, 0, 0, str(c)] for i, c in enumerate(closes)]
+        self.calls = []
+
+    async def get_klines(self, symbol, interval, startTime, limit):
+        self.calls.append((startTime, limit))
+        return [k for k in self.candles if k[0] >= startTime][:limit]
+
+
+@pytest.mark.asyncio
+async def test_settle_pending_trades_backlog_single_transaction(temp_db, mocker):
+    store = DataStore(temp_db)
+    start = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    n = 300
+    for i in range(n):
+        expiry = start + timedelta(minutes=i)
+        store.save_simulated_trade(MockTrade(
+            id=f"T{i}", strategy_name="S1", direction="higher" if i % 2 else "lower",
+            confidence=0.7, timeframe_minutes=10, bet_amount=5.0,
+            open_time=expiry - timedelta(minutes=10), open_price=50000.0, expiry_time=expiry,
+        ))
+    _save_candles(store, int(start.timestamp() * 1000), [50000.0 + (1 if i % 3 else -1) for i in range(n)])
+    closes_spy = mocker.spy(store, "get_ohlcv_closes")
+    update_spy = mocker.spy(store, "update_simulated_trades")
+
+    mock_datetime = mocker.patch('btc_predictor.binance.settler.datetime')
+    mock_datetime.now.return_value = start + timedelta(hours=6)
+    mock_datetime.fromisoformat.side_effect = lambda x: datetime.fromisoformat(x)
+    await settle_pending_trades(store)
+
+    assert closes_spy.call_count == 1
+    assert update_spy.call_count == 1
+    assert store.get_pending_trades().empty
+
+    with store._get_connection() as conn:
+        df = pd.read_sql_query("SELECT * FROM simulated_trades", conn).set_index("id")
+    payout = load_constants()["event_contract"]["payout_ratio"][10]
+    for i in (0, 1, 2, 3):
+        up = i % 3 != 0
+        win = up if i % 2 else not up
+        assert df.loc[f"T{i}", "result"] == ("win" if win else "lose")
+        assert df.loc[f"T{i}", "pnl"] == pytest.approx(5.0 * (payout - 1) if win else -5.0)
+
+
+@pytest.mark.asyncio
+async def test_settle_pending_signals_fetches_gaps_per_run(temp_db):
+    from btc_predictor.models import PredictionSignal
+    from btc_predictor.binance.settler import settle_pending_signals
+
+    store = DataStore(temp_db)
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    first_expiry = now - timedelta(hours=3)
+    first_ms = int(first_expiry.timestamp() * 1000)
+    ids = [
+        store.save_prediction_signal(PredictionSignal(
+            "s1", first_expiry + timedelta(minutes=i) - timedelta(minutes=10), 10, "higher", 0.6, 50000.0
+        ))
+        for i in range(120)
+    ]
+    # Local candles for the first hour only; the second hour comes from REST
+    _save_candles(store, first_ms, [50001.0] * 60)
+    client = FakeKlinesClient(first_ms, [50001.0] * 60 + [49999.0] * 60)
+
+    count = await settle_pending_signals(store, client)
+
+    assert count == 120
+    assert client.calls == [(first_ms + 60 * 60_000, 61)]
+    settled = store.get_settled_signals().set_index("id")
+    assert settled.loc[ids[0], "actual_direction"] == "higher"
+    assert settled.loc[ids[-1], "actual_direction"] == "lower"
+    assert settled["is_correct"].sum() == 60
+
+    # Already settled: nothing left to do
+    assert await settle_pending_signals(store, client) == 0
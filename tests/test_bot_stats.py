@@ -68,21 +68,15 @@ async def test_stats_command_summary():
     s1.available_timeframes = [60]
     bot.pipeline.strategies = [s1]
     
-    # Mock store response for detail (used in summary loop)
-    # Using a helper to avoid repetitive code
-    def mock_get_detail(name, tf):
-        return {
+    # Mock the grouped stats used by the summary table
+    def mock_get_stats(tf=None, polymarket=False):
+        return {("lgbm_v2", 60): {
             "settled": 10, "pending": 2, "wins": 6, "da": 0.6,
             "higher_total": 5, "higher_wins": 3, "higher_da": 0.6,
             "lower_total": 5, "lower_wins": 3, "lower_da": 0.6,
             "total_pnl": 5.0, "max_drawdown": 2.0
-        }
-    bot.store.get_strategy_detail.side_effect = mock_get_detail
-    
-    # Mock the direct connection used in the summary loop
-    conn = MagicMock()
-    bot.store._get_connection.return_value.__enter__.return_value = conn
-    conn.execute.return_value.fetchall.return_value = [("lgbm_v2", 60)]
+        }}
+    bot.store.get_strategy_stats.side_effect = mock_get_stats
     
     cog = EventContractCog(bot)
     interaction = AsyncMock()
@@ -97,6 +91,7 @@ async def test_stats_command_summary():
     embed = kwargs.get('embed') or args[0]
     
     assert embed.title == "📊 交易統計摘要"
+    bot.store.get_strategy_detail.assert_not_called()
     assert "lgbm_v2" in embed.description
     assert "60m" in embed.description
     assert "60.0%" in embed.description
@@ -68,3 +68,141 @@ def test_calculate_bet_different_timeframes(mock_constants):
         
         # 1440m threshold is 0.591
         assert calculate_bet(0.591, 1440) == 5.0
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    from btc_predictor.utils import config
+
+    path = tmp_path / "project_constants.yaml"
+    path.write_text(
+        "risk_control:\n  bet_range: [5, 20]\n  daily_max_loss: 50\n"
+        "confidence_thresholds:\n  10: 0.606\n"
+        "event_contract:\n  payout_ratio:\n    10: 1.80\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "DEFAULT_CONFIG_PATH", path)
+    monkeypatch.setattr(config, "_CACHE", config._ConfigCache())
+    return path
+
+
+def test_load_config_parses_once_until_file_changes(config_file, mocker):
+    import os
+    from btc_predictor.utils import config
+
+    safe_load = mocker.spy(config.yaml, "safe_load")
+    first = config.load_config()
+    assert config.load_config() is first
+    assert config.load_constants() is first.raw
+    assert safe_load.call_count == 1
+
+    config_file.write_text(config_file.read_text().replace("daily_max_loss: 50", "daily_max_loss: 40"))
+    os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1_000_000))
+
+    reloaded = config.load_config()
+    assert safe_load.call_count == 2
+    assert reloaded.risk.daily_max_loss == pytest.approx(40.0)
+
+
+def test_load_config_typed_accessors(config_file):
+    from btc_predictor.utils.config import load_config
+
+    cfg = load_config()
+    assert cfg.risk.bet_range == (5.0, 20.0)
+    assert cfg.risk.max_daily_trades == 30  # default when missing
+    assert cfg.confidence_threshold(10) == pytest.approx(0.606)
+    assert cfg.confidence_threshold(15) == pytest.approx(0.6)
+    assert cfg.payout_ratio(10) == pytest.approx(1.80)
+    assert cfg.payout_ratio(60) == pytest.approx(1.85)
+
+
+def test_calculate_bet_uses_cached_config(config_file, mocker):
+    from btc_predictor.utils import config
+
+    safe_load = mocker.spy(config.yaml, "safe_load")
+    for _ in range(100):
+        assert calculate_bet(1.0, 10) == 20.0
+        assert should_trade(0, 0, 0) is True
+    assert safe_load.call_count == 1
+
+
+def _sim_trade(trade_id, strategy, open_time, result=None, pnl=None):
+    from datetime import timedelta
+    from btc_predictor.models import SimulatedTrade
+
+    return SimulatedTrade(
+        id=trade_id, strategy_name=strategy, direction="higher", confidence=0.7,
+        timeframe_minutes=10, bet_amount=10.0, open_time=open_time, open_price=100.0,
+        expiry_time=open_time + timedelta(minutes=10), result=result, pnl=pnl,
+    )
+
+
+@pytest.fixture
+def risk_store(tmp_path):
+    from datetime import datetime, timedelta, timezone
+    from btc_predictor.infrastructure.store import DataStore
+
+    store = DataStore(str(tmp_path / "risk.db"))
+    day = datetime(2025, 3, 2, tzinfo=timezone.utc)
+    # yesterday: a win then losses; today: losses, a pending trade, another strategy
+    history = [
+        ("y1", "a", day - timedelta(hours=3), "win", 8.0),
+        ("y2", "a", day - timedelta(hours=2), "lose", -10.0),
+        ("t1", "a", day + timedelta(hours=1), "lose", -10.0),
+        ("t2", "a", day + timedelta(hours=2), None, None),
+        ("t3", "a", day + timedelta(hours=3), "lose", -5.0),
+        ("b1", "b", day + timedelta(hours=1), "win", 9.0),
+    ]
+    for trade_id, strategy, open_time, result, pnl in history:
+        store.save_simulated_trade(_sim_trade(trade_id, strategy, open_time))
+        if result:
+            store.update_simulated_trade(trade_id, 100.0, result, pnl)
+    return store, day
+
+
+def test_risk_state_load_matches_get_daily_stats(risk_store):
+    from btc_predictor.simulation.risk import RiskState
+
+    store, day = risk_store
+    state = RiskState(store).load(now=day)
+    for strategy in ("a", "b", "c"):
+        assert state.daily_stats(strategy, "2025-03-02") == pytest.approx(store.get_daily_stats(strategy, "2025-03-02"))
+    assert state.daily_stats("a", "2025-03-02") == {"daily_loss": 15.0, "daily_trades": 3, "consecutive_losses": 3}
+
+
+def test_risk_state_tracks_trades_and_settlements_without_queries(risk_store, mocker):
+    from datetime import timedelta
+    from btc_predictor.simulation.risk import RiskState
+
+    store, day = risk_store
+    state = RiskState(store).load(now=day)
+    connection = mocker.spy(store, "_get_connection")
+
+    new = _sim_trade("t4", "a", day + timedelta(hours=4))
+    state.record_trade(new)
+    state.record_settlement("a", "t2", (day + timedelta(hours=2)).isoformat(), "win", 8.0)
+    state.record_settlement("a", "t4", new.open_time, "lose", -10.0)
+    stats = state.daily_stats("a", "2025-03-02")
+    assert connection.call_count == 0
+
+    store.save_simulated_trade(new)
+    store.update_simulated_trade("t2", 100.0, "win", 8.0)
+    store.update_simulated_trade("t4", 100.0, "lose", -10.0)
+    assert stats == pytest.approx(store.get_daily_stats("a", "2025-03-02"))
+    assert stats == {"daily_loss": 25.0, "daily_trades": 4, "consecutive_losses": 2}
+
+
+def test_risk_state_rolls_over_at_utc_midnight(risk_store):
+    from datetime import timedelta
+    from btc_predictor.simulation.risk import RiskState
+
+    store, day = risk_store
+    state = RiskState(store).load(now=day)
+    assert state.daily_stats("a", "2025-03-03") == {"daily_loss": 0.0, "daily_trades": 0, "consecutive_losses": 3}
+
+    # A trade opened yesterday and settled after midnight only moves the streak
+    state.record_settlement("a", "t2", (day + timedelta(hours=2)).isoformat(), "lose", -10.0)
+    state.record_trade(_sim_trade("n1", "a", day + timedelta(days=1, minutes=5)))
+    assert state.daily_stats("a", "2025-03-03") == {"daily_loss": 0.0, "daily_trades": 1, "consecutive_losses": 4}
+    # Past days are answered by the store
+    assert state.daily_stats("a", "2025-03-02") == pytest.approx(store.get_daily_stats("a", "2025-03-02"))
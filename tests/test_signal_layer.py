@@ -167,3 +167,15 @@ def test_signal_layer_stats(temp_store):
     assert stats['settled'] == 2
     assert stats['correct'] == 1
     assert stats['accuracy'] == pytest.approx(0.5)
+
+
+def test_save_prediction_signals_single_batch_with_trades(temp_store):
+    now = datetime.now(timezone.utc)
+    signals = [PredictionSignal(f"s{i}", now, 10, "higher", 0.6, 1.0) for i in range(3)]
+
+    ids = temp_store.save_prediction_signals(signals, [None, "trade-1", None])
+
+    assert len(set(ids)) == 3
+    with temp_store._get_connection() as conn:
+        rows = {r[0]: r[1:] for r in conn.execute("SELECT id, strategy_name, traded, trade_id FROM prediction_signals")}
+    assert [rows[i] for i in ids] == [("s0", 0, None), ("s1", 1, "trade-1"), ("s2", 0, None)]
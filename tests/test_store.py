@@ -117,3 +117,141 @@ def test_atomic_update_trade(temp_db):
     with store._get_connection() as conn:
         res = conn.execute("SELECT pnl FROM simulated_trades WHERE id='t1'").fetchone()
         assert res[0] == 10.0 # Still 10.0
+
+def test_get_connection_reused_within_thread(temp_db):
+    store = DataStore(temp_db)
+
+    conn = store._get_connection()
+    assert store._get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2   # MEMORY
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+def test_get_connection_per_thread(temp_db):
+    import threading
+
+    store = DataStore(temp_db)
+    main_conn = store._get_connection()
+    seen = {}
+
+    def worker():
+        seen["conn"] = store._get_connection()
+        seen["again"] = store._get_connection()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+
+    assert seen["conn"] is seen["again"]
+    assert seen["conn"] is not main_conn
+
+def test_get_connection_reopens_after_close(temp_db):
+    store = DataStore(temp_db)
+    conn = store._get_connection()
+
+    # Legacy callers may close the connection they were handed
+    conn.close()
+    assert store.check_trade_exists("s", 10, "2025-01-01T00:00:00") is False
+
+    store.close()
+    assert store.get_table_counts()["simulated_trades"] == 0
+
+
+def _trade(trade_id: str) -> SimulatedTrade:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return SimulatedTrade(
+        id=trade_id, strategy_name="s", direction="higher", confidence=0.7,
+        timeframe_minutes=10, bet_amount=5.0, open_time=now, open_price=100.0,
+        expiry_time=now + timedelta(minutes=10),
+    )
+
+
+def test_write_behind_queue_commits_once_per_flush(temp_db):
+    from btc_predictor.infrastructure.store import WriteBehindQueue
+    from btc_predictor.models import PredictionSignal
+
+    store = DataStore(temp_db)
+    queue = WriteBehindQueue(store)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    queue.save_simulated_trade(_trade("t1"))
+    signal_id = queue.save_prediction_signal(PredictionSignal("s", now, 10, "higher", 0.7, 100.0))
+    queue.update_signal_traded(signal_id, "t1")
+
+    # Not visible before the flush; reads go to the store
+    assert queue.get_pending_trades().empty
+    assert queue.flush() == 3
+    assert (queue.transactions, len(queue)) == (1, 0)
+    assert store.get_pending_trades()["id"].tolist() == ["t1"]
+    with store._get_connection() as conn:
+        assert conn.execute("SELECT traded, trade_id FROM prediction_signals").fetchall() == [(1, "t1")]
+
+
+def test_write_behind_queue_drops_bad_rows_after_failed_flush(temp_db, monkeypatch):
+    import sqlite3
+    from btc_predictor.infrastructure.store import WriteBehindQueue
+
+    store = DataStore(temp_db)
+    store.save_simulated_trade(_trade("dup"))
+    queue = WriteBehindQueue(store, max_attempts=2)
+    queue.save_simulated_trade(_trade("t1"))
+    queue.save_simulated_trade(_trade("dup"))
+    queue.save_simulated_trade(_trade("t2"))
+
+    # The duplicate is dropped; the rows around it still get committed
+    assert queue.flush() == 2
+    assert len(queue) == 0
+    assert [row[0] for _, row in queue.rejected] == ["dup"]
+    assert queue.unsaved_trade_ids() == {"dup"}
+    assert sorted(store.get_pending_trades()["id"]) == ["dup", "t1", "t2"]
+
+    # Transient failures are retried on the next flush, at most max_attempts times
+    queue.save_simulated_trade(_trade("t3"))
+    with monkeypatch.context() as m:
+        m.setattr(store, "_get_connection", lambda: (_ for _ in ()).throw(sqlite3.OperationalError("database is locked")))
+        assert queue.flush() == 0
+        assert (len(queue), queue.unsaved_trade_ids()) == (1, {"t3"})
+        assert queue.flush() == 0
+    assert len(queue) == 0
+    assert queue.unsaved_trade_ids() == {"t3"}
+    queue.close()
+    assert sorted(store.get_pending_trades()["id"]) == ["dup", "t1", "t2"]
+
+
+def test_migrations_backfill_epoch_ms_columns(temp_db):
+    class LegacyStore(DataStore):
+        MIGRATIONS = ()
+
+    legacy = LegacyStore(temp_db)
+    legacy.save_simulated_trade(_trade("old"))
+    assert legacy.schema_version == 0
+    legacy.close()
+
+    store = DataStore(temp_db)
+    assert store.schema_version == len(DataStore.MIGRATIONS)
+    new = _trade("new")
+    new.open_time = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    store.save_simulated_trade(new)
+    with store._get_connection() as conn:
+        rows = conn.execute("SELECT id, open_time_ms, expiry_time_ms FROM simulated_trades ORDER BY id").fetchall()
+    # Backfilled on migration, filled by the insert trigger afterwards
+    assert rows == [("new", 1704153600000, 1704067800000), ("old", 1704067200000, 1704067800000)]
+    assert store.get_daily_stats("s", "2024-01-01")["daily_trades"] == 1
+    store.close()
+
+    # Reopening does not re-run anything
+    assert DataStore(temp_db).schema_version == len(DataStore.MIGRATIONS)
+
+
+def test_daily_stats_uses_covering_index(temp_db):
+    from btc_predictor.infrastructure.store import day_bounds_ms
+
+    store = DataStore(temp_db)
+    with store._get_connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT pnl FROM simulated_trades "
+            "WHERE strategy_name = ? AND open_time_ms >= ? AND open_time_ms < ?",
+            ("s", *day_bounds_ms("2024-01-01")),
+        ).fetchall()
+    assert "COVERING INDEX idx_trades_strategy_time" in " ".join(row[-1] for row in plan)
@@ -67,3 +67,14 @@ def test_registry_list_strategies():
     strats = reg.list_strategies()
     assert len(strats) == 1
     assert strats[0] == mock
+
+def test_registry_load_single_strategy(tmp_path):
+    reg = StrategyRegistry()
+    strategies_dir = Path(__file__).parents[2] / "src" / "btc_predictor" / "strategies"
+
+    strategy = reg.load("pm_dummy_reg_v1", strategies_dir, tmp_path)
+
+    assert strategy.name == "pm_dummy_reg_v1"
+    assert reg.list_names() == ["pm_dummy_reg_v1"]
+    with pytest.raises(KeyError):
+        reg.load("no_such_strategy", strategies_dir, tmp_path)
@@ -50,3 +50,40 @@ def test_strategy_predict(trained_strategy):
 def test_strategy_name(trained_strategy):
     strategy, _ = trained_strategy
     assert strategy.name == "xgboost_v1"
+
+def test_predict_batch_matches_predict(trained_strategy):
+    strategy, df = trained_strategy
+    timestamps = df.index[30::7]
+    
+    batch = strategy.predict_batch(df, timestamps, timeframe_minutes=10)
+    assert len(batch) == len(timestamps)
+    
+    for ts, signal in zip(timestamps, batch):
+        expected = strategy.predict(df.loc[:ts], timeframe_minutes=10)
+        assert signal.timestamp == expected.timestamp
+        assert signal.direction == expected.direction
+        assert signal.confidence == pytest.approx(expected.confidence)
+        assert signal.current_price == pytest.approx(expected.current_price)
+
+def test_predict_batch_empty_timestamps(trained_strategy):
+    strategy, df = trained_strategy
+    assert strategy.predict_batch(df, df.index[:0], timeframe_minutes=10) == []
+
+def test_predict_batch_scores_in_one_pass(trained_strategy):
+    strategy, df = trained_strategy
+    timestamps = df.index[30::7]
+
+    # The batch path never falls back to per-row predict
+    strategy.predict = lambda *args: pytest.fail("per-row predict called")
+    assert len(strategy.predict_batch(df, timestamps, timeframe_minutes=10)) == len(timestamps)
+
+    # A subclass overriding predict keeps its semantics
+    calls = []
+
+    class Override(XGBoostDirectionStrategy):
+        def predict(self, ohlcv, timeframe_minutes):
+            calls.append(ohlcv.index[-1])
+            return super().predict(ohlcv, timeframe_minutes)
+
+    Override(model=strategy.models[10]).predict_batch(df, timestamps, timeframe_minutes=10)
+    assert calls == list(timestamps)